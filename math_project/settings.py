@@ -42,12 +42,18 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Estáticos precomprimidos servidos por la app si no hay proxy
+    # (SOLVER_SERVE_STATIC); va antes de sesión y CSRF para no pagar su costo.
+    'math_solver.middleware.PrecompressedStaticMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Perfilado opt-in de los solvers (ver SOLVER_PROFILING_* más abajo).
+    # Va al final para que CSRF y sesión ya se hayan procesado.
+    'math_solver.middleware.SolverProfilerMiddleware',
 ]
 
 ROOT_URLCONF = 'math_project.urls'
@@ -123,7 +129,145 @@ USE_TZ = True
 STATIC_URL = 'static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Fuera de DEBUG, 'collectstatic' genera nombres con hash de contenido y las
+# variantes .gz/.br (ver 'math_solver/storage.py').
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {
+        'BACKEND': ('django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+                    else 'math_solver.storage.CompressedManifestStaticFilesStorage'),
+    },
+}
+
+# Servir STATIC_ROOT desde la propia app cuando no hay un proxy delante.
+SOLVER_SERVE_STATIC = not DEBUG
+SOLVER_STATIC_MAX_AGE = 60 * 60 * 24 * 365  # segundos, para nombres con hash
+
+# Copias locales de Tailwind y MathJax ('python manage.py vendor_assets').
+SOLVER_VENDOR_ASSETS = False
+# Componente de MathJax (entrada TeX y MathML, salida SVG sin fuentes
+# externas): se carga desde aquí o, con SOLVER_VENDOR_ASSETS, su copia local.
+SOLVER_MATHJAX_URL = 'https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-mml-svg.js'
+SOLVER_TAILWIND_CLI = 'npx tailwindcss@3'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# --- Perfilado de solvers por petición ---
+# Con SOLVER_PROFILING_ENABLED = True, se perfilan las peticiones POST que
+# traigan un token firmado en SOLVER_PROFILING_HEADER (generado con
+# 'python manage.py profiling_token') o que caigan en la tasa de muestreo.
+SOLVER_PROFILING_ENABLED = False
+SOLVER_PROFILING_DIR = BASE_DIR / 'profiles'
+SOLVER_PROFILING_SAMPLE_RATE = 0.0
+SOLVER_PROFILING_HEADER = 'X-Solver-Profile'
+SOLVER_PROFILING_TOKEN_MAX_AGE = 60 * 60  # segundos
+
+
+# --- Admisión por costo y cola de segundo plano ---
+# Antes de llamar a dsolve se estima el costo de cada entrada (en segundos)
+# con el modelo de 'solver_logic/cost_model.py'. Las entradas baratas se
+# resuelven en línea, las caras en la cola y las patológicas se rechazan.
+SOLVER_ADMISSION_ENABLED = True
+SOLVER_INLINE_MAX_COST = 3.0
+SOLVER_REJECT_COST = 300.0
+# Pesos ajustados con 'python manage.py fit_cost_model'; si el archivo no
+# existe se usan los pesos por defecto del modelo.
+SOLVER_COST_WEIGHTS_FILE = BASE_DIR / 'cost_weights.json'
+# Orden de los hints de dsolve aprendido de los tiempos reales: cada intento
+# se registra en SOLVER_HINT_LOG (JSONL, None para desactivarlo) y
+# 'python manage.py fit_hint_order' genera SOLVER_HINT_TABLE_FILE, que cada
+# proceso carga al arrancar.
+SOLVER_HINT_TABLE_FILE = BASE_DIR / 'hint_table.json'
+SOLVER_HINT_LOG = None
+# Registro JSONL de tiempos reales de cada solve (None para desactivarlo).
+SOLVER_TIMINGS_LOG = None
+SOLVER_QUEUE_WORKERS = 2
+SOLVER_JOB_TTL = 60 * 60  # segundos que se conserva el resultado de un trabajo
+# Memoria de los procesos de la cola: tamaño de la caché de SymPy de cada
+# proceso (None = valor por defecto de SymPy) y límites para reciclarlos.
+# Un proceso se recicla tras SOLVER_WORKER_MAX_TASKS trabajos o si, después
+# de vaciar la caché de SymPy, sigue por encima de SOLVER_WORKER_MAX_RSS_MB.
+SOLVER_SYMPY_CACHE_SIZE = 500
+SOLVER_WORKER_MAX_TASKS = 200
+SOLVER_WORKER_MAX_RSS_MB = 1024
+
+# Almacén SQLite local compartido por los procesos del servidor. Los tests
+# usan uno temporal (ver 'math_solver.testing').
+SOLVER_STATE_DB = BASE_DIR / 'solver_state.sqlite3'
+TEST_RUNNER = 'math_solver.testing.TestRunner'
+
+# --- Reparto justo entre clientes ---
+# Cada cliente (clave de API, sesión o IP) tiene un cubo de tokens en
+# segundos de CPU: se rellena a 'rate' por segundo hasta 'burst' y cada solve
+# descuenta su tiempo de CPU real. Sin tokens se responde 429 con
+# 'Retry-After'. Las sesiones pagan además en el cubo común de su IP
+# ('network'), para varios alumnos tras la misma red; 'rate' 0 bloquea ese
+# tipo de cliente. Los trabajos de la cola se reparten por turnos entre clientes.
+# Activo fuera de DEBUG, igual que SOLVER_SERVE_STATIC.
+SOLVER_RATE_LIMIT_ENABLED = not DEBUG
+SOLVER_RATE_LIMITS = {
+    'key': {'rate': 2.0, 'burst': 120.0},
+    'session': {'rate': 0.5, 'burst': 30.0},
+    'ip': {'rate': 0.5, 'burst': 30.0},
+    'network': {'rate': 4.0, 'burst': 240.0},
+}
+# Máximo de trabajos en cola o en curso por cliente.
+SOLVER_RATE_MAX_PENDING = 10
+# Claves de API aceptadas: {clave: nombre del cliente}.
+SOLVER_API_KEY_HEADER = 'X-Api-Key'
+SOLVER_API_KEYS = {}
+
+# --- Trabajadores remotos ---
+# Direcciones de procesos 'python manage.py solver_worker' ('host:puerto' o
+# 'unix:/ruta'). Si hay alguna, los solves (en línea y de la cola) se envían
+# al trabajador menos cargado; con SOLVER_REMOTE_FALLBACK_LOCAL, si ninguno
+# responde se resuelven en este proceso.
+SOLVER_REMOTE_WORKERS = []
+SOLVER_REMOTE_TIMEOUT = 120.0  # segundos de espera por solve
+SOLVER_REMOTE_RETRIES = 2  # trabajadores adicionales que se prueban si uno muere
+SOLVER_REMOTE_HEALTH_INTERVAL = 5.0  # segundos antes de volver a probar uno caído
+SOLVER_REMOTE_FALLBACK_LOCAL = True
+
+# --- Single-flight de solves idénticos ---
+# Las peticiones simultáneas con la misma entrada canónica comparten un solo
+# solve, dentro de cada proceso y entre procesos (vía SOLVER_STATE_DB).
+SOLVER_SINGLEFLIGHT_ENABLED = True
+SOLVER_SINGLEFLIGHT_LEASE = 120.0  # segundos que se espera al líder antes de relevarlo
+SOLVER_SINGLEFLIGHT_RESULT_TTL = 30.0  # segundos que se reutiliza un resultado recién calculado
+
+# --- URLs cacheables de resultados ---
+# '/solver/<tipo>/<hash>/?campos' sirve el resultado con ETag fuerte y
+# 'Cache-Control' largo. Al cambiar la lógica o el formato de los solvers hay
+# que incrementar SOLVER_RESULT_VERSION para invalidar ETags y cachés.
+SOLVER_RESULT_VERSION = 3
+SOLVER_RESULT_MAX_AGE = 60 * 60 * 24 * 365  # segundos
+# Alias de CACHES donde el servidor guarda los resultados ya calculados.
+SOLVER_RESULT_CACHE = 'default'
+SOLVER_RESULT_CACHE_TIMEOUT = 60 * 60 * 24  # segundos
+
+# --- Renderizado de fórmulas ---
+# 'latex': el navegador compone las fórmulas con MathJax.
+# 'mathml': el servidor devuelve MathML listo para insertar y MathJax solo se
+# carga si algún fragmento no se pudo convertir ('requiere_mathjax').
+SOLVER_RENDER_MODE = 'latex'
+
+# --- Verificación numérica de soluciones ---
+# Con 'verify=true' en la petición (o para esta fracción del tráfico) se
+# comprueba la solución evaluando el residuo de la EDO en puntos aleatorios;
+# las verificaciones fallidas se registran en el logger 'math_solver.views'.
+SOLVER_VERIFY_SAMPLE_RATE = 0.0
+
+# --- Evaluación numérica de soluciones (/solver/solutions/<id>/eval/) ---
+# Las soluciones se guardan en SOLVER_RESULT_CACHE: con varios procesos hay
+# que usar una caché compartida (archivos, Redis...) en lugar de LocMemCache.
+SOLVER_EVAL_MAX_AGE = 60 * 60  # segundos
+
+# --- Soluciones en serie (/solver/series/<id>/?order=&budget_ms=) ---
+# Orden máximo que se puede pedir y tiempo máximo por petición; al agotarse
+# el tiempo se devuelve el orden alcanzado.
+SOLVER_SERIES_MAX_ORDER = 60
+SOLVER_SERIES_BUDGET_MS = 2000
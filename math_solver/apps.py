@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class MathSolverConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'math_solver'
+
+    def ready(self):
+        from django.conf import settings
+        from .solver_logic import hint_order
+
+        # Orden de hints aprendido (ver 'python manage.py fit_hint_order').
+        hint_order.configure(settings.SOLVER_HINT_TABLE_FILE, settings.SOLVER_HINT_LOG)
@@ -0,0 +1,5 @@
+"""
+Benchmarks reproducibles de los solvers.
+
+Ver 'runner.py' y el comando 'python manage.py benchmark_solvers'.
+"""
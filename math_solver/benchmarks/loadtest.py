@@ -0,0 +1,346 @@
+"""
+Prueba de Carga
+
+Reproduce un corpus JSONL de payloads del formulario contra la aplicación,
+ya sea en proceso (WSGI o ASGI, sin servidor) o contra un servidor HTTP
+local, con varios procesos trabajadores concurrentes durante un tiempo fijo.
+
+Cada línea del corpus es un objeto con 'solver_type' y los mismos nombres de
+campo que lee 'main_solver_view' (p. ej. 'riccati_p_function'). Opcionalmente
+puede incluir 'weight' para darle más peso dentro de la mezcla.
+
+El reporte incluye throughput, percentiles de latencia, tasas de error, de
+timeout, de solves encolados (202) y de rechazos por límite (429), global y
+por solver, y el crecimiento de RSS de cada trabajador.
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import re
+import time
+from http.cookiejar import CookieJar
+from io import BytesIO
+from pathlib import Path
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+from urllib.request import HTTPCookieProcessor, Request, build_opener
+
+DEFAULT_LOADTEST_CORPUS = Path(__file__).resolve().parent / 'loadtest_v1.jsonl'
+
+_CSRF_COOKIE_RE = re.compile(r'csrftoken=([^;]+)')
+
+
+def load_payloads(path, mix=None) -> list:
+    """
+    Lee el corpus JSONL y devuelve una lista de (payload, peso).
+
+    'mix' es un dict opcional {solver_type: peso} que multiplica el peso de
+    cada línea; un peso 0 excluye ese solver de la mezcla.
+    """
+    payloads = []
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            payload = json.loads(line)
+            if 'solver_type' not in payload:
+                raise ValueError(f"Línea {line_number}: falta 'solver_type'.")
+            weight = float(payload.pop('weight', 1))
+            if mix is not None:
+                weight *= float(mix.get(payload['solver_type'], 0))
+            if weight > 0:
+                payloads.append((payload, weight))
+    if not payloads:
+        raise ValueError("La mezcla seleccionada no contiene ningún payload.")
+    return payloads
+
+
+def parse_mix(spec: str) -> dict:
+    """Convierte 'riccati=3,quadratic=1' en {'riccati': 3.0, 'quadratic': 1.0}."""
+    mix = {}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        solver_type, _, weight = item.partition('=')
+        mix[solver_type.strip()] = float(weight or 1)
+    return mix
+
+
+def current_rss_kib() -> int:
+    """RSS actual del proceso en KiB (máximo histórico si no hay /proc)."""
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """Percentil por interpolación lineal sobre una lista ya ordenada."""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+# --- Clientes: cada uno expone get_csrf_token() y post(body, headers, timeout) ---
+
+class _WSGIClient:
+    """Llama directamente a 'math_project.wsgi.application'."""
+
+    def __init__(self, path):
+        from math_project.wsgi import application
+        self.app = application
+        self.path = path
+        self.cookies = ''
+
+    def _call(self, method, body=b'', headers=None):
+        environ = {
+            'REQUEST_METHOD': method,
+            'PATH_INFO': self.path,
+            'QUERY_STRING': '',
+            'SERVER_NAME': 'testserver',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'CONTENT_TYPE': 'application/x-www-form-urlencoded',
+            'CONTENT_LENGTH': str(len(body)),
+            'HTTP_COOKIE': self.cookies,
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': BytesIO(body),
+            'wsgi.errors': BytesIO(),
+            'wsgi.multithread': False,
+            'wsgi.multiprocess': True,
+            'wsgi.run_once': False,
+        }
+        for name, value in (headers or {}).items():
+            environ['HTTP_' + name.upper().replace('-', '_')] = value
+        status_holder = {}
+
+        def start_response(status, response_headers, exc_info=None):
+            status_holder['status'] = int(status.split()[0])
+            status_holder['headers'] = response_headers
+
+        chunks = self.app(environ, start_response)
+        try:
+            content = b''.join(chunks)
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()
+        return status_holder['status'], status_holder['headers'], content
+
+    def get_csrf_token(self):
+        _, headers, _ = self._call('GET')
+        for name, value in headers:
+            match = _CSRF_COOKIE_RE.search(value) if name.lower() == 'set-cookie' else None
+            if match:
+                self.cookies = f'csrftoken={match.group(1)}'
+                return match.group(1)
+        return ''
+
+    def post(self, body, headers, timeout):
+        status, _, content = self._call('POST', body, headers)
+        return status, content
+
+
+class _ASGIClient(_WSGIClient):
+    """Llama directamente a 'math_project.asgi.application' con un bucle asyncio propio."""
+
+    def __init__(self, path):
+        from math_project.asgi import application
+        self.app = application
+        self.path = path
+        self.cookies = ''
+        self.loop = asyncio.new_event_loop()
+
+    def _call(self, method, body=b'', headers=None):
+        raw_headers = [
+            (b'host', b'testserver'),
+            (b'content-type', b'application/x-www-form-urlencoded'),
+            (b'content-length', str(len(body)).encode()),
+            (b'cookie', self.cookies.encode()),
+        ]
+        raw_headers += [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': method, 'scheme': 'http', 'path': self.path, 'raw_path': self.path.encode(),
+            'query_string': b'', 'root_path': '', 'headers': raw_headers,
+            'client': ('127.0.0.1', 0), 'server': ('testserver', 80),
+        }
+        messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+        response = {'headers': [], 'body': b''}
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            await asyncio.sleep(3600)
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+                response['headers'] = [(k.decode(), v.decode()) for k, v in message.get('headers', [])]
+            elif message['type'] == 'http.response.body':
+                response['body'] += message.get('body', b'')
+
+        self.loop.run_until_complete(self.app(scope, receive, send))
+        return response['status'], response['headers'], response['body']
+
+
+class _HTTPClient:
+    """Cliente HTTP contra un servidor local ya arrancado."""
+
+    def __init__(self, base_url, path):
+        self.url = base_url.rstrip('/') + path
+        self.jar = CookieJar()
+        self.opener = build_opener(HTTPCookieProcessor(self.jar))
+
+    def get_csrf_token(self):
+        self.opener.open(self.url, timeout=30).read()
+        for cookie in self.jar:
+            if cookie.name == 'csrftoken':
+                return cookie.value
+        return ''
+
+    def post(self, body, headers, timeout):
+        headers = dict(headers, **{'Content-Type': 'application/x-www-form-urlencoded'})
+        request = Request(self.url, data=body, headers=headers, method='POST')
+        try:
+            with self.opener.open(request, timeout=timeout) as response:
+                return response.status, response.read()
+        except HTTPError as e:
+            return e.code, e.read()
+
+
+def _make_client(target, path):
+    if target == 'wsgi':
+        return _WSGIClient(path)
+    if target == 'asgi':
+        return _ASGIClient(path)
+    return _HTTPClient(target, path)
+
+
+def _close_inherited_connections():
+    """Los procesos hijos no deben reutilizar las conexiones a la BD del padre."""
+    from django.db import connections
+    connections.close_all()
+
+
+def _worker(args):
+    """Bucle de un trabajador: envía payloads hasta que se acaba el tiempo."""
+    worker_id, target, path, payloads, duration, timeout, seed = args
+    rng = random.Random(seed)
+    rss_start = current_rss_kib()
+    client = _make_client(target, path)
+    token = client.get_csrf_token()
+    headers = {'X-Requested-With': 'XMLHttpRequest', 'X-CSRFToken': token}
+    population = [payload for payload, _ in payloads]
+    weights = [weight for _, weight in payloads]
+
+    samples = []  # (solver_type, latencia_s, resultado)
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        payload = rng.choices(population, weights)[0]
+        body = urlencode(payload).encode('utf-8')
+        start = time.perf_counter()
+        try:
+            status, content = client.post(body, headers, timeout)
+            latency = time.perf_counter() - start
+            if latency > timeout:
+                outcome = 'timeout'
+            elif status == 200 and json.loads(content).get('success'):
+                outcome = 'ok'
+            elif status == 202:
+                # Enviado a la cola de segundo plano: aceptado, pero sin resultado.
+                outcome = 'queued'
+            elif status == 429:
+                # Cliente sin tokens o servidor saturado (ver 'fair_share').
+                outcome = 'limited'
+            else:
+                outcome = 'error'
+        except (TimeoutError, URLError) as e:
+            latency = time.perf_counter() - start
+            outcome = 'timeout' if 'timed out' in str(e) else 'error'
+        except Exception:
+            latency = time.perf_counter() - start
+            outcome = 'error'
+        samples.append((payload['solver_type'], latency, outcome))
+
+    return {
+        'worker': worker_id,
+        'pid': os.getpid(),
+        'rss_start_kib': rss_start,
+        'rss_end_kib': current_rss_kib(),
+        'samples': samples,
+    }
+
+
+def _summarize(samples: list, elapsed: float) -> dict:
+    latencies = sorted(latency for _, latency, _ in samples)
+    total = len(samples)
+    counts = {name: sum(1 for _, _, outcome in samples if outcome == name)
+              for name in ('error', 'timeout', 'queued', 'limited')}
+    return {
+        'requests': total,
+        'throughput_rps': round(total / elapsed, 3) if elapsed > 0 else 0.0,
+        'error_rate': round(counts['error'] / total, 4) if total else 0.0,
+        'timeout_rate': round(counts['timeout'] / total, 4) if total else 0.0,
+        'queued_rate': round(counts['queued'] / total, 4) if total else 0.0,
+        'limited_rate': round(counts['limited'] / total, 4) if total else 0.0,
+        'latency_ms': {
+            name: round(percentile(latencies, fraction) * 1000, 2)
+            for name, fraction in (('p50', 0.5), ('p90', 0.9), ('p95', 0.95), ('p99', 0.99), ('max', 1.0))
+        },
+    }
+
+
+def run_load_test(payloads: list, target: str = 'wsgi', path: str = '/solver/', concurrency: int = 2,
+                  duration: float = 10.0, timeout: float = 30.0, seed: int = 0) -> dict:
+    """
+    Lanza 'concurrency' procesos trabajadores contra 'target' ('wsgi', 'asgi'
+    o una URL base como 'http://127.0.0.1:8000') y devuelve el reporte.
+    """
+    jobs = [(i, target, path, payloads, duration, timeout, seed + i) for i in range(concurrency)]
+    start = time.monotonic()
+    if concurrency == 1:
+        results = [_worker(jobs[0])]
+    else:
+        # 'fork' hereda Django ya configurado; con 'spawn' habría que repetir django.setup().
+        context = multiprocessing.get_context('fork')
+        with context.Pool(concurrency, initializer=_close_inherited_connections) as pool:
+            results = pool.map(_worker, jobs)
+    elapsed = time.monotonic() - start
+
+    all_samples = [sample for result in results for sample in result['samples']]
+    by_solver = {}
+    for solver_type in sorted({solver_type for solver_type, _, _ in all_samples}):
+        by_solver[solver_type] = _summarize([s for s in all_samples if s[0] == solver_type], elapsed)
+
+    report = {
+        'target': target,
+        'concurrency': concurrency,
+        'duration_s': round(elapsed, 3),
+        'timeout_s': timeout,
+        'overall': _summarize(all_samples, elapsed),
+        'by_solver': by_solver,
+        'workers': [
+            {
+                'worker': result['worker'],
+                'pid': result['pid'],
+                'requests': len(result['samples']),
+                'rss_start_kib': result['rss_start_kib'],
+                'rss_end_kib': result['rss_end_kib'],
+                'rss_growth_kib': result['rss_end_kib'] - result['rss_start_kib'],
+            }
+            for result in results
+        ],
+    }
+    return report
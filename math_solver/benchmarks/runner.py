@@ -0,0 +1,205 @@
+"""
+Benchmark de Solvers
+
+Ejecuta un corpus versionado de ecuaciones contra cada familia de solvers y
+mide, por caso:
+
+- tiempo en frío (caché de SymPy vaciada antes de la ejecución),
+- tiempo en caliente (mínimo y mediana de varias repeticiones),
+- memoria pico (tracemalloc, en una ejecución aparte para no inflar tiempos),
+- número de llamadas a dsolve.
+
+El reporte es un diccionario serializable a JSON que puede guardarse como
+baseline y compararse después con 'compare_reports'.
+"""
+
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+import sympy
+from sympy import symbols
+from sympy.core.cache import clear_cache
+
+from ..solver_logic import cauchy_euler_solver, clairaut_envelope
+from ..solver_logic import general_solutions, integration, ode_analysis, riccati_solver, second_order_solver
+from ..solver_logic import series_engine
+from ..solver_logic.base_solver import y, parse_safe
+from ..solver_logic.registry import run_solver
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+DEFAULT_CORPUS = BENCHMARK_DIR / 'corpus_v1.json'
+DEFAULT_BASELINE = BENCHMARK_DIR / 'baseline.json'
+
+# Módulos cuyas llamadas a dsolve se contabilizan.
+_DSOLVE_MODULES = [
+    cauchy_euler_solver,
+    general_solutions,
+    riccati_solver,
+    second_order_solver,
+]
+
+
+def load_corpus(path=DEFAULT_CORPUS) -> dict:
+    """Carga un corpus de benchmark ({'version': N, 'cases': [...]})."""
+    with open(path, encoding='utf-8') as f:
+        corpus = json.load(f)
+    if 'version' not in corpus or 'cases' not in corpus:
+        raise ValueError(f"El corpus '{path}' debe tener las claves 'version' y 'cases'.")
+    return corpus
+
+
+@contextmanager
+def count_dsolve_calls():
+    """
+    Reemplaza temporalmente 'dsolve' en los módulos de los solvers por una
+    versión que cuenta sus llamadas. Produce un dict {'calls': n}.
+    """
+    counter = {'calls': 0}
+    originals = {}
+    for module in _DSOLVE_MODULES:
+        original = getattr(module, 'dsolve', None)
+        if original is None:
+            continue
+
+        def counting_dsolve(*args, _original=original, **kwargs):
+            counter['calls'] += 1
+            return _original(*args, **kwargs)
+
+        originals[module] = original
+        module.dsolve = counting_dsolve
+    try:
+        yield counter
+    finally:
+        for module, original in originals.items():
+            module.dsolve = original
+
+
+def _run_numeric(data: dict) -> dict:
+    """Ejecuta un caso del integrador Runge-Kutta (no pasa por el formulario)."""
+    # Se importa aquí para que el resto del benchmark no dependa de NumPy.
+    from ..solver_logic.ivp_solvers import solve_ivp_numerically
+
+    z = symbols('z')
+    rhs = parse_safe(data['rhs'], local_dict={'y': y, 'z': z})
+    if rhs is None:
+        return {'error': f"rhs = '{data['rhs']}' no es válida."}
+    x_range = tuple(data['x_range'])
+    y_prime_0 = float(data['y_prime_0']) if 'y_prime_0' in data else None
+    return solve_ivp_numerically(rhs, float(data['x0']), float(data['y0']), x_range,
+                                 order=data.get('order', 1), y_prime_0=y_prime_0)
+
+
+def run_case(case: dict) -> dict:
+    """Ejecuta una vez un caso del corpus y devuelve el resultado del solver."""
+    if case['solver'] == 'numeric_rk':
+        return _run_numeric(case['data'])
+    return run_solver(case['solver'], case['data'])
+
+
+def _clear_solver_caches():
+    # Las cachés propias de los solvers se vacían en cada medición para que
+    # las repeticiones midan el solve y no un acierto de caché.
+    general_solutions.cache_clear()
+    clairaut_envelope.cache_clear()
+    series_engine.cache_clear()
+    integration.cache_clear()
+    ode_analysis.cache_clear()
+
+
+def _timed(case: dict):
+    _clear_solver_caches()
+    start = time.perf_counter()
+    result = run_case(case)
+    return time.perf_counter() - start, result
+
+
+def benchmark_case(case: dict, repeat: int = 3) -> dict:
+    """Mide un caso: tiempo en frío, tiempos en caliente, memoria pico y dsolve."""
+    clear_cache()
+    with count_dsolve_calls() as counter:
+        cold, result = _timed(case)
+    dsolve_calls = counter['calls']
+
+    warm = [_timed(case)[0] for _ in range(max(repeat, 1))]
+
+    clear_cache()
+    _clear_solver_caches()
+    tracemalloc.start()
+    try:
+        run_case(case)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'solver': case['solver'],
+        'ok': 'error' not in result,
+        'cold_s': round(cold, 6),
+        'warm_min_s': round(min(warm), 6),
+        'warm_median_s': round(statistics.median(warm), 6),
+        'peak_kib': round(peak / 1024, 1),
+        'dsolve_calls': dsolve_calls,
+    }
+
+
+def run_benchmark(corpus: dict, repeat: int = 3, only=None, progress=None) -> dict:
+    """
+    Ejecuta todos los casos del corpus (o los que empiecen por algún prefijo
+    de 'only') y devuelve el reporte completo.
+    """
+    cases = {}
+    for case in corpus['cases']:
+        if only and not any(case['id'].startswith(prefix) for prefix in only):
+            continue
+        cases[case['id']] = benchmark_case(case, repeat=repeat)
+        if progress is not None:
+            progress(case['id'], cases[case['id']])
+
+    return {
+        'corpus_version': corpus['version'],
+        'repeat': repeat,
+        'environment': {
+            'python': platform.python_version(),
+            'sympy': sympy.__version__,
+            'machine': platform.machine(),
+        },
+        'cases': cases,
+    }
+
+
+def compare_reports(current: dict, baseline: dict, threshold: float = 0.25) -> list:
+    """
+    Compara un reporte contra un baseline y devuelve la lista de regresiones.
+
+    Se considera regresión que la mediana en caliente crezca más que
+    'threshold' (fracción relativa), que aumenten las llamadas a dsolve,
+    o que un caso que antes resolvía ahora devuelva error.
+    """
+    if current.get('corpus_version') != baseline.get('corpus_version'):
+        return [f"Versión de corpus distinta: {current.get('corpus_version')} "
+                f"vs baseline {baseline.get('corpus_version')}."]
+
+    regressions = []
+    for case_id, now in current['cases'].items():
+        before = baseline['cases'].get(case_id)
+        if before is None:
+            continue
+        if before['ok'] and not now['ok']:
+            regressions.append(f"{case_id}: antes resolvía y ahora devuelve error.")
+        if before['warm_median_s'] > 0:
+            ratio = now['warm_median_s'] / before['warm_median_s']
+            if ratio > 1 + threshold:
+                regressions.append(
+                    f"{case_id}: mediana en caliente {now['warm_median_s']:.4f}s "
+                    f"vs {before['warm_median_s']:.4f}s (x{ratio:.2f})."
+                )
+        if now['dsolve_calls'] > before['dsolve_calls']:
+            regressions.append(
+                f"{case_id}: llamadas a dsolve {now['dsolve_calls']} vs {before['dsolve_calls']}."
+            )
+    return regressions
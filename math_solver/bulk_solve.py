@@ -0,0 +1,304 @@
+"""
+Resolución Masiva sin Conexión
+
+Para calificar tareas o generar claves de respuestas hay que resolver
+decenas de miles de ecuaciones; 'python manage.py bulk_solve' lo hace sin
+pasar por el formulario. La entrada es un CSV (columnas 'solver_type', los
+campos del formulario y, opcionalmente, 'id') o un JSONL con los mismos
+objetos (o registros con el payload en 'data').
+
+- La entrada se lee en streaming y solo hay un número fijo de trabajos en
+  curso (WINDOW_PER_WORKER por proceso), así que la memoria no depende del
+  tamaño del archivo. Los procesos del pool se reciclan como los de la cola.
+- Si un proceso muere (p. ej. por falta de memoria) y rompe el pool, se crea
+  otro y se reenvían las entradas en curso, cada una como mucho
+  POOL_RETRIES veces; después se escriben como 'error'.
+- Cada entrada tiene un presupuesto de tiempo ('solve_item' de
+  'cache_warmup').
+- Cada resultado se añade al JSONL de salida en cuanto termina (en orden de
+  llegada; 'linea' indica la línea de la entrada):
+
+      {"linea": 12, "id": "alumno-7", "solver_type": "riccati",
+       "estado": "ok", "tiempo_s": 0.41, "resultado": {...}}
+
+  'estado' es 'ok', 'error' (con 'error'), 'timeout' o 'invalida'.
+
+- El punto de control (<salida>.checkpoint) guarda la última línea hasta la
+  que todo está escrito. Al reanudar se salta hasta esa línea y las
+  posteriores que ya estén en la salida, y se descarta una última línea a
+  medio escribir.
+
+Las entradas equivalentes (mismo hash canónico) que se repiten cerca
+reutilizan el resultado (caché acotada de RESULT_CACHE_SIZE entradas).
+"""
+
+import csv
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import ExitStack
+
+from .cache_warmup import STATUS_ERROR, STATUS_OK, STATUS_TIMEOUT, solve_item, solve_pool
+from .solver_logic.compact import compact_result
+from .solver_logic.registry import SOLVERS, input_hash
+
+WINDOW_PER_WORKER = 4
+RESULT_CACHE_SIZE = 512
+# Veces que se reenvía una entrada cuyo pool se rompió.
+POOL_RETRIES = 2
+CHECKPOINT_VERSION = 1
+# Estado de las líneas de la entrada que no se pudieron leer.
+STATUS_INVALID = 'invalida'
+
+
+class CheckpointMismatch(Exception):
+    """El punto de control corresponde a otra entrada u otras opciones."""
+
+
+def input_format(path) -> str:
+    """'csv' o 'jsonl' según la extensión del archivo."""
+    return 'csv' if str(path).lower().endswith('.csv') else 'jsonl'
+
+
+def iter_jobs(path, fmt=None):
+    """
+    Recorre la entrada sin cargarla entera. Produce (línea, id, solver_type,
+    data); si la línea no es válida, solver_type es None y data es el motivo.
+    """
+    fmt = fmt or input_format(path)
+    with open(path, encoding='utf-8', newline='') as f:
+        if fmt == 'csv':
+            # La línea 1 es la cabecera.
+            records = ((number, row) for number, row in enumerate(csv.DictReader(f), 2))
+        else:
+            records = _jsonl_records(f)
+        for number, record in records:
+            if isinstance(record, str):
+                yield number, None, None, record
+                continue
+            solver_type = record.get('solver_type')
+            job_id = record.get('id')
+            if solver_type not in SOLVERS:
+                yield number, job_id, None, f'Tipo de solver desconocido: "{solver_type}"'
+                continue
+            data = record['data'] if isinstance(record.get('data'), dict) else record
+            fields = {name: str(data[name]) for name, _ in SOLVERS[solver_type].fields
+                      if data.get(name) not in (None, '')}
+            yield number, job_id, solver_type, fields
+
+
+def _jsonl_records(f):
+    for number, line in enumerate(f, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield number, f'JSON no válido: {e}'
+            continue
+        yield number, record if isinstance(record, dict) else 'Se esperaba un objeto JSON'
+
+
+def checkpoint_path(output) -> str:
+    return f'{output}.checkpoint'
+
+
+def _read_checkpoint(output, source, options) -> int:
+    try:
+        with open(checkpoint_path(output), encoding='utf-8') as f:
+            checkpoint = json.load(f)
+    except (OSError, ValueError):
+        return 0
+    if checkpoint.get('entrada') != os.path.abspath(source) or checkpoint.get('opciones') != options:
+        raise CheckpointMismatch(
+            f"El punto de control de '{output}' es de otra entrada u otras opciones; usa --restart."
+        )
+    return int(checkpoint.get('linea', 0))
+
+
+def _write_checkpoint(output, source, options, line: int):
+    path = checkpoint_path(output)
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'version': CHECKPOINT_VERSION, 'entrada': os.path.abspath(source), 'opciones': options,
+                   'linea': line}, f)
+    os.replace(tmp, path)
+
+
+def _recover_output(output, watermark: int) -> set:
+    """
+    Descarta una última línea a medio escribir y devuelve las líneas de la
+    entrada posteriores a 'watermark' que ya están en la salida.
+    """
+    done = set()
+    if not os.path.exists(output):
+        return done
+    with open(output, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size:
+            f.seek(size - 1)
+            if f.read(1) != b'\n':
+                # Se busca el último salto de línea completo y se trunca ahí.
+                position = size
+                while position > 0:
+                    step = min(4096, position)
+                    position -= step
+                    f.seek(position)
+                    chunk = f.read(step)
+                    index = chunk.rfind(b'\n')
+                    if index != -1:
+                        position += index + 1
+                        break
+                f.truncate(position)
+    with open(output, encoding='utf-8') as f:
+        for line in f:
+            try:
+                number = json.loads(line)['linea']
+            except (ValueError, KeyError, TypeError):
+                continue
+            if number > watermark:
+                done.add(number)
+    return done
+
+
+class _Watermark:
+    """Última línea de la entrada hasta la que todas están escritas (o ya estaban)."""
+
+    def __init__(self, start: int):
+        self.value = start
+        self._highest = start
+
+    def advance(self, line: int, issued):
+        """'issued': líneas leídas que aún no se han escrito."""
+        self._highest = max(self._highest, line)
+        self.value = max(self.value, min(issued) - 1 if issued else self._highest)
+
+
+def bulk_solve(source, output, workers: int = 2, budget: float = 30.0, render: str = 'latex',
+               schema: int = 1, restart: bool = False, checkpoint_every: int = 100, progress=None) -> dict:
+    """
+    Resuelve todas las entradas de 'source' y añade los resultados a
+    'output'. Con schema=2 cada resultado usa el esquema compacto. Devuelve
+    los contadores de la ejecución; 'progress(contadores)' se llama tras cada
+    punto de control.
+    """
+    options = {'render': render, 'schema': schema, 'budget': budget}
+    if restart:
+        for path in (output, checkpoint_path(output)):
+            if os.path.exists(path):
+                os.remove(path)
+    watermark_line = _read_checkpoint(output, source, options)
+    already_done = _recover_output(output, watermark_line)
+    watermark = _Watermark(watermark_line)
+
+    stats = {STATUS_OK: 0, STATUS_ERROR: 0, STATUS_TIMEOUT: 0, STATUS_INVALID: 0, 'reutilizadas': 0,
+             'saltadas': 0, 'linea': watermark_line}
+    start = time.perf_counter()
+    results = OrderedDict()
+    issued = {}
+    in_flight = {}
+    since_checkpoint = 0
+
+    with open(output, 'a', encoding='utf-8') as out, ExitStack() as stack:
+        executor = solve_pool(workers)
+        # Al salir se cierra el pool vigente (puede haberse reemplazado).
+        stack.callback(lambda: executor.shutdown())
+
+        def replace_pool():
+            nonlocal executor
+            executor.shutdown(wait=False)
+            executor = solve_pool(workers)
+
+        def submit(number, job_id, solver_type, digest, data, attempts=0):
+            try:
+                future = executor.submit(solve_item, solver_type, data, render, budget)
+            except BrokenProcessPool:
+                # El pool se rompió antes de que 'collect' lo viera.
+                replace_pool()
+                future = executor.submit(solve_item, solver_type, data, render, budget)
+            in_flight[future] = (number, job_id, solver_type, digest, data, executor, attempts)
+
+        def write(number, job_id, solver_type, status, elapsed, result):
+            nonlocal since_checkpoint
+            record = {'linea': number, 'id': job_id, 'solver_type': solver_type, 'estado': status,
+                      'tiempo_s': round(elapsed, 6)}
+            if isinstance(result, dict) and 'error' in result:
+                record['error'] = result['error']
+            elif result is not None:
+                record['resultado'] = compact_result(solver_type, result) if schema == 2 else result
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            stats[status] += 1
+            issued.pop(number, None)
+            watermark.advance(number, issued)
+            since_checkpoint += 1
+            if since_checkpoint >= checkpoint_every:
+                checkpoint()
+
+        def checkpoint():
+            nonlocal since_checkpoint
+            out.flush()
+            os.fsync(out.fileno())
+            _write_checkpoint(output, source, options, watermark.value)
+            stats['linea'] = watermark.value
+            stats['segundos'] = round(time.perf_counter() - start, 3)
+            since_checkpoint = 0
+            if progress:
+                progress(dict(stats))
+
+        def collect(block: bool):
+            finished, _ = wait(list(in_flight), timeout=None if block else 0, return_when=FIRST_COMPLETED)
+            for future in finished:
+                number, job_id, solver_type, digest, data, pool, attempts = in_flight.pop(future)
+                try:
+                    status, result, elapsed = future.result()
+                except BrokenProcessPool as e:
+                    if attempts >= POOL_RETRIES:
+                        status, result, elapsed = STATUS_ERROR, {'error': f'El proceso falló: {e}'}, 0.0
+                    else:
+                        # La entrada no llegó a resolverse: se reenvía a un pool nuevo.
+                        if pool is executor:
+                            replace_pool()
+                        submit(number, job_id, solver_type, digest, data, attempts + 1)
+                        continue
+                except Exception as e:
+                    status, result, elapsed = STATUS_ERROR, {'error': f'El proceso falló: {e}'}, 0.0
+                if status == STATUS_OK and digest is not None:
+                    results[digest] = result
+                    while len(results) > RESULT_CACHE_SIZE:
+                        results.popitem(last=False)
+                write(number, job_id, solver_type, status, elapsed, result)
+
+        for number, job_id, solver_type, data in iter_jobs(source):
+            if number <= watermark_line or number in already_done:
+                stats['saltadas'] += 1
+                continue
+            issued[number] = True
+            if solver_type is None:
+                write(number, job_id, None, STATUS_INVALID, 0.0, {'error': data})
+                continue
+            try:
+                digest = input_hash(solver_type, data)
+            except Exception:
+                digest = None
+            if digest in results:
+                results.move_to_end(digest)
+                stats['reutilizadas'] += 1
+                write(number, job_id, solver_type, STATUS_OK, 0.0, results[digest])
+                continue
+            submit(number, job_id, solver_type, digest, data)
+            while len(in_flight) >= workers * WINDOW_PER_WORKER:
+                collect(block=True)
+            if in_flight:
+                collect(block=False)
+
+        while in_flight:
+            collect(block=True)
+        if since_checkpoint:
+            checkpoint()
+    stats['segundos'] = round(time.perf_counter() - start, 3)
+    return stats
@@ -0,0 +1,257 @@
+"""
+Precalentamiento de la Caché de Resultados
+
+Tras cada despliegue la caché de resultados está vacía y la primera hora de
+tráfico paga el 'dsolve' completo de las mismas ecuaciones populares. Este
+módulo (usado por 'python manage.py warm_cache') lee un corpus JSONL o el
+registro de tiempos (SOLVER_TIMINGS_LOG), agrupa las entradas por hash
+canónico (de la más a la menos frecuente) y las resuelve de antemano.
+
+Hay dos modos:
+
+- local: un pool de procesos resuelve las entradas, cada una con un
+  presupuesto de tiempo, y los resultados se guardan en SOLVER_RESULT_CACHE
+  con la misma clave que usa la vista. Solo sirve si esa caché es compartida
+  (archivos, base de datos, Redis...), no con LocMemCache.
+- remoto ('url'): las entradas se envían al servidor en marcha, que las
+  resuelve y llena sus propias cachés, también las de cada proceso
+  (soluciones generales, clasificación de EDOs, integrales...).
+
+Ambos modos son seguros con el servidor en marcha: en local solo se añaden
+claves que no existen ('cache.add') y los procesos corren con menor
+prioridad, y en remoto las peticiones son las normales de la vista.
+"""
+
+import json
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from urllib.error import URLError
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import jobs
+from .solver_logic.registry import SOLVERS, input_hash, run_solver
+
+STATUS_OK = 'ok'
+STATUS_CACHED = 'cached'
+STATUS_ERROR = 'error'
+STATUS_TIMEOUT = 'timeout'
+STATUS_LIMITED = 'limited'
+
+# Prioridad de los procesos del pool local (os.nice).
+WARMUP_NICE = 10
+
+
+class BudgetExceeded(BaseException):
+    """
+    Se agotó el presupuesto de una entrada. Hereda de BaseException para que
+    los 'except Exception' de los solvers no la conviertan en un error.
+    """
+
+
+def read_entries(paths):
+    """
+    Lee (solver_type, data, peso) de archivos JSONL con payloads del formulario
+    (como el corpus de 'loadtest') o registros de tiempos ({'solver_type',
+    'data'}). Devuelve (entradas, líneas no válidas).
+    """
+    entries, invalid = [], 0
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                try:
+                    record = json.loads(line)
+                    solver_type = record['solver_type']
+                    data = record['data'] if isinstance(record.get('data'), dict) else record
+                    weight = float(record.get('weight', 1))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    invalid += 1
+                    continue
+                if solver_type not in SOLVERS:
+                    invalid += 1
+                    continue
+                fields = {name: str(data[name]) for name, _ in SOLVERS[solver_type].fields if name in data}
+                entries.append((solver_type, fields, weight))
+    return entries, invalid
+
+
+def plan_warmup(entries, limit=None):
+    """
+    Agrupa las entradas por hash canónico y las ordena de más a menos
+    frecuente. Devuelve ([(digest, solver_type, data)], entradas sin hash).
+    """
+    counts, first, invalid = Counter(), {}, 0
+    for solver_type, data, weight in entries:
+        try:
+            digest = input_hash(solver_type, data)
+        except Exception:
+            invalid += 1
+            continue
+        counts[digest] += weight
+        first.setdefault(digest, (solver_type, data))
+    ordered = sorted(counts, key=lambda digest: -counts[digest])
+    items = [(digest, *first[digest]) for digest in ordered]
+    return (items[:limit] if limit else items), invalid
+
+
+def _budget_exceeded(signum, frame):
+    raise BudgetExceeded()
+
+
+def solve_item(solver_type: str, data: dict, render: str = 'latex', budget=None):
+    """
+    Resuelve una entrada con como mucho 'budget' segundos (SIGALRM; sin límite
+    donde no existe). Devuelve (estado, resultado, segundos).
+    """
+    start = time.perf_counter()
+    use_alarm = bool(budget) and hasattr(signal, 'setitimer')
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _budget_exceeded)
+        signal.setitimer(signal.ITIMER_REAL, budget)
+    try:
+        result = run_solver(solver_type, data, render=render)
+        status = STATUS_ERROR if 'error' in result else STATUS_OK
+    except BudgetExceeded:
+        result, status = None, STATUS_TIMEOUT
+    except Exception as e:
+        result, status = {'error': str(e)}, STATUS_ERROR
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous)
+    return status, result, time.perf_counter() - start
+
+
+def init_solve_worker(nice, *worker_args):
+    """Initializer de los pools de 'warm_cache' y 'bulk_solve': el de la cola y, si 'nice', menor prioridad."""
+    jobs._init_worker(*worker_args)
+    if nice and hasattr(os, 'nice'):
+        os.nice(nice)
+
+
+def solve_pool(workers: int, nice: int = 0) -> ProcessPoolExecutor:
+    """Pool de procesos para resolver entradas con 'solve_item', reciclados como los de la cola."""
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=init_solve_worker,
+        initargs=(nice, settings.SOLVER_SYMPY_CACHE_SIZE, settings.SOLVER_HINT_TABLE_FILE, settings.SOLVER_HINT_LOG),
+        max_tasks_per_child=settings.SOLVER_WORKER_MAX_TASKS,
+    )
+
+
+def _new_stats(total: int) -> dict:
+    return {'total': total, STATUS_OK: 0, STATUS_CACHED: 0, STATUS_ERROR: 0, STATUS_TIMEOUT: 0,
+            STATUS_LIMITED: 0}
+
+
+def warm_local(items, workers: int = 2, budget: float = 30.0, force: bool = False, progress=None) -> dict:
+    """
+    Resuelve 'items' en un pool de 'workers' procesos y guarda los resultados
+    correctos en SOLVER_RESULT_CACHE. 'progress(hechos, total, estado, digest,
+    solver_type, segundos)' se llama tras cada entrada.
+    """
+    from .views import result_cache_key
+
+    cache = caches[settings.SOLVER_RESULT_CACHE]
+    render = settings.SOLVER_RENDER_MODE
+    stats = _new_stats(len(items))
+    start = time.perf_counter()
+    done = 0
+
+    def report(status, digest, solver_type, elapsed):
+        nonlocal done
+        done += 1
+        stats[status] += 1
+        if progress:
+            progress(done, len(items), status, digest, solver_type, elapsed)
+
+    pending = []
+    for digest, solver_type, data in items:
+        if not force and cache.get(result_cache_key(digest)) is not None:
+            report(STATUS_CACHED, digest, solver_type, 0.0)
+        else:
+            pending.append((digest, solver_type, data))
+
+    if pending:
+        with solve_pool(workers, nice=WARMUP_NICE) as executor:
+            futures = {executor.submit(solve_item, solver_type, data, render, budget): (digest, solver_type)
+                       for digest, solver_type, data in pending}
+            for future in as_completed(futures):
+                digest, solver_type = futures[future]
+                try:
+                    status, result, elapsed = future.result()
+                except Exception:
+                    status, result, elapsed = STATUS_ERROR, None, 0.0
+                if status == STATUS_OK:
+                    key = result_cache_key(digest)
+                    if force:
+                        cache.set(key, result, settings.SOLVER_RESULT_CACHE_TIMEOUT)
+                    else:
+                        cache.add(key, result, settings.SOLVER_RESULT_CACHE_TIMEOUT)
+                report(status, digest, solver_type, elapsed)
+
+    stats['elapsed_s'] = round(time.perf_counter() - start, 3)
+    return stats
+
+
+def warm_remote(items, base_url: str, path: str = '/solver/', concurrency: int = 2, timeout: float = 30.0,
+                api_key=None, progress=None) -> dict:
+    """
+    Envía 'items' al servidor en 'base_url' con 'concurrency' peticiones a la
+    vez; cada una espera como mucho 'timeout' segundos. Con 'api_key' las
+    peticiones usan el límite de esa clave (ver 'fair_share').
+    """
+    from .benchmarks.loadtest import _HTTPClient
+
+    local = threading.local()
+    lock = threading.Lock()
+    stats = _new_stats(len(items))
+    start = time.perf_counter()
+    done = 0
+
+    def send(item):
+        digest, solver_type, data = item
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = _HTTPClient(base_url, path)
+            local.headers = {'X-Requested-With': 'XMLHttpRequest', 'X-CSRFToken': client.get_csrf_token()}
+            if api_key:
+                local.headers[settings.SOLVER_API_KEY_HEADER] = api_key
+        body = urlencode(dict(data, solver_type=solver_type)).encode('utf-8')
+        item_start = time.perf_counter()
+        try:
+            status_code, content = client.post(body, local.headers, timeout)
+            if status_code == 429:
+                status = STATUS_LIMITED
+            elif status_code in (200, 202) and json.loads(content).get('success'):
+                status = STATUS_OK
+            else:
+                status = STATUS_ERROR
+        except (TimeoutError, URLError) as e:
+            status = STATUS_TIMEOUT if 'timed out' in str(e) else STATUS_ERROR
+        except Exception:
+            status = STATUS_ERROR
+        return status, digest, solver_type, time.perf_counter() - item_start
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in as_completed([executor.submit(send, item) for item in items]):
+            status, digest, solver_type, elapsed = future.result()
+            with lock:
+                done += 1
+                stats[status] += 1
+                if progress:
+                    progress(done, len(items), status, digest, solver_type, elapsed)
+
+    stats['elapsed_s'] = round(time.perf_counter() - start, 3)
+    return stats
@@ -0,0 +1,137 @@
+"""
+Reparto Justo del Tiempo de CPU entre Clientes
+
+Un solo cliente que envía miles de ecuaciones de Riccati puede ocupar todos
+los procesos y dejar el servicio inutilizable para los demás. Por eso cada
+cliente tiene un cubo de tokens medido en segundos de CPU, no en peticiones:
+
+- el cubo se rellena a 'rate' segundos de CPU por segundo hasta 'burst';
+- un solve solo se admite si al cliente le quedan tokens (> 0);
+- al terminar se descuenta el tiempo de CPU real del solve, así que el cubo
+  puede quedar en negativo y el cliente espera hasta recuperarlo.
+
+Las respuestas ya cacheadas no gastan tokens. Los trabajos de la cola se
+cobran en el proceso que los ejecuta y se reparten entre clientes en
+'jobs' (ver '_claim_next').
+
+El cliente es, por orden: la clave de API (cabecera SOLVER_API_KEY_HEADER,
+solo las claves de SOLVER_API_KEYS), la sesión del navegador o la IP. Los
+límites de cada tipo están en SOLVER_RATE_LIMITS. Como pedir una sesión
+nueva es gratis, las sesiones pagan además en un cubo común a su IP
+('network'), más grande, para que borrar la cookie no dé tiempo de CPU
+nuevo. Un tipo con 'rate' 0 no puede resolver nada. El estado vive en el
+almacén SQLite local, compartido por todos los procesos de la máquina.
+"""
+
+import hashlib
+import math
+import time
+
+from django.conf import settings
+
+from . import local_store
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS rate_buckets (
+        client TEXT PRIMARY KEY,
+        tokens REAL NOT NULL,
+        updated REAL NOT NULL
+    )
+"""
+
+
+def _connect(db_path):
+    connection = local_store.connect(db_path)
+    connection.execute(_SCHEMA)
+    return connection
+
+
+def _digest(value: str) -> str:
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()[:16]
+
+
+def client_id(request) -> str:
+    """
+    Identificador del cliente: 'key:<nombre>', 'session:<hash>@<dirección>'
+    o 'ip:<dirección>'.
+    """
+    api_key = request.headers.get(settings.SOLVER_API_KEY_HEADER)
+    if api_key and api_key in settings.SOLVER_API_KEYS:
+        return f'key:{settings.SOLVER_API_KEYS[api_key]}'
+    address = request.META.get('REMOTE_ADDR', 'desconocida')
+    session = getattr(request, 'session', None)
+    if session is not None and session.session_key:
+        return f'session:{_digest(session.session_key)}@{address}'
+    return f'ip:{address}'
+
+
+def limits_for(client: str):
+    """(rate, burst) del tipo de cliente según SOLVER_RATE_LIMITS."""
+    limits = settings.SOLVER_RATE_LIMITS[client.split(':', 1)[0]]
+    return limits['rate'], limits['burst']
+
+
+def buckets_for(client: str) -> list:
+    """
+    Cubos que paga el cliente, [(cubo, rate, burst)]: el suyo y, para una
+    sesión, también el común de su IP ('network:<dirección>').
+    """
+    buckets = [(client, *limits_for(client))]
+    if client.startswith('session:'):
+        network = f"network:{client.rpartition('@')[2]}"
+        buckets.append((network, *limits_for(network)))
+    return buckets
+
+
+def _refill(connection, client: str, rate: float, burst: float, now: float) -> float:
+    row = connection.execute("SELECT tokens, updated FROM rate_buckets WHERE client = ?", (client,)).fetchone()
+    if row is None:
+        return burst
+    tokens, updated = row
+    return min(burst, tokens + max(0.0, now - updated) * rate)
+
+
+def _update(db_path, client: str, rate: float, burst: float, cost: float, now=None) -> float:
+    """Rellena el cubo, descuenta 'cost' y devuelve los tokens que quedan."""
+    now = time.time() if now is None else now
+    connection = _connect(db_path)
+    connection.execute('BEGIN IMMEDIATE')
+    try:
+        tokens = _refill(connection, client, rate, burst, now) - cost
+        connection.execute("INSERT OR REPLACE INTO rate_buckets (client, tokens, updated) VALUES (?, ?, ?)",
+                           (client, tokens, now))
+    except BaseException:
+        connection.execute('ROLLBACK')
+        raise
+    connection.execute('COMMIT')
+    return tokens
+
+
+def retry_after(db_path, client: str, rate: float, burst: float, now=None) -> float:
+    """0 si el cliente puede resolver ahora; si no, los segundos hasta que le queden tokens."""
+    tokens = _update(db_path, client, rate, burst, 0.0, now)
+    if tokens > 0:
+        return 0.0
+    return (-tokens / rate) if rate > 0 else float('inf')
+
+
+def charge(db_path, client: str, cpu_s: float, rate: float, burst: float, now=None) -> float:
+    """Descuenta 'cpu_s' segundos de CPU del cubo del cliente; devuelve los tokens restantes."""
+    return _update(db_path, client, rate, burst, cpu_s, now)
+
+
+def client_wait(db_path, buckets, now=None) -> float:
+    """
+    0 si el cliente puede resolver ahora; si no, los segundos que le faltan
+    en el más vacío de sus cubos ('buckets_for'). math.inf si alguno tiene
+    'rate' 0: ese cliente no puede resolver nada.
+    """
+    if any(rate <= 0 for _bucket, rate, _burst in buckets):
+        return math.inf
+    return max(retry_after(db_path, bucket, rate, burst, now) for bucket, rate, burst in buckets)
+
+
+def charge_client(db_path, buckets, cpu_s: float, now=None):
+    """Descuenta 'cpu_s' de todos los cubos del cliente."""
+    for bucket, rate, burst in buckets:
+        charge(db_path, bucket, cpu_s, rate, burst, now)
@@ -0,0 +1,380 @@
+"""
+Cola de Trabajos en Segundo Plano
+
+Los solves que el modelo de costo considera caros no se resuelven dentro de
+la petición: se envían a un pool de procesos propio para que no compitan
+por el GIL con las peticiones baratas que se resuelven en línea.
+
+El estado de cada trabajo vive en el almacén local (SQLite), así que
+cualquier proceso trabajador del servidor puede responder a la consulta de
+estado, no solo el que lo encoló.
+
+Los procesos del pool se reciclan para que su memoria no crezca sin límite:
+tras SOLVER_WORKER_MAX_TASKS trabajos, o cuando un trabajo los deja por
+encima de SOLVER_WORKER_MAX_RSS_MB (ver 'worker_memory'). En el segundo caso
+se crea un pool nuevo para los trabajos siguientes y el viejo termina los
+que ya tenía encolados antes de cerrarse. Si un proceso muere a mitad de un
+trabajo (p. ej. lo mata el sistema por falta de memoria), el pool queda roto:
+se reemplaza por uno nuevo y sus trabajos en curso se marcan como fallidos.
+
+Los trabajos no van directamente al pool: esperan en la tabla 'solve_jobs' y
+cada proceso, cuando tiene un trabajador libre, toma el siguiente según el
+reparto justo entre clientes (ver '_claim_next'). Así, los trabajos de un
+cliente que envía miles de ecuaciones se intercalan con los de los demás en
+lugar de ocupar la cola entera.
+"""
+
+import json
+import logging
+import multiprocessing
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from django.conf import settings
+
+from . import fair_share, local_store, singleflight, solver_rpc, worker_memory
+from .solver_logic.cost_model import append_timing_record
+from .solver_logic.registry import input_hash, run_solver
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS solve_jobs (
+        id TEXT PRIMARY KEY,
+        solver_type TEXT NOT NULL,
+        status TEXT NOT NULL,
+        result TEXT,
+        created REAL NOT NULL,
+        finished REAL,
+        client TEXT,
+        payload TEXT,
+        started REAL
+    )
+"""
+# Columnas añadidas a la tabla después de su primera versión.
+_ADDED_COLUMNS = (('client', 'TEXT'), ('payload', 'TEXT'), ('started', 'REAL'))
+
+# Siguiente trabajo: primero los clientes con menos trabajos en curso, luego
+# el que lleva más tiempo sin que se le atienda y, por último, el más antiguo.
+_NEXT_JOB = """
+    SELECT id, solver_type, client, payload FROM solve_jobs AS j
+    WHERE status = ? AND payload IS NOT NULL
+    ORDER BY
+        (SELECT COUNT(*) FROM solve_jobs AS r WHERE r.client IS j.client AND r.status = ?),
+        COALESCE((SELECT MAX(started) FROM solve_jobs AS r WHERE r.client IS j.client), 0),
+        created
+    LIMIT 1
+"""
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+# Trabajos de este proceso enviados al pool y aún sin terminar.
+_in_flight = 0
+_dispatch_lock = threading.Lock()
+_migrated = set()
+
+
+def _connect(db_path):
+    connection = local_store.connect(db_path)
+    connection.execute(_SCHEMA)
+    if str(db_path) not in _migrated:
+        existing = {row[1] for row in connection.execute('PRAGMA table_info(solve_jobs)')}
+        for name, kind in _ADDED_COLUMNS:
+            if name not in existing:
+                try:
+                    connection.execute(f'ALTER TABLE solve_jobs ADD COLUMN {name} {kind}')
+                except sqlite3.OperationalError:
+                    # Otro proceso la añadió a la vez.
+                    pass
+        _migrated.add(str(db_path))
+    return connection
+
+
+def _init_worker(sympy_cache_size, hint_table, hint_log):
+    # La caché de SymPy se fija antes de importar los solvers (que importan SymPy).
+    worker_memory.configure_worker(sympy_cache_size)
+    from .solver_logic import hint_order
+
+    hint_order.configure(hint_table, hint_log)
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Pool de procesos de la cola, creado la primera vez que se usa."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # 'spawn' evita heredar hilos y conexiones del servidor web; los
+            # hijos solo importan la lógica de los solvers.
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.SOLVER_QUEUE_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(settings.SOLVER_SYMPY_CACHE_SIZE, settings.SOLVER_HINT_TABLE_FILE,
+                          settings.SOLVER_HINT_LOG),
+                max_tasks_per_child=settings.SOLVER_WORKER_MAX_TASKS,
+            )
+        return _executor
+
+
+def recycle_executor(executor: ProcessPoolExecutor):
+    """
+    Retira 'executor': los trabajos nuevos van a un pool nuevo y el viejo se
+    cierra cuando termine los trabajos que ya tenía encolados.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is executor:
+            _executor = None
+    executor.shutdown(wait=False)
+
+
+def _after_job(executor, future):
+    if future.cancelled():
+        return
+    if isinstance(future.exception(), BrokenProcessPool):
+        # Un proceso murió: el pool ya no acepta trabajos y se reemplaza.
+        recycle_executor(executor)
+        return
+    if future.exception() is not None:
+        return
+    report = future.result()
+    if report and report.get('recycle'):
+        recycle_executor(executor)
+
+
+def shutdown(wait: bool = True):
+    """Detiene el pool; con wait=True espera a que terminen los trabajos pendientes."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+
+def run_job(db_path, job_id: str, solver_type: str, data: dict, features: dict,
+            timings_log=None, singleflight_options=None, render='latex', max_rss_mb=None,
+            client=None, limits=None, remote=None):
+    """
+    Ejecuta un trabajo dentro de un proceso del pool y guarda su resultado,
+    renderizado en el modo 'render' ('latex' o 'mathml').
+
+    Con 'singleflight_options' (key, lease y result_ttl), los trabajos idénticos
+    que se ejecutan a la vez comparten un único solve. Con 'client' y
+    'limits' (sus cubos, ver 'fair_share.buckets_for'), el tiempo de CPU del
+    trabajo se descuenta de los cubos de tokens del cliente.
+
+    Con 'remote' (ver '_remote_options') el solve se envía a los trabajadores
+    remotos con las mismas opciones que en la vista (ver 'solver_rpc'); si
+    ninguno responde y 'fallback_local' es True, se resuelve aquí.
+
+    Devuelve el informe de memoria del trabajo (ver 'worker_memory.measure');
+    report['recycle'] indica que el proceso quedó por encima de 'max_rss_mb'.
+    """
+    connection = _connect(db_path)
+    connection.execute("UPDATE solve_jobs SET status = ? WHERE id = ?", (JOB_RUNNING, job_id))
+    remote_stats = {}
+
+    def solve():
+        if not remote:
+            return run_solver(solver_type, data, render=render)
+        options = dict(remote)
+        workers, fallback_local = options.pop('workers'), options.pop('fallback_local')
+        try:
+            return solver_rpc.get_pool(workers, **options).solve(solver_type, data, render=render,
+                                                                 stats=remote_stats)
+        except solver_rpc.NoWorkersAvailable as e:
+            if not fallback_local:
+                raise
+            logger.warning('Solve local: %s', e)
+            return run_solver(solver_type, data, render=render)
+
+    with worker_memory.measure() as memory:
+        try:
+            if singleflight_options is None:
+                result = solve()
+            else:
+                result = singleflight.do(fn=solve, db_path=db_path, **singleflight_options)
+            status = JOB_DONE
+        except Exception as e:
+            result = {'error': f'Ha ocurrido un error inesperado en el trabajo: {e}'}
+            status = JOB_FAILED
+    connection.execute(
+        "UPDATE solve_jobs SET status = ?, result = ?, finished = ? WHERE id = ?",
+        (status, json.dumps(result), time.time(), job_id),
+    )
+    worker_memory.govern(memory, max_rss_mb)
+    if client and limits:
+        fair_share.charge_client(db_path, limits, memory['cpu_s'] + remote_stats.get('cpu_s', 0.0))
+    if timings_log:
+        append_timing_record(timings_log, solver_type, data, features, memory['elapsed_s'],
+                             lane='queue', memory=memory)
+    return memory
+
+
+def _claim_next(db_path):
+    """
+    Marca como en curso el siguiente trabajo según el reparto justo y devuelve
+    (id, solver_type, client, data, features), o None si no hay ninguno.
+    """
+    connection = _connect(db_path)
+    connection.execute('BEGIN IMMEDIATE')
+    try:
+        row = connection.execute(_NEXT_JOB, (JOB_QUEUED, JOB_RUNNING)).fetchone()
+        if row is not None:
+            connection.execute("UPDATE solve_jobs SET status = ?, started = ? WHERE id = ?",
+                               (JOB_RUNNING, time.time(), row[0]))
+    except BaseException:
+        connection.execute('ROLLBACK')
+        raise
+    connection.execute('COMMIT')
+    if row is None:
+        return None
+    job_id, solver_type, client, payload = row
+    payload = json.loads(payload)
+    return job_id, solver_type, client, payload['data'], payload['features']
+
+
+def _fail_orphan(db_path, job_id, future):
+    """
+    Si el trabajo no llegó a guardar su resultado (su proceso murió o no se
+    pudo enviar al pool), lo marca como fallido para que no quede 'running'.
+    """
+    if not future.cancelled() and future.exception() is None:
+        return
+    error = future.exception()
+    if isinstance(error, BrokenProcessPool):
+        message = 'El proceso del trabajo terminó inesperadamente (posiblemente por falta de memoria).'
+    else:
+        message = f'Ha ocurrido un error inesperado en el trabajo: {error}'
+    _connect(db_path).execute(
+        "UPDATE solve_jobs SET status = ?, result = ?, finished = ? WHERE id = ? AND status = ?",
+        (JOB_FAILED, json.dumps({'error': message}), time.time(), job_id, JOB_RUNNING),
+    )
+
+
+def _remote_options():
+    """Trabajadores remotos y opciones de 'solver_rpc.get_pool' para 'run_job', o None."""
+    if not settings.SOLVER_REMOTE_WORKERS:
+        return None
+    return {'workers': list(settings.SOLVER_REMOTE_WORKERS), 'timeout': settings.SOLVER_REMOTE_TIMEOUT,
+            'retries': settings.SOLVER_REMOTE_RETRIES, 'health_interval': settings.SOLVER_REMOTE_HEALTH_INTERVAL,
+            'fallback_local': settings.SOLVER_REMOTE_FALLBACK_LOCAL}
+
+
+def _submit(db_path, job_id, solver_type, client, data, features):
+    singleflight_options = None
+    if settings.SOLVER_SINGLEFLIGHT_ENABLED:
+        key = singleflight.solve_key(input_hash(solver_type, data), settings.SOLVER_RENDER_MODE,
+                                     settings.SOLVER_RESULT_VERSION)
+        singleflight_options = {'key': key, 'lease': settings.SOLVER_SINGLEFLIGHT_LEASE,
+                                'result_ttl': settings.SOLVER_SINGLEFLIGHT_RESULT_TTL}
+    limits = fair_share.buckets_for(client) if client and settings.SOLVER_RATE_LIMIT_ENABLED else None
+    args = (run_job, db_path, job_id, solver_type, data, features, settings.SOLVER_TIMINGS_LOG,
+            singleflight_options, settings.SOLVER_RENDER_MODE, settings.SOLVER_WORKER_MAX_RSS_MB, client,
+            limits, _remote_options())
+    executor = get_executor()
+    try:
+        future = executor.submit(*args)
+    except BrokenProcessPool:
+        # El pool se rompió antes de que '_after_job' lo reemplazara.
+        recycle_executor(executor)
+        executor = get_executor()
+        future = executor.submit(*args)
+    future.add_done_callback(partial(_fail_orphan, db_path, job_id))
+    future.add_done_callback(partial(_after_job, executor))
+    future.add_done_callback(partial(_release_slot, db_path))
+
+
+def _dispatch(db_path):
+    """Envía trabajos de la cola al pool mientras este proceso tenga trabajadores libres."""
+    global _in_flight
+    while True:
+        with _dispatch_lock:
+            if _in_flight >= settings.SOLVER_QUEUE_WORKERS:
+                return
+            job = _claim_next(db_path)
+            if job is None:
+                return
+            _in_flight += 1
+        try:
+            _submit(db_path, *job)
+        except Exception:
+            with _dispatch_lock:
+                _in_flight -= 1
+            # El pool se está cerrando: el trabajo vuelve a la cola para otro proceso.
+            _connect(db_path).execute("UPDATE solve_jobs SET status = ? WHERE id = ?", (JOB_QUEUED, job[0]))
+            raise
+
+
+def _dispatch_quietly(db_path):
+    try:
+        _dispatch(db_path)
+    except Exception:
+        logger.exception('No se pudo despachar la cola de trabajos')
+
+
+def _release_slot(db_path, future):
+    global _in_flight
+    with _dispatch_lock:
+        _in_flight -= 1
+    # En otro hilo: este callback corre en el hilo del pool, y 'shutdown'
+    # espera a ese hilo con '_executor_lock' tomado.
+    threading.Thread(target=_dispatch_quietly, args=(db_path,), daemon=True).start()
+
+
+def submit_job(solver_type: str, data: dict, features: dict, client=None) -> str:
+    """Encola un trabajo del cliente 'client', despacha la cola y devuelve su id."""
+    db_path = settings.SOLVER_STATE_DB
+    connection = _connect(db_path)
+    now = time.time()
+    # Limpieza oportunista de resultados viejos; los trabajos en cola o en
+    # curso se conservan aunque lleven mucho tiempo esperando.
+    connection.execute(
+        "DELETE FROM solve_jobs WHERE status IN (?, ?) AND finished < ?",
+        (JOB_DONE, JOB_FAILED, now - settings.SOLVER_JOB_TTL),
+    )
+
+    job_id = uuid.uuid4().hex
+    connection.execute(
+        "INSERT INTO solve_jobs (id, solver_type, status, created, client, payload) VALUES (?, ?, ?, ?, ?, ?)",
+        (job_id, solver_type, JOB_QUEUED, now, client, json.dumps({'data': data, 'features': features})),
+    )
+    _dispatch(db_path)
+    return job_id
+
+
+def pending_jobs(client: str) -> int:
+    """Trabajos del cliente en cola o en curso."""
+    return _connect(settings.SOLVER_STATE_DB).execute(
+        "SELECT COUNT(*) FROM solve_jobs WHERE client = ? AND status IN (?, ?)",
+        (client, JOB_QUEUED, JOB_RUNNING),
+    ).fetchone()[0]
+
+
+def get_job(job_id: str):
+    """
+    Devuelve {'status', 'solver_type', 'data', 'result'} de un trabajo, o None
+    si no existe. 'data' (la entrada) es None en filas sin 'payload'.
+    """
+    row = _connect(settings.SOLVER_STATE_DB).execute(
+        "SELECT status, solver_type, payload, result FROM solve_jobs WHERE id = ?", (job_id,)
+    ).fetchone()
+    if row is None:
+        return None
+    status, solver_type, payload, result = row
+    return {
+        'status': status,
+        'solver_type': solver_type,
+        'data': json.loads(payload)['data'] if payload else None,
+        'result': json.loads(result) if result else None,
+    }
@@ -0,0 +1,39 @@
+"""
+Almacén Local Compartido
+
+Pequeña base SQLite, separada de la base de datos de Django, donde los
+procesos trabajadores de una misma máquina comparten estado efímero
+(trabajos en segundo plano, resultados en curso, contadores).
+
+Cada hilo mantiene su propia conexión por ruta. Se usa el modo WAL para que
+las lecturas no bloqueen a las escrituras entre procesos.
+"""
+
+import sqlite3
+import threading
+
+_local = threading.local()
+
+
+def connect(path) -> sqlite3.Connection:
+    """Devuelve la conexión de este hilo a la base en 'path' (la crea si hace falta)."""
+    path = str(path)
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+    connection = connections.get(path)
+    if connection is None:
+        # isolation_level=None: autocommit; las transacciones se abren a mano
+        # con 'BEGIN IMMEDIATE' donde hace falta atomicidad entre procesos.
+        connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connections[path] = connection
+    return connection
+
+
+def close_all():
+    """Cierra las conexiones de este hilo (p. ej. tras un fork)."""
+    for connection in getattr(_local, 'connections', {}).values():
+        connection.close()
+    _local.connections = {}
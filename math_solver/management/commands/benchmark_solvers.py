@@ -0,0 +1,74 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from math_solver.benchmarks.runner import (
+    DEFAULT_BASELINE, DEFAULT_CORPUS, compare_reports, load_corpus, run_benchmark,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Ejecuta el benchmark de solvers sobre un corpus versionado y reporta "
+        "tiempos en frío/caliente, memoria pico y llamadas a dsolve en JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--corpus', default=str(DEFAULT_CORPUS),
+                            help='Ruta del corpus JSON de ecuaciones.')
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE),
+                            help='Ruta del baseline contra el que se compara.')
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help='Crecimiento relativo máximo tolerado de la mediana en caliente.')
+        parser.add_argument('--repeat', type=int, default=3,
+                            help='Repeticiones en caliente por caso.')
+        parser.add_argument('--only', action='append', default=[],
+                            help='Prefijo de id de caso a ejecutar (se puede repetir).')
+        parser.add_argument('--output', help='Guardar el reporte JSON en este archivo.')
+        parser.add_argument('--update-baseline', action='store_true',
+                            help='Sobrescribir el baseline con el reporte actual.')
+        parser.add_argument('--no-compare', action='store_true',
+                            help='No comparar contra el baseline.')
+
+    def handle(self, *args, **options):
+        try:
+            corpus = load_corpus(options['corpus'])
+        except (OSError, ValueError) as e:
+            raise CommandError(f"No se pudo cargar el corpus: {e}")
+
+        def progress(case_id, row):
+            self.stderr.write(
+                f"{case_id}: frío {row['cold_s']:.4f}s, caliente {row['warm_median_s']:.4f}s, "
+                f"pico {row['peak_kib']} KiB, dsolve x{row['dsolve_calls']}"
+            )
+
+        report = run_benchmark(corpus, repeat=options['repeat'],
+                               only=options['only'], progress=progress)
+        report_json = json.dumps(report, indent=2, ensure_ascii=False)
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(report_json + '\n')
+        self.stdout.write(report_json)
+
+        if options['update_baseline']:
+            with open(options['baseline'], 'w', encoding='utf-8') as f:
+                f.write(report_json + '\n')
+            self.stderr.write(self.style.SUCCESS(f"Baseline actualizado: {options['baseline']}"))
+            return
+
+        if options['no_compare']:
+            return
+        try:
+            with open(options['baseline'], encoding='utf-8') as f:
+                baseline = json.load(f)
+        except OSError:
+            self.stderr.write(self.style.WARNING("No hay baseline guardado; se omite la comparación."))
+            return
+
+        regressions = compare_reports(report, baseline, threshold=options['threshold'])
+        if regressions:
+            for line in regressions:
+                self.stderr.write(self.style.ERROR(line))
+            raise CommandError(f"{len(regressions)} regresión(es) respecto al baseline.")
+        self.stderr.write(self.style.SUCCESS("Sin regresiones respecto al baseline."))
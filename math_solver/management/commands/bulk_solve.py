@@ -0,0 +1,53 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from math_solver.bulk_solve import CheckpointMismatch, bulk_solve
+
+
+class Command(BaseCommand):
+    help = (
+        "Resuelve sin conexión un CSV o JSONL de ecuaciones en un pool de procesos y "
+        "escribe los resultados en un JSONL a medida que terminan. Si se interrumpe, "
+        "al volver a ejecutarlo continúa donde se quedó."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('input', help="CSV (columnas 'solver_type', campos del formulario e 'id') o JSONL.")
+        parser.add_argument('output', nargs='?', default=None,
+                            help="JSONL de resultados. Por defecto, '<entrada>.results.jsonl'.")
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Procesos del pool. Por defecto, SOLVER_QUEUE_WORKERS.')
+        parser.add_argument('--budget', type=float, default=30.0,
+                            help='Segundos máximos por ecuación (por defecto, 30).')
+        parser.add_argument('--schema', type=int, choices=(1, 2), default=1,
+                            help='1: diccionario completo del solver; 2: esquema compacto de la API.')
+        parser.add_argument('--checkpoint-every', type=int, default=100,
+                            help='Resultados entre puntos de control (por defecto, 100).')
+        parser.add_argument('--restart', action='store_true',
+                            help='Empezar de cero: borra la salida y el punto de control.')
+
+    def handle(self, *args, **options):
+        workers = options['workers'] or settings.SOLVER_QUEUE_WORKERS
+        if workers < 1 or options['checkpoint_every'] < 1:
+            raise CommandError("--workers y --checkpoint-every deben ser al menos 1.")
+        output = options['output'] or f"{options['input']}.results.jsonl"
+        try:
+            stats = bulk_solve(
+                options['input'], output, workers=workers, budget=options['budget'],
+                render=settings.SOLVER_RENDER_MODE, schema=options['schema'], restart=options['restart'],
+                checkpoint_every=options['checkpoint_every'], progress=self._progress,
+            )
+        except CheckpointMismatch as e:
+            raise CommandError(str(e))
+        except OSError as e:
+            raise CommandError(f"No se pudo procesar '{options['input']}': {e}")
+        stats['salida'] = output
+        self.stdout.write(json.dumps(stats, indent=2, ensure_ascii=False))
+
+    def _progress(self, stats):
+        self.stderr.write(
+            f"Hasta la línea {stats['linea']}: {stats['ok']} ok, {stats['error']} con error, "
+            f"{stats['timeout']} timeout, {stats['saltadas']} saltada(s) ({stats['segundos']}s)"
+        )
@@ -0,0 +1,45 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from math_solver.solver_logic.cost_model import fit_weights, read_timing_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Ajusta los pesos del modelo de costo de entradas a partir del registro "
+        "de tiempos reales (SOLVER_TIMINGS_LOG) y los guarda en SOLVER_COST_WEIGHTS_FILE."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('logs', nargs='*',
+                            help='Registros JSONL de tiempos. Por defecto, SOLVER_TIMINGS_LOG.')
+        parser.add_argument('--output', default=None,
+                            help='Archivo de pesos de salida. Por defecto, SOLVER_COST_WEIGHTS_FILE.')
+        parser.add_argument('--ridge', type=float, default=0.1, help='Regularización ridge.')
+
+    def handle(self, *args, **options):
+        logs = options['logs'] or [settings.SOLVER_TIMINGS_LOG]
+        if not all(logs):
+            raise CommandError("Indica un registro de tiempos o configura SOLVER_TIMINGS_LOG.")
+
+        records = []
+        for path in logs:
+            try:
+                records.extend(record for record in read_timing_records(path) if record.get('features'))
+            except OSError as e:
+                raise CommandError(f"No se pudo leer '{path}': {e}")
+
+        try:
+            weights = fit_weights(records, ridge=options['ridge'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        output = options['output'] or settings.SOLVER_COST_WEIGHTS_FILE
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(weights, f, indent=2, sort_keys=True)
+            f.write('\n')
+        self.stdout.write(self.style.SUCCESS(
+            f"Pesos ajustados con {len(records)} registro(s) guardados en {output}."
+        ))
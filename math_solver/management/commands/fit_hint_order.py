@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from math_solver.solver_logic.hint_order import table_from_log
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconstruye la tabla de orden de hints de dsolve a partir del registro "
+        "de intentos (SOLVER_HINT_LOG) y la guarda en SOLVER_HINT_TABLE_FILE."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('logs', nargs='*',
+                            help='Registros JSONL de intentos. Por defecto, SOLVER_HINT_LOG.')
+        parser.add_argument('--output', default=None,
+                            help='Archivo de la tabla. Por defecto, SOLVER_HINT_TABLE_FILE.')
+
+    def handle(self, *args, **options):
+        logs = options['logs'] or [settings.SOLVER_HINT_LOG]
+        if not all(logs):
+            raise CommandError("Indica un registro de intentos o configura SOLVER_HINT_LOG.")
+
+        try:
+            table = table_from_log(logs)
+        except OSError as e:
+            raise CommandError(f"No se pudo leer el registro: {e}")
+
+        output = options['output'] or settings.SOLVER_HINT_TABLE_FILE
+        table.save(output)
+        contexts = len(table.stats) - (1 if table.stats else 0)
+        self.stdout.write(self.style.SUCCESS(
+            f"Tabla con {contexts} contexto(s) guardada en {output}."
+        ))
@@ -0,0 +1,54 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from math_solver.benchmarks.loadtest import (
+    DEFAULT_LOADTEST_CORPUS, load_payloads, parse_mix, run_load_test,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Reproduce un corpus JSONL de payloads del formulario contra la aplicación "
+        "(WSGI/ASGI en proceso o un servidor local) y reporta throughput, percentiles "
+        "de latencia, tasas de error/timeout y crecimiento de RSS por trabajador."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target', default='wsgi',
+                            help="'wsgi', 'asgi' o la URL base de un servidor (p. ej. http://127.0.0.1:8000).")
+        parser.add_argument('--path', default='/solver/', help='Ruta de main_solver_view.')
+        parser.add_argument('--corpus', default=str(DEFAULT_LOADTEST_CORPUS),
+                            help='Corpus JSONL de payloads del formulario.')
+        parser.add_argument('--mix', default='',
+                            help="Pesos por solver, p. ej. 'riccati=3,quadratic=1'. Por defecto, el corpus tal cual.")
+        parser.add_argument('--concurrency', type=int, default=2, help='Número de procesos trabajadores.')
+        parser.add_argument('--duration', type=float, default=10.0, help='Duración de la prueba en segundos.')
+        parser.add_argument('--timeout', type=float, default=30.0,
+                            help='Latencia a partir de la cual una petición cuenta como timeout.')
+        parser.add_argument('--seed', type=int, default=0, help='Semilla de la selección de payloads.')
+        parser.add_argument('--output', help='Guardar el reporte JSON en este archivo.')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise CommandError("--concurrency debe ser al menos 1.")
+        mix = parse_mix(options['mix']) if options['mix'] else None
+        try:
+            payloads = load_payloads(options['corpus'], mix=mix)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"No se pudo cargar el corpus: {e}")
+
+        self.stderr.write(
+            f"Prueba de carga: {options['target']}, {options['concurrency']} trabajador(es), "
+            f"{options['duration']}s, {len(payloads)} payload(s)..."
+        )
+        report = run_load_test(
+            payloads, target=options['target'], path=options['path'],
+            concurrency=options['concurrency'], duration=options['duration'],
+            timeout=options['timeout'], seed=options['seed'],
+        )
+        report_json = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(report_json + '\n')
+        self.stdout.write(report_json)
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from math_solver.middleware import make_profile_token
+
+
+class Command(BaseCommand):
+    help = (
+        "Imprime un token firmado para la cabecera de perfilado "
+        "(SOLVER_PROFILING_HEADER). Caduca según SOLVER_PROFILING_TOKEN_MAX_AGE."
+    )
+
+    def handle(self, *args, **options):
+        self.stdout.write(make_profile_token())
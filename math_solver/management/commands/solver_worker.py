@@ -0,0 +1,39 @@
+import signal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from math_solver.solver_rpc import make_server
+
+
+class Command(BaseCommand):
+    help = (
+        "Arranca un trabajador de solvers que atiende peticiones por TCP "
+        "('host:puerto') o por un socket Unix ('unix:/ruta'). El servidor web lo "
+        "usa si su dirección está en SOLVER_REMOTE_WORKERS."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--bind', default='127.0.0.1:7601',
+                            help="Dirección de escucha: 'host:puerto' (puerto 0 = uno libre) o 'unix:/ruta'.")
+        parser.add_argument('--concurrency', type=int, default=1,
+                            help='Solves simultáneos en este proceso (por defecto, 1).')
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise CommandError('--concurrency debe ser al menos 1.')
+        try:
+            server = make_server(options['bind'], options['concurrency'])
+        except (OSError, ValueError) as e:
+            raise CommandError(f"No se pudo escuchar en {options['bind']}: {e}")
+
+        # SIGTERM termina igual que Ctrl+C.
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        self.stdout.write(self.style.SUCCESS(f'Trabajador escuchando en {server.address}'))
+        self.stdout.flush()
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        self.stdout.write('Trabajador detenido.')
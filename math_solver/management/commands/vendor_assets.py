@@ -0,0 +1,71 @@
+"""
+Genera las copias locales de Tailwind y MathJax en 'static/math_solver/vendor/'.
+
+- MathJax: descarga desde SOLVER_MATHJAX_URL el mismo componente que se
+  carga del CDN ('tex-mml-svg': un único archivo, sin fuentes externas).
+- Tailwind: compila con el CLI de Tailwind (SOLVER_TAILWIND_CLI) una hoja de
+  estilos minificada que solo contiene las clases usadas en las plantillas y
+  en main.js, en lugar del compilador JIT del CDN.
+
+Después hay que ejecutar 'collectstatic' y activar SOLVER_VENDOR_ASSETS.
+"""
+
+import shlex
+import subprocess
+import tempfile
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+APP_DIR = Path(__file__).resolve().parents[2]
+VENDOR_DIR = APP_DIR / 'static' / 'math_solver' / 'vendor'
+
+TAILWIND_INPUT = "@tailwind base;\n@tailwind components;\n@tailwind utilities;\n"
+
+
+class Command(BaseCommand):
+    help = "Descarga MathJax y compila un Tailwind recortado para servirlos localmente."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skip-mathjax', action='store_true', help="No descargar MathJax.")
+        parser.add_argument('--skip-tailwind', action='store_true', help="No compilar Tailwind.")
+
+    def handle(self, *args, **options):
+        VENDOR_DIR.mkdir(parents=True, exist_ok=True)
+        if not options['skip_mathjax']:
+            self._mathjax()
+        if not options['skip_tailwind']:
+            self._tailwind()
+        self.stdout.write("Ejecuta 'python manage.py collectstatic' y activa SOLVER_VENDOR_ASSETS.")
+
+    def _mathjax(self):
+        target = VENDOR_DIR / 'mathjax' / 'mathjax.js'
+        target.parent.mkdir(exist_ok=True)
+        url = settings.SOLVER_MATHJAX_URL
+        try:
+            with urllib.request.urlopen(url, timeout=60) as response:
+                target.write_bytes(response.read())
+        except OSError as e:
+            raise CommandError(f"No se pudo descargar MathJax desde {url}: {e}")
+        self.stdout.write(f"MathJax: {target} ({target.stat().st_size // 1024} KiB)")
+
+    def _tailwind(self):
+        target = VENDOR_DIR / 'tailwind.min.css'
+        content = ','.join([
+            str(APP_DIR / 'templates' / '**' / '*.html'),
+            str(APP_DIR / 'static' / 'math_solver' / 'js' / '*.js'),
+        ])
+        with tempfile.NamedTemporaryFile('w', suffix='.css', delete=False) as f:
+            f.write(TAILWIND_INPUT)
+        command = shlex.split(settings.SOLVER_TAILWIND_CLI) + [
+            '-i', f.name, '-o', str(target), '--content', content, '--minify',
+        ]
+        try:
+            subprocess.run(command, check=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise CommandError(f"No se pudo compilar Tailwind con '{settings.SOLVER_TAILWIND_CLI}': {e}")
+        finally:
+            Path(f.name).unlink(missing_ok=True)
+        self.stdout.write(f"Tailwind: {target} ({target.stat().st_size // 1024} KiB)")
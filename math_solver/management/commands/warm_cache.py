@@ -0,0 +1,66 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from math_solver.cache_warmup import plan_warmup, read_entries, warm_local, warm_remote
+
+
+class Command(BaseCommand):
+    help = (
+        "Precalienta la caché de resultados con las entradas de un corpus JSONL o del "
+        "registro de tiempos (SOLVER_TIMINGS_LOG), sin repetir entradas equivalentes y "
+        "empezando por las más frecuentes. Se puede ejecutar con el servidor en marcha."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='*',
+                            help='Archivos JSONL con payloads o registros de tiempos. Por defecto, SOLVER_TIMINGS_LOG.')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Procesos (o peticiones simultáneas con --url). Por defecto, SOLVER_QUEUE_WORKERS.')
+        parser.add_argument('--budget', type=float, default=30.0,
+                            help='Segundos máximos por entrada (por defecto, 30).')
+        parser.add_argument('--limit', type=int, default=None, help='Solo las N entradas más frecuentes.')
+        parser.add_argument('--force', action='store_true',
+                            help='Resolver también las entradas que ya están en la caché (solo en local).')
+        parser.add_argument('--url', default=None,
+                            help='URL base de un servidor en marcha (p. ej. http://127.0.0.1:8000): '
+                                 'las entradas se le envían para que llene sus propias cachés.')
+        parser.add_argument('--path', default='/solver/', help='Ruta de main_solver_view (con --url).')
+        parser.add_argument('--api-key', default=None, help='Clave de API para las peticiones (con --url).')
+
+    def handle(self, *args, **options):
+        files = options['files'] or [settings.SOLVER_TIMINGS_LOG]
+        if not all(files):
+            raise CommandError("Indica un corpus o configura SOLVER_TIMINGS_LOG.")
+        workers = options['workers'] or settings.SOLVER_QUEUE_WORKERS
+        if workers < 1:
+            raise CommandError("--workers debe ser al menos 1.")
+
+        try:
+            entries, invalid = read_entries(files)
+        except OSError as e:
+            raise CommandError(f"No se pudo leer el corpus: {e}")
+        items, unparsable = plan_warmup(entries, limit=options['limit'])
+        self.stderr.write(
+            f"{len(entries)} entrada(s), {len(items)} distinta(s), {invalid + unparsable} no válida(s)."
+        )
+
+        if options['url']:
+            stats = warm_remote(items, options['url'], path=options['path'], concurrency=workers,
+                                timeout=options['budget'], api_key=options['api_key'], progress=self._progress)
+        else:
+            backend = settings.CACHES[settings.SOLVER_RESULT_CACHE]['BACKEND']
+            if backend.endswith('LocMemCache'):
+                self.stderr.write(self.style.WARNING(
+                    "SOLVER_RESULT_CACHE usa LocMemCache: el servidor no verá estos resultados. "
+                    "Configura una caché compartida o usa --url."
+                ))
+            stats = warm_local(items, workers=workers, budget=options['budget'], force=options['force'],
+                               progress=self._progress)
+
+        stats.update({'entries': len(entries), 'invalid': invalid + unparsable})
+        self.stdout.write(json.dumps(stats, indent=2))
+
+    def _progress(self, done, total, status, digest, solver_type, elapsed):
+        self.stderr.write(f"[{done}/{total}] {status:<7} {solver_type} {digest[:12]} {elapsed:.2f}s")
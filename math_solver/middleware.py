@@ -0,0 +1,158 @@
+import cProfile
+import mimetypes
+import os
+import random
+import re
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core import signing
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+from . import views
+from .solver_logic.registry import SOLVERS, input_hash
+
+PROFILE_TOKEN_SALT = 'math_solver.profiling'
+
+
+def make_profile_token() -> str:
+    """
+    Genera un token firmado para la cabecera de perfilado.
+
+    El token se firma con SECRET_KEY y caduca según
+    SOLVER_PROFILING_TOKEN_MAX_AGE, así que solo quien tenga acceso a la
+    configuración puede forzar el perfilado de una petición.
+    """
+    return signing.TimestampSigner(salt=PROFILE_TOKEN_SALT).sign('profile')
+
+
+def _valid_profile_token(token: str) -> bool:
+    max_age = getattr(settings, 'SOLVER_PROFILING_TOKEN_MAX_AGE', 3600)
+    try:
+        return signing.TimestampSigner(salt=PROFILE_TOKEN_SALT).unsign(token, max_age=max_age) == 'profile'
+    except signing.BadSignature:
+        return False
+
+
+class SolverProfilerMiddleware:
+    """
+    Perfila con cProfile las peticiones POST a 'main_solver_view'.
+
+    Solo actúa si SOLVER_PROFILING_ENABLED es True y además la petición trae
+    un token válido en la cabecera configurada (SOLVER_PROFILING_HEADER) o
+    cae dentro de la tasa de muestreo (SOLVER_PROFILING_SAMPLE_RATE).
+
+    Cada perfil se guarda como un archivo '.pstats' en SOLVER_PROFILING_DIR,
+    nombrado con el tipo de solver y el hash de la entrada, listo para
+    'snakeviz', 'flameprof' o 'python -m pstats'.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def _should_profile(self, request) -> bool:
+        if not getattr(settings, 'SOLVER_PROFILING_ENABLED', False):
+            return False
+        header = getattr(settings, 'SOLVER_PROFILING_HEADER', 'X-Solver-Profile')
+        token = request.headers.get(header)
+        if token:
+            return _valid_profile_token(token)
+        sample_rate = getattr(settings, 'SOLVER_PROFILING_SAMPLE_RATE', 0.0)
+        return sample_rate > 0 and random.random() < sample_rate
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if view_func is not views.main_solver_view or request.method != 'POST':
+            return None
+        if not self._should_profile(request):
+            return None
+
+        solver_type = request.POST.get('solver_type', '')
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            response = view_func(request, *view_args, **view_kwargs)
+        finally:
+            profiler.disable()
+            self._dump(profiler, request, solver_type)
+        return response
+
+    def _dump(self, profiler, request, solver_type):
+        if solver_type in SOLVERS:
+            tag = input_hash(solver_type, request.POST)[:16]
+        else:
+            solver_type, tag = 'unknown', 'noinput'
+
+        directory = Path(getattr(settings, 'SOLVER_PROFILING_DIR', settings.BASE_DIR / 'profiles'))
+        directory.mkdir(parents=True, exist_ok=True)
+        now = time.time()
+        stamp = f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}.{int(now * 1000) % 1000:03d}"
+        filename = f"{stamp}-{os.getpid()}-{solver_type}-{tag}.pstats"
+        profiler.dump_stats(directory / filename)
+
+
+# Nombres versionados por ManifestStaticFilesStorage: 'main.3f2a9c1b7d4e.js'.
+_HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[A-Za-z0-9]+$')
+
+# Codificaciones en orden de preferencia, con el sufijo de su variante.
+_ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+class PrecompressedStaticMiddleware:
+    """
+    Sirve STATIC_ROOT directamente desde la aplicación cuando no hay un proxy
+    delante (SOLVER_SERVE_STATIC = True).
+
+    Si el navegador acepta brotli o gzip y 'collectstatic' generó la variante
+    precomprimida, se envía esa variante sin comprimir nada por petición. Los
+    nombres con hash de contenido se sirven con caché inmutable de un año;
+    el resto, con una caché corta.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if getattr(settings, 'SOLVER_SERVE_STATIC', False) and request.method in ('GET', 'HEAD'):
+            response = self._serve(request)
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def _serve(self, request):
+        prefix = '/' + settings.STATIC_URL.lstrip('/')
+        if not request.path.startswith(prefix) or not settings.STATIC_ROOT:
+            return None
+        name = request.path[len(prefix):]
+        try:
+            path = safe_join(settings.STATIC_ROOT, name)
+        except SuspiciousFileOperation:
+            return None
+        if not os.path.isfile(path):
+            return None
+
+        accepted = request.headers.get('Accept-Encoding', '')
+        encoding = None
+        for candidate, suffix in _ENCODINGS:
+            if candidate in accepted and os.path.isfile(path + suffix):
+                encoding, path = candidate, path + suffix
+                break
+
+        content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+        response = FileResponse(open(path, 'rb'), content_type=content_type,
+                                filename=os.path.basename(name))
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        patch_vary_headers(response, ['Accept-Encoding'])
+        if _HASHED_NAME.search(name):
+            patch_cache_control(response, public=True, immutable=True,
+                                max_age=getattr(settings, 'SOLVER_STATIC_MAX_AGE', 60 * 60 * 24 * 365))
+        else:
+            patch_cache_control(response, public=True, max_age=60)
+        return response
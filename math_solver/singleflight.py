@@ -0,0 +1,168 @@
+"""
+Single-flight de Solves Idénticos
+
+Cuando llegan a la vez varias peticiones con la misma entrada canónica (p. ej.
+toda una clase enviando el mismo ejercicio), solo la primera ejecuta el
+solver; las demás esperan y comparten su resultado.
+
+La coordinación tiene dos niveles:
+
+1. Dentro de un proceso: un diccionario de llamadas en curso con un
+   'threading.Event' por clave.
+2. Entre procesos: una fila por clave en el almacén SQLite local. El proceso
+   que inserta la fila es el líder; el resto consulta la fila hasta que tenga
+   resultado. Si el líder muere, su fila caduca (lease) y otro toma el relevo.
+
+El resultado se conserva unos segundos tras terminar para que las peticiones
+que llegan justo después también lo reutilicen. Solo se comparten resultados
+serializables a JSON, como los diccionarios de los solvers.
+"""
+
+import json
+import os
+import threading
+import time
+
+from . import local_store
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS singleflight (
+        key TEXT PRIMARY KEY,
+        owner TEXT NOT NULL,
+        status TEXT NOT NULL,
+        result TEXT,
+        started REAL NOT NULL,
+        finished REAL
+    )
+"""
+
+_RUNNING = 'running'
+_DONE = 'done'
+
+
+class _Call:
+    """Llamada en curso dentro de este proceso."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.ok = False
+
+
+_calls = {}
+_calls_lock = threading.Lock()
+
+
+def solve_key(digest: str, render: str, version) -> str:
+    """
+    Clave de un solve: hash canónico de la entrada, modo de render y versión
+    de la lógica de los solvers (SOLVER_RESULT_VERSION), como la caché de
+    resultados, para no compartir un resultado entre versiones al desplegar.
+    """
+    return f'{version}:{digest}:{render}'
+
+
+def _owner_id() -> str:
+    return f'{os.getpid()}:{threading.get_ident()}'
+
+
+def _connect(db_path):
+    connection = local_store.connect(db_path)
+    connection.execute(_SCHEMA)
+    return connection
+
+
+def _claim(connection, key: str, lease: float, result_ttl: float):
+    """
+    Intenta ser el líder de 'key'. Devuelve ('leader', None), ('done', resultado)
+    o ('wait', None) si otro proceso lo está calculando.
+    """
+    now = time.time()
+    connection.execute('BEGIN IMMEDIATE')
+    try:
+        row = connection.execute(
+            "SELECT status, result, started, finished FROM singleflight WHERE key = ?", (key,)
+        ).fetchone()
+        state, result = 'leader', None
+        if row is not None:
+            status, stored, started, finished = row
+            if status == _DONE and finished is not None and now - finished <= result_ttl:
+                state, result = 'done', json.loads(stored)
+            elif status == _RUNNING and now - started <= lease:
+                state = 'wait'
+        if state == 'leader':
+            # No hay fila, el resultado caducó o el líder anterior excedió su lease.
+            connection.execute(
+                "INSERT OR REPLACE INTO singleflight (key, owner, status, started) VALUES (?, ?, ?, ?)",
+                (key, _owner_id(), _RUNNING, now),
+            )
+            # Limpieza oportunista de filas viejas.
+            connection.execute(
+                "DELETE FROM singleflight WHERE started < ?", (now - max(lease, result_ttl) * 4,)
+            )
+    except BaseException:
+        connection.execute('ROLLBACK')
+        raise
+    connection.execute('COMMIT')
+    return state, result
+
+
+def _lead(connection, key: str, fn):
+    try:
+        result = fn()
+    except BaseException:
+        # Los que esperan verán desaparecer la fila y lo intentarán por su cuenta.
+        connection.execute("DELETE FROM singleflight WHERE key = ? AND owner = ?", (key, _owner_id()))
+        raise
+    connection.execute(
+        "UPDATE singleflight SET status = ?, result = ?, finished = ? WHERE key = ? AND owner = ?",
+        (_DONE, json.dumps(result), time.time(), key, _owner_id()),
+    )
+    return result
+
+
+def _across_processes(key: str, fn, db_path, lease: float, result_ttl: float):
+    connection = _connect(db_path)
+    delay = 0.02
+    while True:
+        state, result = _claim(connection, key, lease, result_ttl)
+        if state == 'done':
+            return result
+        if state == 'leader':
+            return _lead(connection, key, fn)
+        # Otro proceso está calculando: se consulta con espera creciente.
+        time.sleep(delay)
+        delay = min(delay * 2, 0.25)
+
+
+def do(key: str, fn, db_path=None, lease: float = 120.0, result_ttl: float = 30.0):
+    """
+    Ejecuta 'fn()' una sola vez por 'key' entre todas las llamadas concurrentes.
+
+    Sin 'db_path' la deduplicación es solo dentro del proceso. 'lease' es el
+    tiempo máximo que se espera a otro líder antes de tomar el relevo, y
+    'result_ttl' cuánto se reutiliza un resultado ya terminado.
+    """
+    with _calls_lock:
+        call = _calls.get(key)
+        leader = call is None
+        if leader:
+            call = _calls[key] = _Call()
+
+    if not leader:
+        if call.event.wait(lease) and call.ok:
+            return call.result
+        # El líder falló o tardó demasiado: se calcula de forma independiente.
+        return fn()
+
+    try:
+        if db_path is None:
+            call.result = fn()
+        else:
+            call.result = _across_processes(key, fn, db_path, lease, result_ttl)
+        call.ok = True
+        return call.result
+    finally:
+        with _calls_lock:
+            _calls.pop(key, None)
+        call.event.set()
@@ -0,0 +1 @@
+from .api import Solution, SolverError, solve
@@ -0,0 +1,162 @@
+"""
+API de Biblioteca de los Solvers
+
+Las funciones 'solve_*' reciben strings del formulario y devuelven un
+diccionario con HTML y LaTeX para la plantilla. Para usar los solvers desde
+Python (procesos por lotes, trabajadores, notebooks) este módulo ofrece una
+API tipada que no depende de Django:
+
+    from math_solver.solver_logic import api
+
+    sol = api.bernoulli('1/x', 'x', 2)
+    sol.solution      # objeto SymPy (Eq, o lista de Eq/raíces)
+    sol.method        # 'bernoulli', 'solucion_particular', 'serie'...
+    sol.elapsed_s     # tiempo de reloj; sol.cpu_s, tiempo de CPU
+    sol.latex         # LaTeX de la solución, generado al pedirlo
+    sol.steps         # pasos en LaTeX, generados al pedirlos
+
+Los argumentos pueden ser expresiones SymPy (se usan tal cual, sin volver a
+parsearlas), strings o números. El solver se ejecuta en modo 'none' (ver
+'base_solver'), sin generar LaTeX ni HTML; 'steps' vuelve a ejecutarlo con
+presentación la primera vez que se pide, y las cachés del proceso (soluciones
+generales, clasificación de EDOs) hacen que esa segunda ejecución cueste poco.
+Si el solver no puede resolver la entrada se lanza 'SolverError'.
+"""
+
+import time
+from typing import Optional, Union
+
+from sympy import Basic, latex as sympy_latex
+
+from .base_solver import RENDER_LATEX, RENDER_NONE, capture_solution, render_mode
+from .compact import method_id
+from .registry import SOLVERS
+
+# Lo que aceptan los argumentos de la API.
+Expr = Union[Basic, str, int, float]
+
+# Claves del diccionario del solver que ya están en los atributos de 'Solution'.
+_OWN_FIELDS = ('solucion', 'steps', 'metodo', 'ecuacion_srepr', 'solucion_srepr', 'ics_srepr')
+
+
+class SolverError(Exception):
+    """El solver no pudo resolver la entrada (el 'error' de su diccionario)."""
+
+
+class Solution:
+    """
+    Resultado de un solver. 'solution' es None cuando solo hay una solución
+    parcial o en serie; en ese caso 'details' tiene el resto de campos del
+    solver (p. ej. 'serie' o 'curva_singular').
+    """
+
+    __slots__ = ('solver_type', 'method', 'equation', 'solution', 'ics', 'details', 'elapsed_s', 'cpu_s',
+                 '_args', '_latex', '_steps')
+
+    def __init__(self, solver_type: str, method: str, equation, solution, ics, details: dict,
+                 elapsed_s: float, cpu_s: float, args: tuple):
+        self.solver_type = solver_type
+        self.method = method
+        self.equation = equation
+        self.solution = solution
+        self.ics = ics
+        self.details = details
+        self.elapsed_s = elapsed_s
+        self.cpu_s = cpu_s
+        self._args = args
+        self._latex = None
+        self._steps = None
+
+    @property
+    def latex(self) -> Optional[str]:
+        """LaTeX de la solución (sin delimitadores), o None si no hay solución simbólica."""
+        if self._latex is None and self.solution is not None:
+            self._latex = sympy_latex(self.solution)
+        return self._latex
+
+    @property
+    def steps(self) -> list:
+        """Pasos del solver en LaTeX, como los muestra el formulario."""
+        if self._steps is None:
+            with render_mode(RENDER_LATEX):
+                result = SOLVERS[self.solver_type].func(*self._args)
+            self._steps = list(result.get('steps', []))
+        return self._steps
+
+    def __repr__(self):
+        return f'<Solution {self.solver_type} ({self.method}): {self.solution}>'
+
+
+def solve(solver_type: str, *args: Optional[Expr]) -> Solution:
+    """
+    Resuelve con el solver 'solver_type' del registro. Los argumentos van en
+    el orden de sus campos ('SOLVERS[solver_type].fields'); los que faltan
+    toman el mismo valor por defecto que en el formulario.
+    """
+    spec = SOLVERS.get(solver_type)
+    if spec is None:
+        raise ValueError(f'Tipo de solver desconocido: "{solver_type}"')
+    if len(args) > len(spec.fields):
+        raise TypeError(f'{solver_type} recibe como mucho {len(spec.fields)} argumentos ({len(args)} dados)')
+    args = tuple(_argument(value) for value in args)
+    args += tuple(default for _name, default in spec.fields[len(args):])
+
+    start, cpu_start = time.perf_counter(), time.thread_time()
+    with render_mode(RENDER_NONE), capture_solution() as captured:
+        result = spec.func(*args)
+    elapsed_s, cpu_s = time.perf_counter() - start, time.thread_time() - cpu_start
+    if 'error' in result:
+        raise SolverError(result['error'])
+
+    details = {key: value for key, value in result.items() if key not in _OWN_FIELDS}
+    return Solution(solver_type, method_id(solver_type, result), captured.get('ecuacion'),
+                    captured.get('solucion'), captured.get('ics'), details, elapsed_s, cpu_s, args)
+
+
+def _argument(value):
+    # Los números se pasan como texto para que 'parse_safe' los convierta a
+    # racionales exactos de SymPy, igual que desde el formulario.
+    if value is None or isinstance(value, (Basic, str)):
+        return value
+    return str(value)
+
+
+def quadratic(a: Expr, b: Expr, c: Expr) -> Solution:
+    """Raíces de a·x² + b·x + c = 0 ('solution' es la lista de raíces)."""
+    return solve('quadratic', a, b, c)
+
+
+def bernoulli(p: Expr, q: Expr, n: Expr, x0: Expr = None, y0: Expr = None) -> Solution:
+    """y' + P(x)·y = Q(x)·yⁿ, con y(x0) = y0 si se indican."""
+    return solve('bernoulli', p, q, n, x0, y0)
+
+
+def cauchy_euler(a: Expr, b: Expr, c: Expr, r: Expr = '0') -> Solution:
+    """a·x²·y'' + b·x·y' + c·y = R(x)."""
+    return solve('cauchy', a, b, c, r)
+
+
+def clairaut(f: Expr) -> Solution:
+    """y = x·p + f(p), con p = y'."""
+    return solve('clairaut', f)
+
+
+def riccati(p: Expr, q: Expr, r: Expr, x0: Expr = None, y0: Expr = None, yp: Expr = None) -> Solution:
+    """
+    y' = P(x)·y² + Q(x)·y + R(x): 'p' es el coeficiente de y², 'q' el de y y
+    'r' el término independiente. y(x0) = y0 y una solución particular 'yp'
+    son opcionales.
+    """
+    return solve('riccati', p, q, r, x0, y0, yp)
+
+
+def second_order_homogeneous(a: Expr, b: Expr, c: Expr, x0: Expr = None, y0: Expr = None,
+                             y_prime_0: Expr = None) -> Solution:
+    """a·y'' + b·y' + c·y = 0, con y(x0) = y0 e y'(x0) = y_prime_0 si se indican."""
+    return solve('second_order_homogeneous', a, b, c, x0, y0, y_prime_0)
+
+
+def second_order_nonhomogeneous(a: Expr, b: Expr, c: Expr, g: Expr, x0: Expr = None, y0: Expr = None,
+                                y_prime_0: Expr = None) -> Solution:
+    """a·y'' + b·y' + c·y = g(x), con y(x0) = y0 e y'(x0) = y_prime_0 si se indican."""
+    return solve('second_order_nonhomogeneous', a, b, c, g, x0, y0, y_prime_0)
@@ -1,4 +1,7 @@
-from sympy import sympify, latex, symbols, Function, SympifyError, sin, cos, tan, exp, log, asin, acos, atan, sqrt
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sympy import Basic, sympify, latex as sympy_latex, srepr, symbols, Function, SympifyError, sin, cos, tan, exp, log, asin, acos, atan, sqrt
 
 # --- Símbolos Comunes ---
 # Definimos los símbolos base que usarán todos los solvers de EDO.
@@ -7,6 +10,33 @@ x = symbols('x')
 # y es la función desconocida y(x).
 y = Function('y')(x)
 
+# --- Modo de Renderizado ---
+# 'latex' (por defecto): las fórmulas salen como '$$...$$' para MathJax.
+# 'mathml': format_latex imprime MathML en el servidor (ver 'mathml.py').
+# 'none': sin presentación; format_latex y latex devuelven '' (lo usa la API
+# de biblioteca, ver 'api.py', que solo necesita los objetos de SymPy).
+RENDER_LATEX = 'latex'
+RENDER_MATHML = 'mathml'
+RENDER_NONE = 'none'
+RENDER_MODES = (RENDER_LATEX, RENDER_MATHML)
+
+_render_mode = ContextVar('render_mode', default=RENDER_LATEX)
+# Destino de 'record_solution' mientras está activo 'capture_solution'.
+_captured = ContextVar('captured_solution', default=None)
+
+
+@contextmanager
+def render_mode(mode: str):
+    """Fija el modo de renderizado de format_latex dentro del bloque."""
+    if mode not in RENDER_MODES and mode != RENDER_NONE:
+        raise ValueError(f'Modo de renderizado desconocido: {mode}')
+    token = _render_mode.set(mode)
+    try:
+        yield
+    finally:
+        _render_mode.reset(token)
+
+
 # --- Diccionario de Funciones Permitidas para parse_safe ---
 # Permite que los usuarios usen funciones matemáticas comunes
 ALLOWED_FUNCTIONS = {
@@ -24,8 +54,11 @@ def parse_safe(expr_str: str, local_dict=None):
     Usa sympify con un manejo de errores estricto y funciones permitidas.
     Devuelve la expresión SymPy si es válida, o None si falla.
     """
-    if not expr_str:
+    if expr_str is None or expr_str == '':
         return None
+    if isinstance(expr_str, Basic):
+        # Ya es una expresión SymPy (p. ej. desde la API de biblioteca).
+        return expr_str
     try:
         # Combinar el diccionario local con las funciones permitidas
         if local_dict is None:
@@ -45,11 +78,63 @@ def format_latex(expr) -> str:
     """
     Convierte una expresión SymPy (como una solución) en un string de LaTeX.
     
-    Esto permite que MathJax lo renderice bellamente en el frontend.
+    Esto permite que MathJax lo renderice bellamente en el frontend. En modo
+    'mathml' devuelve directamente MathML generado por SymPy.
     """
     try:
+        mode = _render_mode.get()
+        if mode == RENDER_NONE:
+            return ''
+        if mode == RENDER_MATHML:
+            from .mathml import expr_to_mathml
+            return expr_to_mathml(expr)
         # latex() es la función de SymPy que genera el código LaTeX.
-        return f"$${latex(expr)}$$"
+        return f"$${sympy_latex(expr)}$$"
     except Exception:
         # Si hay algún problema, devolvemos un string de error.
-        return "Error al formatear LaTeX."
\ No newline at end of file
+        return "Error al formatear LaTeX."
+
+def latex(expr, **settings) -> str:
+    """'sympy.latex' para los pasos de los solvers; en modo 'none' no genera nada."""
+    if _render_mode.get() == RENDER_NONE:
+        return ''
+    return sympy_latex(expr, **settings)
+
+
+@contextmanager
+def capture_solution():
+    """
+    Dentro del bloque, 'record_solution' guarda en el diccionario devuelto
+    los objetos SymPy de la solución ('ecuacion', 'solucion', 'ics').
+    """
+    captured = {}
+    token = _captured.set(captured)
+    try:
+        yield captured
+    finally:
+        _captured.reset(token)
+
+
+def record_solution(ecuacion, solucion, ics=None):
+    """Guarda la solución para 'capture_solution' (no hace nada fuera del bloque)."""
+    captured = _captured.get()
+    if captured is not None:
+        captured.update(ecuacion=ecuacion, solucion=solucion, ics=ics)
+
+
+def symbolic_fields(ecuacion, solucion, ics=None) -> dict:
+    """
+    Campos con la EDO, la solución y las condiciones iniciales en forma 'srepr'.
+
+    Los solvers los añaden a su resultado para que la solución se pueda
+    verificar o evaluar numéricamente después sin volver a llamar a dsolve.
+    En modo 'none' solo se registra la solución (ver 'capture_solution').
+    """
+    record_solution(ecuacion, solucion, ics)
+    if _render_mode.get() == RENDER_NONE:
+        return {}
+    return {
+        'ecuacion_srepr': srepr(ecuacion),
+        'solucion_srepr': srepr(solucion),
+        'ics_srepr': srepr(ics) if ics else None,
+    }
@@ -1,6 +1,8 @@
-from sympy import Eq, dsolve, Function, pde_separate_add, latex, simplify, integrate, log
+from sympy import Eq, Function, log
 # Importamos nuestros símbolos y funciones comunes del base_solver
-from .base_solver import x, y, parse_safe, format_latex
+from .base_solver import x, y, parse_safe, format_latex, symbolic_fields, latex
+from .general_solutions import constants_step, general_solution, solve_ivp
+from .integration import antiderivative, linear_first_order
 
 def solve_bernoulli(P_str: str, Q_str: str, n_str: str, x0_str: str = None, y0_str: str = None) -> dict:
     """
@@ -62,10 +64,12 @@ def solve_bernoulli(P_str: str, Q_str: str, n_str: str, x0_str: str = None, y0_s
             # Resolver con o sin IVP
             if is_ivp:
                 ics = {y.subs(x, x0_expr): y0_expr}
-                sol_y = dsolve(ecuacion_lineal, y, ics=ics)
+                sol_y, constantes = solve_ivp(ecuacion_lineal, y, ics)
+                if constantes:
+                    steps.append(constants_step(constantes))
                 steps.append(f"   - Solución usando método de ecuación lineal con IVP: {format_latex(sol_y)}")
             else:
-                sol_y = dsolve(ecuacion_lineal, y)
+                sol_y = general_solution(ecuacion_lineal, y)
                 steps.append(f"   - Solución usando método de ecuación lineal: {format_latex(sol_y)}")
             
             solucion_latex = format_latex(sol_y)
@@ -82,16 +86,18 @@ def solve_bernoulli(P_str: str, Q_str: str, n_str: str, x0_str: str = None, y0_s
             
             # Integrar ambos lados
             integral_izq = log(y)
-            integral_der = integrate(q_menos_p, x)
+            integral_der = antiderivative(q_menos_p, x)
             sol_separable = Eq(integral_izq, integral_der)
             
             # Resolver con o sin IVP
             if is_ivp:
                 ics = {y.subs(x, x0_expr): y0_expr}
-                sol_y = dsolve(ecuacion_original, y, ics=ics)
+                sol_y, constantes = solve_ivp(ecuacion_original, y, ics)
+                if constantes:
+                    steps.append(constants_step(constantes))
                 steps.append(f"   - Solución por separación de variables con IVP: {format_latex(sol_y)}")
             else:
-                sol_y = dsolve(ecuacion_original, y)
+                sol_y = general_solution(ecuacion_original, y)
                 steps.append(f"   - Solución por separación de variables: {format_latex(sol_y)}")
                 
             solucion_latex = format_latex(sol_y)
@@ -110,8 +116,9 @@ def solve_bernoulli(P_str: str, Q_str: str, n_str: str, x0_str: str = None, y0_s
             steps.append(rf"   - La ecuación lineal transformada para \(v(x)\) es: \( {latex(ecuacion_lineal)} \)")
 
             # 5. Resolver la Ecuación Lineal para v(x)
-            steps.append(rf"Se resuelve la ecuación lineal para \(v(x)\), usualmente con un factor integrante.")
-            sol_v = dsolve(ecuacion_lineal, v)
+            steps.append(rf"Se resuelve la ecuación lineal para \(v(x)\) con un factor integrante.")
+            sol_v, mu = linear_first_order(p_lineal, q_lineal, v)
+            steps.append(rf"   - Factor integrante: \( \mu(x) = {latex(mu)} \)")
             steps.append(rf"   - La solución para \(v(x)\) es: \( {latex(sol_v)} \)")
 
             # 6. Sustituir de Vuelta a y(x)
@@ -120,15 +127,18 @@ def solve_bernoulli(P_str: str, Q_str: str, n_str: str, x0_str: str = None, y0_s
             # Resolver con o sin IVP
             if is_ivp:
                 ics = {y.subs(x, x0_expr): y0_expr}
-                sol_y = dsolve(ecuacion_original, y, ics=ics)
+                sol_y, constantes = solve_ivp(ecuacion_original, y, ics)
+                if constantes:
+                    steps.append(constants_step(constantes))
                 steps.append(f"   - La solución final con IVP es: {format_latex(sol_y)}")
             else:
-                sol_y = dsolve(ecuacion_original, y)
+                sol_y = general_solution(ecuacion_original, y)
                 steps.append(f"   - La solución final es: {format_latex(sol_y)}")
                 
             solucion_latex = format_latex(sol_y)
 
-        return {'solucion': solucion_latex, 'steps': steps}
+        return {'solucion': solucion_latex, 'steps': steps,
+                **symbolic_fields(ecuacion_original, sol_y, ics if is_ivp else None)}
 
     except Exception as e:
         return {'error': f"Error durante la resolución: {e}"}
\ No newline at end of file
@@ -1,6 +1,7 @@
-from sympy import Eq, dsolve, symbols, latex, solve
+from sympy import Eq, dsolve, symbols, solve
 # Importamos nuestros símbolos y funciones comunes
-from .base_solver import x, y, parse_safe, format_latex
+from .base_solver import x, y, parse_safe, format_latex, symbolic_fields, latex
+from .ode_analysis import analyze
 
 def solve_cauchy_euler(a_str: str, b_str: str, c_str: str, R_str: str) -> dict:
     """
@@ -47,11 +48,11 @@ def solve_cauchy_euler(a_str: str, b_str: str, c_str: str, R_str: str) -> dict:
             steps.append(rf"   - La solución general es \(y = y_h + y_p\).")
 
         # 6. Resolver y Formatear
-        solucion = dsolve(ecuacion, y)
+        solucion = dsolve(ecuacion, y, **analyze(ecuacion, y).dsolve_kwargs())
         solucion_latex = format_latex(solucion)
         steps.append(f"6. La solución final combinada es: {solucion_latex}")
 
-        return {'solucion': solucion_latex, 'steps': steps}
+        return {'solucion': solucion_latex, 'steps': steps, **symbolic_fields(ecuacion, solucion)}
 
     except Exception as e:
         return {'error': f"Error durante la resolución: {e}"}
\ No newline at end of file
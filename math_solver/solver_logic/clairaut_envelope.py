@@ -0,0 +1,99 @@
+"""
+Solución Singular (Envolvente) de la Ecuación de Clairaut
+
+Para y = x p + f(p) la envolvente de la familia y = C x + f(C) cumple
+x = -f'(p). En lugar de llamar a 'dsolve' (lento, y que falla para muchos
+f(p)), se despeja p de esa relación y se sustituye de vuelta:
+
+    y = x p(x) + f(p(x))
+
+Si p no se puede despejar en forma cerrada, la envolvente se devuelve como
+curva paramétrica (x(p), y(p)) = (-f'(p), -p f'(p) + f(p)), evaluada
+vectorizada con NumPy sobre un rango de p.
+
+Los resultados se cachean por f(p) canónico (la expresión ya simplificada
+por SymPy), así que las entradas equivalentes comparten la misma entrada.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+from sympy import Eq, I, Symbol, lambdify, simplify, solve
+
+from .base_solver import x, y
+
+ENVELOPE_CACHE_SIZE = 128
+PARAMETRIC_POINTS = 200
+PARAMETRIC_RANGE = (-5.0, 5.0)
+
+p = Symbol('p')
+
+
+class Envelope:
+    """
+    Solución singular de una ecuación de Clairaut.
+
+    'soluciones' es la lista de Eq y(x) = ... (vacía si no hay forma cerrada),
+    'parametrica' el par de expresiones (x(p), y(p)) y 'curva' su muestreo
+    numérico {'p', 'x', 'y'} cuando no hubo forma cerrada.
+    """
+
+    def __init__(self, soluciones, parametrica, curva=None):
+        self.soluciones = soluciones
+        self.parametrica = parametrica
+        self.curva = curva
+
+
+def _discard_spurious(ecuacion, candidates):
+    """Quita las raíces ajenas (p. ej. por elevar al cuadrado al despejar p)."""
+    from .verification import verify_solution
+    return [c for c in candidates if verify_solution(ecuacion, c, func=y)['ok'] is not False]
+
+
+def sample_parametric(x_p, y_p, points: int = PARAMETRIC_POINTS, p_range=PARAMETRIC_RANGE) -> dict:
+    """Muestrea vectorizado la curva (x(p), y(p)); los puntos no reales o no finitos son None."""
+    ps = np.linspace(*p_range, points)
+    curve = {'p': ps.tolist()}
+    with np.errstate(all='ignore'):
+        for name, expr in (('x', x_p), ('y', y_p)):
+            values = np.broadcast_to(np.asarray(lambdify(p, expr, modules='numpy')(ps), dtype=complex), ps.shape)
+            real = values.real.copy()
+            real[(np.abs(values.imag) > 1e-9) | ~np.isfinite(real)] = np.nan
+            curve[name] = [None if np.isnan(v) else float(v) for v in real]
+    return curve
+
+
+@lru_cache(maxsize=ENVELOPE_CACHE_SIZE)
+def singular_solution(f_p) -> Envelope:
+    """
+    Envolvente de y = x y' + f(y'), con f dada como expresión en 'p'.
+    Devuelve None si f es lineal en p (la familia de rectas no tiene envolvente).
+    """
+    f_prime = f_p.diff(p)
+    if f_prime.diff(p) == 0:
+        return None
+    x_p = -f_prime
+    y_p = simplify(p * x_p + f_p)
+
+    try:
+        roots = solve(Eq(x, x_p), p)
+    except NotImplementedError:
+        roots = []
+    candidates = []
+    for root in roots:
+        if root.has(I):
+            continue
+        candidate = Eq(y, simplify(x * root + f_p.subs(p, root)))
+        if candidate not in candidates:
+            candidates.append(candidate)
+    if len(candidates) > 1:
+        candidates = _discard_spurious(Eq(y, x * y.diff(x) + f_p.subs(p, y.diff(x))), candidates)
+
+    if candidates:
+        return Envelope(candidates, (x_p, y_p))
+    return Envelope([], (x_p, y_p), curva=sample_parametric(x_p, y_p))
+
+
+def cache_clear():
+    """Vacía la caché de envolventes."""
+    singular_solution.cache_clear()
@@ -1,6 +1,7 @@
-from sympy import Eq, dsolve, Symbol, Derivative, latex, solve
+from sympy import Eq, Symbol, Derivative, solve
 # Importamos nuestros símbolos y funciones comunes
-from .base_solver import x, y, parse_safe, format_latex
+from .base_solver import x, y, parse_safe, format_latex, symbolic_fields, latex
+from .clairaut_envelope import singular_solution
 
 def solve_clairaut(f_p_str: str) -> dict:
     """
@@ -15,6 +16,8 @@ def solve_clairaut(f_p_str: str) -> dict:
         f_p_expr = parse_safe(f_p_str, local_dict={'p': p})
         if f_p_expr is None:
             return {'error': f"f(p) = '{f_p_str}' no es válida."}
+        if f_p_expr.has(x):
+            return {'error': f"Error: La función f(p) no debe contener 'x'. Use 'p' en su lugar."}
     except Exception as e:
         return {'error': f"Error al parsear f(p): {e}"}
 
@@ -38,29 +41,32 @@ def solve_clairaut(f_p_str: str) -> dict:
         steps.append(rf"   - La solución singular está dada por: \( x = {latex(-f_p_deriv)} \)")
         steps.append("   - Esta relación junto con la ecuación original define la solución singular.")
 
-        # 5. Resolver y Formatear
-        try:
-            soluciones = dsolve(ecuacion, y)
-            
-            if isinstance(soluciones, list):
-                soluciones_html = []
-                for sol in soluciones:
-                    tipo = "Solución General" if "C1" in str(sol) else "Solución Singular"
-                    sol_latex = format_latex(sol)
-                    soluciones_html.append(f"<p class='font-semibold mt-2'>{tipo}:</p> {sol_latex}")
-                solucion_final_html = "\n".join(soluciones_html)
-            else:
-                solucion_final_html = format_latex(soluciones)
+        # 5. Despejar p de x = -f'(p) y sustituir (sin dsolve)
+        envolvente = singular_solution(f_p_expr)
+        soluciones = [sol_general]
+        resultado = {}
+        if envolvente is None:
+            steps.append(r"4. Como \( f(p) \) es lineal en \( p \), la familia de rectas no tiene envolvente: no hay solución singular.")
+        elif envolvente.soluciones:
+            steps.append(r"4. Despejando \( p \) de \( x = -f'(p) \) y sustituyendo en \( y = xp + f(p) \):")
+            soluciones += envolvente.soluciones
+        else:
+            x_p, y_p = envolvente.parametrica
+            steps.append(r"4. \( p \) no se puede despejar en forma cerrada; la solución singular queda en forma paramétrica:")
+            steps.append(rf"   - \( x(p) = {latex(x_p)},\quad y(p) = {latex(y_p)} \)")
+            resultado['curva_singular'] = envolvente.curva
 
-            steps.append(f"4. SymPy resuelve y encuentra: {solucion_final_html}")
-            return {'solucion': solucion_final_html, 'steps': steps}
-        except Exception as solve_error:
-            # Si dsolve falla, mostrar la solución general manualmente
-            sol_general_manual = Eq(y, C * x + f_p_expr.subs(p, C))
-            sol_latex = format_latex(sol_general_manual)
-            steps.append(f"4. Solución general: {sol_latex}")
-            steps.append("   Nota: La solución singular requiere eliminación paramétrica manual.")
-            return {'solucion': sol_latex, 'steps': steps}
+        soluciones_html = []
+        for sol in soluciones:
+            tipo = "Solución General" if sol is sol_general else "Solución Singular"
+            soluciones_html.append(f"<p class='font-semibold mt-2'>{tipo}:</p> {format_latex(sol)}")
+        if 'curva_singular' in resultado:
+            parametrica = [Eq(x, x_p), Eq(Symbol('y'), y_p)]
+            soluciones_html.append(f"<p class='font-semibold mt-2'>Solución Singular (paramétrica):</p> {format_latex(parametrica)}")
+        solucion_final_html = "\n".join(soluciones_html)
+        steps.append(f"5. Soluciones: {solucion_final_html}")
+        return {'solucion': solucion_final_html, 'steps': steps, **resultado,
+                **symbolic_fields(ecuacion, soluciones if len(soluciones) > 1 else sol_general)}
 
     except Exception as e:
         if "free symbol" in str(e):
@@ -0,0 +1,124 @@
+"""
+Esquema Compacto de Resultados (API JSON, versión 2)
+
+El diccionario de un solver está pensado para la plantilla: la 'solucion'
+lleva bloques HTML con clases de Tailwind y cada paso es una frase con
+fórmulas incrustadas. Para la API se convierte en un esquema compacto:
+
+    {
+      "v": 2,
+      "tipo": "riccati",
+      "metodo": "solucion_particular",
+      "solucion": {"latex": ["y{\\left(x \\right)} = ..."], "srepr": "Equality(...)"},
+      "pasos": [["3f9a1c2e", ["P{\\left(x \\right)} = 1", ...]], ...],
+      "plantillas": {"3f9a1c2e": "- Con {0}, {1} y {2}.", ...},
+      "meta": {"tiempo_ms": 12.3, "render": "latex"}
+    }
+
+Cada paso es [código, parámetros]: el texto sin HTML ni marcas, con las
+fórmulas sustituidas por {0}, {1}... forma la plantilla, y el código es un
+hash corto y estable de esa plantilla. Los parámetros son LaTeX plano (o
+MathML si el servidor renderiza en ese modo). Como los códigos no cambian
+entre procesos ni peticiones, un cliente puede guardar las plantillas y
+pedir las respuestas sin ellas ('plantillas=0').
+
+El HTML de presentación solo lo usa la plantilla de Django; este esquema no
+lo incluye.
+"""
+
+import hashlib
+import re
+
+SCHEMA_VERSION = 2
+
+# Fórmulas incrustadas: $$...$$, \( ... \), \[ ... \] o un bloque <math> ya renderizado.
+_MATH = re.compile(r'\$\$(.+?)\$\$|\\\((.+?)\\\)|\\\[(.+?)\\\]|(<math\b.*?</math>)', re.DOTALL)
+_TAG = re.compile(r'<[^>]+>')
+_SPACES = re.compile(r'\s+')
+
+# Campos del resultado que se copian tal cual al esquema compacto.
+_PASSTHROUGH = ('curva_singular', 'verificacion', 'solution_id', 'eval_url', 'permalink')
+_SERIES_FIELDS = ('x0', 'orden', 'coeficientes', 'radio', 'serie_id', 'url')
+
+
+def _plain(text: str) -> str:
+    """Texto sin etiquetas HTML, sin '**' y con los espacios normalizados."""
+    return _SPACES.sub(' ', _TAG.sub(' ', text).replace('**', '')).strip()
+
+
+def split_math(text: str):
+    """Separa un texto con fórmulas en (plantilla con {0}, {1}..., [fórmulas])."""
+    formulas = []
+
+    def placeholder(match):
+        formulas.append(next(group for group in match.groups() if group is not None).strip())
+        return f'{{{len(formulas) - 1}}}'
+
+    # Las llaves literales se escapan para que la plantilla siga siendo válida para str.format.
+    escaped = text.replace('{', '{{').replace('}', '}}')
+    template = _MATH.sub(placeholder, escaped)
+    # Las llaves dentro de las fórmulas se escaparon con el texto; se restauran.
+    formulas = [f.replace('{{', '{').replace('}}', '}') for f in formulas]
+    return _plain(template), formulas
+
+
+def step_code(template: str) -> str:
+    return hashlib.sha1(template.encode('utf-8')).hexdigest()[:8]
+
+
+def compact_steps(steps):
+    """(pasos [[código, parámetros]], plantillas {código: plantilla})."""
+    compact, templates = [], {}
+    for step in steps or []:
+        template, params = split_math(str(step))
+        code = step_code(template)
+        templates[code] = template
+        compact.append([code, params])
+    return compact, templates
+
+
+def method_id(solver_type: str, result: dict) -> str:
+    """Método con el que se obtuvo la solución ('metodo' del solver o uno por defecto)."""
+    if result.get('metodo'):
+        return result['metodo']
+    if result.get('serie'):
+        return 'serie'
+    return solver_type
+
+
+def compact_result(solver_type: str, result: dict, elapsed=None, templates: bool = True) -> dict:
+    """
+    Convierte el diccionario de un solver (o el contexto de la vista) al
+    esquema compacto. Con templates=False se omiten las 'plantillas'.
+    """
+    compact = {'v': SCHEMA_VERSION, 'tipo': solver_type}
+    if 'error' in result:
+        compact['error'] = result['error']
+        if result.get('reintentar_en'):
+            compact['reintentar_en'] = result['reintentar_en']
+        return compact
+    if result.get('pendiente'):
+        compact.update({'pendiente': True, 'job_id': result['job_id'], 'job_url': result['job_url']})
+        return compact
+
+    render = result.get('render', 'latex')
+    solution_text = str(result.get('solucion', ''))
+    _template, formulas = split_math(solution_text)
+    solution = {render: formulas, 'srepr': result.get('solucion_srepr')}
+    if not formulas:
+        # Soluciones descriptivas (p. ej. el análisis final de Riccati).
+        solution['texto'] = _plain(solution_text)
+    steps, step_templates = compact_steps(result.get('steps'))
+
+    compact.update({'metodo': method_id(solver_type, result), 'solucion': solution, 'pasos': steps})
+    if templates:
+        compact['plantillas'] = step_templates
+    if result.get('serie'):
+        compact['serie'] = {key: result['serie'][key] for key in _SERIES_FIELDS if key in result['serie']}
+    for key in _PASSTHROUGH:
+        if result.get(key) is not None:
+            compact[key] = result[key]
+    compact['meta'] = {'render': render}
+    if elapsed is not None:
+        compact['meta']['tiempo_ms'] = round(elapsed * 1000, 3)
+    return compact
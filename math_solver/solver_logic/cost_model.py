@@ -0,0 +1,179 @@
+"""
+Modelo de Costo de Entradas
+
+Estima, antes de llamar a dsolve, cuánto tardará en resolverse una entrada a
+partir de rasgos estructurales baratos de las expresiones parseadas:
+
+- tamaño de las expresiones ('count_ops'),
+- presencia de funciones trascendentes y de funciones especiales,
+- rasgos propios de cada solver (P(x) no polinomial en Riccati, n
+  fraccionario en Bernoulli, presencia de condiciones iniciales, ...).
+
+El modelo es lineal sobre log(segundos): costo = exp(w · rasgos). Los pesos
+se ajustan con 'fit_weights' a partir de tiempos reales registrados.
+"""
+
+import json
+import math
+import time
+
+from sympy import Function
+
+from .base_solver import x, parse_safe
+
+# Módulo de SymPy donde viven las funciones especiales (Bessel, Airy, erf, ...).
+_SPECIAL_MODULE_PREFIX = 'sympy.functions.special'
+
+# Pesos iniciales sobre log(segundos), calibrados a mano con el corpus de
+# benchmarks. Se reemplazan por los del archivo de pesos ajustado si existe.
+DEFAULT_WEIGHTS = {
+    'bias': -4.0,
+    'solver:quadratic': -0.5,
+    'solver:bernoulli': 1.5,
+    'solver:cauchy': 1.5,
+    'solver:clairaut': 4.5,
+    'solver:riccati': 2.0,
+    'solver:second_order_homogeneous': 0.5,
+    'solver:second_order_nonhomogeneous': 1.5,
+    'ops': 0.08,
+    'transcendental': 0.6,
+    'special': 2.5,
+    'ivp': 0.2,
+    'riccati_nonpoly_p': 1.5,
+    'bernoulli_general_n': 3.0,
+    'bernoulli_fractional_n': 1.5,
+}
+
+LANE_INLINE = 'inline'
+LANE_QUEUE = 'queue'
+LANE_REJECT = 'reject'
+
+
+def _parse(value):
+    if value is None:
+        return None
+    return parse_safe(str(value).strip())
+
+
+def _function_atoms(expr):
+    return expr.atoms(Function) if hasattr(expr, 'atoms') else set()
+
+
+def extract_features(solver_type: str, args: list) -> dict:
+    """
+    Calcula los rasgos estructurales de una entrada.
+
+    'args' son los argumentos posicionales del solver (strings del formulario,
+    en el orden de 'registry.SOLVERS'). No se llama a ningún solver simbólico.
+    """
+    exprs = [_parse(value) for value in args]
+    parsed = [expr for expr in exprs if expr is not None]
+
+    features = {'bias': 1.0, f'solver:{solver_type}': 1.0}
+    features['ops'] = float(sum(expr.count_ops() for expr in parsed if hasattr(expr, 'count_ops')))
+
+    functions = set()
+    for expr in parsed:
+        functions |= _function_atoms(expr)
+    special = [f for f in functions if type(f).__module__.startswith(_SPECIAL_MODULE_PREFIX)]
+    features['special'] = float(len(special))
+    features['transcendental'] = float(len(functions) - len(special))
+
+    if solver_type == 'riccati':
+        p_expr = exprs[0]
+        if p_expr is not None and not p_expr.is_polynomial(x):
+            features['riccati_nonpoly_p'] = 1.0
+        features['ivp'] = float(args[3] is not None and args[4] is not None)
+    elif solver_type == 'bernoulli':
+        n_expr = exprs[2]
+        if n_expr is not None and n_expr not in (0, 1):
+            features['bernoulli_general_n'] = 1.0
+            if not n_expr.is_Integer or n_expr.free_symbols:
+                features['bernoulli_fractional_n'] = 1.0
+        features['ivp'] = float(args[3] is not None and args[4] is not None)
+    elif solver_type.startswith('second_order'):
+        features['ivp'] = float(all(value is not None for value in args[-3:]))
+
+    return features
+
+
+def estimate_cost(features: dict, weights: dict = None) -> float:
+    """Costo estimado en segundos para un conjunto de rasgos."""
+    weights = DEFAULT_WEIGHTS if weights is None else weights
+    score = sum(weights.get(name, 0.0) * value for name, value in features.items())
+    # Se acota el exponente para que un peso mal ajustado no desborde.
+    return math.exp(max(min(score, 50.0), -50.0))
+
+
+def choose_lane(cost: float, inline_max: float, reject_above: float) -> str:
+    """Decide el carril: en línea, cola en segundo plano o rechazo."""
+    if cost > reject_above:
+        return LANE_REJECT
+    if cost > inline_max:
+        return LANE_QUEUE
+    return LANE_INLINE
+
+
+def fit_weights(records: list, ridge: float = 0.1) -> dict:
+    """
+    Ajusta los pesos por mínimos cuadrados (con regularización ridge) sobre
+    log(segundos), a partir de registros {'features': {...}, 'elapsed_s': t}.
+    """
+    import numpy as np
+
+    records = [r for r in records if r.get('elapsed_s', 0) > 0]
+    if not records:
+        raise ValueError("No hay registros de tiempos para ajustar el modelo.")
+
+    names = sorted({name for record in records for name in record['features']})
+    A = np.array([[record['features'].get(name, 0.0) for name in names] for record in records])
+    b = np.log([record['elapsed_s'] for record in records])
+    # Ridge: se resuelve (AᵀA + λI) w = Aᵀb
+    w = np.linalg.solve(A.T @ A + ridge * np.eye(len(names)), A.T @ b)
+    return {name: round(float(value), 6) for name, value in zip(names, w)}
+
+
+def load_weights(path) -> dict:
+    """Carga pesos ajustados; si el archivo no existe, devuelve los pesos por defecto."""
+    if not path:
+        return dict(DEFAULT_WEIGHTS)
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return dict(DEFAULT_WEIGHTS)
+
+
+def append_timing_record(path, solver_type: str, data: dict, features: dict, elapsed: float, lane: str = 'inline',
+                         memory: dict = None):
+    """
+    Añade una línea JSON con el tiempo real de un solve al registro de tiempos.
+
+    Cada línea guarda también el payload del formulario, de modo que el
+    registro sirve después para reajustar los pesos y para repetir tráfico.
+    'memory' es el informe de memoria del trabajo, si se midió.
+    """
+    record = {
+        'ts': round(time.time(), 3),
+        'solver_type': solver_type,
+        'data': data,
+        'features': features,
+        'elapsed_s': round(elapsed, 6),
+        'lane': lane,
+    }
+    if memory is not None:
+        record['memory'] = memory
+    # Una sola escritura por línea: en modo 'a' el sistema operativo la añade
+    # de forma atómica aunque escriban varios procesos a la vez.
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def read_timing_records(path):
+    """Itera los registros de tiempos de un archivo JSONL, ignorando líneas corruptas."""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
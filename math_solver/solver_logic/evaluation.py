@@ -0,0 +1,118 @@
+"""
+Evaluación Numérica de Soluciones Simbólicas
+
+Compila una solución (en forma 'srepr', ver 'base_solver.symbolic_fields') a
+funciones NumPy con lambdify y la evalúa vectorizada sobre un rango de x,
+con valores numéricos para las constantes C1, C2, ...
+
+La compilación se cachea por solución ('compile_solution' usa lru_cache), de
+modo que al mover un deslizador en la interfaz solo se paga la evaluación
+vectorizada, no un nuevo 'dsolve' ni un nuevo lambdify.
+"""
+
+import hashlib
+import math
+import re
+from functools import lru_cache
+
+import numpy as np
+from sympy import Eq, lambdify, sympify
+from sympy.core.function import AppliedUndef
+
+from .base_solver import x
+
+MAX_POINTS = 2000
+COMPILED_CACHE_SIZE = 256
+# Nombres de las constantes de integración que se pueden fijar.
+CONSTANT_NAME = re.compile(r'C\d+')
+
+# Las partes imaginarias menores que esto se consideran ruido numérico.
+_IMAG_TOLERANCE = 1e-9
+
+
+class SolutionNotEvaluable(ValueError):
+    """La solución no es explícita en y(x) y no se puede muestrear."""
+
+
+class CompiledSolution:
+    """Ramas y = f(x, constantes) de una solución, compiladas con lambdify."""
+
+    def __init__(self, branches, parameters):
+        self.branches = branches
+        self.parameters = parameters
+
+    def sample(self, xs, constants: dict):
+        values = [float(constants.get(name, 1.0)) for name in self.parameters]
+        return [function(xs, *values) for function in self.branches]
+
+
+def solution_id(solution_srepr: str) -> str:
+    """Identificador estable de una solución, derivado de su 'srepr'."""
+    return hashlib.sha256(solution_srepr.encode('utf-8')).hexdigest()[:32]
+
+
+def _vectorized(expr, args):
+    """Función vectorizada con NumPy o, si NumPy no conoce alguna función, con mpmath punto a punto."""
+    function = lambdify(args, expr, modules='numpy')
+    probe = [np.linspace(0.5, 1.5, 3)] + [1.0] * (len(args) - 1)
+    try:
+        with np.errstate(all='ignore'):
+            function(*probe)
+        return function
+    except (NameError, TypeError, AttributeError, ValueError):
+        pass
+    scalar = lambdify(args, expr, modules='mpmath')
+
+    def pointwise(xs, *params):
+        out = np.empty(len(xs), dtype=complex)
+        for i, value in enumerate(xs):
+            try:
+                out[i] = complex(scalar(complex(value), *params))
+            except (TypeError, ValueError, ZeroDivisionError, OverflowError):
+                out[i] = np.nan
+        return out
+
+    return pointwise
+
+
+@lru_cache(maxsize=COMPILED_CACHE_SIZE)
+def compile_solution(solution_srepr: str) -> CompiledSolution:
+    """Compila (una vez por solución) las ramas explícitas de una solución."""
+    solution = sympify(solution_srepr)
+    solutions = solution if isinstance(solution, (list, tuple)) else [solution]
+    rhs_list = []
+    for sol in solutions:
+        if not isinstance(sol, Eq) or not isinstance(sol.lhs, AppliedUndef) or sol.rhs.has(AppliedUndef):
+            raise SolutionNotEvaluable('La solución no es explícita en y(x).')
+        rhs_list.append(sol.rhs)
+    parameters = sorted({s for rhs in rhs_list for s in rhs.free_symbols} - {x}, key=str)
+    args = [x] + parameters
+    branches = [_vectorized(rhs, args) for rhs in rhs_list]
+    return CompiledSolution(branches, [str(p) for p in parameters])
+
+
+def evaluate_solution(solution_srepr: str, x_min: float, x_max: float, points: int,
+                      constants: dict = None) -> dict:
+    """
+    Muestrea la solución en 'points' valores de x equiespaciados.
+
+    Devuelve {'x': [...], 'ramas': [[...], ...], 'parametros': [...]}. Los
+    puntos donde la solución no es real o no es finita se devuelven como None.
+    De 'constants' solo se usan (y convierten a float) las de 'parametros'.
+    """
+    if not 2 <= points <= MAX_POINTS:
+        raise ValueError(f'El número de puntos debe estar entre 2 y {MAX_POINTS}.')
+    if not (math.isfinite(x_min) and math.isfinite(x_max)):
+        raise ValueError('x_min y x_max deben ser números finitos.')
+    if not x_min < x_max:
+        raise ValueError('x_min debe ser menor que x_max.')
+    compiled = compile_solution(solution_srepr)
+    xs = np.linspace(x_min, x_max, points)
+    branches = []
+    with np.errstate(all='ignore'):
+        for values in compiled.sample(xs, constants or {}):
+            values = np.broadcast_to(np.asarray(values, dtype=complex), xs.shape)
+            real = values.real.copy()
+            real[(np.abs(values.imag) > _IMAG_TOLERANCE * (1 + np.abs(real))) | ~np.isfinite(real)] = np.nan
+            branches.append([None if np.isnan(v) else float(v) for v in real])
+    return {'x': xs.tolist(), 'ramas': branches, 'parametros': compiled.parameters}
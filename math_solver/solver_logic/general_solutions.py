@@ -0,0 +1,209 @@
+"""
+Soluciones Generales Reutilizables para IVPs
+
+Un IVP solo difiere de otro con la misma EDO en los valores de las
+constantes de integración. En lugar de llamar a 'dsolve(..., ics=...)' por
+cada condición inicial, la solución general se calcula una vez (y se cachea
+por EDO) y cada IVP se resuelve sustituyendo (x₀, y₀[, y'₀]) en ella y
+resolviendo el pequeño sistema algebraico para C1, C2, ...
+
+Si el sistema no se puede resolver (solución implícita con condiciones sobre
+derivadas, ecuaciones trascendentes sin solución cerrada, ...) se recurre a
+'dsolve' con 'ics', como antes.
+
+La solución general prueba los hints de 'dsolve' en el orden aprendido por
+'hint_order' y registra el tiempo y el resultado de cada intento.
+"""
+
+import re
+import time
+from functools import lru_cache
+
+from sympy import Eq, Subs, dsolve, solve
+
+from . import hint_order
+from .base_solver import latex
+from .ode_analysis import analyze
+
+GENERAL_CACHE_SIZE = 128
+
+_CONSTANT_NAME = re.compile(r'C\d+$')
+
+
+def _solved(result) -> bool:
+    return result is not None and result != []
+
+
+def solve_with_hints(ecuacion, func, hints=None):
+    """
+    'dsolve' probando los hints en el orden aprendido y registrando cada
+    intento: primero el hint por defecto y los que ya funcionaron en EDOs
+    parecidas, y solo si fallan, el resto de los aplicables. Sin hints
+    aprendidos para el contexto es un único 'dsolve' con el hint por defecto
+    (y sus mismos errores). Devuelve (solución, hint); lanza
+    NotImplementedError si ningún hint resuelve la EDO.
+    """
+    analysis = analyze(ecuacion, func)
+    # Sin hints aplicables: el mismo error que daría 'dsolve'.
+    default_kwargs = analysis.dsolve_kwargs()
+    if hints is None:
+        key = hint_order.context_key(ecuacion, func)
+        if not hint_order.learned_hints(key, analysis.default_hint):
+            return _solve_default(ecuacion, func, key, default_kwargs)
+    tried, errors = [], []
+    for full in (False, True):
+        key, ordered = hint_order.plan(ecuacion, func, hints, max_hints=hint_order.MAX_HINTS - len(tried),
+                                       full=full)
+        for hint in ordered:
+            if hint in tried or not analysis.matches(hint):
+                continue
+            tried.append(hint)
+            start = time.perf_counter()
+            try:
+                # Con la clasificación ya hecha, 'dsolve' no vuelve a clasificar.
+                result = dsolve(ecuacion, func, **analysis.dsolve_kwargs(hint))
+            except Exception as e:
+                result = None
+                errors.append(f'{hint}: {e}')
+            hint_order.record(key, hint, time.perf_counter() - start, _solved(result))
+            if _solved(result):
+                return result, hint
+        if hints is not None or len(tried) >= hint_order.MAX_HINTS:
+            break
+    raise NotImplementedError(f"Ningún hint resolvió la ecuación ({'; '.join(errors) or 'sin solución'}).")
+
+
+def _solve_default(ecuacion, func, key, kwargs):
+    """Un solo 'dsolve' con el hint por defecto ya clasificado; registra el intento."""
+    start = time.perf_counter()
+    try:
+        result = dsolve(ecuacion, func, **kwargs)
+    except Exception:
+        hint_order.record(key, kwargs['hint'], time.perf_counter() - start, False)
+        raise
+    hint_order.record(key, kwargs['hint'], time.perf_counter() - start, _solved(result))
+    if not _solved(result):
+        raise NotImplementedError(f"{kwargs['hint']}: sin solución")
+    return result, kwargs['hint']
+
+
+@lru_cache(maxsize=GENERAL_CACHE_SIZE)
+def _cached_general_solution(ecuacion, func):
+    result, _hint = solve_with_hints(ecuacion, func)
+    # Se guarda como tupla para que nadie modifique la entrada cacheada.
+    return tuple(result) if isinstance(result, list) else result
+
+
+def general_solution(ecuacion, func):
+    """Solución general de la EDO (sin condiciones iniciales), calculada una vez por EDO."""
+    result = _cached_general_solution(ecuacion, func)
+    return list(result) if isinstance(result, tuple) else result
+
+
+def cache_clear():
+    """Vacía la caché de soluciones generales."""
+    _cached_general_solution.cache_clear()
+
+
+def cache_info():
+    return _cached_general_solution.cache_info()
+
+
+def integration_constants(solution, ecuacion=None):
+    """Constantes C1, C2, ... que aparecen en la solución (y no en la EDO), ordenadas."""
+    known = ecuacion.free_symbols if ecuacion is not None else set()
+    constants = {s for s in solution.free_symbols if _CONSTANT_NAME.match(s.name)} - known
+    return sorted(constants, key=lambda s: int(s.name[1:]))
+
+
+def _condition(solution, func, key, value):
+    """Ecuación algebraica que impone la condición inicial 'key = value' sobre la solución."""
+    if isinstance(key, Subs):
+        # y'(x₀) llega como Subs(Derivative(y(x), x), x, x₀): necesita una solución explícita.
+        if solution.lhs != func or solution.rhs.has(func):
+            return None
+        expr, variables, point = key.args
+        return Eq(expr.subs(func, solution.rhs).doit().subs(variables[0], point[0]), value)
+    variable, point = func.args[0], key.args[0]
+    # y(x₀) = y₀ vale también para soluciones implícitas F(x, y) = C.
+    implicit = (solution.lhs - solution.rhs).subs(func, value).subs(variable, point)
+    return Eq(implicit, 0)
+
+
+def _discard_spurious(ecuacion, func, candidates):
+    """
+    Descarta las soluciones que la verificación numérica rechaza: al resolver
+    para las constantes pueden aparecer raíces ajenas (p. ej. al elevar al
+    cuadrado en Bernoulli con n = 1/2).
+    """
+    from .verification import verify_solution
+    return [(c, values) for c, values in candidates
+            if verify_solution(ecuacion, c, func=func)['ok'] is not False]
+
+
+def apply_initial_conditions(general, func, ics: dict, ecuacion=None):
+    """
+    Particulariza una solución general (Eq o lista de Eq) con las condiciones
+    iniciales 'ics'. Devuelve (solución, constantes), donde 'constantes' es el
+    diccionario {C: valor}, o (None, None) si no se pudo resolver el sistema.
+    """
+    branches = general if isinstance(general, (list, tuple)) else [general]
+    particular = []
+    for branch in branches:
+        constants = integration_constants(branch, ecuacion)
+        if not constants:
+            continue
+        conditions = [_condition(branch, func, key, value) for key, value in ics.items()]
+        if None in conditions or False in conditions:
+            continue
+        conditions = [c for c in conditions if c is not True]
+        try:
+            solutions = solve(conditions, constants, dict=True)
+        except NotImplementedError:
+            continue
+        for values in solutions:
+            if not set(constants) <= set(values):
+                continue
+            candidate = branch.subs(values)
+            if all(candidate != found for found, _ in particular):
+                particular.append((candidate, values))
+    if len(particular) > 1 and ecuacion is not None:
+        particular = _discard_spurious(ecuacion, func, particular)
+    if not particular:
+        return None, None
+    if len(particular) == 1:
+        return particular[0]
+    # Varias ramas cumplen las condiciones: se devuelven todas, con las constantes de la primera.
+    return [found for found, _ in particular], particular[0][1]
+
+
+def constants_step(constants: dict, reused: bool = True) -> str:
+    """
+    Paso que muestra las constantes obtenidas de las condiciones iniciales.
+
+    'reused' indica si la solución general es la cacheada de 'general_solution';
+    si el solver la construyó por otro camino (reducción, coeficientes
+    indeterminados...) el texto no dice que se reutiliza.
+    """
+    values = r',\ '.join(f'{latex(c)} = {latex(v)}' for c, v in constants.items())
+    if reused:
+        return rf"   - Se reutiliza la solución general y las condiciones iniciales dan \( {values} \)"
+    return rf"   - Imponiendo las condiciones iniciales en la solución general: \( {values} \)"
+
+
+def solve_ivp(ecuacion, func, ics: dict):
+    """
+    Resuelve el IVP reutilizando la solución general cacheada de 'ecuacion'.
+
+    Devuelve (solución, constantes); 'constantes' es None si hubo que recurrir
+    a 'dsolve' con 'ics'.
+    """
+    try:
+        general = general_solution(ecuacion, func)
+    except (NotImplementedError, ValueError):
+        general = None
+    if general is not None:
+        solution, constants = apply_initial_conditions(general, func, ics, ecuacion)
+        if solution is not None:
+            return solution, constants
+    return dsolve(ecuacion, func, ics=ics), None
@@ -0,0 +1,173 @@
+"""
+Orden Adaptativo de los Hints de dsolve
+
+'dsolve' usa siempre el primer hint que 'classify_ode' considera aplicable,
+y el bucle de hints de Riccati recorría una lista fija. Algunos hints (p. ej.
+'lie_group') son muy lentos para entradas que otro hint resuelve enseguida.
+
+Cada intento (hint, tiempo, éxito) se registra en una tabla por contexto: el
+orden de la EDO, si es polinómica en x e y, y el hint por defecto de
+'classify_ode' (la clasificación rápida; ver 'ode_analysis'). Para una
+entrada nueva, los hints candidatos se ordenan por tiempo esperado hasta el
+éxito, t / p, con
+
+    p = (éxitos + 1) / (intentos + 2)          (probabilidad de éxito suavizada)
+    t = (segundos + PRIOR_TIME) / (intentos + 1)  (tiempo medio suavizado)
+
+Si el contexto no tiene datos de un hint se usan los de todos los contextos
+('*'). Sin datos todos los hints empatan y se conserva el orden de SymPy.
+Mientras un contexto no tenga ningún hint aprendido (uno distinto del de por
+defecto que ya resolvió alguna EDO del contexto), 'solve_with_hints' hace un
+solo 'dsolve' con el hint por defecto, como 'dsolve' sin más. Con hints
+aprendidos se prueban el de por defecto y esos, por tiempo esperado, y la
+lista completa de hints aplicables (una clasificación mucho más cara) solo se
+pide si todos fallan.
+
+La tabla aprende en memoria y se puede guardar y recargar en JSON
+('HintTable.save' / 'load'). Con un registro JSONL configurado, cada intento
+se añade también al registro, y 'python manage.py fit_hint_order' reconstruye
+la tabla a partir de los registros de todos los procesos.
+"""
+
+import json
+import os
+import threading
+import time
+
+from sympy import Derivative
+
+from .ode_analysis import analyze
+
+PRIOR_TIME = 1.0
+# Máximo de hints que se prueban por EDO antes de rendirse.
+MAX_HINTS = 3
+ALL_CONTEXTS = '*'
+
+
+class HintTable:
+    """Intentos, éxitos y segundos acumulados por contexto y hint."""
+
+    def __init__(self, stats=None):
+        # {contexto: {hint: [intentos, éxitos, segundos]}}
+        self.stats = stats or {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str, hint: str, elapsed: float, ok: bool):
+        with self._lock:
+            for context in (key, ALL_CONTEXTS):
+                entry = self.stats.setdefault(context, {}).setdefault(hint, [0, 0, 0.0])
+                entry[0] += 1
+                entry[1] += int(ok)
+                entry[2] += elapsed
+
+    def expected_cost(self, key: str, hint: str) -> float:
+        entry = self.stats.get(key, {}).get(hint) or self.stats.get(ALL_CONTEXTS, {}).get(hint) or [0, 0, 0.0]
+        attempts, successes, seconds = entry
+        p = (successes + 1) / (attempts + 2)
+        t = (seconds + PRIOR_TIME) / (attempts + 1)
+        return t / p
+
+    def order(self, key: str, hints) -> list:
+        """Hints ordenados por tiempo esperado hasta el éxito (orden estable)."""
+        return sorted(hints, key=lambda hint: self.expected_cost(key, hint))
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            return {'version': 1, 'tabla': json.loads(json.dumps(self.stats))}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'HintTable':
+        return cls({context: {hint: list(entry) for hint, entry in hints.items()}
+                    for context, hints in data.get('tabla', {}).items()})
+
+    def save(self, path):
+        """Guarda la tabla en JSON (escritura atómica)."""
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, sort_keys=True)
+            f.write('\n')
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path) -> 'HintTable':
+        """Tabla guardada en 'path', o una vacía si no existe o no es válida."""
+        try:
+            with open(path, encoding='utf-8') as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, AttributeError):
+            return cls()
+
+
+_table = HintTable()
+_log_path = None
+_log_lock = threading.Lock()
+
+
+def configure(table_path=None, log_path=None):
+    """Carga la tabla aprendida ('table_path') y activa el registro JSONL de intentos ('log_path')."""
+    global _table, _log_path
+    if table_path is not None:
+        _table = HintTable.load(table_path)
+    _log_path = log_path
+
+
+def get_table() -> HintTable:
+    return _table
+
+
+def context_key(ecuacion, func) -> str:
+    """Contexto de una EDO: orden, si es polinómica en x e y, y el hint por defecto."""
+    var = func.args[0]
+    expr = (ecuacion.lhs - ecuacion.rhs).subs({d: 0 for d in ecuacion.atoms(Derivative)})
+    polynomial = expr.subs(func, var).is_polynomial(var)
+    analysis = analyze(ecuacion, func)
+    return f"{analysis.order}|{'poli' if polynomial else 'trans'}|{analysis.default_hint}"
+
+
+def learned_hints(key: str, exclude=None) -> list:
+    """Hints (salvo 'exclude') que ya resolvieron alguna EDO del contexto 'key'."""
+    return [hint for hint, (_attempts, successes, _seconds) in _table.stats.get(key, {}).items()
+            if successes and hint != exclude]
+
+
+def plan(ecuacion, func, hints=None, max_hints: int = MAX_HINTS, full: bool = False):
+    """
+    (contexto, hints ordenados) para resolver la EDO. 'hints' fija los
+    candidatos (p. ej. la lista de respaldo de Riccati). Si no, son el hint
+    por defecto y los aprendidos en este contexto o, con full=True, todos
+    los aplicables según la clasificación completa.
+    """
+    key = context_key(ecuacion, func)
+    analysis = analyze(ecuacion, func)
+    if hints is not None:
+        candidates = tuple(hints)
+    elif full:
+        candidates = analysis.hints
+    else:
+        known = learned_hints(key, analysis.default_hint)
+        candidates = tuple(([analysis.default_hint] if analysis.default_hint else []) + known)
+    return key, _table.order(key, candidates)[:max_hints]
+
+
+def record(key: str, hint: str, elapsed: float, ok: bool):
+    """Registra un intento en la tabla y, si está configurado, en el registro JSONL."""
+    _table.record(key, hint, elapsed, ok)
+    if _log_path:
+        line = json.dumps({'ts': round(time.time(), 3), 'contexto': key, 'hint': hint,
+                           'tiempo_s': round(elapsed, 6), 'ok': bool(ok)})
+        with _log_lock, open(_log_path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+
+
+def table_from_log(paths) -> HintTable:
+    """Reconstruye la tabla a partir de registros JSONL de intentos (ignora líneas corruptas)."""
+    table = HintTable()
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    table.record(entry['contexto'], entry['hint'], float(entry['tiempo_s']), entry['ok'])
+                except (ValueError, KeyError, TypeError):
+                    continue
+    return table
@@ -0,0 +1,150 @@
+"""
+Integración Memoizada
+
+Servicio de integración compartido por los solvers. En lugar de llamar a
+'integrate' con todas sus estrategias (que puede tardar muchísimo), prueba
+primero las baratas y deja Risch/Meijer G para el final:
+
+1. 'tabla': polinomios y funciones racionales (integración racional directa).
+2. 'manual': 'manualintegrate', las reglas de tabla paso a paso.
+3. 'heurisch': el algoritmo heurístico de Risch-Norman.
+4. 'completa': 'integrate' con todas las estrategias.
+
+Las antiderivadas se cachean por integrando canónico (la expresión SymPy ya
+normalizada), así que las entradas equivalentes comparten el cálculo, y las
+llamadas simultáneas con el mismo integrando esperan al mismo cálculo.
+
+El cálculo corre en un hilo aparte con un presupuesto de tiempo: si se agota,
+se devuelve la integral sin evaluar (Integral) en lugar de bloquear la
+petición. El hilo termina por su cuenta y deja el resultado en la caché para
+las siguientes llamadas. Como SymPy no se puede interrumpir, el número de
+hilos está acotado (INTEGRATION_THREADS): si todos están ocupados con
+integrales lentas, las nuevas esperan en cola y agotan su presupuesto.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from sympy import Eq, Integral, Symbol, exp, integrate, simplify, sympify
+from sympy.integrals.heurisch import heurisch
+from sympy.integrals.manualintegrate import manualintegrate
+
+from .base_solver import x
+
+# Tiempo máximo (segundos) que una llamada espera una antiderivada.
+INTEGRATION_BUDGET = 2.0
+INTEGRATION_CACHE_SIZE = 256
+INTEGRATION_THREADS = 2
+
+_cache = OrderedDict()
+_pending = {}
+_lock = threading.Lock()
+_executor = None
+_stats = {'hits': 0, 'misses': 0, 'timeouts': 0}
+
+
+def _table(integrand, var):
+    if integrand.is_polynomial(var) or integrand.is_rational_function(var):
+        return integrate(integrand, var)
+    return None
+
+
+def _manual(integrand, var):
+    return manualintegrate(integrand, var)
+
+
+def _heurisch(integrand, var):
+    return heurisch(integrand, var)
+
+
+def _complete(integrand, var):
+    return integrate(integrand, var)
+
+
+STRATEGIES = (('tabla', _table), ('manual', _manual), ('heurisch', _heurisch), ('completa', _complete))
+
+
+def compute_antiderivative(integrand, var):
+    """
+    Prueba las estrategias en orden y devuelve (antiderivada, estrategia).
+    Si ninguna da forma cerrada devuelve (Integral(integrand, var), None).
+    Sin caché ni presupuesto de tiempo.
+    """
+    for name, strategy in STRATEGIES:
+        try:
+            result = strategy(integrand, var)
+        except Exception:
+            continue
+        if result is not None and not result.has(Integral):
+            return result, name
+    return Integral(integrand, var), None
+
+
+def _run(key):
+    try:
+        result, _strategy = compute_antiderivative(*key)
+        with _lock:
+            _cache[key] = result
+            while len(_cache) > INTEGRATION_CACHE_SIZE:
+                _cache.popitem(last=False)
+        return result
+    finally:
+        with _lock:
+            _pending.pop(key, None)
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=INTEGRATION_THREADS, thread_name_prefix='integration')
+    return _executor
+
+
+def antiderivative(integrand, var=x, budget: float = INTEGRATION_BUDGET):
+    """
+    Antiderivada de 'integrand' respecto de 'var' (sin constante), cacheada.
+    Si no se obtiene en 'budget' segundos devuelve Integral(integrand, var).
+    """
+    integrand = sympify(integrand)
+    key = (integrand, var)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            _stats['hits'] += 1
+            return _cache[key]
+        _stats['misses'] += 1
+        future = _pending.get(key)
+        if future is None:
+            future = _pending[key] = _get_executor().submit(_run, key)
+    try:
+        return future.result(timeout=budget)
+    except FutureTimeout:
+        with _lock:
+            _stats['timeouts'] += 1
+        return Integral(integrand, var)
+
+
+def linear_first_order(p, q, func, budget: float = INTEGRATION_BUDGET):
+    """
+    Resuelve func' + p func = q con factor integrante μ = e^{∫p dx}:
+    func = (C1 + ∫ μ q dx) / μ. Devuelve (Eq(func, ...), μ).
+    """
+    var = func.args[0]
+    mu = simplify(exp(antiderivative(p, var, budget)))
+    integral = antiderivative(simplify(mu * q), var, budget)
+    return Eq(func, simplify((Symbol('C1') + integral) / mu)), mu
+
+
+def cache_info() -> dict:
+    """Aciertos, fallos y llamadas que agotaron el presupuesto."""
+    with _lock:
+        return dict(_stats, size=len(_cache))
+
+
+def cache_clear():
+    """Vacía la caché de antiderivadas y los contadores."""
+    with _lock:
+        _cache.clear()
+        for name in _stats:
+            _stats[name] = 0
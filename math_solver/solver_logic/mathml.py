@@ -0,0 +1,276 @@
+"""
+Renderizado de Soluciones a MathML en el Servidor
+
+En modo 'mathml' el navegador recibe las fórmulas ya compuestas y no necesita
+MathJax para mostrarlas:
+
+- Las expresiones que pasan por 'format_latex' se imprimen directamente con
+  la impresora MathML de presentación de SymPy (ver 'base_solver').
+- El resto de fragmentos LaTeX escritos a mano en los pasos ('\\( ... \\)' y
+  '$$ ... $$') se convierten con 'tex_to_mathml', que cubre el subconjunto
+  de LaTeX que generan SymPy y los solvers. Si un fragmento usa algo fuera
+  de ese subconjunto se deja en LaTeX y el resultado se marca con
+  'requiere_mathjax' para que el frontend cargue MathJax solo entonces.
+"""
+
+import html
+import re
+
+from sympy.printing.mathml import mathml
+
+
+class UnsupportedTeX(ValueError):
+    """El fragmento LaTeX usa construcciones que 'tex_to_mathml' no cubre."""
+
+
+def math_element(content: str, display: bool) -> str:
+    mode = 'block' if display else 'inline'
+    return f'<math xmlns="http://www.w3.org/1998/Math/MathML" display="{mode}">{content}</math>'
+
+
+def expr_to_mathml(expr, display: bool = True) -> str:
+    """Imprime una expresión (o lista de expresiones) con la impresora MathML de SymPy."""
+    if isinstance(expr, (list, tuple)):
+        items = '<mo>,</mo>'.join(mathml(item, printer='presentation') for item in expr)
+        content = f'<mrow><mo>[</mo>{items}<mo>]</mo></mrow>'
+    else:
+        content = mathml(expr, printer='presentation')
+    return math_element(content, display)
+
+
+# --- Conversión de LaTeX a MathML ---
+
+_TOKEN = re.compile(r'\\[A-Za-z]+|\\.|[0-9]+(?:\.[0-9]+)?|\s+|.', re.DOTALL)
+
+_IDENTIFIERS = {
+    'alpha': 'α', 'beta': 'β', 'gamma': 'γ', 'delta': 'δ', 'epsilon': 'ϵ', 'varepsilon': 'ε',
+    'zeta': 'ζ', 'eta': 'η', 'theta': 'θ', 'vartheta': 'ϑ', 'iota': 'ι', 'kappa': 'κ',
+    'lambda': 'λ', 'mu': 'μ', 'nu': 'ν', 'xi': 'ξ', 'pi': 'π', 'rho': 'ρ', 'sigma': 'σ',
+    'tau': 'τ', 'upsilon': 'υ', 'phi': 'ϕ', 'varphi': 'φ', 'chi': 'χ', 'psi': 'ψ', 'omega': 'ω',
+    'Gamma': 'Γ', 'Delta': 'Δ', 'Theta': 'Θ', 'Lambda': 'Λ', 'Xi': 'Ξ', 'Pi': 'Π',
+    'Sigma': 'Σ', 'Upsilon': 'Υ', 'Phi': 'Φ', 'Psi': 'Ψ', 'Omega': 'Ω',
+    'infty': '∞', 'emptyset': '∅', 'hbar': 'ℏ', 'ell': 'ℓ',
+}
+
+_OPERATORS = {
+    'pm': '±', 'mp': '∓', 'cdot': '⋅', 'times': '×', 'div': '÷', 'neq': '≠', 'ne': '≠',
+    'leq': '≤', 'le': '≤', 'geq': '≥', 'ge': '≥', 'approx': '≈', 'equiv': '≡', 'sim': '∼',
+    'to': '→', 'rightarrow': '→', 'Rightarrow': '⇒', 'leftarrow': '←', 'Leftrightarrow': '⇔',
+    'int': '∫', 'sum': '∑', 'prod': '∏', 'partial': '∂', 'nabla': '∇', 'circ': '∘',
+    'cdots': '⋯', 'ldots': '…', 'dots': '…', 'in': '∈', 'notin': '∉', 'cup': '∪', 'cap': '∩',
+    'subset': '⊂', 'wedge': '∧', 'vee': '∨', 'neg': '¬', 'prime': '′',
+    '{': '{', '}': '}', 'lbrace': '{', 'rbrace': '}', '|': '‖', 'vert': '|', 'mid': '|',
+    'langle': '⟨', 'rangle': '⟩', 'lfloor': '⌊', 'rfloor': '⌋', 'lceil': '⌈', 'rceil': '⌉',
+}
+
+_FUNCTIONS = {
+    'sin', 'cos', 'tan', 'cot', 'sec', 'csc', 'arcsin', 'arccos', 'arctan', 'sinh', 'cosh',
+    'tanh', 'coth', 'log', 'ln', 'exp', 'lim', 'max', 'min', 'det', 'arg', 'sup', 'inf',
+}
+
+_SPACES = {',': '0.167em', ':': '0.222em', ';': '0.278em', ' ': '0.25em', '!': '0',
+           'quad': '1em', 'qquad': '2em'}
+
+_IGNORED = {'displaystyle', 'textstyle', 'limits', 'nolimits'}
+
+_FONTS = {'mathrm': 'normal', 'mathbf': 'bold', 'mathit': 'italic', 'mathbb': 'double-struck',
+          'mathcal': 'script', 'mathtt': 'monospace', 'operatorname': 'normal'}
+
+
+class _TeXParser:
+    """Parser recursivo del subconjunto de LaTeX de SymPy (sin entornos ni tablas)."""
+
+    def __init__(self, tex: str):
+        self.tokens = [t for t in _TOKEN.findall(tex)]
+        self.pos = 0
+
+    def peek(self):
+        # Los espacios no son significativos en modo matemático.
+        while self.pos < len(self.tokens) and self.tokens[self.pos].isspace():
+            self.pos += 1
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def next(self):
+        token = self.peek()
+        if token is None:
+            raise UnsupportedTeX('fin inesperado del fragmento')
+        self.pos += 1
+        return token
+
+    def parse(self) -> str:
+        content = self.sequence(stop=())
+        if self.peek() is not None:
+            raise UnsupportedTeX(f'token inesperado: {self.peek()}')
+        return content
+
+    def sequence(self, stop) -> str:
+        nodes = []
+        while True:
+            token = self.peek()
+            if token is None or token in stop:
+                return f'<mrow>{"".join(nodes)}</mrow>' if len(nodes) != 1 else nodes[0]
+            if token in ('^', '_'):
+                # Superíndice/subíndice sin base, p. ej. '^{2}' al inicio.
+                base = '<mrow></mrow>'
+            else:
+                base = self.atom()
+                if base is None:
+                    continue
+            nodes.append(self.scripts(base))
+
+    def scripts(self, base: str) -> str:
+        sub = sup = None
+        while self.peek() in ('^', '_'):
+            kind = self.next()
+            arg = self.argument()
+            if kind == '^':
+                sup = arg
+            else:
+                sub = arg
+        if sub is not None and sup is not None:
+            return f'<msubsup>{base}{sub}{sup}</msubsup>'
+        if sup is not None:
+            return f'<msup>{base}{sup}</msup>'
+        if sub is not None:
+            return f'<msub>{base}{sub}</msub>'
+        return base
+
+    def argument(self) -> str:
+        if self.peek() == '{':
+            self.next()
+            content = self.sequence(stop=('}',))
+            self.next()
+            return content
+        atom = self.atom()
+        if atom is None:
+            raise UnsupportedTeX('argumento vacío')
+        return atom
+
+    def raw_group(self) -> str:
+        """Texto literal de un grupo '{...}' (para \\text, \\operatorname, ...)."""
+        if self.next() != '{':
+            raise UnsupportedTeX('se esperaba un grupo')
+        depth, parts = 1, []
+        while True:
+            if self.pos >= len(self.tokens):
+                raise UnsupportedTeX('grupo sin cerrar')
+            token = self.tokens[self.pos]
+            self.pos += 1
+            if token == '{':
+                depth += 1
+            elif token == '}':
+                depth -= 1
+                if depth == 0:
+                    return ''.join(parts)
+            parts.append(token)
+
+    def delimiter(self) -> str:
+        token = self.next()
+        if token == '.':
+            return ''
+        symbol = _OPERATORS.get(token[1:]) if token.startswith('\\') else token
+        if symbol is None:
+            raise UnsupportedTeX(f'delimitador no soportado: {token}')
+        return f'<mo stretchy="true">{html.escape(symbol)}</mo>'
+
+    def atom(self):
+        token = self.next()
+        if token == '{':
+            content = self.sequence(stop=('}',))
+            self.next()
+            return content
+        if token.isdigit() or re.fullmatch(r'[0-9]+\.[0-9]+', token):
+            return f'<mn>{token}</mn>'
+        if token.isalpha():
+            return f'<mi>{token}</mi>'
+        if token == "'":
+            return '<mo>′</mo>'
+        if not token.startswith('\\'):
+            if token in '}&':
+                raise UnsupportedTeX(f'token inesperado: {token}')
+            return f'<mo>{html.escape(token)}</mo>'
+        return self.command(token[1:])
+
+    def command(self, name: str):
+        if name in _IGNORED:
+            return None
+        if name in ('frac', 'dfrac', 'tfrac'):
+            return f'<mfrac>{self.argument()}{self.argument()}</mfrac>'
+        if name == 'sqrt':
+            if self.peek() == '[':
+                self.next()
+                index = self.sequence(stop=(']',))
+                self.next()
+                return f'<mroot>{self.argument()}{index}</mroot>'
+            return f'<msqrt>{self.argument()}</msqrt>'
+        if name == 'left':
+            opening = self.delimiter()
+            content = self.sequence(stop=('\\right',))
+            self.next()
+            return f'<mrow>{opening}{content}{self.delimiter()}</mrow>'
+        if name == 'text':
+            return f'<mtext>{html.escape(self.raw_group())}</mtext>'
+        if name in _FONTS:
+            text = html.escape(self.raw_group())
+            return f'<mi mathvariant="{_FONTS[name]}">{text}</mi>'
+        if name in _SPACES:
+            return f'<mspace width="{_SPACES[name]}"></mspace>'
+        if name in _IDENTIFIERS:
+            return f'<mi>{_IDENTIFIERS[name]}</mi>'
+        if name in _OPERATORS:
+            return f'<mo>{html.escape(_OPERATORS[name])}</mo>'
+        if name in _FUNCTIONS:
+            return f'<mi>{name}</mi>'
+        raise UnsupportedTeX(f'comando no soportado: \\{name}')
+
+
+def tex_to_mathml(tex: str, display: bool = False) -> str:
+    """Convierte un fragmento LaTeX a un elemento <math>; lanza UnsupportedTeX si no puede."""
+    return math_element(_TeXParser(tex).parse(), display)
+
+
+_MATH_SEGMENT = re.compile(r'\$\$(.+?)\$\$|\\\((.+?)\\\)', re.DOTALL)
+
+
+def render_text(text: str):
+    """
+    Sustituye los fragmentos '$$...$$' y '\\(...\\)' de un texto por MathML.
+
+    Devuelve (texto, completo); 'completo' es False si algún fragmento se tuvo
+    que dejar en LaTeX.
+    """
+    complete = True
+
+    def replace(match):
+        nonlocal complete
+        display = match.group(1) is not None
+        tex = match.group(1) if display else match.group(2)
+        try:
+            return tex_to_mathml(tex, display=display)
+        except UnsupportedTeX:
+            complete = False
+            return match.group(0)
+
+    return _MATH_SEGMENT.sub(replace, text), complete
+
+
+def render_result(result: dict) -> dict:
+    """Convierte a MathML la 'solucion' y los 'steps' del diccionario de un solver."""
+    if 'error' in result:
+        return result
+    rendered = dict(result)
+    complete = True
+    if isinstance(result.get('solucion'), str):
+        rendered['solucion'], ok = render_text(result['solucion'])
+        complete &= ok
+    if isinstance(result.get('steps'), list):
+        steps = []
+        for step in result['steps']:
+            if isinstance(step, str):
+                step, ok = render_text(step)
+                complete &= ok
+            steps.append(step)
+        rendered['steps'] = steps
+    rendered['render'] = 'mathml'
+    rendered['requiere_mathjax'] = not complete
+    return rendered
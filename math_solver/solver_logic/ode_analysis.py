@@ -0,0 +1,106 @@
+"""
+Análisis Compartido de una EDO
+
+'dsolve' clasifica la ecuación ('classify_ode') en cada llamada, y una sola
+petición de Riccati puede llamar a 'dsolve' varias veces con la misma EDO
+(más la clasificación que se muestra en los pasos y la que usa 'hint_order').
+
+'analyze' devuelve un objeto por EDO canónica (la Eq ya normalizada por
+SymPy), cacheado en el proceso, que clasifica una sola vez y reparte el
+resultado: el orden, el hint por defecto, los hints aplicables y el 'match'
+de cada uno. La clasificación completa solo se calcula si hace falta un hint
+distinto del de por defecto. Con 'dsolve_kwargs' se llama a 'dsolve' sin
+volver a clasificar:
+
+    dsolve(ecuacion, y, **analyze(ecuacion, y).dsolve_kwargs(hint))
+"""
+
+import threading
+from functools import lru_cache
+
+from sympy import classify_ode
+
+ANALYSIS_CACHE_SIZE = 256
+
+
+class ODEAnalysis:
+    """
+    Clasificación de una EDO en dos niveles, calculados la primera vez que se
+    necesitan: la rápida (la que usa 'dsolve', que se detiene en el hint por
+    defecto) y la completa (todos los hints aplicables, bastante más cara).
+    """
+
+    def __init__(self, ecuacion, func):
+        self.ecuacion = ecuacion
+        self.func = func
+        self._default = None
+        self._full = None
+        self._lock = threading.Lock()
+
+    @property
+    def default_classification(self) -> dict:
+        """classify_ode(..., dict=True): orden, hint por defecto y su 'match'."""
+        with self._lock:
+            if self._default is None:
+                self._default = classify_ode(self.ecuacion, self.func, dict=True)
+            return self._default
+
+    @property
+    def classification(self) -> dict:
+        """classify_ode(..., dict=True, hint='all'): todos los hints aplicables."""
+        with self._lock:
+            if self._full is None:
+                self._full = classify_ode(self.ecuacion, self.func, dict=True, hint='all')
+            return self._full
+
+    @property
+    def default_hint(self):
+        """Hint que usaría 'dsolve' por defecto, o None si ninguno aplica."""
+        return self.default_classification['default']
+
+    @property
+    def order(self) -> int:
+        return self.default_classification['order']
+
+    @property
+    def ordered_hints(self) -> tuple:
+        """Hints aplicables en el orden de preferencia de SymPy (lo que devuelve classify_ode)."""
+        return tuple(self.classification.get('ordered_hints', ()))
+
+    @property
+    def hints(self) -> tuple:
+        """Hints aplicables sin las variantes '_Integral'."""
+        return tuple(hint for hint in self.ordered_hints if not hint.endswith('_Integral'))
+
+    def matches(self, hint: str) -> bool:
+        # El hint por defecto no necesita la clasificación completa.
+        return (hint is not None and hint == self.default_hint) or hint in self.ordered_hints
+
+    def dsolve_kwargs(self, hint: str = 'default') -> dict:
+        """
+        Argumentos para 'dsolve' con el hint ya clasificado. Lanza las mismas
+        excepciones que 'dsolve': NotImplementedError si ningún hint aplica y
+        ValueError si 'hint' no corresponde a la ecuación.
+        """
+        if hint == 'default':
+            hint = self.default_hint
+            if not hint:
+                raise NotImplementedError(f"solve: Cannot solve {self.ecuacion}")
+        if hint == self.default_hint:
+            classification = self.default_classification
+        elif self.matches(hint):
+            classification = self.classification
+        else:
+            raise ValueError(f"ODE {self.ecuacion} does not match hint {hint}")
+        return {'hint': hint, 'classify': False, 'match': classification[hint], 'order': self.order}
+
+
+@lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def analyze(ecuacion, func) -> ODEAnalysis:
+    """Análisis compartido de la EDO, uno por ecuación canónica en cada proceso."""
+    return ODEAnalysis(ecuacion, func)
+
+
+def cache_clear():
+    """Vacía la caché de análisis."""
+    analyze.cache_clear()
@@ -1,6 +1,6 @@
-from sympy import Eq, solve, factor, symbols, discriminant, latex
+from sympy import Eq, solve, factor, symbols, discriminant
 # Importamos 'x' y nuestras funciones comunes
-from .base_solver import x, parse_safe, format_latex
+from .base_solver import x, parse_safe, format_latex, latex, record_solution
 
 def solve_quadratic(a_str: str, b_str: str, c_str: str) -> dict:
     """
@@ -63,6 +63,7 @@ def solve_quadratic(a_str: str, b_str: str, c_str: str) -> dict:
         
         # Añadir la solución final a los pasos
         steps.append(f"4. Las raíces de la ecuación son: {raices_latex}")
+        record_solution(ecuacion, raices)
         
         return {'solucion': solucion_html, 'steps': steps}
 
@@ -0,0 +1,148 @@
+"""
+Registro de Solvers
+
+Tabla única que relaciona cada 'solver_type' del formulario con la función
+de lógica que lo resuelve y con los nombres de los campos POST que recibe,
+en el mismo orden que los argumentos de la función.
+
+La usan las herramientas que necesitan ejecutar un solver a partir de un
+payload del formulario (benchmarks, pruebas de carga, procesos por lotes)
+sin duplicar el enrutamiento de 'main_solver_view'.
+"""
+
+import hashlib
+import json
+from collections import namedtuple
+
+from sympy import srepr
+
+from .base_solver import RENDER_MATHML, parse_safe, render_mode
+from .mathml import render_result
+from .verification import verify_result
+from .quadratic_solver import solve_quadratic
+from .bernoulli_solver import solve_bernoulli
+from .cauchy_euler_solver import solve_cauchy_euler
+from .clairaut_solver import solve_clairaut
+from .riccati_solver import solve_riccati
+from .second_order_solver import solve_second_order_homogeneous, solve_second_order_nonhomogeneous
+
+# 'fields' es una lista de (nombre_del_campo_POST, valor_por_defecto).
+# Un valor por defecto None indica un parámetro opcional (p. ej. IVP).
+SolverSpec = namedtuple('SolverSpec', ['func', 'fields'])
+
+SOLVERS = {
+    'quadratic': SolverSpec(solve_quadratic, [
+        ('quad_a_val', '0'),
+        ('quad_b_val', '0'),
+        ('quad_c_val', '0'),
+    ]),
+    'bernoulli': SolverSpec(solve_bernoulli, [
+        ('bernoulli_p_function', ''),
+        ('bernoulli_q_function', ''),
+        ('bernoulli_n_value', ''),
+        ('bernoulli_x0', None),
+        ('bernoulli_y0', None),
+    ]),
+    'cauchy': SolverSpec(solve_cauchy_euler, [
+        ('cauchy_a_val', '0'),
+        ('cauchy_b_val', '0'),
+        ('cauchy_c_val', '0'),
+        ('cauchy_r_function', '0'),
+    ]),
+    'clairaut': SolverSpec(solve_clairaut, [
+        ('clairaut_f_p_function', ''),
+    ]),
+    'riccati': SolverSpec(solve_riccati, [
+        ('riccati_p_function', ''),
+        ('riccati_q_function', ''),
+        ('riccati_r_function', ''),
+        ('riccati_x0', None),
+        ('riccati_y0', None),
+        ('riccati_yp', None),
+    ]),
+    'second_order_homogeneous': SolverSpec(solve_second_order_homogeneous, [
+        ('second_a_val', '0'),
+        ('second_b_val', '0'),
+        ('second_c_val', '0'),
+        ('second_x0', None),
+        ('second_y0', None),
+        ('second_y_prime_0', None),
+    ]),
+    'second_order_nonhomogeneous': SolverSpec(solve_second_order_nonhomogeneous, [
+        ('second_a_val', '0'),
+        ('second_b_val', '0'),
+        ('second_c_val', '0'),
+        ('second_g_function', '0'),
+        ('second_x0', None),
+        ('second_y0', None),
+        ('second_y_prime_0', None),
+    ]),
+}
+
+
+def solver_args(solver_type: str, data) -> list:
+    """
+    Extrae de 'data' (un QueryDict o un dict) los argumentos posicionales
+    del solver indicado, aplicando los mismos valores por defecto que la vista.
+    """
+    spec = SOLVERS[solver_type]
+    return [data.get(name, default) for name, default in spec.fields]
+
+
+def run_solver(solver_type: str, data, render: str = 'latex', verify: bool = False) -> dict:
+    """
+    Ejecuta el solver correspondiente a 'solver_type' con los campos de 'data'.
+
+    Con render='mathml' las fórmulas de la solución y de los pasos se devuelven
+    ya convertidas a MathML (ver 'mathml.py'). Con verify=True se añade
+    'verificacion', el informe de la verificación numérica de la solución.
+
+    Devuelve el diccionario del solver, o {'error': ...} si el tipo no existe.
+    """
+    spec = SOLVERS.get(solver_type)
+    if spec is None:
+        return {'error': f'Tipo de solver desconocido: "{solver_type}"'}
+    with render_mode(render):
+        result = spec.func(*solver_args(solver_type, data))
+    if render == RENDER_MATHML:
+        result = render_result(result)
+    if verify and 'solucion' in result:
+        result['verificacion'] = verify_result(result)
+    return result
+
+
+def canonical_input(solver_type: str, data) -> list:
+    """
+    Forma canónica de la entrada de un solver: cada argumento se parsea y se
+    representa con 'srepr', de modo que "x^2", "x**2" o " x**2 " coinciden.
+    Los valores que no se pueden parsear se conservan como texto.
+    """
+    canonical = []
+    for value in solver_args(solver_type, data):
+        if value is None:
+            canonical.append(None)
+            continue
+        value = str(value).strip()
+        expr = parse_safe(value)
+        canonical.append(srepr(expr) if expr is not None else value)
+    return canonical
+
+
+def input_hash(solver_type: str, data) -> str:
+    """Hash SHA-256 de la entrada canónica, usado como clave de caché y de perfiles."""
+    payload = json.dumps([solver_type, canonical_input(solver_type, data)], separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def canonical_query(solver_type: str, data) -> list:
+    """
+    Pares (campo, valor) de la entrada en el orden del registro, omitiendo los
+    campos ausentes. Con 'input_hash' forma la URL canónica de un resultado:
+    ambos describen exactamente la misma entrada que 'solver_args'.
+    """
+    query = []
+    for name, _default in SOLVERS[solver_type].fields:
+        value = data.get(name)
+        if value is not None:
+            query.append((name, str(value)))
+    return query
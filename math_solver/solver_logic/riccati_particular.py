@@ -0,0 +1,130 @@
+"""
+Solución Particular de Riccati y Reducción a Lineal
+
+Conocida una solución particular y_p de y' = P y² + Q y + R, el cambio
+y = y_p + 1/v convierte la ecuación en la lineal de primer orden
+
+    v' + (2 P y_p + Q) v = -P
+
+que se resuelve con un factor integrante μ = e^{∫(2 P y_p + Q) dx}:
+
+    v = (C1 - ∫ P μ dx) / μ
+
+La búsqueda de y_p prueba, de menor a mayor costo, constantes, monomios
+c·x^m y polinomios (de Laurent) con grados acotados por los de P, Q y R.
+Cada candidato se sustituye en la ecuación y se igualan a cero los
+coeficientes del numerador, lo que da un sistema algebraico pequeño.
+"""
+
+from sympy import Eq, Integral, Poly, Symbol, exp, fraction, simplify, solve, symbols, together
+
+from .base_solver import latex
+from .integration import antiderivative
+
+MAX_DEGREE = 4
+MAX_NEGATIVE_DEGREE = 3
+
+
+def residual(P, Q, R, candidate, var):
+    """y_p' - (P y_p² + Q y_p + R); es cero si 'candidate' es solución particular."""
+    return candidate.diff(var) - (P * candidate**2 + Q * candidate + R)
+
+
+def is_particular_solution(P, Q, R, candidate, var) -> bool:
+    return simplify(residual(P, Q, R, candidate, var)) == 0
+
+
+def _degrees(expr, var):
+    """(grado del numerador, grado del denominador) de una función racional en var, o None."""
+    numerator, denominator = fraction(together(expr))
+    if not (numerator.is_polynomial(var) and denominator.is_polynomial(var)):
+        return None
+    return Poly(numerator, var).degree(), Poly(denominator, var).degree()
+
+
+def degree_bounds(P, Q, R, var):
+    """
+    Cotas (grado máximo, grado negativo máximo) del ansatz de Laurent, a partir
+    del balance de los términos dominantes. None si P, Q o R no son racionales.
+    """
+    degrees = [_degrees(coef, var) for coef in (P, Q, R)]
+    if None in degrees:
+        return None
+    (np_, dp), (nq, dq), (nr, dr) = degrees
+    deg_p, deg_q, deg_r = np_ - dp, nq - dq, nr - dr
+    # Grado d de y_p: 2d + deg P debe cancelarse con d + deg Q, deg R o d - 1.
+    high = max(0, deg_r - deg_p, deg_q - deg_p, (deg_r - deg_p) // 2)
+    low = max(dp, dq, dr, 1)
+    return min(high, MAX_DEGREE), min(low, MAX_NEGATIVE_DEGREE)
+
+
+def _solve_ansatz(P, Q, R, ansatz, unknowns, var):
+    """Resuelve los coeficientes del ansatz; devuelve y_p o None."""
+    numerator = fraction(together(residual(P, Q, R, ansatz, var)))[0]
+    numerator = numerator.expand()
+    if numerator == 0:
+        return None
+    if not numerator.is_polynomial(var):
+        return None
+    equations = Poly(numerator, var).coeffs()
+    try:
+        solutions = solve(equations, unknowns, dict=True)
+    except NotImplementedError:
+        return None
+    for values in solutions:
+        if set(values) != set(unknowns):
+            continue
+        if not all(value.is_number and value.is_real for value in values.values()):
+            continue
+        return ansatz.subs(values)
+    return None
+
+
+def _candidates(P, Q, R, var):
+    """Ansatz (expresión, incógnitas) en orden creciente de costo."""
+    a = Symbol('a')
+    yield a, [a]
+    bounds = degree_bounds(P, Q, R, var)
+    if bounds is None:
+        return
+    high, low = bounds
+    for m in list(range(1, high + 1)) + [-k for k in range(1, low + 1)]:
+        yield a * var**m, [a]
+    for degree in range(1, high + 1):
+        coefficients = symbols(f'a0:{degree + 1}')
+        yield sum(c * var**k for k, c in enumerate(coefficients)), list(coefficients)
+    if low:
+        coefficients = symbols(f'a0:{high + low + 1}')
+        powers = range(-low, high + 1)
+        yield sum(c * var**k for k, c in zip(powers, coefficients)), list(coefficients)
+
+
+def find_particular_solution(P, Q, R, var):
+    """Busca una solución particular racional sencilla; devuelve y_p o None."""
+    for ansatz, unknowns in _candidates(P, Q, R, var):
+        found = _solve_ansatz(P, Q, R, ansatz, unknowns, var)
+        if found is not None:
+            return found
+    return None
+
+
+def reduce_to_linear(P, Q, R, y_p, func):
+    """
+    Aplica y = y_p + 1/v y resuelve la ecuación lineal en v con factor integrante.
+    Devuelve (solución Eq(y, ...), pasos).
+    """
+    var = func.args[0]
+    C1 = Symbol('C1')
+    coefficient = simplify(2 * P * y_p + Q)
+    steps = [
+        rf"   - Con \( y = y_p + \frac{{1}}{{v}} \) la ecuación se reduce a la lineal \( v' + \left({latex(coefficient)}\right) v = {latex(-P)} \)",
+    ]
+    mu = simplify(exp(antiderivative(coefficient, var)))
+    steps.append(rf"   - Factor integrante: \( \mu(x) = {latex(mu)} \)")
+    integral = antiderivative(simplify(P * mu), var)
+    if isinstance(integral, Integral):
+        steps.append("   - La integral de \\( P \\mu \\) no tiene forma elemental; se deja indicada.")
+    v_sol = simplify((C1 - integral) / mu)
+    steps.append(rf"   - \( v(x) = {latex(v_sol)} \)")
+    solution = Eq(func, simplify(y_p + 1 / v_sol))
+    return solution, steps
@@ -1,6 +1,14 @@
-from sympy import Eq, dsolve, latex, symbols, simplify, integrate, exp, log, solve, Function, diff, Rational, classify_ode, sqrt, atan, asin, acos, tan, sin, cos, airyai, airybi, besselj, bessely, hyper, meijerg
+import time
+
+from sympy import Eq, dsolve, symbols, simplify, integrate, exp, log, solve, Function, diff, Rational, classify_ode, sqrt, atan, asin, acos, tan, sin, cos, airyai, airybi, besselj, bessely, hyper, meijerg
 # Importamos nuestros símbolos y funciones comunes
-from .base_solver import x, y, parse_safe, format_latex
+from . import hint_order
+from .base_solver import x, y, parse_safe, format_latex, symbolic_fields, latex
+from .general_solutions import apply_initial_conditions, constants_step, general_solution, solve_ivp
+from .integration import antiderivative
+from .ode_analysis import analyze
+from .series_engine import SERIES_BUDGET, riccati_spec, series_equation, series_fallback, series_result
+from .riccati_particular import find_particular_solution, is_particular_solution, reduce_to_linear
 
 def is_constant(expr):
     """Safely check if an expression is constant"""
@@ -26,7 +34,24 @@ def is_polynomial(expr, sym):
         return True
     return hasattr(expr, 'is_polynomial') and expr.is_polynomial(sym)
 
-def solve_riccati(P_str: str, Q_str: str, R_str: str, x0_str: str = None, y0_str: str = None) -> dict:
+def _particularize(solucion, ecuacion, ics, steps):
+    """
+    Impone las condiciones iniciales 'ics' (si las hay) a una solución general
+    obtenida por un método de respaldo. Devuelve (solución, ics a verificar):
+    si no se pueden imponer se conserva la solución general y no se verifican
+    las condiciones, para no informar de un fallo que no lo es.
+    """
+    if ics is None:
+        return solucion, None
+    particular, constantes = apply_initial_conditions(solucion, y, ics, ecuacion)
+    if particular is None:
+        steps.append("   - ⚠️ No se pudieron imponer las condiciones iniciales; se muestra la solución general.")
+        return solucion, None
+    steps.append(constants_step(constantes, reused=False))
+    return particular, ics
+
+def solve_riccati(P_str: str, Q_str: str, R_str: str, x0_str: str = None, y0_str: str = None,
+                  yp_str: str = None) -> dict:
     """
     Resuelve una Ecuación de Riccati y proporciona los pasos.
     Enhanced version with multiple solution methods and optional IVP support.
@@ -35,6 +60,7 @@ def solve_riccati(P_str: str, Q_str: str, R_str: str, x0_str: str = None, y0_str
         P_str, Q_str, R_str: Coefficients P(x), Q(x), R(x)
         x0_str: (Opcional) Valor inicial x₀ para IVP
         y0_str: (Opcional) Valor inicial y(x₀) para IVP
+        yp_str: (Opcional) Solución particular conocida y_p(x)
     """
     
     # 1. Parsear y Validar
@@ -56,6 +82,11 @@ def solve_riccati(P_str: str, Q_str: str, R_str: str, x0_str: str = None, y0_str
         y0_expr = parse_safe(y0_str)
         if y0_expr is None: return {'error': f"y₀ = '{y0_str }' no es válido."}
 
+    yp_expr = None
+    if yp_str:
+        yp_expr = parse_safe(yp_str)
+        if yp_expr is None: return {'error': f"y_p = '{yp_str}' no es válida."}
+
     steps = []
     try:
         # 2. Construir la Ecuación Original
@@ -71,23 +102,58 @@ def solve_riccati(P_str: str, Q_str: str, R_str: str, x0_str: str = None, y0_str
         # 1b. Mostrar condiciones iniciales si es IVP
         if is_ivp:
             steps.append(rf"**Problema de Valor Inicial (IVP)**:")
-            steps.append(rf"   - Condición inicial: \\( y({latex(x0_expr)}) = {latex(y0_expr)} \\)")
-        
-        # Método 1: Intentar dsolve directo primero
-        steps.append("2. **Intentando método directo con SymPy**...")
+            steps.append(rf"   - Condición inicial: \( y({latex(x0_expr)}) = {latex(y0_expr)} \)")
+            ics = {y.subs(x, x0_expr): y0_expr}
+
+        # Método 1: Solución particular y reducción a lineal
+        if p_expr != 0:
+            steps.append("2. **Buscando una solución particular**...")
+            y_p = None
+            if yp_expr is not None:
+                if is_particular_solution(p_expr, q_expr, r_expr, yp_expr, x):
+                    y_p = yp_expr
+                    steps.append(rf"   - Se usa la solución particular dada: \( y_p = {latex(y_p)} \)")
+                else:
+                    steps.append(rf"   - ❌ \( y_p = {latex(yp_expr)} \) no satisface la ecuación; se busca otra.")
+            if y_p is None:
+                y_p = find_particular_solution(p_expr, q_expr, r_expr, x)
+                if y_p is not None:
+                    steps.append(rf"   - ✅ Solución particular encontrada: \( y_p = {latex(y_p)} \)")
+                else:
+                    steps.append("   - ❌ No se encontró una solución particular polinómica o racional sencilla.")
+            if y_p is not None:
+                try:
+                    solucion_reducida, pasos = reduce_to_linear(p_expr, q_expr, r_expr, y_p, y)
+                    steps.extend(pasos)
+                    if is_ivp:
+                        solucion_reducida, constantes = apply_initial_conditions(solucion_reducida, y, ics, ecuacion)
+                        if solucion_reducida is None:
+                            raise ValueError("no se pudieron imponer las condiciones iniciales")
+                        steps.append(constants_step(constantes, reused=False))
+                    solucion_latex = format_latex(solucion_reducida)
+                    steps.append(f"   - ✅ Solución: {solucion_latex}")
+                    return {'solucion': solucion_latex, 'steps': steps, 'metodo': 'solucion_particular',
+                            **symbolic_fields(ecuacion, solucion_reducida, ics if is_ivp else None)}
+                except Exception as e:
+                    steps.append(f"   - ❌ Error en la reducción a lineal: {e}")
+
+        # Método 2: Intentar dsolve directo
+        steps.append("3. **Intentando método directo con SymPy**...")
         try:
             # Use ics if IVP
             if is_ivp:
-                ics = {y.subs(x, x0_expr): y0_expr}
-                solucion_directa = dsolve(ecuacion, y, ics=ics)
+                solucion_directa, constantes = solve_ivp(ecuacion, y, ics)
+                if constantes:
+                    steps.append(constants_step(constantes))
             else:
-                solucion_directa = dsolve(ecuacion, y)
+                solucion_directa = general_solution(ecuacion, y)
                 
             # FIXED: Check if solution exists without truth value issues
             if solucion_directa is not None and str(solucion_directa) != "[]":
                 solucion_latex = format_latex(solucion_directa)
                 steps.append(f"   - ✅ Solución encontrada: {solucion_latex}")
-                return {'solucion': solucion_latex, 'steps': steps}
+                return {'solucion': solucion_latex, 'steps': steps, 'metodo': 'dsolve',
+                        **symbolic_fields(ecuacion, solucion_directa, ics if is_ivp else None)}
             else:
                 steps.append("   - ❌ Método directo no funcionó, intentando otros métodos...")
         except Exception as e:
@@ -97,8 +163,8 @@ def solve_riccati(P_str: str, Q_str: str, R_str: str, x0_str: str = None, y0_str
             else:
                 steps.append(f"   - ❌ Método directo falló: {error_msg}")
         
-        # Método 2: Casos especiales
-        steps.append("3. **Verificando casos especiales**...")
+        # Método 3: Casos especiales
+        steps.append("4. **Verificando casos especiales**...")
         
         # Caso 2.1: Ecuación separable (Q = R = 0)
         if q_expr == 0 and r_expr == 0:
@@ -107,11 +173,13 @@ def solve_riccati(P_str: str, Q_str: str, R_str: str, x0_str: str = None, y0_str
             steps.append("   - Separando: dy/y² = P(x)dx")
             
             try:
-                integral_p = integrate(p_expr, x)
+                integral_p = antiderivative(p_expr, x)
                 sol_separable = Eq(y, -1 / (integral_p + symbols('C1')))
+                sol_separable, ics_verificar = _particularize(sol_separable, ecuacion, ics if is_ivp else None, steps)
                 solucion_latex = format_latex(sol_separable)
                 steps.append(f"   - ✅ Solución: {solucion_latex}")
-                return {'solucion': solucion_latex, 'steps': steps}
+                return {'solucion': solucion_latex, 'steps': steps, 'metodo': 'separable',
+                        **symbolic_fields(ecuacion, sol_separable, ics_verificar)}
             except Exception as e:
                 steps.append(f"   - ❌ Error en método separable: {e}")
         
@@ -123,16 +191,18 @@ def solve_riccati(P_str: str, Q_str: str, R_str: str, x0_str: str = None, y0_str
             
             try:
                 ecuacion_lineal = Eq(y.diff(x), q_expr * y + r_expr)
-                sol_lineal = dsolve(ecuacion_lineal, y)
+                sol_lineal = dsolve(ecuacion_lineal, y, **analyze(ecuacion_lineal, y).dsolve_kwargs())
                 if sol_lineal is not None and str(sol_lineal) != "[]":
+                    sol_lineal, ics_verificar = _particularize(sol_lineal, ecuacion, ics if is_ivp else None, steps)
                     solucion_latex = format_latex(sol_lineal)
                     steps.append(f"   - ✅ Solución lineal: {solucion_latex}")
-                    return {'solucion': solucion_latex, 'steps': steps}
+                    return {'solucion': solucion_latex, 'steps': steps, 'metodo': 'lineal',
+                            **symbolic_fields(ecuacion, sol_lineal, ics_verificar)}
             except Exception as e:
                 steps.append(f"   - ❌ Error en método lineal: {e}")
         
-        # Método 3: Transformación de Bernoulli
-        steps.append("4. **Intentando sustitución de Bernoulli**...")
+        # Método 4: Transformación de Bernoulli
+        steps.append("5. **Intentando sustitución de Bernoulli**...")
         try:
             u = Function('u')(x)
             # Transformación: y = -u'/(P*u)
@@ -140,16 +210,18 @@ def solve_riccati(P_str: str, Q_str: str, R_str: str, x0_str: str = None, y0_str
             ec_u_latex = latex(ec_u)
             steps.append(f"   - Ecuación transformada: $${ec_u_latex}$$")
             
-            sol_u = dsolve(ec_u, u)
+            sol_u = dsolve(ec_u, u, **analyze(ec_u, u).dsolve_kwargs())
             if sol_u is not None and str(sol_u) != "[]":
                 steps.append(f"   - ✅ Solución para u encontrada")
                 # Intentar obtener solución final
                 try:
-                    sol_final = dsolve(ecuacion, y)
+                    sol_final = dsolve(ecuacion, y, **analyze(ecuacion, y).dsolve_kwargs())
                     if sol_final is not None and str(sol_final) != "[]":
+                        sol_final, ics_verificar = _particularize(sol_final, ecuacion, ics if is_ivp else None, steps)
                         solucion_latex = format_latex(sol_final)
                         steps.append(f"   - ✅ Solución final: {solucion_latex}")
-                        return {'solucion': solucion_latex, 'steps': steps}
+                        return {'solucion': solucion_latex, 'steps': steps, 'metodo': 'sustitucion_lineal',
+                                **symbolic_fields(ecuacion, sol_final, ics_verificar)}
                 except:
                     pass
                 
@@ -168,36 +240,12 @@ def solve_riccati(P_str: str, Q_str: str, R_str: str, x0_str: str = None, y0_str
                 </div>
                 """
                 steps.append(f"   - ✅ Solución parcial encontrada")
-                return {'solucion': solucion_completa, 'steps': steps}
+                return {'solucion': solucion_completa, 'steps': steps, 'metodo': 'sustitucion_lineal_parcial'}
             else:
                 steps.append("   - ❌ No se pudo resolver ecuación transformada")
         except Exception as e:
             steps.append(f"   - ❌ Error en transformación: {e}")
         
-        # Método 4: Intentar solución particular
-        steps.append("5. **Buscando solución particular**...")
-        try:
-            # Intentar solución particular constante
-            k = symbols('k')
-            if p_expr != 0:
-                ec_k = Eq(p_expr * k**2 + q_expr * k + r_expr, 0)
-                sol_k = solve(ec_k, k)
-                if sol_k and len(sol_k) > 0:
-                    y_p = sol_k[0]
-                    steps.append(f"   - ✅ Solución particular: y_p = {latex(y_p)}")
-                    
-                    # Ahora resolver con esta solución particular
-                    try:
-                        sol_final = dsolve(ecuacion, y)
-                        if sol_final is not None and str(sol_final) != "[]":
-                            solucion_latex = format_latex(sol_final)
-                            steps.append(f"   - ✅ Solución completa: {solucion_latex}")
-                            return {'solucion': solucion_latex, 'steps': steps}
-                    except:
-                        pass
-        except Exception as e:
-            steps.append(f"   - ❌ Error en búsqueda de solución particular: {e}")
-        
         # Método 5: Simplificación
         steps.append("6. **Intentando simplificación**...")
         try:
@@ -208,31 +256,42 @@ def solve_riccati(P_str: str, Q_str: str, R_str: str, x0_str: str = None, y0_str
             if p_simpl != p_expr or q_simpl != q_expr or r_simpl != r_expr:
                 steps.append("   - Coeficientes simplificados")
                 ecuacion_simpl = Eq(y.diff(x), (p_simpl * y**2) + (q_simpl * y) + r_simpl)
-                sol_simpl = dsolve(ecuacion_simpl, y)
+                sol_simpl = dsolve(ecuacion_simpl, y, **analyze(ecuacion_simpl, y).dsolve_kwargs())
                 if sol_simpl is not None and str(sol_simpl) != "[]":
+                    sol_simpl, ics_verificar = _particularize(sol_simpl, ecuacion, ics if is_ivp else None, steps)
                     solucion_latex = format_latex(sol_simpl)
                     steps.append(f"   - ✅ Solución simplificada: {solucion_latex}")
-                    return {'solucion': solucion_latex, 'steps': steps}
+                    return {'solucion': solucion_latex, 'steps': steps, 'metodo': 'simplificacion',
+                            **symbolic_fields(ecuacion, sol_simpl, ics_verificar)}
         except Exception as e:
             steps.append(f"   - ❌ Error en simplificación: {e}")
         
         # Método 6: Clasificación y hints
         steps.append("7. **Intentando diferentes hints**...")
         try:
-            ode_class = classify_ode(ecuacion)
-            steps.append(f"   - Clasificación: {ode_class}")
+            analisis = analyze(ecuacion, y)
+            steps.append(f"   - Clasificación: {analisis.ordered_hints}")
             
-            # Probar diferentes hints
-            hints_to_try = ['riccati', 'lie_group', '2nd_power_series', '1st_exact', '1st_power_series']
+            # Probar diferentes hints (solo los que aplican), en el orden
+            # aprendido de los tiempos reales
+            hints_to_try = [hint for hint in ('riccati', 'lie_group', '2nd_power_series', '1st_exact', '1st_power_series')
+                            if analisis.matches(hint)]
+            contexto, hints_to_try = hint_order.plan(ecuacion, y, hints_to_try, max_hints=len(hints_to_try))
             
             for hint in hints_to_try:
+                inicio = time.perf_counter()
                 try:
-                    sol_hint = dsolve(ecuacion, y, hint=hint)
-                    if sol_hint is not None and str(sol_hint) != "[]":
+                    sol_hint = dsolve(ecuacion, y, **analisis.dsolve_kwargs(hint))
+                    resuelta = sol_hint is not None and str(sol_hint) != "[]"
+                    hint_order.record(contexto, hint, time.perf_counter() - inicio, resuelta)
+                    if resuelta:
+                        sol_hint, ics_verificar = _particularize(sol_hint, ecuacion, ics if is_ivp else None, steps)
                         solucion_latex = format_latex(sol_hint)
                         steps.append(f"   - ✅ Solución con hint '{hint}': {solucion_latex}")
-                        return {'solucion': solucion_latex, 'steps': steps}
+                        return {'solucion': solucion_latex, 'steps': steps, 'metodo': f'hint:{hint}',
+                                **symbolic_fields(ecuacion, sol_hint, ics_verificar)}
                 except:
+                    hint_order.record(contexto, hint, time.perf_counter() - inicio, False)
                     continue
         except Exception as e:
             steps.append(f"   - ❌ Error en clasificación: {e}")
@@ -265,7 +324,21 @@ def solve_riccati(P_str: str, Q_str: str, R_str: str, x0_str: str = None, y0_str
         </div>
         """
         
-        return {'solucion': partial_solution, 'steps': steps}
+        # Solución aproximada en serie de potencias alrededor de x₀
+        spec = series_fallback(
+            lambda x0: riccati_spec(p_expr, q_expr, r_expr, x0, y0_expr if is_ivp else None),
+            x0_expr if is_ivp else None,
+        )
+        if spec is not None:
+            serie = series_result(spec, budget=SERIES_BUDGET)
+            solucion_serie = format_latex(series_equation(y, spec, serie['orden']))
+            steps.append(rf"   - Solución en serie alrededor de \( x_0 = {serie['x0']} \) (recurrencia de coeficientes): {solucion_serie}")
+            if serie['radio'] is not None:
+                steps.append(rf"   - Radio de convergencia estimado: \( \approx {serie['radio']:.4g} \)")
+            return {'solucion': solucion_serie + partial_solution, 'steps': steps, 'metodo': 'serie',
+                    'serie': serie}
+
+        return {'solucion': partial_solution, 'steps': steps, 'metodo': 'analisis'}
         
     except Exception as e:
         return {'error': f"Error general: {e}", 'steps': steps}
\ No newline at end of file
@@ -1,6 +1,37 @@
-from sympy import Eq, dsolve, symbols, latex, Function, simplify, solve
+from sympy import Eq, Order, dsolve, symbols, Function, simplify, solve
 # Importamos nuestros símbolos y funciones comunes
-from .base_solver import x, parse_safe, format_latex
+from .base_solver import x, parse_safe, format_latex, symbolic_fields, latex
+from .general_solutions import apply_initial_conditions, constants_step, general_solution, solve_ivp
+from .series_engine import SERIES_BUDGET, linear_second_order_spec, series_equation, series_fallback, series_result
+from .undetermined_coefficients import solve_undetermined
+
+def _is_closed_form(solucion) -> bool:
+    """False si no hay solución o si SymPy solo devolvió una serie truncada (con O(...))."""
+    if solucion is None:
+        return False
+    soluciones = solucion if isinstance(solucion, list) else [solucion]
+    return not any(sol.has(Order) for sol in soluciones)
+
+
+def _series_solution(a_expr, b_expr, c_expr, g_expr, y_func, steps, paso, ivp=None):
+    """
+    Respaldo sin forma cerrada: serie de potencias por recurrencia alrededor
+    de x₀ ('ivp' es (x₀, y₀, y'₀) o None). Devuelve el resultado o None.
+    """
+    x0_expr, y0_expr, y_prime_0_expr = ivp if ivp else (None, None, None)
+    spec = series_fallback(
+        lambda x0: linear_second_order_spec(a_expr, b_expr, c_expr, g_expr, x0, y0_expr, y_prime_0_expr),
+        x0_expr,
+    )
+    if spec is None:
+        return None
+    serie = series_result(spec, budget=SERIES_BUDGET)
+    solucion_latex = format_latex(series_equation(y_func, spec, serie['orden']))
+    steps.append(rf"{paso}. No se encontró forma cerrada; solución en serie alrededor de \( x_0 = {serie['x0']} \) (recurrencia de coeficientes): {solucion_latex}")
+    if serie['radio'] is not None:
+        steps.append(rf"   - Radio de convergencia estimado: \( \approx {serie['radio']:.4g} \)")
+    return {'solucion': solucion_latex, 'steps': steps, 'metodo': 'serie', 'serie': serie}
+
 
 def solve_second_order_homogeneous(a_str: str, b_str: str, c_str: str, 
                                     x0_str: str = None, y0_str: str = None, y_prime_0_str: str = None) -> dict:
@@ -83,21 +114,37 @@ def solve_second_order_homogeneous(a_str: str, b_str: str, c_str: str,
                 steps.append(r"4. **Raíces complejas conjugadas**: La solución general es \( y = e^{\alpha x}(C_1 \cos(\beta x) + C_2 \sin(\beta x)) \)")
                 steps.append(rf"   - Con \( \alpha = {latex(alpha)} \) y \( \beta = {latex(beta)} \)")
 
-        # 6. Resolver con SymPy
+        # 6. Resolver con SymPy (serie de potencias si no hay forma cerrada)
         if is_ivp:
             ics = {
                 y_func.subs(x, x0_expr): y0_expr,
                 y_func.diff(x).subs(x, x0_expr): y_prime_0_expr
             }
-            solucion = dsolve(ecuacion, y_func, ics=ics)
+        try:
+            if is_ivp:
+                solucion, constantes = solve_ivp(ecuacion, y_func, ics)
+            else:
+                solucion = general_solution(ecuacion, y_func)
+        except NotImplementedError:
+            solucion = None
+        if not _is_closed_form(solucion):
+            respaldo = _series_solution(a_expr, b_expr, c_expr, 0, y_func, steps, 5,
+                                        (x0_expr, y0_expr, y_prime_0_expr) if is_ivp else None)
+            if respaldo is not None:
+                return respaldo
+        if solucion is None:
+            raise NotImplementedError("SymPy no encontró solución y no se pudo desarrollar en serie.")
+        if is_ivp:
+            if constantes:
+                steps.append(constants_step(constantes))
             steps.append(f"5. La solución con IVP es: {format_latex(solucion)}")
         else:
-            solucion = dsolve(ecuacion, y_func)
             steps.append(f"5. La solución general es: {format_latex(solucion)}")
-            
+
         solucion_latex = format_latex(solucion)
 
-        return {'solucion': solucion_latex, 'steps': steps}
+        return {'solucion': solucion_latex, 'steps': steps, 'metodo': 'ecuacion_caracteristica',
+                **symbolic_fields(ecuacion, solucion, ics if is_ivp else None)}
 
     except Exception as e:
         return {'error': f"Error al resolver la ecuación: {e}"}
@@ -166,21 +213,56 @@ def solve_second_order_nonhomogeneous(a_str: str, b_str: str, c_str: str, g_str:
         steps.append("   - Luego se encuentra una solución particular")
         steps.append("   - La solución general es: y = y_h + y_p")
 
-        # 4. Resolver con SymPy
         if is_ivp:
             ics = {
                 y_func.subs(x, x0_expr): y0_expr,
                 y_func.diff(x).subs(x, x0_expr): y_prime_0_expr
             }
-            solucion = dsolve(ecuacion, y_func, ics=ics)
-            steps.append(f"3. La solución con IVP encontrada por SymPy es: {format_latex(solucion)}")
-        else:
-            solucion = dsolve(ecuacion, y_func)
-            steps.append(f"3. La solución general encontrada por SymPy es: {format_latex(solucion)}")
-            
+
+        # 4. Coeficientes indeterminados (si g(x) tiene la forma adecuada)
+        metodo = solve_undetermined(a_expr, b_expr, c_expr, g_expr, y_func)
+        solucion = None
+        metodo_id = 'coeficientes_indeterminados'
+        if metodo is not None:
+            steps.append("3. **Coeficientes Indeterminados**:")
+            steps.extend(metodo['steps'])
+            solucion = metodo['general']
+            if is_ivp:
+                solucion, constantes = apply_initial_conditions(solucion, y_func, ics, ecuacion)
+                if solucion is not None:
+                    steps.append(constants_step(constantes, reused=False))
+                    steps.append(f"4. La solución con IVP es: {format_latex(solucion)}")
+            else:
+                steps.append(f"4. La solución general es: {format_latex(solucion)}")
+
+        # 5. Resolver con SymPy si el método no se pudo aplicar (serie como respaldo)
+        if solucion is None:
+            metodo_id = 'dsolve'
+            try:
+                if is_ivp:
+                    solucion, constantes = solve_ivp(ecuacion, y_func, ics)
+                else:
+                    solucion = general_solution(ecuacion, y_func)
+            except NotImplementedError:
+                solucion = None
+            if not _is_closed_form(solucion):
+                respaldo = _series_solution(a_expr, b_expr, c_expr, g_expr, y_func, steps, 3,
+                                            (x0_expr, y0_expr, y_prime_0_expr) if is_ivp else None)
+                if respaldo is not None:
+                    return respaldo
+            if solucion is None:
+                raise NotImplementedError("SymPy no encontró solución y no se pudo desarrollar en serie.")
+            if is_ivp:
+                if constantes:
+                    steps.append(constants_step(constantes))
+                steps.append(f"3. La solución con IVP encontrada por SymPy es: {format_latex(solucion)}")
+            else:
+                steps.append(f"3. La solución general encontrada por SymPy es: {format_latex(solucion)}")
+
         solucion_latex = format_latex(solucion)
 
-        return {'solucion': solucion_latex, 'steps': steps}
+        return {'solucion': solucion_latex, 'steps': steps, 'metodo': metodo_id,
+                **symbolic_fields(ecuacion, solucion, ics if is_ivp else None)}
 
     except Exception as e:
         return {'error': f"Error al resolver la ecuación: {e}"}
\ No newline at end of file
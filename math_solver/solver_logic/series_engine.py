@@ -0,0 +1,252 @@
+"""
+Soluciones en Serie de Potencias
+
+Cuando no hay forma cerrada, la solución se da como serie de Taylor alrededor
+de un punto ordinario x₀. Los coeficientes no se obtienen expandiendo
+simbólicamente la solución, sino con una recurrencia sobre los coeficientes
+de las funciones conocidas (P, Q, R o a, b, c, g):
+
+- Riccati  y' = P y² + Q y + R:
+      (n + 1) a_{n+1} = Σ p_i (a²)_{n-i} + Σ q_i a_{n-i} + r_n
+- Lineal de segundo orden  a y'' + b y' + c y = g:
+      Σ a_i (n-i+2)(n-i+1) a_{n-i+2} + Σ b_i (n-i+1) a_{n-i+1} + Σ c_i a_{n-i} = g_n
+
+Cada 'SeriesSolution' guarda los coeficientes ya calculados, así que pedir
+más orden solo calcula los términos nuevos. Las soluciones se cachean por
+ecuación (ver 'series_spec') y el cálculo admite un presupuesto de tiempo:
+si se agota, se devuelve el orden alcanzado.
+
+Sin condiciones iniciales los coeficientes quedan en función de C1 (y C2).
+"""
+
+import hashlib
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from sympy import Eq, O, Poly, Symbol, expand, factorial, nan, oo, srepr, sympify, zoo
+
+from .base_solver import x
+
+DEFAULT_ORDER = 8
+MAX_ORDER = 60
+# Tiempo máximo (segundos) que los solvers dedican a la serie de respaldo.
+SERIES_BUDGET = 2.0
+SERIES_CACHE_SIZE = 64
+
+RICCATI = 'riccati'
+LINEAR_SECOND_ORDER = 'lineal_2'
+
+
+class SeriesError(ValueError):
+    """No se puede desarrollar en serie (p. ej. x₀ es un punto singular)."""
+
+
+class _TaylorCoefficients:
+    """Coeficientes de Taylor de una función conocida en x₀, calculados bajo demanda."""
+
+    def __init__(self, expr, x0):
+        self.x0 = x0
+        self.values = []
+        shifted = expand(sympify(expr).subs(x, x + x0))
+        if shifted.is_polynomial(x):
+            self.values = list(reversed(Poly(shifted, x).all_coeffs()))
+            self.derivative = None
+        else:
+            self.derivative = sympify(expr)
+        self.polynomial = self.derivative is None
+
+    def __getitem__(self, n):
+        if self.polynomial:
+            return self.values[n] if n < len(self.values) else 0
+        while len(self.values) <= n:
+            k = len(self.values)
+            value = self.derivative.subs(x, self.x0) / factorial(k)
+            if value.has(oo, zoo, nan) or value.is_finite is False:
+                raise SeriesError(f'x₀ = {self.x0} es un punto singular de la ecuación.')
+            self.values.append(expand(value))
+            self.derivative = self.derivative.diff(x)
+        return self.values[n]
+
+
+class SeriesSolution:
+    """Serie de Taylor de la solución, extensible sin recalcular los términos previos."""
+
+    def __init__(self, kind, functions, x0, initial):
+        self.kind = kind
+        self.x0 = sympify(x0)
+        self.functions = [_TaylorCoefficients(f, self.x0) for f in functions]
+        self.coefficients = [sympify(value) for value in initial]
+        self._squares = []
+        self._lock = threading.Lock()
+        if kind == LINEAR_SECOND_ORDER and self.functions[0][0] == 0:
+            raise SeriesError(f'x₀ = {self.x0} es un punto singular: a(x₀) = 0.')
+
+    @property
+    def order(self) -> int:
+        """Mayor potencia de (x - x₀) calculada."""
+        return len(self.coefficients) - 1
+
+    def _next_riccati(self):
+        P, Q, R = self.functions
+        a, squares = self.coefficients, self._squares
+        n = len(a) - 1
+        # (a²)_m solo depende de a_0..a_m: se completa hasta m = n.
+        while len(squares) <= n:
+            m = len(squares)
+            squares.append(expand(sum(a[j] * a[m - j] for j in range(m + 1))))
+        total = sum(P[i] * squares[n - i] + Q[i] * a[n - i] for i in range(n + 1)) + R[n]
+        return expand(total / (n + 1))
+
+    def _next_linear(self):
+        A, B, C, G = self.functions
+        a = self.coefficients
+        n = len(a) - 2
+        total = G[n]
+        total -= sum(A[i] * (n - i + 2) * (n - i + 1) * a[n - i + 2] for i in range(1, n + 1))
+        total -= sum(B[i] * (n - i + 1) * a[n - i + 1] for i in range(n + 1))
+        total -= sum(C[i] * a[n - i] for i in range(n + 1))
+        return expand(total / (A[0] * (n + 2) * (n + 1)))
+
+    def extend(self, order: int, budget: float = None) -> int:
+        """
+        Calcula los coeficientes hasta (x - x₀)^order. Con 'budget' (segundos)
+        se detiene al agotarlo. Devuelve el orden alcanzado.
+        """
+        order = min(order, MAX_ORDER)
+        deadline = None if budget is None else time.perf_counter() + budget
+        step = self._next_riccati if self.kind == RICCATI else self._next_linear
+        with self._lock:
+            while self.order < order:
+                if deadline is not None and time.perf_counter() > deadline:
+                    break
+                self.coefficients.append(step())
+        return self.order
+
+    def polynomial(self, order: int = None):
+        order = self.order if order is None else min(order, self.order)
+        return sum(c * (x - self.x0)**n for n, c in enumerate(self.coefficients[:order + 1]))
+
+    def radius(self, order: int = None):
+        """
+        Estimación del radio de convergencia con el criterio del cociente sobre
+        los últimos coeficientes hasta 'order' (con C1 = C2 = 1 si quedan
+        constantes libres). None si no hay suficientes coeficientes no nulos.
+        """
+        order = self.order if order is None else min(order, self.order)
+        values = []
+        for n, c in enumerate(self.coefficients[:order + 1]):
+            c = c.subs({s: 1 for s in c.free_symbols})
+            try:
+                value = abs(complex(c))
+            except TypeError:
+                return None
+            if value > 0:
+                values.append((n, value))
+        if len(values) < 3:
+            return None
+        tail = values[-6:]
+        estimates = []
+        for (n1, v1), (n2, v2) in zip(tail, tail[1:]):
+            estimates.append((v1 / v2) ** (1 / (n2 - n1)))
+        estimates.sort()
+        estimate = estimates[len(estimates) // 2]
+        return estimate if math.isfinite(estimate) else None
+
+
+def series_spec(kind, functions, x0, initial) -> dict:
+    """Descripción serializable (JSON) de la ecuación y sus valores iniciales."""
+    return {
+        'tipo': kind,
+        'funciones': [srepr(sympify(f)) for f in functions],
+        'x0': srepr(sympify(x0)),
+        'iniciales': [srepr(sympify(v)) for v in initial],
+    }
+
+
+def series_id(spec: dict) -> str:
+    payload = json.dumps(spec, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def from_spec(spec: dict) -> SeriesSolution:
+    """SeriesSolution de una especificación, compartida mientras siga en la caché LRU."""
+    key = series_id(spec)
+    with _cache_lock:
+        solution = _cache.get(key)
+        if solution is not None:
+            _cache.move_to_end(key)
+            return solution
+    solution = SeriesSolution(
+        spec['tipo'], [sympify(f) for f in spec['funciones']], sympify(spec['x0']),
+        [sympify(v) for v in spec['iniciales']],
+    )
+    with _cache_lock:
+        solution = _cache.setdefault(key, solution)
+        while len(_cache) > SERIES_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return solution
+
+
+def cache_clear():
+    with _cache_lock:
+        _cache.clear()
+
+
+def riccati_spec(P, Q, R, x0=0, y0=None) -> dict:
+    return series_spec(RICCATI, [P, Q, R], x0, [Symbol('C1') if y0 is None else y0])
+
+
+def linear_second_order_spec(a, b, c, g, x0=0, y0=None, y_prime_0=None) -> dict:
+    initial = [Symbol('C1') if y0 is None else y0, Symbol('C2') if y_prime_0 is None else y_prime_0]
+    return series_spec(LINEAR_SECOND_ORDER, [a, b, c, g], x0, initial)
+
+
+def series_fallback(build_spec, x0=None, alternatives=(0, 1)):
+    """
+    Especificación de la primera serie desarrollable: en el x₀ dado (IVP) o,
+    sin él, en el primer punto ordinario de 'alternatives'. None si no hay.
+    """
+    for point in ([x0] if x0 is not None else alternatives):
+        spec = build_spec(point)
+        try:
+            # Los primeros coeficientes ya detectan un punto singular.
+            from_spec(spec).extend(1)
+        except SeriesError:
+            continue
+        return spec
+    return None
+
+
+def series_result(spec: dict, order: int = DEFAULT_ORDER, budget: float = None) -> dict:
+    """
+    Desarrolla la serie hasta 'order' (o hasta agotar 'budget') y devuelve un
+    diccionario serializable: 'x0', 'orden', 'coeficientes' (texto SymPy),
+    'radio' (estimado o None), 'serie_id' y 'serie_spec'.
+    """
+    solution = from_spec(spec)
+    start = time.perf_counter()
+    # La serie compartida puede estar ya desarrollada más allá de 'order'.
+    reached = min(order, solution.extend(order, budget))
+    return {
+        'x0': str(solution.x0),
+        'orden': reached,
+        'coeficientes': [str(c) for c in solution.coefficients[:reached + 1]],
+        'radio': solution.radius(reached),
+        'tiempo_ms': round((time.perf_counter() - start) * 1000, 3),
+        'serie_id': series_id(spec),
+        'serie_spec': spec,
+    }
+
+
+def series_equation(func, spec: dict, order: int):
+    """Eq y(x) = Σ a_n (x - x₀)^n + O((x - x₀)^{order+1}) para mostrar en los pasos."""
+    solution = from_spec(spec)
+    x0 = solution.x0
+    return Eq(func, solution.polynomial(order) + O((x - x0)**(order + 1), (x, x0)))
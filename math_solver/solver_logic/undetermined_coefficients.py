@@ -0,0 +1,212 @@
+"""
+Método de Coeficientes Indeterminados
+
+Resuelve a y'' + b y' + c y = g(x) con coeficientes constantes cuando g(x)
+es una suma de términos  polinomio · e^{αx} · cos(βx) / sin(βx):
+
+1. Se obtienen las raíces de la ecuación característica y la solución
+   homogénea y_h.
+2. Los términos de g se agrupan por (α, β). Para cada grupo se propone
+   x^s e^{αx} [P(x) cos(βx) + Q(x) sin(βx)], con P y Q polinomios del grado
+   máximo del grupo y s la multiplicidad de α + iβ como raíz característica
+   (regla de resonancia).
+3. Se sustituye y_p en la EDO y se igualan coeficientes: queda un sistema
+   lineal pequeño para los coeficientes de P y Q.
+
+Si g(x) no tiene esa forma (o los coeficientes no son numéricos) se devuelve
+None y el solver recurre a 'dsolve'.
+"""
+
+from sympy import (
+    Add, Eq, I, Mul, Poly, S, Symbol, cos, exp, expand, im, linsolve, re, roots, sin, symbols,
+)
+
+from .base_solver import latex
+
+_TRIG = (sin, cos)
+
+
+def _linear_coefficient(arg, var):
+    """(k, constante) si arg = k·var + constante con k real numérico, o (None, None)."""
+    poly = Poly(arg, var) if arg.is_polynomial(var) else None
+    if poly is None or poly.degree() > 1:
+        return None, None
+    k = poly.coeff_monomial(var)
+    if not (k.is_number and k.is_real):
+        return None, None
+    return k, poly.coeff_monomial(1)
+
+
+def _classify_term(term, var):
+    """
+    Descompone un término en coef · x^k · e^{αx} · trig(βx). Devuelve
+    (coef, k, α, β, trig) con trig en {None, sin, cos}, o None si no encaja.
+    """
+    coefficient, degree, alpha, beta, trig = S.One, 0, S.Zero, S.Zero, None
+    for factor in Mul.make_args(term):
+        if not factor.has(var):
+            coefficient *= factor
+        elif factor == var:
+            degree += 1
+        elif factor.is_Pow and factor.base == var and factor.exp.is_Integer and factor.exp > 0:
+            degree += int(factor.exp)
+        elif isinstance(factor, exp):
+            k, offset = _linear_coefficient(factor.args[0], var)
+            if k is None:
+                return None
+            alpha += k
+            coefficient *= exp(offset)
+        elif isinstance(factor, _TRIG) and trig is None:
+            k, offset = _linear_coefficient(factor.args[0], var)
+            if k is None or offset != 0:
+                return None
+            # sin(-βx) = -sin(βx), cos(-βx) = cos(βx): β se deja positivo.
+            if k < 0:
+                k = -k
+                if factor.func is sin:
+                    coefficient = -coefficient
+            beta, trig = k, factor.func
+        else:
+            return None
+    return coefficient, degree, alpha, beta, trig
+
+
+def forcing_groups(g, var):
+    """
+    Agrupa los términos de g(x) por (α, β) con el grado polinómico máximo de
+    cada grupo. Devuelve {(α, β): grado} o None si g no tiene la forma del método.
+    """
+    groups = {}
+    for term in Add.make_args(expand(g)):
+        if term == 0:
+            continue
+        parts = _classify_term(term, var)
+        if parts is None:
+            return None
+        _, degree, alpha, beta, _ = parts
+        key = (alpha, beta)
+        groups[key] = max(groups.get(key, 0), degree)
+    return groups
+
+
+def characteristic_roots(a, b, c):
+    """Raíces (con multiplicidad) de a r² + b r + c, o None si los coeficientes no son numéricos."""
+    if not all(coef.is_number and coef.is_real for coef in (a, b, c)):
+        return None
+    r = Symbol('r')
+    found = roots(Poly(a * r**2 + b * r + c, r))
+    if sum(found.values()) != 2:
+        return None
+    return found
+
+
+def homogeneous_solution(found_roots, var):
+    """Solución homogénea con constantes C1, C2 a partir de las raíces características."""
+    C1, C2 = symbols('C1 C2')
+    items = list(found_roots.items())
+    if len(items) == 1:
+        root = items[0][0]
+        return (C1 + C2 * var) * exp(root * var)
+    r1, r2 = items[0][0], items[1][0]
+    if im(r1) != 0:
+        alpha, beta = re(r1), abs(im(r1))
+        return exp(alpha * var) * (C1 * cos(beta * var) + C2 * sin(beta * var))
+    return C1 * exp(r1 * var) + C2 * exp(r2 * var)
+
+
+def _multiplicity(found_roots, alpha, beta):
+    target = alpha + I * beta
+    return next((m for root, m in found_roots.items() if expand(root - target) == 0), 0)
+
+
+def _trial_solution(alpha, beta, degree, s, var, start):
+    """Forma propuesta para un grupo y sus coeficientes desconocidos (A_start, A_start+1, ...)."""
+    indices = range(start, start + degree + 1)
+    A = [Symbol(f'A{i}') for i in indices]
+    polynomial_a = sum(A[k] * var**k for k in range(degree + 1))
+    unknowns = list(A)
+    if beta == 0:
+        body = polynomial_a
+    else:
+        B = [Symbol(f'B{i}') for i in indices]
+        polynomial_b = sum(B[k] * var**k for k in range(degree + 1))
+        unknowns += B
+        body = polynomial_a * cos(beta * var) + polynomial_b * sin(beta * var)
+    return var**s * exp(alpha * var) * body, unknowns
+
+
+def _basis_label(alpha, beta, var):
+    parts = []
+    if alpha != 0:
+        parts.append(f'e^{{{latex(alpha * var)}}}')
+    if beta != 0:
+        parts.append(rf'\cos({latex(beta * var)}), \sin({latex(beta * var)})')
+    return r' \cdot '.join(parts) if parts else None
+
+
+def solve_undetermined(a, b, c, g, func):
+    """
+    Resuelve a y'' + b y' + c y = g(x) por coeficientes indeterminados.
+
+    Devuelve {'homogenea', 'particular', 'general', 'steps'} ('general' es la
+    Eq y(x) = y_h + y_p) o None si el método no se puede aplicar.
+    """
+    var = func.args[0]
+    found_roots = characteristic_roots(a, b, c)
+    if found_roots is None:
+        return None
+    groups = forcing_groups(g, var)
+    if groups is None:
+        return None
+
+    steps = []
+    r = Symbol('r')
+    roots_text = ', '.join(
+        rf"\( r = {latex(root)} \)" + (f' (multiplicidad {m})' if m > 1 else '') for root, m in found_roots.items()
+    )
+    steps.append(rf"   - Ecuación característica: \( {latex(a * r**2 + b * r + c)} = 0 \), con raíces {roots_text}")
+    y_h = homogeneous_solution(found_roots, var)
+    steps.append(rf"   - Solución homogénea: \( y_h = {latex(y_h)} \)")
+
+    y_p_trial, unknowns, start = 0, [], 0
+    for (alpha, beta), degree in sorted(groups.items(), key=str):
+        s = _multiplicity(found_roots, alpha, beta)
+        trial, group_unknowns = _trial_solution(alpha, beta, degree, s, var, start)
+        start += degree + 1
+        y_p_trial += trial
+        unknowns += group_unknowns
+        label = _basis_label(alpha, beta, var)
+        terms = rf"los términos en \( {label} \)" if label else "los términos polinómicos"
+        step = rf"   - Para {terms} (grado {degree}) se propone \( {latex(trial)} \)"
+        if s:
+            step += rf"; como \( {latex(alpha + I * beta)} \) es raíz característica de multiplicidad {s}, se multiplica por \( {latex(var**s)} \)"
+        steps.append(step)
+
+    if unknowns:
+        residual = expand(a * y_p_trial.diff(var, 2) + b * y_p_trial.diff(var) + c * y_p_trial - g)
+        # Cada e^{αx}, cos(βx) y sin(βx) se cambia por un símbolo para que Poly
+        # no relacione e^{2x} con (e^{x})²: son funciones independientes.
+        basis = sorted({atom for atom in residual.atoms(exp, sin, cos) if atom.has(var)}, key=str)
+        placeholders = symbols(f'_u0:{len(basis)}')
+        residual = residual.xreplace(dict(zip(basis, placeholders)))
+        equations = Poly(residual, var, *placeholders).coeffs()
+        solutions = linsolve(equations, unknowns)
+        if not solutions:
+            return None
+        values = dict(zip(unknowns, next(iter(solutions))))
+        if any(value.free_symbols & set(unknowns) for value in values.values()):
+            return None
+        steps.append(rf"   - Al sustituir en la ecuación e igualar coeficientes se obtiene un sistema lineal de {len(unknowns)} incógnitas")
+        system = r',\ '.join(f'{latex(k)} = {latex(v)}' for k, v in values.items())
+        steps.append(rf"   - Solución del sistema: \( {system} \)")
+        y_p = expand(y_p_trial.subs(values))
+    else:
+        y_p = 0
+    steps.append(rf"   - Solución particular: \( y_p = {latex(y_p)} \)")
+
+    return {
+        'homogenea': y_h,
+        'particular': y_p,
+        'general': Eq(func, y_h + y_p),
+        'steps': steps,
+    }
@@ -0,0 +1,158 @@
+"""
+Verificación Numérica de Soluciones
+
+Comprobar una solución con 'checkodesol' suele costar más que resolverla.
+Aquí se hace numéricamente: se sustituye la solución en la EDO, se compila
+el residuo 'LHS - RHS' con lambdify (NumPy) y se evalúa vectorizado en
+puntos aleatorios, con valores aleatorios para las constantes C1, C2, ...
+Si se dio un IVP, también se comprueban las condiciones iniciales.
+
+El residuo se mide de forma relativa, |LHS - RHS| / (1 + max(|LHS|, |RHS|)),
+para que las soluciones con valores grandes no den falsos negativos. Los
+puntos donde la solución no es finita (polos, ramas) se descartan.
+"""
+
+import time
+
+import numpy as np
+from sympy import Eq, Subs, lambdify, sympify
+from sympy.core.function import AppliedUndef
+
+from .base_solver import x
+
+DEFAULT_SAMPLES = 32
+DEFAULT_TOLERANCE = 1e-6
+# Intervalo de muestreo de x: evita x = 0 y x < 0, donde muchas soluciones
+# (Cauchy-Euler, logaritmos, raíces) no están definidas en los reales.
+X_RANGE = (0.25, 2.5)
+CONSTANT_RANGE = (-2.0, 2.0)
+
+_EVAL_ERRORS = (NameError, TypeError, ValueError, AttributeError, ZeroDivisionError, OverflowError)
+
+
+def _evaluate(expr, args, columns):
+    """
+    Evalúa 'expr' en los puntos dados (una columna por argumento) como números
+    complejos. Usa NumPy vectorizado y, si la expresión tiene funciones que
+    NumPy no conoce (Bessel, Airy, integrales sin evaluar), recurre a mpmath
+    punto a punto.
+    """
+    try:
+        with np.errstate(all='ignore'):
+            values = lambdify(args, expr, modules='numpy')(*columns)
+        return np.broadcast_to(np.asarray(values, dtype=complex), columns[0].shape)
+    except _EVAL_ERRORS:
+        pass
+    function = lambdify(args, expr, modules='mpmath')
+    values = np.empty(columns[0].shape, dtype=complex)
+    for i in range(len(values)):
+        try:
+            values[i] = complex(function(*(complex(column[i]) for column in columns)))
+        except _EVAL_ERRORS:
+            values[i] = np.nan
+    return values
+
+
+def _explicit_solutions(solution, func):
+    """Lista de expresiones y(x) = ... de la solución, o None si alguna es implícita."""
+    solutions = solution if isinstance(solution, (list, tuple)) else [solution]
+    explicit = []
+    for sol in solutions:
+        if not isinstance(sol, Eq) or sol.lhs != func or sol.rhs.has(func):
+            return None
+        explicit.append(sol.rhs)
+    return explicit
+
+
+def _residual(ode, func, rhs, rng, samples):
+    """Residuo relativo máximo de una solución explícita sobre puntos aleatorios."""
+    lhs = ode.lhs.subs(func, rhs).doit()
+    rhs_side = ode.rhs.subs(func, rhs).doit()
+    params = sorted((lhs.free_symbols | rhs_side.free_symbols) - {x}, key=str)
+    args = [x] + params
+    columns = [rng.uniform(*X_RANGE, samples)] + [rng.uniform(*CONSTANT_RANGE, samples) for _ in params]
+    left = _evaluate(lhs, args, columns)
+    right = _evaluate(rhs_side, args, columns)
+    with np.errstate(all='ignore'):
+        residual = np.abs(left - right) / (1 + np.maximum(np.abs(left), np.abs(right)))
+    finite = residual[np.isfinite(residual)]
+    return (float(finite.max()) if finite.size else None), int(finite.size)
+
+
+def _ic_residual(ics, func, rhs):
+    """Error relativo máximo de la solución en las condiciones iniciales."""
+    worst = 0.0
+    for key, target in ics.items():
+        if isinstance(key, Subs):
+            # y'(x0) llega como Subs(Derivative(y(x), x), x, x0)
+            expr, variables, point = key.args
+            value = expr.subs(func, rhs).doit().subs(variables[0], point[0])
+        else:
+            value = rhs.subs(x, key.args[0])
+        try:
+            error = abs(complex((value - target).evalf()))
+        except TypeError:
+            return None
+        worst = max(worst, error / (1 + abs(complex(sympify(target).evalf()))))
+    return worst
+
+
+def verify_solution(ode, solution, ics=None, func=None, samples: int = DEFAULT_SAMPLES,
+                    tolerance: float = DEFAULT_TOLERANCE, seed: int = 0) -> dict:
+    """
+    Verifica numéricamente que 'solution' (Eq o lista de Eq) satisface 'ode'.
+
+    Devuelve un diccionario con:
+    - 'ok': True/False, o None si no se pudo verificar ('motivo' explica por qué),
+    - 'residuo_max': residuo relativo máximo sobre la EDO,
+    - 'residuo_ci': error relativo máximo en las condiciones iniciales (IVP),
+    - 'puntos': puntos válidos evaluados,
+    - 'tiempo_ms': lo que tardó la verificación.
+    """
+    start = time.perf_counter()
+    func = func if func is not None else next(iter(ode.atoms(AppliedUndef)))
+    report = {'ok': None, 'residuo_max': None, 'residuo_ci': None, 'puntos': 0}
+
+    explicit = _explicit_solutions(solution, func)
+    if explicit is None:
+        report['motivo'] = 'La solución es implícita.'
+    else:
+        rng = np.random.default_rng(seed)
+        residuals, points = [], 0
+        for rhs in explicit:
+            residual, valid = _residual(ode, func, rhs, rng, samples)
+            points += valid
+            if residual is not None:
+                residuals.append(residual)
+        report['puntos'] = points
+        if not residuals:
+            report['motivo'] = 'La solución no es finita en los puntos de muestreo.'
+        else:
+            report['residuo_max'] = max(residuals)
+            ok = report['residuo_max'] <= tolerance
+            if ics:
+                ic_errors = [_ic_residual(ics, func, rhs) for rhs in explicit]
+                if None not in ic_errors:
+                    # Basta con que una de las ramas cumpla las condiciones iniciales.
+                    report['residuo_ci'] = min(ic_errors)
+                    ok = ok and report['residuo_ci'] <= tolerance
+            report['ok'] = ok
+
+    report['tiempo_ms'] = round((time.perf_counter() - start) * 1000, 3)
+    return report
+
+
+def verify_result(result: dict, **options) -> dict:
+    """
+    Verifica el resultado de un solver a partir de sus campos 'srepr' (ver
+    'base_solver.symbolic_fields'). Devuelve el informe de 'verify_solution'.
+    """
+    if 'error' in result or not result.get('solucion_srepr'):
+        return {'ok': None, 'motivo': 'El resultado no incluye una solución verificable.', 'tiempo_ms': 0.0}
+    start = time.perf_counter()
+    ode = sympify(result['ecuacion_srepr'])
+    solution = sympify(result['solucion_srepr'])
+    ics = sympify(result['ics_srepr']) if result.get('ics_srepr') else None
+    report = verify_solution(ode, solution, ics=ics, **options)
+    report['tiempo_ms'] = round((time.perf_counter() - start) * 1000, 3)
+    return report
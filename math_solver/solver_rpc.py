@@ -0,0 +1,377 @@
+"""
+Trabajadores Remotos de Solvers
+
+Para repartir los solves entre varias máquinas sin montar el servidor web en
+cada una, 'python manage.py solver_worker' arranca un proceso que sirve el
+registro de solvers por un socket TCP ('host:puerto') o Unix ('unix:/ruta').
+
+Protocolo: cada mensaje es un objeto JSON precedido de su longitud (4 bytes,
+big-endian). Una conexión admite varias peticiones seguidas:
+
+    {"op": "ping"}
+        -> {"ok": true, "load": 0, "pid": 1234, "solvers": [...]}
+    {"op": "solve", "solver_type": "riccati", "data": {...}, "render": "latex"}
+        -> {"ok": true, "load": 1, "cpu_s": 0.42, "result": {...}}
+    (error del trabajador) -> {"ok": false, "error": "..."}
+
+'load' son los solves en curso o en espera en ese trabajador y 'cpu_s' el
+tiempo de CPU del solve (para cobrarlo al cliente, ver 'fair_share'). Cada
+proceso resuelve 'concurrency' solves a la vez (SymPy no libera el GIL, así
+que lo normal es 1 y varios procesos por máquina).
+
+En el servidor web, 'WorkerPool' mantiene conexiones reutilizables con cada
+trabajador, envía cada solve al menos cargado, marca como caídos los que no
+responden (se vuelven a comprobar con un 'ping' pasado 'health_interval') y
+reintenta en otro trabajador si el elegido muere a mitad del solve. Los
+solves son funciones puras de la entrada, así que repetirlos es seguro.
+"""
+
+import json
+import os
+import select
+import socket
+import socketserver
+import struct
+import threading
+import time
+
+from .solver_logic.registry import SOLVERS, run_solver
+
+_HEADER = struct.Struct('>I')
+MAX_FRAME = 16 * 1024 * 1024
+
+
+class ProtocolError(Exception):
+    """Mensaje mal formado o demasiado grande."""
+
+
+class RemoteSolverError(Exception):
+    """El trabajador respondió con un error ('ok': false)."""
+
+
+class NoWorkersAvailable(Exception):
+    """Ningún trabajador sano pudo atender la petición."""
+
+
+def parse_address(address: str):
+    """('unix', ruta) para 'unix:/ruta' o ('tcp', (host, puerto)) para 'host:puerto'."""
+    if address.startswith('unix:'):
+        return 'unix', address[len('unix:'):]
+    host, _, port = address.rpartition(':')
+    if not host or not port.isdigit():
+        raise ValueError(f'Dirección de trabajador no válida: "{address}"')
+    return 'tcp', (host, int(port))
+
+
+def format_address(kind: str, location) -> str:
+    return f'unix:{location}' if kind == 'unix' else f'{location[0]}:{location[1]}'
+
+
+def _read_exact(stream, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) < size:
+        raise EOFError('Conexión cerrada')
+    return data
+
+
+def read_frame(stream) -> dict:
+    (size,) = _HEADER.unpack(_read_exact(stream, _HEADER.size))
+    if size > MAX_FRAME:
+        raise ProtocolError(f'Mensaje demasiado grande ({size} bytes)')
+    try:
+        return json.loads(_read_exact(stream, size).decode('utf-8'))
+    except ValueError as e:
+        raise ProtocolError(f'Mensaje no válido: {e}')
+
+
+def write_frame(stream, message: dict):
+    body = json.dumps(message, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if len(body) > MAX_FRAME:
+        raise ProtocolError(f'Mensaje demasiado grande ({len(body)} bytes)')
+    stream.write(_HEADER.pack(len(body)) + body)
+    stream.flush()
+
+
+# --- Servidor ---
+
+class SolverWorker:
+    """Atiende las peticiones del protocolo con como mucho 'concurrency' solves a la vez."""
+
+    def __init__(self, concurrency: int = 1):
+        self._slots = threading.Semaphore(concurrency)
+        self._lock = threading.Lock()
+        self.load = 0
+        self.served = 0
+
+    def handle(self, request: dict) -> dict:
+        op = request.get('op')
+        if op == 'ping':
+            return {'ok': True, 'load': self.load, 'served': self.served, 'pid': os.getpid(),
+                    'solvers': sorted(SOLVERS)}
+        if op == 'solve':
+            return self._solve(request)
+        return {'ok': False, 'error': f'Operación desconocida: "{op}"'}
+
+    def _solve(self, request: dict) -> dict:
+        with self._lock:
+            self.load += 1
+        try:
+            with self._slots:
+                cpu_start = time.thread_time()
+                result = run_solver(request.get('solver_type'), request.get('data') or {},
+                                    render=request.get('render', 'latex'))
+                cpu_s = time.thread_time() - cpu_start
+            return {'ok': True, 'load': self.load - 1, 'cpu_s': round(cpu_s, 6), 'result': result}
+        except Exception as e:
+            return {'ok': False, 'error': f'{type(e).__name__}: {e}'}
+        finally:
+            with self._lock:
+                self.load -= 1
+                self.served += 1
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            try:
+                request = read_frame(self.rfile)
+            except (EOFError, ConnectionError):
+                return
+            except ProtocolError as e:
+                write_frame(self.wfile, {'ok': False, 'error': str(e)})
+                return
+            write_frame(self.wfile, self.server.worker.handle(request))
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, 'ThreadingUnixStreamServer'):
+    class _UnixServer(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+else:  # Windows
+    _UnixServer = None
+
+
+def make_server(address: str, concurrency: int = 1):
+    """Crea el servidor del trabajador (sin arrancarlo). 'host:0' elige un puerto libre."""
+    kind, location = parse_address(address)
+    if kind == 'unix':
+        if _UnixServer is None:
+            raise ValueError('Los sockets Unix no están disponibles en este sistema.')
+        if os.path.exists(location):
+            os.unlink(location)
+        server = _UnixServer(location, _Handler)
+    else:
+        server = _TCPServer(location, _Handler)
+    server.worker = SolverWorker(concurrency)
+    server.address = format_address(kind, server.server_address)
+    return server
+
+
+# --- Cliente ---
+
+class _RemoteWorker:
+    """Estado de un trabajador visto desde el cliente, con sus conexiones libres."""
+
+    def __init__(self, address: str):
+        self.address = address
+        self.idle = []
+        self.in_flight = 0
+        self.load = 0
+        self.healthy = True
+        self.checked = 0.0
+
+
+class WorkerPool:
+    """
+    Cliente de varios trabajadores con conexiones reutilizables, reparto al
+    menos cargado, comprobación de salud y reintento si un trabajador muere.
+    """
+
+    def __init__(self, addresses, timeout: float = 120.0, connect_timeout: float = 2.0,
+                 retries: int = 2, health_interval: float = 5.0, max_idle: int = 4):
+        if not addresses:
+            raise ValueError('Hace falta al menos un trabajador.')
+        self.workers = [_RemoteWorker(address) for address in addresses]
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.retries = retries
+        self.health_interval = health_interval
+        self.max_idle = max_idle
+        self._lock = threading.Lock()
+
+    def _connect(self, worker):
+        kind, location = parse_address(worker.address)
+        family = socket.AF_UNIX if kind == 'unix' else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(self.connect_timeout)
+            sock.connect(location)
+            sock.settimeout(self.timeout)
+            if kind == 'tcp':
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except BaseException:
+            sock.close()
+            raise
+        return sock, sock.makefile('rwb')
+
+    def _exchange(self, worker, message: dict) -> dict:
+        with self._lock:
+            connection = worker.idle.pop() if worker.idle else None
+        if connection is not None and self._is_closed(connection):
+            # Conexión guardada que el trabajador ya cerró (p. ej. se reinició).
+            self._close(connection)
+            connection = None
+        if connection is not None:
+            try:
+                self._write(connection, message)
+            except ConnectionError:
+                # Se cerró antes de que la petición llegara al trabajador, así
+                # que se puede enviar por otra. Un 'socket.timeout' o un error
+                # tras escribir la petición no se repiten aquí.
+                connection = None
+        if connection is None:
+            connection = self._connect(worker)
+            self._write(connection, message)
+        return self._read(worker, connection)
+
+    @staticmethod
+    def _is_closed(connection) -> bool:
+        # Una conexión libre no tiene nada pendiente de leer: si el socket está
+        # legible, el trabajador la cerró (EOF) o mandó algo inesperado.
+        try:
+            readable, _, _ = select.select([connection[0]], [], [], 0)
+        except (OSError, ValueError):
+            return True
+        return bool(readable)
+
+    def _write(self, connection, message: dict):
+        try:
+            write_frame(connection[1], message)
+        except BaseException:
+            self._close(connection)
+            raise
+
+    def _read(self, worker, connection) -> dict:
+        try:
+            response = read_frame(connection[1])
+        except BaseException:
+            self._close(connection)
+            raise
+        with self._lock:
+            if len(worker.idle) < self.max_idle:
+                worker.idle.append(connection)
+                connection = None
+        if connection is not None:
+            self._close(connection)
+        return response
+
+    @staticmethod
+    def _close(connection):
+        for resource in reversed(connection):
+            try:
+                resource.close()
+            except OSError:
+                pass
+
+    def _mark_down(self, worker):
+        with self._lock:
+            worker.healthy = False
+            worker.checked = time.monotonic()
+            idle, worker.idle = worker.idle, []
+        for connection in idle:
+            self._close(connection)
+
+    def ping(self, worker) -> bool:
+        """Comprueba un trabajador y actualiza su estado y su carga."""
+        try:
+            response = self._exchange(worker, {'op': 'ping'})
+        except (OSError, EOFError, ProtocolError):
+            self._mark_down(worker)
+            return False
+        with self._lock:
+            worker.healthy = bool(response.get('ok'))
+            worker.load = response.get('load', 0)
+            worker.checked = time.monotonic()
+        return worker.healthy
+
+    def check_health(self) -> dict:
+        """{dirección: sano} tras hacer 'ping' a todos los trabajadores."""
+        return {worker.address: self.ping(worker) for worker in self.workers}
+
+    def _pick(self, exclude):
+        now = time.monotonic()
+        for worker in self.workers:
+            # Los caídos se vuelven a probar pasado 'health_interval'.
+            if not worker.healthy and worker.address not in exclude and now - worker.checked >= self.health_interval:
+                self.ping(worker)
+        with self._lock:
+            candidates = [w for w in self.workers if w.healthy and w.address not in exclude]
+            if not candidates:
+                return None
+            worker = min(candidates, key=lambda w: (w.in_flight, w.load))
+            worker.in_flight += 1
+            return worker
+
+    def call(self, message: dict) -> dict:
+        """Envía 'message' al trabajador menos cargado, reintentando en otro si muere."""
+        tried = set()
+        for _attempt in range(self.retries + 1):
+            worker = self._pick(tried)
+            if worker is None:
+                break
+            tried.add(worker.address)
+            try:
+                response = self._exchange(worker, message)
+            except socket.timeout:
+                # El trabajador sigue vivo pero el solve es lento: no se repite.
+                raise
+            except (OSError, EOFError, ProtocolError):
+                self._mark_down(worker)
+                continue
+            finally:
+                with self._lock:
+                    worker.in_flight -= 1
+            with self._lock:
+                worker.load = response.get('load', worker.load)
+            if not response.get('ok'):
+                raise RemoteSolverError(response.get('error', 'Error desconocido del trabajador'))
+            return response
+        raise NoWorkersAvailable(f'Ningún trabajador disponible (probados: {", ".join(sorted(tried)) or "ninguno"}).')
+
+    def solve(self, solver_type: str, data, render: str = 'latex', stats=None) -> dict:
+        """
+        Como 'run_solver', pero en un trabajador remoto. Si se pasa el
+        diccionario 'stats', se le añade el 'cpu_s' del solve.
+        """
+        response = self.call({'op': 'solve', 'solver_type': solver_type,
+                              'data': {name: data[name] for name in data}, 'render': render})
+        if stats is not None:
+            stats['cpu_s'] = stats.get('cpu_s', 0.0) + response.get('cpu_s', 0.0)
+        return response['result']
+
+    def close(self):
+        with self._lock:
+            connections = [c for worker in self.workers for c in worker.idle]
+            for worker in self.workers:
+                worker.idle = []
+        for connection in connections:
+            self._close(connection)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(addresses, **options) -> WorkerPool:
+    """Pool compartido del proceso para esta lista de trabajadores y opciones."""
+    addresses = tuple(addresses)
+    key = (addresses, tuple(sorted(options.items())))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = WorkerPool(addresses, **options)
+        return pool
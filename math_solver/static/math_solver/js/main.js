@@ -349,7 +349,7 @@ class MathSolverApp {
         this.resultadoBox.innerHTML = this.resultadoPlaceholderHTML;
 
         // Re-render MathJax if necessary
-        if (window.MathJax) {
+        if (window.MathJax && window.MathJax.typesetPromise) {
             window.MathJax.typesetClear([this.resultadoBox]);
             window.MathJax.typesetPromise([this.resultadoBox]).catch(err => console.error(err));
         }
@@ -379,7 +379,11 @@ class MathSolverApp {
         })
             .then(response => response.json())
             .then(data => {
-                if (data.success && data.data) {
+                if (data.pending && data.data && data.data.job_url) {
+                    // Expensive input: solved by the background queue, poll for the result
+                    this.showPendingState(data.data);
+                    this.pollJob(data.data.job_url);
+                } else if (data.success && data.data) {
                     // Update result box with solution data
                     this.updateResultBox(data.data);
 
@@ -400,7 +404,43 @@ class MathSolverApp {
             });
     }
 
+    showPendingState(data) {
+        this.resultadoBox.innerHTML = `
+            <div class="text-center py-8">
+                <div class="inline-block animate-spin rounded-full h-8 w-8 border-b-2 border-yellow-600"></div>
+                <p class="mt-4 text-gray-700">Ecuación costosa: se está resolviendo en segundo plano...</p>
+                <p class="mt-1 text-sm text-gray-500">Costo estimado: ${data.costo_estimado} s</p>
+            </div>
+        `;
+    }
+
+    // Poll a background job until it finishes, then show its result
+    pollJob(jobUrl, delay = 1000) {
+        setTimeout(() => {
+            fetch(jobUrl, { headers: { 'Accept': 'application/json' } })
+                .then(response => response.json())
+                .then(job => {
+                    if (job.pending) {
+                        this.pollJob(jobUrl, Math.min(delay * 1.5, 5000));
+                        return;
+                    }
+                    this.updateResultBox(job.data);
+                    this.solutionHistory[this.currentSolver] = this.resultadoBox.innerHTML;
+                    this.saveStateToStorage();
+                    this.rerenderMathJax();
+                })
+                .catch(error => {
+                    console.error('Error polling job:', error);
+                    this.showError(`Error al consultar el trabajo: ${error.message}`);
+                });
+        }, delay);
+    }
+
     updateResultBox(data) {
+        // MathML mode: formulas arrive typeset; MathJax only for leftover LaTeX
+        if (data.requiere_mathjax) {
+            this.ensureMathJax();
+        }
         if (data.error) {
             this.showError(data.error);
         } else if (data.solucion) {
@@ -417,6 +457,13 @@ class MathSolverApp {
                 `;
             }
 
+            // Link to the cacheable GET URL of this result
+            const permalinkHtml = data.permalink ? `
+                <p class="mt-6 text-sm">
+                    <a href="${data.permalink}" class="text-blue-600 hover:underline">🔗 Enlace permanente a este resultado</a>
+                </p>
+            ` : '';
+
             // Render solution with proper formatting
             this.resultadoBox.innerHTML = `
                 <div class="p-6 bg-green-50 border border-green-200 rounded-lg">
@@ -425,6 +472,7 @@ class MathSolverApp {
                         ${data.solucion}
                     </div>
                     ${stepsHtml}
+                    ${permalinkHtml}
                 </div>
             `;
         } else {
@@ -441,9 +489,22 @@ class MathSolverApp {
         `;
     }
 
+    // Load MathJax on demand (server-side MathML mode)
+    ensureMathJax() {
+        if (document.getElementById('MathJax-script') || !window.djangoContext) {
+            return;
+        }
+        const script = document.createElement('script');
+        script.id = 'MathJax-script';
+        script.async = true;
+        script.src = window.djangoContext.mathJaxUrl;
+        script.onload = () => window.MathJax.startup.promise.then(() => this.rerenderMathJax());
+        document.head.appendChild(script);
+    }
+
     // Force MathJax to re-render all content
     rerenderMathJax() {
-        if (window.MathJax) {
+        if (window.MathJax && window.MathJax.typesetPromise) {
             setTimeout(() => {
                 window.MathJax.typesetPromise().catch(err => console.error('MathJax render error:', err));
             }, 100);
@@ -497,6 +558,8 @@ class MathSolverApp {
             // Re-render MathJax for new content
             if (window.MathJax) {
                 setTimeout(() => {
+                    // Not loaded in MathML mode unless the result needs it
+                    if (!window.MathJax.typesetPromise) return;
                     window.MathJax.typesetPromise([this.resultadoBox]).catch(err => console.error('Error al renderizar MathJax:', err));
                 }, 100);
             }
@@ -592,6 +655,7 @@ const solverTemplates = {
                 <input type="text" name="riccati_p_function" placeholder="Función P(x), ej: 1" class="w-full px-4 py-3 border border-gray-300 rounded-lg focus:outline-none focus:ring-2 focus:ring-blue-500" required>
                 <input type="text" name="riccati_q_function" placeholder="Función Q(x), ej: 2/x" class="w-full px-4 py-3 border border-gray-300 rounded-lg focus:outline-none focus:ring-2 focus:ring-blue-500" required>
                 <input type="text" name="riccati_r_function" placeholder="Función R(x), ej: -1/x**2" class="w-full px-4 py-3 border border-gray-300 rounded-lg focus:outline-none focus:ring-2 focus:ring-blue-500" required>
+                <input type="text" name="riccati_yp" placeholder="Solución particular y_p(x) conocida (opcional), ej: 1/x" class="w-full px-4 py-3 border border-gray-300 rounded-lg focus:outline-none focus:ring-2 focus:ring-blue-500">
             </div>
             <button type="submit" class="w-full bg-blue-600 text-white font-bold py-3 px-6 rounded-lg mt-6 hover:bg-blue-700 transition-transform transform hover:scale-105 focus:outline-none focus:ring-2 focus:ring-blue-500 focus:ring-opacity-50">
                 Resolver Riccati
@@ -655,6 +719,9 @@ document.addEventListener('DOMContentLoaded', () => {
             window.djangoContext.hasSolution,
             window.djangoContext.hasError
         );
+        if (window.djangoContext.pendingJobUrl) {
+            window.mathSolverApp.pollJob(window.djangoContext.pendingJobUrl);
+        }
     }
 });
 
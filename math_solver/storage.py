@@ -0,0 +1,58 @@
+"""
+Almacenamiento de Archivos Estáticos
+
+'collectstatic' con ManifestStaticFilesStorage copia cada archivo con un hash
+de su contenido en el nombre (p. ej. 'main.3f2a9c1b7d4e.js'), de modo que se
+puede servir con caché inmutable. Esta subclase además genera en ese mismo
+paso las variantes precomprimidas '.gz' y, si el paquete opcional 'brotli'
+está instalado, '.br', que 'PrecompressedStaticMiddleware' sirve según el
+'Accept-Encoding' del navegador.
+"""
+
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # Dependencia opcional: sin ella solo se genera gzip.
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.map', '.txt', '.html', '.xml')
+
+# Por debajo de este tamaño la compresión no compensa la cabecera extra.
+MIN_COMPRESS_SIZE = 256
+
+
+def compress_variants(content: bytes) -> dict:
+    """Devuelve {'.gz': bytes, '.br': bytes} con las variantes que reducen el tamaño."""
+    variants = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['.br'] = brotli.compress(content, quality=11)
+    return {suffix: data for suffix, data in variants.items() if len(data) < len(content)}
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """ManifestStaticFilesStorage que además escribe variantes .gz/.br."""
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+        # Se comprimen tanto los nombres originales como los versionados.
+        names = set(paths) | set(self.hashed_files.values())
+        for name in sorted(names):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS) and self.exists(name):
+                self._write_variants(name)
+
+    def _write_variants(self, name):
+        with self.open(name) as f:
+            content = f.read()
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+        for suffix, data in compress_variants(content).items():
+            target = name + suffix
+            if self.exists(target):
+                self.delete(target)
+            self._save(target, ContentFile(data))
@@ -0,0 +1,46 @@
+"""
+Etiquetas de plantilla para los recursos de terceros (Tailwind y MathJax).
+
+Con SOLVER_VENDOR_ASSETS = True las plantillas cargan las copias locales
+generadas por 'python manage.py vendor_assets' (servidas con hash y
+precomprimidas como el resto de estáticos) en lugar de los CDN. MathJax es
+el mismo componente en ambos casos (SOLVER_MATHJAX_URL), así que activarlo
+no cambia cómo se componen las fórmulas.
+"""
+
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+
+register = template.Library()
+
+CDN_ASSETS = {
+    'tailwind': 'https://cdn.tailwindcss.com',
+}
+
+VENDOR_ASSETS = {
+    'tailwind': 'math_solver/vendor/tailwind.min.css',
+    'mathjax': 'math_solver/vendor/mathjax/mathjax.js',
+}
+
+
+@register.simple_tag
+def vendored_assets() -> bool:
+    """Indica si se usan las copias locales de los recursos de terceros."""
+    return getattr(settings, 'SOLVER_VENDOR_ASSETS', False)
+
+
+@register.simple_tag
+def asset_url(name: str) -> str:
+    """URL del recurso 'tailwind' o 'mathjax': copia local o CDN."""
+    if vendored_assets():
+        return static(VENDOR_ASSETS[name])
+    if name == 'mathjax':
+        return settings.SOLVER_MATHJAX_URL
+    return CDN_ASSETS[name]
+
+
+@register.simple_tag
+def solver_render_mode() -> str:
+    """Modo de renderizado de fórmulas configurado ('latex' o 'mathml')."""
+    return getattr(settings, 'SOLVER_RENDER_MODE', 'latex')
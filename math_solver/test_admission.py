@@ -0,0 +1,143 @@
+"""
+Tests for the input cost model and admission control
+"""
+
+import os
+import tempfile
+import time
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from math_solver import jobs
+from math_solver.solver_logic.cost_model import (
+    LANE_INLINE, LANE_QUEUE, LANE_REJECT, choose_lane, estimate_cost, extract_features, fit_weights,
+)
+from math_solver.solver_logic.registry import solver_args
+
+
+def features_for(solver_type, data):
+    return extract_features(solver_type, solver_args(solver_type, data))
+
+
+class CostModelTests(TestCase):
+    """Structural features and cost estimates"""
+
+    def test_riccati_non_polynomial_p(self):
+        features = features_for('riccati', {'riccati_p_function': 'exp(x)', 'riccati_q_function': '1',
+                                            'riccati_r_function': 'x'})
+        self.assertEqual(features['riccati_nonpoly_p'], 1.0)
+        self.assertEqual(features['transcendental'], 1.0)
+        self.assertEqual(features['ivp'], 0.0)
+
+    def test_bernoulli_fractional_n(self):
+        features = features_for('bernoulli', {'bernoulli_p_function': '1', 'bernoulli_q_function': 'x',
+                                              'bernoulli_n_value': '1/2'})
+        self.assertEqual(features['bernoulli_fractional_n'], 1.0)
+        integer = features_for('bernoulli', {'bernoulli_p_function': '1', 'bernoulli_q_function': 'x',
+                                             'bernoulli_n_value': '3'})
+        self.assertNotIn('bernoulli_fractional_n', integer)
+
+    def test_special_functions_are_expensive(self):
+        cheap = features_for('second_order_homogeneous',
+                             {'second_a_val': '1', 'second_b_val': '0', 'second_c_val': '1'})
+        special = features_for('riccati', {'riccati_p_function': '1', 'riccati_q_function': '0',
+                                           'riccati_r_function': 'besselj(0, x)'})
+        self.assertEqual(special['special'], 1.0)
+        self.assertLess(estimate_cost(cheap), estimate_cost(special))
+
+    def test_choose_lane(self):
+        self.assertEqual(choose_lane(0.1, inline_max=1, reject_above=10), LANE_INLINE)
+        self.assertEqual(choose_lane(5, inline_max=1, reject_above=10), LANE_QUEUE)
+        self.assertEqual(choose_lane(50, inline_max=1, reject_above=10), LANE_REJECT)
+
+    def test_fit_weights_recovers_model(self):
+        true_weights = {'bias': -3.0, 'ops': 0.5}
+        records = [{'features': {'bias': 1.0, 'ops': float(ops)},
+                    'elapsed_s': estimate_cost({'bias': 1.0, 'ops': float(ops)}, true_weights)}
+                   for ops in range(10)]
+        weights = fit_weights(records, ridge=1e-9)
+        self.assertAlmostEqual(weights['bias'], -3.0, places=3)
+        self.assertAlmostEqual(weights['ops'], 0.5, places=3)
+
+
+class AdmissionViewTests(TestCase):
+    """main_solver_view routes inputs to the right lane"""
+
+    data = {'solver_type': 'second_order_homogeneous',
+            'second_a_val': '1', 'second_b_val': '0', 'second_c_val': '1'}
+
+    def setUp(self):
+        # Un resultado ya cacheado no pasa por la admisión.
+        caches['default'].clear()
+
+    def post_ajax(self, data):
+        return self.client.post('/solver/', data, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+    @override_settings(SOLVER_REJECT_COST=0.0)
+    def test_reject_lane(self):
+        response = self.post_ajax(self.data)
+        payload = response.json()
+        self.assertFalse(payload['success'])
+        self.assertIn('demasiado costosa', payload['data']['error'])
+
+    def test_inline_lane_records_timings(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log = os.path.join(tmp, 'timings.jsonl')
+            with override_settings(SOLVER_TIMINGS_LOG=log):
+                response = self.post_ajax(self.data)
+            self.assertTrue(response.json()['success'])
+            with open(log) as f:
+                self.assertIn('"lane": "inline"', f.read())
+
+    def test_queue_lane(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with override_settings(SOLVER_INLINE_MAX_COST=0.0, SOLVER_QUEUE_WORKERS=1,
+                                   SOLVER_STATE_DB=os.path.join(tmp, 'state.sqlite3')):
+                try:
+                    response = self.post_ajax(self.data)
+                    self.assertEqual(response.status_code, 202)
+                    payload = response.json()
+                    self.assertTrue(payload['pending'])
+
+                    job_url = payload['data']['job_url']
+                    deadline = time.monotonic() + 60
+                    job = self.client.get(job_url).json()
+                    while job['pending'] and time.monotonic() < deadline:
+                        time.sleep(0.2)
+                        job = self.client.get(job_url).json()
+                finally:
+                    jobs.shutdown(wait=True)
+        self.assertEqual(job['status'], jobs.JOB_DONE)
+        self.assertTrue(job['success'])
+        self.assertIn('solucion', job['data'])
+        # El enlace de evaluación lleva la entrada para sobrevivir a la caché.
+        self.assertIn('tipo=second_order_homogeneous', job['data']['eval_url'])
+
+    def test_unknown_job(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with override_settings(SOLVER_STATE_DB=os.path.join(tmp, 'state.sqlite3')):
+                response = self.client.get('/solver/jobs/doesnotexist/')
+        self.assertEqual(response.status_code, 404)
+
+
+class JobCleanupTests(TestCase):
+    """submit_job only purges finished jobs past SOLVER_JOB_TTL"""
+
+    def test_keeps_queued_and_running_jobs(self):
+        old, now = time.time() - 7200, time.time()
+        rows = [('queued', jobs.JOB_QUEUED, old, None), ('running', jobs.JOB_RUNNING, old, None),
+                ('done', jobs.JOB_DONE, old, old), ('failed', jobs.JOB_FAILED, old, old),
+                ('recent', jobs.JOB_DONE, old, now)]
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'state.sqlite3')
+            connection = jobs._connect(db_path)
+            connection.executemany(
+                "INSERT INTO solve_jobs (id, solver_type, status, created, finished) VALUES (?, 'quadratic', ?, ?, ?)",
+                rows,
+            )
+            with override_settings(SOLVER_STATE_DB=db_path, SOLVER_JOB_TTL=3600), \
+                    mock.patch.object(jobs, '_dispatch'):
+                new = jobs.submit_job('quadratic', {}, {})
+            left = {row[0] for row in connection.execute("SELECT id FROM solve_jobs")}
+        self.assertEqual(left, {'queued', 'running', 'recent', new})
@@ -0,0 +1,102 @@
+"""
+Tests for the solver benchmark and load-test harnesses
+"""
+
+from django.test import TestCase
+from math_solver.benchmarks.runner import (
+    DEFAULT_CORPUS, benchmark_case, compare_reports, count_dsolve_calls, load_corpus, run_case,
+)
+from math_solver.benchmarks.loadtest import (
+    DEFAULT_LOADTEST_CORPUS, _summarize, load_payloads, parse_mix, percentile, run_load_test,
+)
+from math_solver.solver_logic import general_solutions
+
+
+class BenchmarkCorpusTests(TestCase):
+    """The shipped corpus covers every solver family"""
+
+    def test_corpus_covers_all_solvers(self):
+        corpus = load_corpus(DEFAULT_CORPUS)
+        solvers = {case['solver'] for case in corpus['cases']}
+        for expected in ('quadratic', 'bernoulli', 'cauchy', 'clairaut', 'riccati',
+                         'second_order_homogeneous', 'second_order_nonhomogeneous', 'numeric_rk'):
+            self.assertIn(expected, solvers)
+
+    def test_case_ids_are_unique(self):
+        corpus = load_corpus(DEFAULT_CORPUS)
+        ids = [case['id'] for case in corpus['cases']]
+        self.assertEqual(len(ids), len(set(ids)))
+
+
+class BenchmarkRunnerTests(TestCase):
+    """Measurements and baseline comparison"""
+
+    linear_case = {
+        'id': 'bernoulli-n0', 'solver': 'bernoulli',
+        'data': {'bernoulli_p_function': '1', 'bernoulli_q_function': '2', 'bernoulli_n_value': '0'},
+    }
+
+    def test_dsolve_calls_are_counted(self):
+        general_solutions.cache_clear()
+        with count_dsolve_calls() as counter:
+            result = run_case(self.linear_case)
+        self.assertNotIn('error', result)
+        self.assertEqual(counter['calls'], 1)
+
+    def test_benchmark_case_reports_metrics(self):
+        row = benchmark_case(self.linear_case, repeat=1)
+        self.assertTrue(row['ok'])
+        self.assertEqual(row['dsolve_calls'], 1)
+        for key in ('cold_s', 'warm_min_s', 'warm_median_s', 'peak_kib'):
+            self.assertGreater(row[key], 0)
+
+    def test_numeric_case(self):
+        result = run_case({'id': 'rk', 'solver': 'numeric_rk',
+                           'data': {'order': 1, 'rhs': 'x - y', 'x0': '0', 'y0': '1',
+                                    'x_range': [0, 1, 11]}})
+        self.assertEqual(result['method'], 'numerical')
+        self.assertEqual(len(result['y_values']), 11)
+
+    def test_compare_detects_regressions(self):
+        row = {'ok': True, 'warm_median_s': 0.1, 'dsolve_calls': 1}
+        baseline = {'corpus_version': 1, 'cases': {'a': row}}
+        slower = {'corpus_version': 1, 'cases': {'a': dict(row, warm_median_s=0.2, dsolve_calls=2)}}
+        same = {'corpus_version': 1, 'cases': {'a': dict(row, warm_median_s=0.11)}}
+        self.assertEqual(len(compare_reports(slower, baseline, threshold=0.25)), 2)
+        self.assertEqual(compare_reports(same, baseline, threshold=0.25), [])
+
+    def test_compare_rejects_other_corpus_version(self):
+        self.assertTrue(compare_reports({'corpus_version': 2, 'cases': {}},
+                                        {'corpus_version': 1, 'cases': {}}))
+
+
+class LoadTestTests(TestCase):
+    """Load-test helpers and a short in-process run"""
+
+    def test_percentile(self):
+        values = [0.1, 0.2, 0.3, 0.4]
+        self.assertAlmostEqual(percentile(values, 0.5), 0.25)
+        self.assertEqual(percentile(values, 1.0), 0.4)
+        self.assertEqual(percentile([], 0.9), 0.0)
+
+    def test_mix_filters_payloads(self):
+        payloads = load_payloads(DEFAULT_LOADTEST_CORPUS, mix=parse_mix('quadratic=2'))
+        self.assertTrue(payloads)
+        self.assertTrue(all(payload['solver_type'] == 'quadratic' for payload, _ in payloads))
+
+    def test_summary_separates_queued_and_limited(self):
+        samples = [('riccati', 0.1, 'ok'), ('riccati', 0.2, 'queued'), ('riccati', 0.01, 'limited'),
+                   ('riccati', 0.01, 'limited')]
+        summary = _summarize(samples, 1.0)
+        self.assertEqual(summary['error_rate'], 0.0)
+        self.assertEqual(summary['queued_rate'], 0.25)
+        self.assertEqual(summary['limited_rate'], 0.5)
+
+    def test_in_process_wsgi_run(self):
+        payloads = [({'solver_type': 'quadratic', 'quad_a_val': '1',
+                      'quad_b_val': '0', 'quad_c_val': '-1'}, 1.0)]
+        report = run_load_test(payloads, target='wsgi', concurrency=1, duration=0.3)
+        self.assertGreater(report['overall']['requests'], 0)
+        self.assertEqual(report['overall']['error_rate'], 0.0)
+        self.assertIn('quadratic', report['by_solver'])
+        self.assertEqual(len(report['workers']), 1)
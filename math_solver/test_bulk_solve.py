@@ -0,0 +1,149 @@
+"""
+Tests for the offline bulk-solve command
+"""
+
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from math_solver import bulk_solve as bulk_solve_module
+from math_solver.cache_warmup import solve_pool
+from math_solver.bulk_solve import (
+    STATUS_INVALID, CheckpointMismatch, _Watermark, bulk_solve, checkpoint_path, iter_jobs,
+)
+
+CSV = (
+    "id,solver_type,quad_a_val,quad_b_val,quad_c_val\n"
+    "a1,quadratic,1,-5,6\n"
+    "a2,quadratic,1,-5,6\n"
+    "a3,desconocido,1,2,3\n"
+    "a4,quadratic,2,1,3\n"
+)
+
+
+def read_output(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+class BulkSolveMixin:
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.input = os.path.join(self.tmp.name, 'tarea.csv')
+        self.output = os.path.join(self.tmp.name, 'claves.jsonl')
+        with open(self.input, 'w', encoding='utf-8') as f:
+            f.write(CSV)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+
+class ParsingTests(BulkSolveMixin, TestCase):
+    """CSV and JSONL inputs are streamed with their line numbers"""
+
+    def test_csv(self):
+        jobs = list(iter_jobs(self.input))
+        self.assertEqual([job[0] for job in jobs], [2, 3, 4, 5])
+        self.assertEqual(jobs[0][1:], ('a1', 'quadratic', {'quad_a_val': '1', 'quad_b_val': '-5', 'quad_c_val': '6'}))
+        self.assertIsNone(jobs[2][2])
+
+    def test_jsonl(self):
+        path = os.path.join(self.tmp.name, 'tarea.jsonl')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('{"solver_type": "quadratic", "quad_a_val": "1"}\n\nroto\n'
+                    '{"solver_type": "quadratic", "data": {"quad_a_val": "2"}}\n')
+        jobs = list(iter_jobs(path))
+        self.assertEqual([job[0] for job in jobs], [1, 3, 4])
+        self.assertIn('JSON no válido', jobs[1][3])
+        self.assertEqual(jobs[2][3], {'quad_a_val': '2'})
+
+    def test_watermark(self):
+        watermark = _Watermark(1)
+        issued = {3: True, 4: True}
+        watermark.advance(2, issued)
+        self.assertEqual(watermark.value, 2)
+        del issued[4]
+        watermark.advance(4, issued)
+        self.assertEqual(watermark.value, 2)
+        del issued[3]
+        watermark.advance(3, issued)
+        self.assertEqual(watermark.value, 4)
+
+
+class BulkSolveTests(BulkSolveMixin, TestCase):
+    """Results are written incrementally and runs resume from the checkpoint"""
+
+    def test_solves_every_line(self):
+        stats = bulk_solve(self.input, self.output, workers=2, checkpoint_every=1)
+        records = {record['linea']: record for record in read_output(self.output)}
+        self.assertEqual(sorted(records), [2, 3, 4, 5])
+        self.assertEqual(records[2]['estado'], 'ok')
+        self.assertIn('solucion', records[2]['resultado'])
+        self.assertEqual(records[4]['estado'], STATUS_INVALID)
+        self.assertEqual((stats['ok'], stats[STATUS_INVALID], stats['linea']), (3, 1, 5))
+
+    def test_resume_after_crash(self):
+        # Simula una ejecución interrumpida: líneas 2 y 4 escritas, punto de
+        # control en la 2 y una última línea a medio escribir.
+        bulk_solve(self.input, self.output, workers=1)
+        records = read_output(self.output)
+        keep = [r for r in records if r['linea'] in (2, 4)]
+        with open(self.output, 'w', encoding='utf-8') as f:
+            for record in keep:
+                f.write(json.dumps(record) + '\n')
+            f.write('{"linea": 5, "estado"')
+        with open(checkpoint_path(self.output)) as f:
+            checkpoint = json.load(f)
+        checkpoint['linea'] = 2
+        with open(checkpoint_path(self.output), 'w') as f:
+            json.dump(checkpoint, f)
+
+        stats = bulk_solve(self.input, self.output, workers=1)
+        self.assertEqual(stats['saltadas'], 2)
+        self.assertEqual(sorted(r['linea'] for r in read_output(self.output)), [2, 3, 4, 5])
+
+    def test_broken_pool_is_replaced(self):
+        pools = []
+
+        def breaking_pool(workers):
+            # El primer pool pierde sus procesos en cuanto recibe una entrada.
+            pool = solve_pool(workers)
+            pools.append(pool)
+            if len(pools) == 1:
+                submit = pool.submit
+
+                def submit_and_kill(*args, **kwargs):
+                    future = submit(*args, **kwargs)
+                    for process in list(pool._processes.values()):
+                        process.kill()
+                    return future
+
+                pool.submit = submit_and_kill
+            return pool
+
+        with mock.patch.object(bulk_solve_module, 'solve_pool', side_effect=breaking_pool):
+            stats = bulk_solve(self.input, self.output, workers=1)
+        self.assertGreater(len(pools), 1)
+        self.assertEqual((stats['ok'], stats['error']), (3, 0))
+        self.assertEqual(sorted(r['linea'] for r in read_output(self.output)), [2, 3, 4, 5])
+
+    def test_checkpoint_of_other_options(self):
+        bulk_solve(self.input, self.output, workers=1)
+        with self.assertRaises(CheckpointMismatch):
+            bulk_solve(self.input, self.output, workers=1, schema=2)
+
+    def test_command_compact_schema(self):
+        out = io.StringIO()
+        call_command('bulk_solve', self.input, self.output, '--workers', '1', '--schema', '2',
+                     stdout=out, stderr=io.StringIO())
+        self.assertEqual(json.loads(out.getvalue())['ok'], 3)
+        record = next(r for r in read_output(self.output) if r['linea'] == 2)
+        self.assertEqual(record['resultado']['v'], 2)
+        with self.assertRaises(CommandError):
+            call_command('bulk_solve', self.input, self.output, '--workers', '1',
+                         stdout=io.StringIO(), stderr=io.StringIO())
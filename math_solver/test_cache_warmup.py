@@ -0,0 +1,118 @@
+"""
+Tests for the result cache warm-up
+"""
+
+import io
+import json
+import os
+import tempfile
+import time
+from unittest import mock
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase
+from math_solver import cache_warmup
+from math_solver.cache_warmup import plan_warmup, read_entries, solve_item, warm_local, warm_remote
+from math_solver.views import result_cache_key
+
+LINES = [
+    {'solver_type': 'second_order_homogeneous', 'second_a_val': '1', 'second_b_val': '0', 'second_c_val': '1'},
+    # Registro de tiempos: el payload va en 'data'.
+    {'solver_type': 'bernoulli', 'lane': 'inline', 'elapsed_s': 0.2,
+     'data': {'bernoulli_p_function': 'x^2', 'bernoulli_q_function': 'x', 'bernoulli_n_value': '2'}},
+    {'solver_type': 'bernoulli',
+     'data': {'bernoulli_p_function': 'x**2', 'bernoulli_q_function': 'x', 'bernoulli_n_value': '2'}},
+    {'solver_type': 'desconocido'},
+]
+
+
+class CorpusMixin:
+    def setUp(self):
+        caches['default'].clear()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.corpus = os.path.join(self.tmp.name, 'corpus.jsonl')
+        with open(self.corpus, 'w', encoding='utf-8') as f:
+            for line in LINES:
+                f.write(json.dumps(line) + '\n')
+            f.write('no es json\n')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+
+class PlanTests(CorpusMixin, TestCase):
+    """Corpus parsing and canonical deduplication"""
+
+    def test_read_both_formats(self):
+        entries, invalid = read_entries([self.corpus])
+        self.assertEqual(len(entries), 3)
+        self.assertEqual(invalid, 2)
+        self.assertEqual(entries[1][1], {'bernoulli_p_function': 'x^2', 'bernoulli_q_function': 'x',
+                                         'bernoulli_n_value': '2'})
+
+    def test_dedupe_most_frequent_first(self):
+        items, invalid = plan_warmup(read_entries([self.corpus])[0])
+        self.assertEqual(invalid, 0)
+        self.assertEqual([solver_type for _, solver_type, _ in items], ['bernoulli', 'second_order_homogeneous'])
+        self.assertEqual(len(plan_warmup(read_entries([self.corpus])[0], limit=1)[0]), 1)
+
+
+class SolveItemTests(TestCase):
+    """Per-item time budget"""
+
+    def test_budget(self):
+        with mock.patch.object(cache_warmup, 'run_solver', lambda *args, **kwargs: time.sleep(5)):
+            status, result, elapsed = solve_item('quadratic', {}, budget=0.2)
+        self.assertEqual(status, cache_warmup.STATUS_TIMEOUT)
+        self.assertIsNone(result)
+        self.assertLess(elapsed, 4)
+
+    def test_solver_error(self):
+        status, result, _elapsed = solve_item('bernoulli', {'bernoulli_p_function': '(('}, budget=5)
+        self.assertEqual(status, cache_warmup.STATUS_ERROR)
+
+
+class WarmLocalTests(CorpusMixin, TestCase):
+    """Local warm-up fills the result cache used by the view"""
+
+    def test_fills_cache_and_skips_cached(self):
+        items, _invalid = plan_warmup(read_entries([self.corpus])[0])
+        progress = []
+        stats = warm_local(items, workers=1, budget=30, progress=lambda *args: progress.append(args))
+        self.assertEqual(stats[cache_warmup.STATUS_OK], 2)
+        self.assertEqual([p[0] for p in progress], [1, 2])
+        for digest, _solver_type, _data in items:
+            self.assertIn('solucion', caches['default'].get(result_cache_key(digest)))
+
+        stats = warm_local(items, workers=1)
+        self.assertEqual(stats[cache_warmup.STATUS_CACHED], 2)
+
+    def test_command(self):
+        out, err = io.StringIO(), io.StringIO()
+        call_command('warm_cache', self.corpus, '--workers', '1', '--limit', '1', stdout=out, stderr=err)
+        stats = json.loads(out.getvalue())
+        self.assertEqual((stats['total'], stats['ok'], stats['entries']), (1, 1, 3))
+        self.assertIn('[1/1] ok', err.getvalue())
+
+
+class WarmRemoteTests(TestCase):
+    """Remote warm-up posts every entry to the live server"""
+
+    def test_statuses(self):
+        responses = iter([(200, b'{"success": true}'), (429, b'{}')])
+
+        class FakeClient:
+            def __init__(self, base_url, path):
+                pass
+
+            def get_csrf_token(self):
+                return 'token'
+
+            def post(self, body, headers, timeout):
+                return next(responses)
+
+        items = [('a', 'quadratic', {'quad_a_val': '1'}), ('b', 'quadratic', {'quad_a_val': '2'})]
+        with mock.patch('math_solver.benchmarks.loadtest._HTTPClient', FakeClient):
+            stats = warm_remote(items, 'http://127.0.0.1:8000', concurrency=1)
+        self.assertEqual((stats['ok'], stats['limited']), (1, 1))
@@ -0,0 +1,71 @@
+"""
+Tests for the direct Clairaut envelope computation
+"""
+
+import math
+
+from django.test import TestCase
+from sympy import Eq, Function, cos, exp, sqrt, symbols
+from math_solver.benchmarks.runner import count_dsolve_calls
+from math_solver.solver_logic.clairaut_envelope import p, sample_parametric, singular_solution
+from math_solver.solver_logic.clairaut_solver import solve_clairaut
+
+x = symbols('x')
+y = Function('y')(x)
+
+
+class SingularSolutionTests(TestCase):
+    """Solving x = -f'(p) for p and substituting back"""
+
+    def setUp(self):
+        singular_solution.cache_clear()
+
+    def test_quadratic_envelope(self):
+        envelope = singular_solution(p**2)
+        self.assertEqual(envelope.soluciones, [Eq(y, -x**2 / 4)])
+        self.assertIsNone(envelope.curva)
+
+    def test_spurious_roots_are_discarded(self):
+        self.assertEqual(len(singular_solution(sqrt(1 + p**2)).soluciones), 1)
+
+    def test_exponential_envelope(self):
+        envelope = singular_solution(exp(p))
+        self.assertEqual(len(envelope.soluciones), 1)
+
+    def test_linear_f_has_no_envelope(self):
+        self.assertIsNone(singular_solution(3 * p))
+
+    def test_parametric_fallback(self):
+        envelope = singular_solution(p**2 + cos(p))
+        self.assertEqual(envelope.soluciones, [])
+        self.assertEqual(len(envelope.curva['x']), len(envelope.curva['p']))
+        # x(p) = -2p + sin(p) en p = -5
+        self.assertAlmostEqual(envelope.curva['x'][0], 10 - math.sin(5))
+
+    def test_cached_per_canonical_expression(self):
+        singular_solution(p**2)
+        singular_solution(p * p)
+        self.assertEqual(singular_solution.cache_info().hits, 1)
+
+    def test_non_real_points_are_null(self):
+        curve = sample_parametric(sqrt(p), p, points=3, p_range=(-1.0, 1.0))
+        self.assertEqual(curve['x'], [None, 0.0, 1.0])
+
+
+class SolveClairautTests(TestCase):
+    """solve_clairaut without dsolve"""
+
+    def test_returns_general_and_singular_solutions(self):
+        with count_dsolve_calls() as counter:
+            result = solve_clairaut('p**2')
+        self.assertEqual(counter['calls'], 0)
+        self.assertIn('Solución General', result['solucion'])
+        self.assertIn('Solución Singular', result['solucion'])
+
+    def test_parametric_result(self):
+        result = solve_clairaut('p**2 + cos(p)')
+        self.assertIn('curva_singular', result)
+        self.assertIn('paramétrica', result['solucion'])
+
+    def test_rejects_x_in_f(self):
+        self.assertIn('error', solve_clairaut('x*p'))
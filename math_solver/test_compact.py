@@ -0,0 +1,113 @@
+"""
+Tests for the compact (v2) JSON result schema
+"""
+
+import gzip
+import json
+
+from django.core.cache import caches
+from django.test import TestCase
+from math_solver.solver_logic.compact import SCHEMA_VERSION, compact_result, split_math, step_code
+
+
+class SplitMathTests(TestCase):
+    """Templates with placeholders and plain LaTeX parameters"""
+
+    def test_delimiters(self):
+        template, formulas = split_math(r"   - Con $$P(x) = 1$$ y \( y_p = x \) en \[ x^{2} \]")
+        self.assertEqual(template, '- Con {0} y {1} en {2}')
+        self.assertEqual(formulas, ['P(x) = 1', 'y_p = x', 'x^{2}'])
+
+    def test_html_and_markdown_are_removed(self):
+        template, formulas = split_math("<p class='font-semibold'>2. **Método**: $$e^{y{\\left(x \\right)}}$$</p>")
+        self.assertEqual(template, '2. Método: {0}')
+        self.assertEqual(formulas, [r'e^{y{\left(x \right)}}'])
+
+    def test_literal_braces_keep_template_formattable(self):
+        template, formulas = split_math('conjunto {a} y $$b$$')
+        self.assertEqual(template.format(*formulas), 'conjunto {a} y b')
+
+    def test_codes_are_stable(self):
+        self.assertEqual(step_code('- {0}'), step_code('- {0}'))
+        self.assertNotEqual(step_code('- {0}'), step_code('1. {0}'))
+
+
+class CompactResultTests(TestCase):
+    """Conversion of solver dictionaries"""
+
+    result = {
+        'solucion': '<div class="bg-green-50">$$y = C_1 e^{x}$$</div>',
+        'steps': ['1. Ecuación: $$y\' = y$$', '   - Raíz: \\( r = 1 \\)', '   - Raíz: \\( r = 2 \\)'],
+        'solucion_srepr': "Symbol('y')",
+        'ecuacion_srepr': "Symbol('e')",
+    }
+
+    def test_schema(self):
+        compact = compact_result('second_order_homogeneous', self.result, elapsed=0.0125)
+        self.assertEqual(compact['v'], SCHEMA_VERSION)
+        self.assertEqual(compact['solucion'], {'latex': ['y = C_1 e^{x}'], 'srepr': "Symbol('y')"})
+        self.assertEqual(compact['metodo'], 'second_order_homogeneous')
+        self.assertEqual(compact['meta']['tiempo_ms'], 12.5)
+        self.assertNotIn('ecuacion_srepr', compact)
+        self.assertNotIn('<div', json.dumps(compact))
+
+    def test_repeated_templates_share_code(self):
+        compact = compact_result('x', self.result)
+        codes = [code for code, _params in compact['pasos']]
+        self.assertEqual(codes[1], codes[2])
+        self.assertEqual(len(compact['plantillas']), 2)
+        self.assertEqual(compact['pasos'][2][1], ['r = 2'])
+
+    def test_without_templates(self):
+        self.assertNotIn('plantillas', compact_result('x', self.result, templates=False))
+
+    def test_method_and_series(self):
+        compact = compact_result('riccati', {'solucion': 'texto sin fórmulas', 'metodo': 'serie',
+                                             'serie': {'orden': 8, 'serie_spec': {}, 'coeficientes': ['1']}})
+        self.assertEqual(compact['metodo'], 'serie')
+        self.assertEqual(compact['serie'], {'orden': 8, 'coeficientes': ['1']})
+        self.assertEqual(compact['solucion']['texto'], 'texto sin fórmulas')
+
+    def test_error(self):
+        self.assertEqual(compact_result('riccati', {'error': 'mal'}), {'v': 2, 'tipo': 'riccati', 'error': 'mal'})
+
+
+class CompactViewTests(TestCase):
+    """schema=2 on the JSON endpoints"""
+
+    data = {'solver_type': 'second_order_homogeneous',
+            'second_a_val': '1', 'second_b_val': '0', 'second_c_val': '1'}
+
+    def setUp(self):
+        caches['default'].clear()
+
+    def test_post_compact(self):
+        response = self.client.post('/solver/?schema=2', self.data)
+        payload = response.json()
+        self.assertEqual(payload['v'], 2)
+        self.assertEqual(payload['metodo'], 'ecuacion_caracteristica')
+        self.assertIn('eval_url', payload)
+        self.assertIn('tiempo_ms', payload['meta'])
+
+    def test_gzip(self):
+        response = self.client.post('/solver/', dict(self.data, schema='2'), HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(json.loads(gzip.decompress(response.content))['v'], 2)
+
+    def test_smaller_than_full_payload(self):
+        full = self.client.post('/solver/', self.data, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        compact = self.client.post('/solver/?schema=2&plantillas=0', self.data, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertLess(len(compact.content) * 2, len(full.content))
+
+    def test_result_url_etag(self):
+        permalink = self.client.post('/solver/', self.data,
+                                     HTTP_X_REQUESTED_WITH='XMLHttpRequest').json()['data']['permalink']
+        full = self.client.get(permalink + '&format=json')
+        compact = self.client.get(permalink + '&schema=2', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(compact['Content-Encoding'], 'gzip')
+        self.assertTrue(compact['ETag'].startswith('W/'))
+        self.assertNotEqual(compact['ETag'].lstrip('W/'), full['ETag'])
+        revalidated = self.client.get(permalink + '&schema=2', HTTP_IF_NONE_MATCH=compact['ETag'],
+                                      HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(revalidated.status_code, 304)
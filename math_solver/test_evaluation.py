@@ -0,0 +1,122 @@
+"""
+Tests for the solution evaluation endpoint
+"""
+
+from django.core.cache import caches
+from django.test import TestCase
+from django.utils.http import urlencode
+from sympy import Eq, Function, airyai, exp, srepr, symbols
+from math_solver.solver_logic.evaluation import (
+    SolutionNotEvaluable, compile_solution, evaluate_solution, solution_id,
+)
+
+x, C1 = symbols('x C1')
+y = Function('y')(x)
+
+
+class EvaluateSolutionTests(TestCase):
+    """Sampling compiled solutions"""
+
+    solution = srepr(Eq(y, C1 * exp(x)))
+
+    def test_samples_with_constants(self):
+        samples = evaluate_solution(self.solution, 0, 1, 3, {'C1': 2})
+        self.assertEqual(samples['parametros'], ['C1'])
+        self.assertEqual(samples['x'], [0.0, 0.5, 1.0])
+        self.assertAlmostEqual(samples['ramas'][0][2], 2 * 2.718281828459045)
+
+    def test_compiled_function_is_cached(self):
+        compile_solution.cache_clear()
+        evaluate_solution(self.solution, 0, 1, 10)
+        evaluate_solution(self.solution, 0, 2, 10, {'C1': 3})
+        self.assertEqual(compile_solution.cache_info().hits, 1)
+
+    def test_non_real_points_are_null(self):
+        samples = evaluate_solution(srepr(Eq(y, x ** 0.5)), -1, 1, 3)
+        self.assertEqual(samples['ramas'][0][0], None)
+        self.assertEqual(samples['ramas'][0][2], 1.0)
+
+    def test_special_functions_fall_back_to_mpmath(self):
+        samples = evaluate_solution(srepr(Eq(y, airyai(x))), 0, 1, 2)
+        self.assertAlmostEqual(samples['ramas'][0][0], 0.3550280538878172)
+
+    def test_implicit_solution(self):
+        with self.assertRaises(SolutionNotEvaluable):
+            evaluate_solution(srepr(Eq(y ** 2 + x, C1)), 0, 1, 3)
+
+    def test_invalid_range(self):
+        with self.assertRaises(ValueError):
+            evaluate_solution(self.solution, 1, 0, 3)
+        with self.assertRaises(ValueError):
+            evaluate_solution(self.solution, float('-inf'), 0, 3)
+        with self.assertRaises(ValueError):
+            evaluate_solution(self.solution, 0, float('nan'), 3)
+
+
+class EvaluateSolutionViewTests(TestCase):
+    """Solve once, then sample through /solver/solutions/<id>/eval/"""
+
+    def setUp(self):
+        caches['default'].clear()
+
+    def test_solve_then_evaluate(self):
+        response = self.client.post('/solver/', {
+            'solver_type': 'second_order_homogeneous',
+            'second_a_val': '1', 'second_b_val': '0', 'second_c_val': '1',
+        }, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        data = response.json()['data']
+        self.assertEqual(data['solution_id'], solution_id(data['solucion_srepr']))
+
+        samples = self.client.get(data['eval_url'], {'x_min': 0, 'x_max': 1, 'points': 5,
+                                                     'C1': 1, 'C2': 0}).json()
+        self.assertTrue(samples['success'])
+        self.assertEqual(samples['data']['parametros'], ['C1', 'C2'])
+        self.assertEqual(len(samples['data']['ramas'][0]), 5)
+
+    def _solve(self):
+        response = self.client.post('/solver/', {
+            'solver_type': 'second_order_homogeneous',
+            'second_a_val': '1', 'second_b_val': '0', 'second_c_val': '1',
+        }, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        return response.json()['data']
+
+    def test_expired_solution_is_rebuilt(self):
+        # El 'eval_url' de una respuesta cacheada un año sigue sirviendo
+        # aunque la solución ya no esté en la caché de resultados.
+        data = self._solve()
+        caches['default'].clear()
+        query = urlencode({'x_min': 0, 'x_max': 1, 'points': 5, 'C1': 1, 'C2': 0})
+        samples = self.client.get(f"{data['eval_url']}&{query}").json()
+        self.assertTrue(samples['success'])
+        self.assertEqual(len(samples['data']['ramas'][0]), 5)
+        self.assertIsNotNone(caches['default'].get(f"solution:{data['solution_id']}"))
+
+    def test_rebuilt_solution_with_another_id_redirects(self):
+        data = self._solve()
+        caches['default'].clear()
+        url = data['eval_url'].replace(data['solution_id'], 'old')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response['Location'].startswith(data['eval_url'].split('?')[0] + '?'))
+
+    def test_unknown_solution(self):
+        self.assertEqual(self.client.get('/solver/solutions/nope/eval/').status_code, 404)
+
+    def test_bad_parameters(self):
+        caches['default'].set('solution:abc', srepr(Eq(y, x)))
+        response = self.client.get('/solver/solutions/abc/eval/', {'points': 'many'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_non_finite_range(self):
+        caches['default'].set('solution:abc', srepr(Eq(y, x)))
+        response = self.client.get('/solver/solutions/abc/eval/', {'x_min': '-inf', 'x_max': 'nan'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_ignores_other_parameters(self):
+        caches['default'].set('solution:abc', srepr(Eq(y, C1 * x)))
+        response = self.client.get('/solver/solutions/abc/eval/', {'x_min': 0, 'x_max': 1, 'points': 2,
+                                                                   '_': 'cache-buster', 'C2': 'no', 'C1': 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['ramas'], [[0.0, 3.0]])
+        response = self.client.get('/solver/solutions/abc/eval/', {'C1': 'tres'})
+        self.assertEqual(response.status_code, 400)
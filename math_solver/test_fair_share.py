@@ -0,0 +1,174 @@
+"""
+Tests for per-client rate limiting and fair job dispatch
+"""
+
+import json
+import os
+import tempfile
+import time
+
+from django.core.cache import caches
+from django.test import RequestFactory, TestCase, override_settings
+from math_solver import fair_share, jobs
+from math_solver.views import result_url
+
+LIMITS = {'key': {'rate': 1.0, 'burst': 5.0}, 'session': {'rate': 0.5, 'burst': 2.0},
+          'ip': {'rate': 0.5, 'burst': 2.0}, 'network': {'rate': 1.0, 'burst': 4.0}}
+
+
+class TempStateMixin:
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'state.sqlite3')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+
+class TokenBucketTests(TempStateMixin, TestCase):
+    """Buckets are charged by CPU seconds and refill over time"""
+
+    def test_new_client_is_admitted(self):
+        self.assertEqual(fair_share.retry_after(self.db_path, 'ip:1.2.3.4', 0.5, 2.0, now=100.0), 0.0)
+
+    def test_debt_and_refill(self):
+        fair_share.charge(self.db_path, 'ip:1.2.3.4', 3.0, 0.5, 2.0, now=100.0)
+        # 2 - 3 = -1 token: 2 s a 0.5 tokens/s.
+        self.assertAlmostEqual(fair_share.retry_after(self.db_path, 'ip:1.2.3.4', 0.5, 2.0, now=100.0), 2.0)
+        self.assertEqual(fair_share.retry_after(self.db_path, 'ip:1.2.3.4', 0.5, 2.0, now=103.0), 0.0)
+
+    def test_refill_is_capped_at_burst(self):
+        fair_share.charge(self.db_path, 'c', 1.0, 0.5, 2.0, now=0.0)
+        self.assertAlmostEqual(fair_share.charge(self.db_path, 'c', 0.0, 0.5, 2.0, now=1000.0), 2.0)
+
+    @override_settings(SOLVER_RATE_LIMITS=LIMITS)
+    def test_session_also_pays_its_network(self):
+        buckets = fair_share.buckets_for('session:abc@10.0.0.7')
+        self.assertEqual([bucket for bucket, _, _ in buckets], ['session:abc@10.0.0.7', 'network:10.0.0.7'])
+        fair_share.charge_client(self.db_path, buckets, 10.0, now=0.0)
+        # Una sesión nueva desde la misma IP hereda la deuda del cubo común.
+        fresh = fair_share.buckets_for('session:nueva@10.0.0.7')
+        self.assertAlmostEqual(fair_share.client_wait(self.db_path, fresh, now=0.0), 6.0)
+
+    def test_zero_rate_is_a_hard_reject(self):
+        buckets = [('ip:1.2.3.4', 0.0, 2.0)]
+        self.assertEqual(fair_share.client_wait(self.db_path, buckets, now=0.0), float('inf'))
+
+    def test_clients_are_independent(self):
+        fair_share.charge(self.db_path, 'a', 10.0, 0.5, 2.0, now=0.0)
+        self.assertEqual(fair_share.retry_after(self.db_path, 'b', 0.5, 2.0, now=0.0), 0.0)
+
+
+@override_settings(SOLVER_API_KEYS={'secreto': 'laboratorio'}, SOLVER_RATE_LIMITS=LIMITS)
+class ClientIdTests(TestCase):
+    """Clients are identified by API key, session or IP"""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def test_api_key(self):
+        request = self.factory.post('/solver/', HTTP_X_API_KEY='secreto')
+        self.assertEqual(fair_share.client_id(request), 'key:laboratorio')
+        self.assertEqual(fair_share.limits_for('key:laboratorio'), (1.0, 5.0))
+
+    def test_unknown_key_falls_back_to_ip(self):
+        request = self.factory.post('/solver/', HTTP_X_API_KEY='inventada', REMOTE_ADDR='10.0.0.7')
+        self.assertEqual(fair_share.client_id(request), 'ip:10.0.0.7')
+
+    def test_session(self):
+        request = self.factory.post('/solver/')
+        request.session = type('Session', (), {'session_key': 'abc'})()
+        client = fair_share.client_id(request)
+        self.assertTrue(client.startswith('session:'))
+        self.assertTrue(client.endswith('@127.0.0.1'))
+        self.assertNotIn('abc', client)
+
+
+class FairDispatchTests(TempStateMixin, TestCase):
+    """Queued jobs are interleaved across clients"""
+
+    def enqueue(self, client, created):
+        job_id = f'{client}-{created}'
+        jobs._connect(self.db_path).execute(
+            "INSERT INTO solve_jobs (id, solver_type, status, created, client, payload) VALUES (?, ?, ?, ?, ?, ?)",
+            (job_id, 'second_order_homogeneous', jobs.JOB_QUEUED, created, client,
+             json.dumps({'data': {}, 'features': None})),
+        )
+        return job_id
+
+    def finish(self, job_id):
+        jobs._connect(self.db_path).execute("UPDATE solve_jobs SET status = ? WHERE id = ?",
+                                            (jobs.JOB_DONE, job_id))
+
+    def test_busy_client_does_not_block_others(self):
+        for created in range(3):
+            self.enqueue('a', created)
+        self.enqueue('b', 10)
+        first = jobs._claim_next(self.db_path)[0]
+        second = jobs._claim_next(self.db_path)[0]
+        self.assertEqual((first, second), ('a-0', 'b-10'))
+
+    def test_round_robin_with_one_worker(self):
+        for created in range(3):
+            self.enqueue('a', created)
+        self.enqueue('b', 10)
+        self.enqueue('b', 11)
+        order = []
+        while (job := jobs._claim_next(self.db_path)) is not None:
+            order.append(job[0])
+            self.finish(job[0])
+            time.sleep(0.01)
+        self.assertEqual(order, ['a-0', 'b-10', 'a-1', 'b-11', 'a-2'])
+
+    def test_legacy_table_gets_new_columns(self):
+        from math_solver import local_store
+
+        local_store.connect(self.db_path).execute(
+            "CREATE TABLE solve_jobs (id TEXT PRIMARY KEY, solver_type TEXT NOT NULL, status TEXT NOT NULL, "
+            "result TEXT, created REAL NOT NULL, finished REAL)")
+        self.enqueue('a', 0)
+        self.assertEqual(jobs._claim_next(self.db_path)[2], 'a')
+
+
+class RateLimitViewTests(TempStateMixin, TestCase):
+    """main_solver_view answers 429 once the client's CPU budget is spent"""
+
+    data = {'solver_type': 'second_order_homogeneous',
+            'second_a_val': '1', 'second_b_val': '0', 'second_c_val': '1'}
+
+    def setUp(self):
+        super().setUp()
+        caches['default'].clear()
+
+    def test_429_with_retry_after(self):
+        with override_settings(SOLVER_RATE_LIMIT_ENABLED=True, SOLVER_RATE_LIMITS=LIMITS,
+                               SOLVER_STATE_DB=self.db_path):
+            response = self.client.post('/solver/', self.data, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+            self.assertEqual(response.status_code, 200)
+            fair_share.charge(self.db_path, 'ip:127.0.0.1', 100.0, 0.5, 2.0)
+            # Un resultado ya cacheado no gasta tokens.
+            self.assertEqual(
+                self.client.post('/solver/', self.data, HTTP_X_REQUESTED_WITH='XMLHttpRequest').status_code, 200)
+            response = self.client.post('/solver/', dict(self.data, second_c_val='4'),
+                                        HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 100)
+        self.assertFalse(response.json()['success'])
+
+    def test_permalink_is_limited_too(self):
+        with override_settings(SOLVER_RATE_LIMIT_ENABLED=True, SOLVER_RATE_LIMITS=LIMITS,
+                               SOLVER_STATE_DB=self.db_path):
+            fair_share.charge(self.db_path, 'ip:127.0.0.1', 100.0, 0.5, 2.0)
+            data = {name: value for name, value in self.data.items() if name != 'solver_type'}
+            response = self.client.get(result_url('second_order_homogeneous', data) + '&format=json')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 100)
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_zero_rate_rejects_without_retry_after(self):
+        limits = dict(LIMITS, ip={'rate': 0.0, 'burst': 2.0})
+        with override_settings(SOLVER_RATE_LIMIT_ENABLED=True, SOLVER_RATE_LIMITS=limits,
+                               SOLVER_STATE_DB=self.db_path):
+            response = self.client.post('/solver/', self.data, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.status_code, 429)
+        self.assertNotIn('Retry-After', response)
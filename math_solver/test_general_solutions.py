@@ -0,0 +1,58 @@
+"""
+Tests for reusing cached general solutions across IVPs
+"""
+
+from django.test import TestCase
+from sympy import Eq, Function, Rational, cos, dsolve, exp, symbols
+from math_solver.benchmarks.runner import count_dsolve_calls
+from math_solver.solver_logic import general_solutions
+from math_solver.solver_logic.general_solutions import apply_initial_conditions, solve_ivp
+from math_solver.solver_logic.second_order_solver import solve_second_order_homogeneous
+
+x = symbols('x')
+y = Function('y')(x)
+
+
+class SolveIVPTests(TestCase):
+    """Solving only for the integration constants"""
+
+    def setUp(self):
+        general_solutions.cache_clear()
+
+    def test_matches_dsolve_with_ics(self):
+        ode = Eq(y.diff(x) + y, x * y ** 2)
+        ics = {y.subs(x, 0): 1}
+        solution, constants = solve_ivp(ode, y, ics)
+        self.assertEqual(solution, dsolve(ode, y, ics=ics))
+        self.assertEqual(list(constants.values()), [0])
+
+    def test_second_order_conditions(self):
+        ode = Eq(y.diff(x, 2) + 4 * y, 0)
+        ics = {y.subs(x, 0): 1, y.diff(x).subs(x, 0): 0}
+        solution, _ = solve_ivp(ode, y, ics)
+        self.assertEqual(solution, Eq(y, cos(2 * x)))
+
+    def test_general_solution_is_computed_once(self):
+        ode = Eq(y.diff(x) - 2 * y, 0)
+        with count_dsolve_calls() as counter:
+            for y0 in range(5):
+                solution, _ = solve_ivp(ode, y, {y.subs(x, 0): y0})
+                self.assertEqual(solution, Eq(y, y0 * exp(2 * x)))
+        self.assertEqual(counter['calls'], 1)
+
+    def test_spurious_roots_are_discarded(self):
+        # Bernoulli con n = 1/2: y(1) = 1 da dos valores de C1, solo uno es solución.
+        ode = Eq(y.diff(x) + y / x, x * y ** Rational(1, 2))
+        solution, _ = solve_ivp(ode, y, {y.subs(x, 1): 1})
+        self.assertIsInstance(solution, Eq)
+
+    def test_unsolvable_conditions_return_none(self):
+        general = Eq(y, symbols('C1') * exp(x))
+        # y(0) = 1 y y'(0) = 2 son incompatibles con una sola constante.
+        ics = {y.subs(x, 0): 1, y.diff(x).subs(x, 0): 2}
+        self.assertEqual(apply_initial_conditions(general, y, ics), (None, None))
+
+    def test_solver_reports_constants(self):
+        result = solve_second_order_homogeneous('1', '0', '4', '0', '1', '0')
+        self.assertIn('cos', result['solucion'])
+        self.assertTrue(any('condiciones iniciales dan' in step for step in result['steps']))
@@ -0,0 +1,123 @@
+"""
+Tests for adaptive dsolve hint ordering
+"""
+
+import io
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from sympy import Eq, Function, symbols
+from math_solver.solver_logic import general_solutions, hint_order
+from math_solver.solver_logic.hint_order import HintTable, plan
+
+x = symbols('x')
+y = Function('y')(x)
+
+# y' = y: separable, lineal, Bernoulli, ...
+EQUATION = Eq(y.diff(x), y)
+
+
+class HintTableTests(TestCase):
+    """Ordering by expected time to success"""
+
+    def test_no_data_keeps_sympy_order(self):
+        self.assertEqual(HintTable().order('k', ['a', 'b', 'c']), ['a', 'b', 'c'])
+
+    def test_fast_reliable_hint_first(self):
+        table = HintTable()
+        for _ in range(5):
+            table.record('k', 'lento', 3.0, True)
+            table.record('k', 'rapido', 0.01, True)
+            table.record('k', 'falla', 0.01, False)
+        self.assertEqual(table.order('k', ['lento', 'falla', 'rapido']), ['rapido', 'falla', 'lento'])
+
+    def test_unknown_context_uses_global_stats(self):
+        table = HintTable()
+        table.record('otro', 'b', 0.01, True)
+        table.record('otro', 'a', 5.0, False)
+        self.assertEqual(table.order('nuevo', ['a', 'b']), ['b', 'a'])
+
+    def test_save_and_load(self):
+        table = HintTable()
+        table.record('k', 'a', 0.5, True)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'hints.json')
+            table.save(path)
+            self.assertEqual(HintTable.load(path).stats, table.stats)
+            self.assertEqual(HintTable.load(os.path.join(tmp, 'missing.json')).stats, {})
+
+
+class PlanTests(TestCase):
+    """Hints come from the ODE analysis and are reordered by the table"""
+
+    def setUp(self):
+        hint_order.configure(table_path=os.devnull)
+        general_solutions.cache_clear()
+
+    def tearDown(self):
+        hint_order.configure(table_path=os.devnull)
+
+    def test_default_first(self):
+        key, hints = plan(EQUATION, y)
+        # Sin datos, solo el hint por defecto de dsolve (la clasificación rápida).
+        self.assertEqual(hints, ['nth_linear_constant_coeff_homogeneous'])
+        self.assertEqual(key, '1|poli|nth_linear_constant_coeff_homogeneous')
+        _key, all_hints = plan(EQUATION, y, full=True)
+        self.assertEqual(all_hints[0], 'separable')
+        self.assertNotIn('_Integral', ','.join(all_hints))
+
+    def test_learned_order(self):
+        key, hints = plan(EQUATION, y)
+        for _ in range(3):
+            hint_order.record(key, hints[0], 10.0, False)
+        hint_order.record(key, 'separable', 0.01, True)
+        self.assertEqual(plan(EQUATION, y)[1], ['separable', hints[0]])
+
+    def test_solve_records_attempts(self):
+        solution, hint = general_solutions.solve_with_hints(EQUATION, y)
+        self.assertEqual(hint, 'nth_linear_constant_coeff_homogeneous')
+        key, _hints = plan(EQUATION, y)
+        self.assertEqual(hint_order.get_table().stats[key][hint][:2], [1, 1])
+
+    def test_single_dsolve_without_learned_hints(self):
+        key, hints = plan(EQUATION, y)
+        with mock.patch.object(general_solutions, 'dsolve', side_effect=NotImplementedError) as dsolve:
+            with self.assertRaises(NotImplementedError):
+                general_solutions.solve_with_hints(EQUATION, y)
+        # Sin datos aprendidos no se pide la clasificación completa ni se prueban otros hints.
+        dsolve.assert_called_once()
+        self.assertEqual(hint_order.get_table().stats[key][hints[0]][:2], [1, 0])
+
+    def test_falls_through_failing_hints(self):
+        key, hints = plan(EQUATION, y)
+        # Un hint aprendido en este contexto activa el orden adaptativo.
+        hint_order.record(key, '1st_linear', 5.0, True)
+        real_dsolve = general_solutions.dsolve
+
+        def flaky(eq, func, **kwargs):
+            if kwargs['hint'] == hints[0]:
+                raise NotImplementedError
+            return real_dsolve(eq, func, **kwargs)
+
+        with mock.patch.object(general_solutions, 'dsolve', flaky):
+            _solution, hint = general_solutions.solve_with_hints(EQUATION, y)
+        # Tras fallar el de por defecto se prueba el aprendido.
+        self.assertEqual(hint, '1st_linear')
+        self.assertEqual(hint_order.get_table().stats[key][hints[0]][:2], [1, 0])
+
+    def test_attempt_log_and_fit_command(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log = os.path.join(tmp, 'hints.jsonl')
+            output = os.path.join(tmp, 'table.json')
+            hint_order.configure(table_path=os.devnull, log_path=log)
+            general_solutions.solve_with_hints(EQUATION, y)
+            with open(log, 'a') as f:
+                f.write('no es json\n')
+            call_command('fit_hint_order', log, output=output, stdout=io.StringIO())
+            with open(output) as f:
+                stats = json.load(f)['tabla']
+        self.assertEqual(stats['*']['nth_linear_constant_coeff_homogeneous'][:2], [1, 1])
@@ -0,0 +1,73 @@
+"""
+Tests for the memoized, budgeted integration service
+"""
+
+import threading
+from unittest import mock
+
+from django.test import TestCase
+from sympy import Function, Integral, checkodesol, exp, log, symbols
+from math_solver.solver_logic import integration
+from math_solver.solver_logic.integration import (
+    antiderivative, cache_info, compute_antiderivative, linear_first_order,
+)
+
+x = symbols('x')
+
+
+class StrategyOrderTests(TestCase):
+    """Cheap strategies are tried before the full integrate"""
+
+    def test_rational_uses_table(self):
+        result, strategy = compute_antiderivative(1 / (x**2 + 1), x)
+        self.assertEqual(strategy, 'tabla')
+        self.assertEqual(result.diff(x).simplify(), 1 / (x**2 + 1))
+
+    def test_manual_before_complete(self):
+        with mock.patch.object(integration, 'STRATEGIES', (
+                ('manual', integration._manual),
+                ('completa', mock.Mock(side_effect=AssertionError('no debe llamarse'))))):
+            _result, strategy = compute_antiderivative(x * exp(x), x)
+        self.assertEqual(strategy, 'manual')
+
+    def test_non_elementary_stays_unevaluated(self):
+        result, strategy = compute_antiderivative(exp(exp(x)) / log(x), x)
+        self.assertIsNone(strategy)
+        self.assertIsInstance(result, Integral)
+
+
+class CacheTests(TestCase):
+    """Antiderivatives are cached by canonical integrand"""
+
+    def setUp(self):
+        integration.cache_clear()
+
+    def test_equivalent_integrands_share_entry(self):
+        antiderivative(x * exp(x))
+        antiderivative(exp(x) * x)
+        self.assertEqual(cache_info()['hits'], 1)
+        self.assertEqual(cache_info()['size'], 1)
+
+    def test_over_budget_returns_integral_and_fills_cache_later(self):
+        release = threading.Event()
+
+        def slow(integrand, var):
+            release.wait(10)
+            return x**2 / 2, 'tabla'
+
+        with mock.patch.object(integration, 'compute_antiderivative', slow):
+            self.assertEqual(antiderivative(x, budget=0.01), Integral(x, x))
+            self.assertEqual(cache_info()['timeouts'], 1)
+            release.set()
+            # La llamada siguiente espera al mismo cálculo pendiente.
+            self.assertEqual(antiderivative(x, budget=10), x**2 / 2)
+
+
+class LinearFirstOrderTests(TestCase):
+    """Integrating-factor solution of v' + p v = q"""
+
+    def test_solution_satisfies_the_ode(self):
+        v = Function('v')(x)
+        solution, mu = linear_first_order(-2 / x, x**3, v)
+        self.assertEqual(mu, x**-2)
+        self.assertTrue(checkodesol(v.diff(x) - 2 / x * v - x**3, solution)[0])
@@ -0,0 +1,67 @@
+"""
+Tests for server-side MathML rendering
+"""
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from math_solver.solver_logic.mathml import UnsupportedTeX, render_result, render_text, tex_to_mathml
+from math_solver.solver_logic.registry import run_solver
+
+
+class TeXToMathMLTests(TestCase):
+    """The LaTeX subset produced by SymPy and the solvers"""
+
+    def test_fraction_and_scripts(self):
+        markup = tex_to_mathml(r'\frac{d^{2}}{d x^{2}} y{\left(x \right)} = C_{1} e^{- x}')
+        self.assertIn('<mfrac>', markup)
+        self.assertIn('<msup><mi>d</mi><mn>2</mn></msup>', markup)
+        self.assertIn('<msub><mi>C</mi><mn>1</mn></msub>', markup)
+        self.assertIn('display="inline"', markup)
+
+    def test_roots_functions_and_symbols(self):
+        markup = tex_to_mathml(r'\sqrt[3]{x} + \sin{\left(\alpha \right)} \pm \operatorname{erf}{\left(x \right)}')
+        self.assertIn('<mroot>', markup)
+        self.assertIn('<mi>sin</mi>', markup)
+        self.assertIn('α', markup)
+        self.assertIn('±', markup)
+        self.assertIn('<mi mathvariant="normal">erf</mi>', markup)
+
+    def test_unsupported_constructs(self):
+        with self.assertRaises(UnsupportedTeX):
+            tex_to_mathml(r'\begin{cases} x & x > 0 \end{cases}')
+        with self.assertRaises(UnsupportedTeX):
+            tex_to_mathml(r'\frac{1}{')
+
+    def test_render_text_keeps_unsupported_segments(self):
+        text, complete = render_text(r'a \( x^{2} \) y $$\unknowncmd{x}$$')
+        self.assertIn('<math', text)
+        self.assertIn(r'$$\unknowncmd{x}$$', text)
+        self.assertFalse(complete)
+
+    def test_errors_are_untouched(self):
+        self.assertEqual(render_result({'error': 'x'}), {'error': 'x'})
+
+
+class MathMLSolverTests(TestCase):
+    """Solvers in 'mathml' render mode"""
+
+    data = {'second_a_val': '1', 'second_b_val': '0', 'second_c_val': '4'}
+
+    def test_solution_uses_sympy_printer(self):
+        result = run_solver('second_order_homogeneous', self.data, render='mathml')
+        self.assertTrue(result['solucion'].startswith('<math'))
+        self.assertNotIn('$$', result['solucion'])
+        self.assertFalse(result['requiere_mathjax'])
+        self.assertFalse(any(r'\(' in step for step in result['steps']))
+
+    def test_latex_is_still_the_default(self):
+        result = run_solver('second_order_homogeneous', self.data)
+        self.assertTrue(result['solucion'].startswith('$$'))
+        self.assertNotIn('render', result)
+
+    @override_settings(SOLVER_RENDER_MODE='mathml')
+    def test_view_returns_mathml_and_skips_mathjax(self):
+        caches['default'].clear()
+        response = self.client.post('/solver/', dict(self.data, solver_type='second_order_homogeneous'))
+        self.assertContains(response, '<math xmlns=')
+        self.assertNotContains(response, 'id="MathJax-script"')
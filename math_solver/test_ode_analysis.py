@@ -0,0 +1,56 @@
+"""
+Tests for the shared ODE analysis
+"""
+
+from unittest import mock
+
+from django.test import TestCase
+from sympy import Eq, Function, dsolve, symbols
+from math_solver.solver_logic import ode_analysis
+from math_solver.solver_logic.ode_analysis import analyze
+
+x = symbols('x')
+y = Function('y')(x)
+
+
+class ODEAnalysisTests(TestCase):
+    """Classification is computed once and reused by dsolve"""
+
+    def setUp(self):
+        ode_analysis.cache_clear()
+
+    def test_one_analysis_per_equation(self):
+        ecuacion = Eq(y.diff(x), x * y)
+        self.assertIs(analyze(ecuacion, y), analyze(Eq(y.diff(x), y * x), y))
+
+    def test_classifies_once(self):
+        ecuacion = Eq(y.diff(x) + y, x)
+        with mock.patch.object(ode_analysis, 'classify_ode', wraps=ode_analysis.classify_ode) as spy:
+            analysis = analyze(ecuacion, y)
+            for _ in range(3):
+                analysis.dsolve_kwargs()
+            self.assertEqual(spy.call_count, 1)
+            for _ in range(3):
+                analysis.matches('separable')
+            self.assertEqual(spy.call_count, 2)
+
+    def test_same_solution_as_dsolve(self):
+        for ecuacion in (Eq(y.diff(x), y), Eq(y.diff(x, 2) + y, 0), Eq(y.diff(x), y**2 - 2 / x**2)):
+            analysis = analyze(ecuacion, y)
+            self.assertEqual(dsolve(ecuacion, y, **analysis.dsolve_kwargs()), dsolve(ecuacion, y))
+        ecuacion = Eq(y.diff(x), y)
+        self.assertEqual(dsolve(ecuacion, y, **analyze(ecuacion, y).dsolve_kwargs('separable')),
+                         dsolve(ecuacion, y, hint='separable'))
+
+    def test_default_is_dsolve_default(self):
+        analysis = analyze(Eq(y.diff(x), y), y)
+        self.assertEqual(analysis.default_hint, 'nth_linear_constant_coeff_homogeneous')
+        self.assertEqual(analysis.order, 1)
+        self.assertIn('separable', analysis.hints)
+        self.assertNotIn('separable_Integral', analysis.hints)
+
+    def test_errors_match_dsolve(self):
+        analysis = analyze(Eq(y.diff(x), y), y)
+        with self.assertRaises(ValueError):
+            analysis.dsolve_kwargs('Bessel')
+        self.assertFalse(analysis.matches('Bessel'))
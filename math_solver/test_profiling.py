@@ -0,0 +1,57 @@
+"""
+Tests for the opt-in per-request solver profiler
+"""
+
+import pstats
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase, override_settings
+from math_solver.middleware import make_profile_token
+
+
+class SolverProfilerMiddlewareTests(TestCase):
+    """Profiles are only written when explicitly requested"""
+
+    data = {'solver_type': 'quadratic', 'quad_a_val': '1', 'quad_b_val': '0', 'quad_c_val': '-1'}
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def profiles(self):
+        return list(Path(self.tmp.name).glob('*.pstats'))
+
+    def test_disabled_by_default(self):
+        with override_settings(SOLVER_PROFILING_DIR=self.tmp.name):
+            self.client.post('/solver/', self.data, HTTP_X_SOLVER_PROFILE=make_profile_token())
+        self.assertEqual(self.profiles(), [])
+
+    def test_signed_header_writes_pstats(self):
+        with override_settings(SOLVER_PROFILING_ENABLED=True, SOLVER_PROFILING_DIR=self.tmp.name):
+            response = self.client.post('/solver/', self.data, HTTP_X_SOLVER_PROFILE=make_profile_token())
+        self.assertEqual(response.status_code, 200)
+        files = self.profiles()
+        self.assertEqual(len(files), 1)
+        self.assertIn('-quadratic-', files[0].name)
+        # The file must be loadable by the standard pstats tooling
+        self.assertGreater(pstats.Stats(str(files[0])).total_calls, 0)
+
+    def test_invalid_token_is_ignored(self):
+        with override_settings(SOLVER_PROFILING_ENABLED=True, SOLVER_PROFILING_DIR=self.tmp.name):
+            self.client.post('/solver/', self.data, HTTP_X_SOLVER_PROFILE='forged')
+        self.assertEqual(self.profiles(), [])
+
+    def test_sample_rate(self):
+        with override_settings(SOLVER_PROFILING_ENABLED=True, SOLVER_PROFILING_DIR=self.tmp.name,
+                               SOLVER_PROFILING_SAMPLE_RATE=1.0):
+            self.client.post('/solver/', self.data)
+        self.assertEqual(len(self.profiles()), 1)
+
+    def test_same_input_same_tag(self):
+        with override_settings(SOLVER_PROFILING_ENABLED=True, SOLVER_PROFILING_DIR=self.tmp.name,
+                               SOLVER_PROFILING_SAMPLE_RATE=1.0):
+            self.client.post('/solver/', self.data)
+            self.client.post('/solver/', dict(self.data, quad_c_val=' -1 '))
+        tags = {path.stem.rsplit('-', 1)[-1] for path in self.profiles()}
+        self.assertEqual(len(tags), 1)
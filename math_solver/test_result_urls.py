@@ -0,0 +1,83 @@
+"""
+Tests for cacheable GET result URLs
+"""
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from math_solver.solver_logic.registry import input_hash
+from math_solver.views import result_url
+
+
+class ResultUrlTests(TestCase):
+    """Canonical GET endpoint with ETag and conditional requests"""
+
+    data = {'quad_a_val': '1', 'quad_b_val': '0', 'quad_c_val': '-1'}
+
+    def setUp(self):
+        caches['default'].clear()
+
+    def test_url_is_canonical(self):
+        url = result_url('quadratic', self.data)
+        spelled = result_url('quadratic', {'quad_a_val': ' 1', 'quad_b_val': '0*x', 'quad_c_val': '-1'})
+        self.assertTrue(url.startswith(f"/solver/quadratic/{input_hash('quadratic', self.data)}/?"))
+        self.assertEqual(url.split('?')[0], spelled.split('?')[0])
+
+    def test_get_returns_cacheable_json(self):
+        response = self.client.get(result_url('quadratic', self.data) + '&format=json')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.json()['success'])
+        self.assertIn('solucion', response.json()['data'])
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('max-age', response['Cache-Control'])
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_if_none_match_returns_304(self):
+        url = result_url('quadratic', self.data)
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_html_is_private(self):
+        response = self.client.get(result_url('quadratic', self.data))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertNotIn('public', response['Cache-Control'])
+        self.assertNotIn('immutable', response['Cache-Control'])
+
+    def test_html_and_json_have_different_etags(self):
+        url = result_url('quadratic', self.data)
+        self.assertNotEqual(self.client.get(url)['ETag'], self.client.get(url + '&format=json')['ETag'])
+
+    def test_wrong_hash_redirects_to_canonical(self):
+        url = result_url('quadratic', self.data)
+        wrong = url.replace(input_hash('quadratic', self.data), '0' * 64)
+        response = self.client.get(wrong)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response['Location'], url)
+
+    def test_url_carries_result_version(self):
+        url = result_url('quadratic', self.data)
+        self.assertIn('v=3-latex', url)
+        with override_settings(SOLVER_RESULT_VERSION=4):
+            response = self.client.get(url + '&format=json')
+            self.assertEqual(response.status_code, 302)
+            self.assertEqual(response['Location'], result_url('quadratic', self.data) + '&format=json')
+        with override_settings(SOLVER_RENDER_MODE='mathml'):
+            self.assertEqual(self.client.get(url).status_code, 302)
+        self.assertEqual(self.client.get(url.replace('&v=3-latex', '')).status_code, 302)
+
+    def test_errors_are_not_cached(self):
+        response = self.client.get(result_url('quadratic', {'quad_a_val': '0', 'quad_b_val': '0',
+                                                             'quad_c_val': '1'}) + '&format=json')
+        self.assertNotIn('ETag', response)
+        self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_unknown_solver_is_404(self):
+        self.assertEqual(self.client.get('/solver/nope/abc/').status_code, 404)
+
+    def test_post_links_permalink(self):
+        response = self.client.post('/solver/', dict(self.data, solver_type='quadratic'),
+                                    HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertEqual(response.json()['data']['permalink'], result_url('quadratic', self.data))
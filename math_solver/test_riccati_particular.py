@@ -0,0 +1,97 @@
+"""
+Tests for the Riccati particular-solution search and linear reduction
+"""
+
+from unittest import mock
+
+from django.test import TestCase
+from sympy import Eq, Function, S, checkodesol, exp, symbols
+from math_solver.benchmarks.runner import count_dsolve_calls
+from math_solver.solver_logic import general_solutions
+from math_solver.solver_logic.riccati_particular import (
+    degree_bounds, find_particular_solution, is_particular_solution, reduce_to_linear,
+)
+from math_solver.solver_logic.riccati_solver import solve_riccati
+from math_solver.solver_logic.verification import verify_result
+
+x = symbols('x')
+y = Function('y')(x)
+
+
+class ParticularSolutionSearchTests(TestCase):
+    """Constant, monomial and polynomial candidates"""
+
+    def test_constant(self):
+        self.assertEqual(find_particular_solution(S(1), S(0), S(-1), x), -1)
+
+    def test_monomial(self):
+        self.assertEqual(find_particular_solution(S(-1), S(0), 1 + x**2, x), x)
+
+    def test_negative_power(self):
+        self.assertEqual(find_particular_solution(S(1), -1 / x, -1 / x**2, x), -1 / x)
+
+    def test_degree_bounds(self):
+        self.assertEqual(degree_bounds(S(1), S(0), x**2, x), (2, 1))
+        self.assertIsNone(degree_bounds(exp(x), S(0), S(0), x))
+
+    def test_not_found(self):
+        self.assertIsNone(find_particular_solution(S(1), S(0), x, x))
+
+
+class ReduceToLinearTests(TestCase):
+    """y = y_p + 1/v and the integrating factor"""
+
+    def test_general_solution_satisfies_the_ode(self):
+        P, Q, R = S(1), -2 * x, x**2 + 1
+        solution, steps = reduce_to_linear(P, Q, R, x, y)
+        self.assertTrue(checkodesol(Eq(y.diff(x), P * y**2 + Q * y + R), solution)[0])
+        self.assertTrue(any('Factor integrante' in step for step in steps))
+
+    def test_checks_user_particular_solution(self):
+        self.assertTrue(is_particular_solution(S(1), -1 / x, -1 / x**2, -1 / x, x))
+        self.assertFalse(is_particular_solution(S(1), -1 / x, -1 / x**2, x, x))
+
+
+class SolveRiccatiTests(TestCase):
+    """solve_riccati finishes with one linear solve when y_p is known"""
+
+    def setUp(self):
+        general_solutions.cache_clear()
+
+    def test_search_avoids_dsolve(self):
+        with count_dsolve_calls() as counter:
+            result = solve_riccati('1', '-2*x', 'x**2 + 1')
+        self.assertNotIn('error', result)
+        self.assertEqual(counter['calls'], 0)
+        self.assertIn('Solución particular encontrada', ' '.join(result['steps']))
+
+    def test_user_particular_solution(self):
+        result = solve_riccati('1/x**2', '-1/x', '1', yp_str='x')
+        self.assertIn('Se usa la solución particular dada', ' '.join(result['steps']))
+        self.assertIn('solucion', result)
+
+    def test_wrong_user_particular_solution_falls_back_to_search(self):
+        result = solve_riccati('1', '0', '-1', yp_str='x')
+        steps = ' '.join(result['steps'])
+        self.assertIn('no satisface', steps)
+        self.assertIn('Solución particular encontrada', steps)
+
+    def test_invalid_particular_solution(self):
+        self.assertIn('error', solve_riccati('1', '0', '-1', yp_str='x +* 2'))
+
+    def test_initial_value_problem(self):
+        result = solve_riccati('1', '0', '-1', '0', '0')
+        self.assertNotIn('error', result)
+        steps = ' '.join(result['steps'])
+        self.assertIn('condiciones iniciales', steps)
+        # La solución general sale de la reducción a lineal, no de la caché.
+        self.assertNotIn('Se reutiliza', steps)
+
+    def test_fallback_branch_applies_initial_conditions(self):
+        # Sin dsolve directo, P = 0 cae en el caso lineal, que también debe
+        # particularizar la solución para que la verificación de las ICs pase.
+        with mock.patch('math_solver.solver_logic.riccati_solver.solve_ivp', side_effect=NotImplementedError):
+            result = solve_riccati('0', '1', 'x', '0', '1')
+        self.assertEqual(result['metodo'], 'lineal')
+        self.assertNotIn('C_{1}', result['solucion'])
+        self.assertTrue(verify_result(result)['ok'])
@@ -0,0 +1,177 @@
+"""
+Tests for the incremental power-series engine and the series endpoint
+"""
+
+import math
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from sympy import Function, Rational, S, Symbol, exp, sin, symbols
+from math_solver import fair_share
+from math_solver.solver_logic import series_engine
+from math_solver.solver_logic.second_order_solver import _series_solution
+from math_solver.solver_logic.series_engine import (
+    SeriesError, from_spec, linear_second_order_spec, riccati_spec, series_fallback, series_result,
+)
+
+x = symbols('x')
+C1, C2 = Symbol('C1'), Symbol('C2')
+
+
+class RecurrenceTests(TestCase):
+    """Coefficients from the Riccati and linear recurrences"""
+
+    def setUp(self):
+        series_engine.cache_clear()
+
+    def test_riccati_tan(self):
+        # y' = y² + 1, y(0) = 0  ->  tan(x)
+        solution = from_spec(riccati_spec(S(1), S(0), S(1), 0, S(0)))
+        solution.extend(7)
+        self.assertEqual(solution.coefficients, [0, 1, 0, Rational(1, 3), 0, Rational(2, 15), 0, Rational(17, 315)])
+
+    def test_tan_radius(self):
+        solution = from_spec(riccati_spec(S(1), S(0), S(1), 0, S(0)))
+        solution.extend(30)
+        self.assertAlmostEqual(solution.radius(), math.pi / 2, places=2)
+
+    def test_airy(self):
+        # y'' - x y = 0: a_{n+2} = a_{n-1} / ((n+2)(n+1))
+        solution = from_spec(linear_second_order_spec(S(1), S(0), -x, S(0)))
+        solution.extend(6)
+        self.assertEqual(solution.coefficients[:4], [C1, C2, 0, C1 / 6])
+        self.assertEqual(solution.coefficients[4], C2 / 12)
+        self.assertEqual(solution.coefficients[6], C1 / 180)
+
+    def test_non_polynomial_coefficients(self):
+        # y'' + y = exp(x), y(0) = y'(0) = 0  ->  (e^x - cos x - sin x) / 2
+        solution = from_spec(linear_second_order_spec(S(1), S(0), S(1), exp(x), 0, S(0), S(0)))
+        solution.extend(4)
+        self.assertEqual(solution.coefficients, [0, 0, Rational(1, 2), Rational(1, 6), 0])
+
+    def test_singular_point(self):
+        with self.assertRaises(SeriesError):
+            from_spec(linear_second_order_spec(x, S(0), S(1), S(0)))
+        with self.assertRaises(SeriesError):
+            from_spec(riccati_spec(1 / x, S(0), S(0), 0, S(1))).extend(3)
+
+    def test_fallback_moves_away_from_singular_point(self):
+        spec = series_fallback(lambda x0: linear_second_order_spec(x, S(0), S(1), S(0), x0))
+        self.assertEqual(from_spec(spec).x0, 1)
+        self.assertIsNone(series_fallback(lambda x0: linear_second_order_spec(x, S(0), S(1), S(0), x0), 0))
+
+
+class IncrementalExtensionTests(TestCase):
+    """Extending keeps the computed terms and respects the budget"""
+
+    def setUp(self):
+        series_engine.cache_clear()
+
+    def test_extension_reuses_coefficients(self):
+        spec = riccati_spec(S(1), S(0), S(1), 0, S(0))
+        solution = from_spec(spec)
+        solution.extend(5)
+        first = solution.coefficients[:6]
+        self.assertEqual(series_result(spec, 10)['orden'], 10)
+        self.assertIs(from_spec(spec), solution)
+        for old, new in zip(first, solution.coefficients):
+            self.assertIs(old, new)
+
+    def test_lower_order_after_higher(self):
+        spec = riccati_spec(S(1), S(0), S(1), 0, S(0))
+        fresh = series_result(spec, 3)
+        series_engine.cache_clear()
+        self.assertEqual(series_result(spec, 8)['orden'], 8)
+        result = series_result(spec, 3)
+        self.assertEqual(result['orden'], 3)
+        self.assertEqual(len(result['coeficientes']), 4)
+        self.assertEqual(result['radio'], fresh['radio'])
+
+    def test_budget_returns_reached_order(self):
+        spec = linear_second_order_spec(S(1), S(0), sin(x), S(0))
+        self.assertLess(series_result(spec, 40, budget=0)['orden'], 40)
+
+    def test_order_is_capped(self):
+        solution = from_spec(riccati_spec(S(0), S(1), S(0), 0, S(1)))
+        self.assertEqual(solution.extend(series_engine.MAX_ORDER + 10), series_engine.MAX_ORDER)
+
+
+class SeriesViewTests(TestCase):
+    """GET /solver/series/<id>/"""
+
+    def setUp(self):
+        series_engine.cache_clear()
+        self.spec = riccati_spec(S(1), S(0), S(1), 0, S(0))
+        self.series_id = series_result(self.spec, 2)['serie_id']
+
+    def test_unknown_series_is_404(self):
+        response = self.client.get(reverse('math_solver:series', args=['0' * 32]))
+        self.assertEqual(response.status_code, 404)
+
+    def test_extends_cached_series(self):
+        caches[settings.SOLVER_RESULT_CACHE].set(f'series:{self.series_id}', self.spec)
+        response = self.client.get(reverse('math_solver:series', args=[self.series_id]), {'order': 5})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual(data['orden'], 5)
+        self.assertEqual(data['coeficientes'], ['0', '1', '0', '1/3', '0', '2/15'])
+
+    def test_expired_series_is_rebuilt(self):
+        response = self.client.post('/solver/', {
+            'solver_type': 'second_order_homogeneous',
+            'second_a_val': '1', 'second_b_val': '0', 'second_c_val': 'sin(x)',
+        }, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        serie = response.json()['data']['serie']
+        caches[settings.SOLVER_RESULT_CACHE].delete(f"series:{serie['serie_id']}")
+        response = self.client.get(f"{serie['url']}&order=6")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['orden'], 6)
+
+    def test_source_of_another_series_is_404(self):
+        caches[settings.SOLVER_RESULT_CACHE].delete(f'series:{self.series_id}')
+        url = reverse('math_solver:series', args=[self.series_id])
+        response = self.client.get(url, {'tipo': 'quadratic', 'quad_a_val': '1'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_order(self):
+        caches[settings.SOLVER_RESULT_CACHE].set(f'series:{self.series_id}', self.spec)
+        url = reverse('math_solver:series', args=[self.series_id])
+        self.assertEqual(self.client.get(url, {'order': 'abc'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'order': settings.SOLVER_SERIES_MAX_ORDER + 1}).status_code, 400)
+
+    def test_non_finite_budget(self):
+        caches[settings.SOLVER_RESULT_CACHE].set(f'series:{self.series_id}', self.spec)
+        url = reverse('math_solver:series', args=[self.series_id])
+        for budget in ('nan', 'inf', '-1'):
+            self.assertEqual(self.client.get(url, {'order': 5, 'budget_ms': budget}).status_code, 400)
+        self.assertEqual(self.client.post(url).status_code, 405)
+
+    def test_rate_limited(self):
+        caches[settings.SOLVER_RESULT_CACHE].set(f'series:{self.series_id}', self.spec)
+        url = reverse('math_solver:series', args=[self.series_id])
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'state.sqlite3')
+            with override_settings(SOLVER_RATE_LIMIT_ENABLED=True, SOLVER_STATE_DB=db_path):
+                fair_share.charge(db_path, 'ip:127.0.0.1', 1000.0, *fair_share.limits_for('ip:'))
+                response = self.client.get(url, {'order': 5})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+
+class SolverFallbackTests(TestCase):
+    """Second-order solvers fall back to the series engine"""
+
+    def setUp(self):
+        series_engine.cache_clear()
+
+    def test_series_solution_result(self):
+        steps = []
+        result = _series_solution(S(1), S(0), sin(x), S(0), Function('y')(x), steps, 5, (S(0), S(1), S(0)))
+        self.assertIn('serie', result)
+        self.assertEqual(result['serie']['coeficientes'][:3], ['1', '0', '0'])
+        self.assertIn('serie_spec', result['serie'])
+        self.assertTrue(result['steps'])
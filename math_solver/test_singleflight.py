@@ -0,0 +1,142 @@
+"""
+Tests for single-flight coalescing of identical solves
+"""
+
+import os
+import tempfile
+import threading
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from math_solver import singleflight, views
+
+
+class SingleFlightTests(TestCase):
+    """Concurrent calls with the same key share a single execution"""
+
+    def run_concurrently(self, key, fn, n=5, **kwargs):
+        results = [None] * n
+
+        def call(i):
+            results[i] = singleflight.do(key, fn, **kwargs)
+
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(n)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def slow_counter(self):
+        calls = []
+
+        def fn():
+            calls.append(1)
+            time.sleep(0.2)
+            return {'solucion': 'y = x'}
+
+        return calls, fn
+
+    def test_in_process_calls_coalesce(self):
+        calls, fn = self.slow_counter()
+        results = self.run_concurrently('in-process', fn)
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result == {'solucion': 'y = x'} for result in results))
+
+    def test_store_row_coalesces_and_is_reused(self):
+        calls, fn = self.slow_counter()
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'state.sqlite3')
+            self.run_concurrently('cross-process', fn, db_path=db_path)
+            self.assertEqual(len(calls), 1)
+            # Una llamada posterior dentro del TTL reutiliza el resultado guardado.
+            result = singleflight.do('cross-process', fn, db_path=db_path, result_ttl=30)
+            self.assertEqual(result, {'solucion': 'y = x'})
+            self.assertEqual(len(calls), 1)
+            # Con el TTL vencido se vuelve a calcular.
+            singleflight.do('cross-process', fn, db_path=db_path, result_ttl=0)
+            self.assertEqual(len(calls), 2)
+
+    def test_waiter_sees_other_process_result(self):
+        calls, fn = self.slow_counter()
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'state.sqlite3')
+            connection = singleflight._connect(db_path)
+            # Simula un líder de otro proceso que termina mientras se espera.
+            connection.execute(
+                "INSERT INTO singleflight (key, owner, status, started) VALUES ('k', 'other', 'running', ?)",
+                (time.time(),),
+            )
+            timer = threading.Timer(0.2, lambda: singleflight._connect(db_path).execute(
+                "UPDATE singleflight SET status = 'done', result = '{\"solucion\": \"y = 2\"}', "
+                "finished = ? WHERE key = 'k'", (time.time(),)))
+            timer.start()
+            result = singleflight.do('k', fn, db_path=db_path)
+            timer.join()
+        self.assertEqual(result, {'solucion': 'y = 2'})
+        self.assertEqual(calls, [])
+
+    def test_expired_lease_is_taken_over(self):
+        calls, fn = self.slow_counter()
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'state.sqlite3')
+            singleflight._connect(db_path).execute(
+                "INSERT INTO singleflight (key, owner, status, started) VALUES ('k', 'dead', 'running', ?)",
+                (time.time() - 600,),
+            )
+            result = singleflight.do('k', fn, db_path=db_path, lease=60)
+        self.assertEqual(result, {'solucion': 'y = x'})
+        self.assertEqual(len(calls), 1)
+
+    def test_leader_error_lets_followers_compute(self):
+        state = {'calls': 0}
+
+        def flaky():
+            state['calls'] += 1
+            if state['calls'] == 1:
+                time.sleep(0.2)
+                raise RuntimeError('fallo del líder')
+            return {'solucion': 'ok'}
+
+        results = []
+        errors = []
+
+        def call():
+            try:
+                results.append(singleflight.do('flaky', flaky))
+            except RuntimeError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+            time.sleep(0.02)
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(results, [{'solucion': 'ok'}, {'solucion': 'ok'}])
+
+
+class SolveKeyTests(TestCase):
+    """Shared solves are keyed by SOLVER_RESULT_VERSION and stored outside the project"""
+
+    data = {'quad_a_val': '1', 'quad_b_val': '0', 'quad_c_val': '-1'}
+
+    def test_key_includes_result_version(self):
+        keys = []
+
+        def do(key, fn, **kwargs):
+            keys.append(key)
+            return fn()
+
+        with mock.patch.object(singleflight, 'do', side_effect=do):
+            for version in (1, 2):
+                with override_settings(SOLVER_RESULT_VERSION=version):
+                    views.solve_once('quadratic', self.data)
+        self.assertEqual(len(keys), 2)
+        self.assertNotEqual(keys[0], keys[1])
+
+    def test_tests_use_a_temporary_state_db(self):
+        self.assertNotEqual(os.path.dirname(settings.SOLVER_STATE_DB), str(settings.BASE_DIR))
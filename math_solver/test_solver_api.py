@@ -0,0 +1,69 @@
+"""
+Tests for the typed library API over the solvers
+"""
+
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import TestCase
+from sympy import Eq, Function, Rational, cos, symbols
+from math_solver.solver_logic import Solution, SolverError, api, solve
+from math_solver.solver_logic.registry import run_solver
+
+x = symbols('x')
+y = Function('y')(x)
+
+
+class SolverAPITests(TestCase):
+    """Solvers return SymPy objects without building presentation output"""
+
+    def test_sympy_and_string_arguments(self):
+        from_objects = api.bernoulli(1 / x, x, 2)
+        from_strings = api.bernoulli('1/x', 'x', '2')
+        self.assertIsInstance(from_objects, Solution)
+        self.assertEqual(from_objects.solution, from_strings.solution)
+        self.assertEqual(from_objects.equation.lhs, y.diff(x) + y / x)
+        self.assertEqual(from_objects.method, 'bernoulli')
+        self.assertGreater(from_objects.elapsed_s, 0)
+        self.assertGreaterEqual(from_objects.cpu_s, 0)
+
+    def test_quadratic_roots_and_numbers(self):
+        sol = api.quadratic(2, 0, Rational(-1, 2))
+        self.assertEqual(sol.solution, [Rational(-1, 2), Rational(1, 2)])
+        self.assertEqual(solve('quadratic', '1', '-5', '6').solution, [2, 3])
+
+    def test_initial_conditions(self):
+        sol = api.second_order_homogeneous(1, 0, 1, 0, 1, 0)
+        self.assertEqual(sol.solution, Eq(y, cos(x)))
+        self.assertEqual(sol.ics, {y.subs(x, 0): 1, y.diff(x).subs(x, 0): 0})
+
+    def test_riccati_coefficients(self):
+        sol = api.riccati(2, 3, 5)
+        self.assertEqual(sol.equation, Eq(y.diff(x), 2 * y**2 + 3 * y + 5))
+
+    def test_lazy_presentation(self):
+        sol = api.riccati(-2 / x**2, 0, 1)
+        self.assertIsNone(sol._steps)
+        self.assertNotIn('solucion_srepr', sol.details)
+        expected = run_solver('riccati', {'riccati_p_function': '-2/x**2', 'riccati_q_function': '0',
+                                          'riccati_r_function': '1'})
+        self.assertEqual(sol.steps, expected['steps'])
+        self.assertIn(r'\frac', sol.latex)
+
+    def test_errors(self):
+        with self.assertRaises(SolverError):
+            api.quadratic(0, 1, 1)
+        with self.assertRaises(ValueError):
+            solve('desconocido', 1)
+        with self.assertRaises(TypeError):
+            api.solve('clairaut', 'p**2', 1)
+
+    def test_importable_without_django(self):
+        env = {key: value for key, value in os.environ.items() if key != 'DJANGO_SETTINGS_MODULE'}
+        code = ("import sys; from math_solver.solver_logic import api; "
+                "print(api.quadratic(1, -3, 2).solution, any(m.startswith('django') for m in sys.modules))")
+        output = subprocess.run([sys.executable, '-c', code], cwd=settings.BASE_DIR, env=env,
+                                capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), '[1, 2] False')
@@ -0,0 +1,260 @@
+"""
+Tests for the remote solver worker protocol and client pool
+"""
+
+import io
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from math_solver import jobs, solver_rpc
+from math_solver.solver_logic.registry import run_solver
+from math_solver.solver_rpc import (
+    NoWorkersAvailable, ProtocolError, RemoteSolverError, WorkerPool, make_server, parse_address,
+    read_frame, write_frame,
+)
+
+DATA = {'second_a_val': '1', 'second_b_val': '0', 'second_c_val': '1'}
+
+
+def free_address():
+    """Una dirección TCP de localhost en la que no escucha nadie."""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return f'127.0.0.1:{sock.getsockname()[1]}'
+
+
+class ThreadWorkerMixin:
+    """Trabajadores en hilos de este mismo proceso."""
+
+    def start_worker(self, address='127.0.0.1:0'):
+        server = make_server(address)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+
+class ProtocolTests(SimpleTestCase):
+    """Length-prefixed JSON frames"""
+
+    def test_round_trip(self):
+        stream = io.BytesIO()
+        write_frame(stream, {'op': 'ping', 'texto': 'ecuación'})
+        write_frame(stream, {'op': 'solve'})
+        stream.seek(0)
+        self.assertEqual(read_frame(stream), {'op': 'ping', 'texto': 'ecuación'})
+        self.assertEqual(read_frame(stream), {'op': 'solve'})
+        with self.assertRaises(EOFError):
+            read_frame(stream)
+
+    def test_oversized_frame(self):
+        stream = io.BytesIO((solver_rpc.MAX_FRAME + 1).to_bytes(4, 'big'))
+        with self.assertRaises(ProtocolError):
+            read_frame(stream)
+
+    def test_parse_address(self):
+        self.assertEqual(parse_address('10.0.0.5:7601'), ('tcp', ('10.0.0.5', 7601)))
+        self.assertEqual(parse_address('unix:/run/solver.sock'), ('unix', '/run/solver.sock'))
+        with self.assertRaises(ValueError):
+            parse_address('sin-puerto')
+
+
+class WorkerPoolTests(ThreadWorkerMixin, SimpleTestCase):
+    """Pooled connections, least-loaded routing and retries"""
+
+    def test_solve_matches_local(self):
+        server = self.start_worker()
+        pool = WorkerPool([server.address])
+        stats = {}
+        self.assertEqual(pool.solve('second_order_homogeneous', DATA, stats=stats),
+                         run_solver('second_order_homogeneous', DATA))
+        self.assertIn('cpu_s', stats)
+        # La conexión se reutiliza.
+        pool.solve('second_order_homogeneous', DATA)
+        self.assertEqual(len(pool.workers[0].idle), 1)
+        pool.close()
+
+    def test_worker_errors_are_raised(self):
+        server = self.start_worker()
+        pool = WorkerPool([server.address])
+        with self.assertRaises(RemoteSolverError):
+            pool.call({'op': 'desconocida'})
+
+    def test_least_loaded(self):
+        busy, idle = self.start_worker(), self.start_worker()
+        pool = WorkerPool([busy.address, idle.address])
+        pool.workers[0].load = 3
+        self.assertIs(pool._pick(set()), pool.workers[1])
+
+    def test_retry_on_dead_worker(self):
+        server = self.start_worker()
+        pool = WorkerPool([free_address(), server.address], health_interval=60)
+        self.assertIn('solucion', pool.solve('second_order_homogeneous', DATA))
+        self.assertFalse(pool.workers[0].healthy)
+        self.assertEqual(pool.check_health(), {pool.workers[0].address: False, server.address: True})
+
+    def test_no_workers(self):
+        pool = WorkerPool([free_address()], retries=0)
+        with self.assertRaises(NoWorkersAvailable):
+            pool.solve('second_order_homogeneous', DATA)
+
+    def test_timeout_is_not_resent(self):
+        server = self.start_worker()
+        pool = WorkerPool([server.address], timeout=0.3)
+        self.assertTrue(pool.check_health()[server.address])
+        calls = []
+
+        def slow(request):
+            calls.append(request)
+            time.sleep(1)
+            return {'ok': True, 'load': 0, 'result': {}}
+
+        with mock.patch.object(server.worker, '_solve', side_effect=slow):
+            with self.assertRaises(socket.timeout):
+                pool.solve('second_order_homogeneous', DATA)
+            time.sleep(1)
+        # El solve lento se envió una sola vez, por la conexión reutilizada.
+        self.assertEqual(len(calls), 1)
+        pool.close()
+
+    def test_closed_idle_connection_is_replaced(self):
+        listener = socket.socket()
+        listener.bind(('127.0.0.1', 0))
+        listener.listen()
+        self.addCleanup(listener.close)
+        closed = threading.Event()
+
+        def serve():
+            # Responde a una petición por conexión y la cierra, como un trabajador reiniciado.
+            while True:
+                try:
+                    connection, _ = listener.accept()
+                except OSError:
+                    return
+                with connection, connection.makefile('rwb') as stream:
+                    read_frame(stream)
+                    write_frame(stream, {'ok': True, 'load': 0})
+                closed.set()
+
+        threading.Thread(target=serve, daemon=True).start()
+        address = f'127.0.0.1:{listener.getsockname()[1]}'
+        pool = WorkerPool([address])
+        self.assertTrue(pool.check_health()[address])
+        self.assertTrue(closed.wait(timeout=10))
+        self.assertTrue(pool.check_health()[address])
+        pool.close()
+
+    def test_get_pool_per_options(self):
+        address = free_address()
+        self.assertIs(solver_rpc.get_pool([address], timeout=5.0), solver_rpc.get_pool([address], timeout=5.0))
+        self.assertEqual(solver_rpc.get_pool([address], timeout=7.0).timeout, 7.0)
+
+    def test_unix_socket(self):
+        if solver_rpc._UnixServer is None:
+            self.skipTest('Sin sockets Unix')
+        with tempfile.TemporaryDirectory() as tmp:
+            server = self.start_worker(f"unix:{os.path.join(tmp, 'solver.sock')}")
+            pool = WorkerPool([server.address])
+            self.assertTrue(pool.check_health()[server.address])
+            pool.close()
+
+
+class WorkerProcessTests(SimpleTestCase):
+    """Several 'solver_worker' processes on localhost"""
+
+    def start_process(self):
+        process = subprocess.Popen(
+            [sys.executable, '-u', 'manage.py', 'solver_worker', '--bind', '127.0.0.1:0'],
+            cwd=settings.BASE_DIR, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+        self.addCleanup(process.wait, timeout=30)
+        self.addCleanup(process.kill)
+        line = process.stdout.readline()
+        self.assertIn('escuchando en', line)
+        return process, line.rsplit(' ', 1)[1].strip()
+
+    def test_failover_between_processes(self):
+        (first, first_address), (_second, second_address) = self.start_process(), self.start_process()
+        pool = WorkerPool([first_address, second_address], health_interval=60)
+        self.assertEqual(pool.check_health(), {first_address: True, second_address: True})
+        self.assertIn('solucion', pool.solve('second_order_homogeneous', DATA))
+
+        first.kill()
+        first.wait(timeout=30)
+        for _ in range(3):
+            self.assertIn('solucion', pool.solve('second_order_homogeneous', DATA))
+        self.assertEqual(pool.check_health(), {first_address: False, second_address: True})
+        pool.close()
+
+
+@override_settings(SOLVER_SINGLEFLIGHT_ENABLED=False)
+class RemoteViewTests(ThreadWorkerMixin, TestCase):
+    """main_solver_view sends solves to SOLVER_REMOTE_WORKERS"""
+
+    data = dict(DATA, solver_type='second_order_homogeneous')
+
+    def setUp(self):
+        caches['default'].clear()
+
+    def post(self):
+        return self.client.post('/solver/', self.data, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+
+    def test_remote_solve(self):
+        server = self.start_worker()
+        with override_settings(SOLVER_REMOTE_WORKERS=[server.address]):
+            response = self.post()
+        self.assertTrue(response.json()['success'])
+        self.assertEqual(server.worker.served, 1)
+
+    def test_local_fallback(self):
+        with override_settings(SOLVER_REMOTE_WORKERS=[free_address()], SOLVER_REMOTE_RETRIES=0):
+            with self.assertLogs('math_solver.views', 'WARNING'):
+                self.assertTrue(self.post().json()['success'])
+        caches['default'].clear()
+        with override_settings(SOLVER_REMOTE_WORKERS=[free_address()], SOLVER_REMOTE_RETRIES=0,
+                               SOLVER_REMOTE_FALLBACK_LOCAL=False):
+            self.assertFalse(self.post().json()['success'])
+
+
+class RemoteJobTests(ThreadWorkerMixin, TestCase):
+    """run_job uses the remote worker settings and the local fallback"""
+
+    def run_job(self, remote):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'state.sqlite3')
+            job_id = uuid.uuid4().hex
+            jobs._connect(db_path).execute(
+                "INSERT INTO solve_jobs (id, solver_type, status, created) VALUES (?, ?, ?, 0)",
+                (job_id, 'second_order_homogeneous', jobs.JOB_QUEUED),
+            )
+            jobs.run_job(db_path, job_id, 'second_order_homogeneous', DATA, {}, remote=remote)
+            with override_settings(SOLVER_STATE_DB=db_path):
+                return jobs.get_job(job_id)
+
+    def test_remote_options_from_settings(self):
+        server = self.start_worker()
+        with override_settings(SOLVER_REMOTE_WORKERS=[server.address], SOLVER_REMOTE_TIMEOUT=9.0,
+                               SOLVER_REMOTE_RETRIES=1, SOLVER_REMOTE_HEALTH_INTERVAL=3.0):
+            remote = jobs._remote_options()
+        self.assertEqual(remote['timeout'], 9.0)
+        self.assertEqual(self.run_job(remote)['status'], jobs.JOB_DONE)
+        self.assertEqual(server.worker.served, 1)
+        pool = solver_rpc.get_pool([server.address], timeout=9.0, retries=1, health_interval=3.0)
+        self.assertEqual((pool.timeout, pool.retries, pool.health_interval), (9.0, 1, 3.0))
+
+    def test_local_fallback(self):
+        remote = {'workers': [free_address()], 'retries': 0, 'fallback_local': True}
+        with self.assertLogs('math_solver.jobs', 'WARNING'):
+            self.assertEqual(self.run_job(remote)['status'], jobs.JOB_DONE)
+        remote['fallback_local'] = False
+        self.assertEqual(self.run_job(remote)['status'], jobs.JOB_FAILED)
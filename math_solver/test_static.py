@@ -0,0 +1,90 @@
+"""
+Tests for the precompressed, content-hashed static pipeline
+"""
+
+import gzip
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.template import Context, Template
+from math_solver.storage import compress_variants
+
+COMPRESSED_STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'math_solver.storage.CompressedManifestStaticFilesStorage'},
+}
+
+
+class CompressVariantsTests(TestCase):
+
+    def test_gzip_roundtrip(self):
+        content = b'body { color: red; }\n' * 100
+        variants = compress_variants(content)
+        self.assertEqual(gzip.decompress(variants['.gz']), content)
+
+    def test_incompressible_content_is_skipped(self):
+        self.assertEqual(compress_variants(os.urandom(512)), {})
+
+
+class CollectStaticPipelineTests(TestCase):
+    """collectstatic + PrecompressedStaticMiddleware end to end"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.settings_override = override_settings(
+            STATIC_ROOT=self.tmp.name, STORAGES=COMPRESSED_STORAGES, SOLVER_SERVE_STATIC=True,
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    def hashed_main_js(self):
+        return Template("{% load static %}{% static 'math_solver/js/main.js' %}").render(Context())
+
+    def test_hashed_name_and_variants(self):
+        url = self.hashed_main_js()
+        self.assertRegex(url, r'main\.[0-9a-f]{12}\.js$')
+        path = os.path.join(self.tmp.name, url.split('/static/')[1])
+        self.assertTrue(os.path.isfile(path + '.gz'))
+
+    def test_serves_gzip_with_immutable_cache(self):
+        response = self.client.get(self.hashed_main_js(), HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertIn(b'class', gzip.decompress(b''.join(response.streaming_content)))
+
+    def test_identity_and_unhashed_names(self):
+        response = self.client.get('/static/math_solver/js/main.js')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertNotIn('immutable', response['Cache-Control'])
+
+    def test_path_traversal_is_not_served(self):
+        response = self.client.get('/static/../manage.py')
+        self.assertNotEqual(response.status_code, 200)
+
+
+class VendoredAssetsTests(TestCase):
+
+    template = Template("{% load solver_assets %}{% asset_url 'mathjax' %}")
+
+    def test_cdn_by_default(self):
+        self.assertEqual(self.template.render(Context()), settings.SOLVER_MATHJAX_URL)
+
+    @override_settings(SOLVER_VENDOR_ASSETS=True)
+    def test_local_copy_when_vendored(self):
+        self.assertEqual(self.template.render(Context()), '/static/math_solver/vendor/mathjax/mathjax.js')
+
+    @override_settings(SOLVER_VENDOR_ASSETS=True)
+    def test_help_page_uses_local_copies(self):
+        content = self.client.get('/solver/help/').content.decode()
+        self.assertIn('/static/math_solver/vendor/mathjax/mathjax.js', content)
+        self.assertIn('/static/math_solver/vendor/tailwind.min.css', content)
+        self.assertNotIn('cdn.', content)
+        self.assertNotIn('polyfill.io', content)
@@ -0,0 +1,85 @@
+"""
+Tests for the undetermined-coefficients engine
+"""
+
+from django.test import TestCase
+from sympy import Eq, Function, S, checkodesol, cos, exp, sin, symbols, tan
+from math_solver.benchmarks.runner import count_dsolve_calls
+from math_solver.solver_logic import general_solutions
+from math_solver.solver_logic.second_order_solver import solve_second_order_nonhomogeneous
+from math_solver.solver_logic.undetermined_coefficients import forcing_groups, solve_undetermined
+
+x = symbols('x')
+y = Function('y')(x)
+
+
+def _solve(a, b, c, g):
+    return solve_undetermined(S(a), S(b), S(c), g, y)
+
+
+class ForcingGroupsTests(TestCase):
+    """Detecting polynomial × exponential × sin/cos forcing terms"""
+
+    def test_groups_by_exponent_and_frequency(self):
+        groups = forcing_groups(x**2 + 3 * x * exp(2 * x) * cos(x) - sin(x), x)
+        self.assertEqual(groups, {(0, 0): 2, (2, 1): 1, (0, 1): 0})
+
+    def test_unsupported_terms(self):
+        self.assertIsNone(forcing_groups(tan(x), x))
+        self.assertIsNone(forcing_groups(sin(x)**2 * exp(x**2), x))
+        self.assertIsNone(forcing_groups(1 / x, x))
+
+
+class SolveUndeterminedTests(TestCase):
+    """Particular solutions and the resonance rule"""
+
+    def assertSolves(self, a, b, c, g):
+        result = _solve(a, b, c, g)
+        self.assertIsNotNone(result)
+        ode = Eq(a * y.diff(x, 2) + b * y.diff(x) + c * y, g)
+        self.assertTrue(checkodesol(ode, result['general'])[0])
+        return result
+
+    def test_polynomial_forcing(self):
+        self.assertEqual(self.assertSolves(1, 0, 1, x)['particular'], x)
+
+    def test_resonance_with_simple_root(self):
+        result = self.assertSolves(1, -3, 2, x * exp(x))
+        self.assertEqual(result['particular'], -x**2 * exp(x) / 2 - x * exp(x))
+        self.assertTrue(any('multiplicidad 1' in step for step in result['steps']))
+
+    def test_resonance_with_double_root(self):
+        result = self.assertSolves(1, 2, 1, exp(-x))
+        self.assertEqual(result['particular'], x**2 * exp(-x) / 2)
+
+    def test_resonance_with_complex_roots(self):
+        result = self.assertSolves(1, 0, 4, sin(2 * x))
+        self.assertEqual(result['particular'], -x * cos(2 * x) / 4)
+
+    def test_mixed_forcing(self):
+        self.assertSolves(1, 1, 1, x**2 + 3 * exp(2 * x) * cos(x))
+
+    def test_not_applicable(self):
+        self.assertIsNone(_solve(1, 0, 1, tan(x)))
+        self.assertIsNone(solve_undetermined(symbols('k'), S(0), S(1), x, y))
+
+
+class NonhomogeneousSolverTests(TestCase):
+    """solve_second_order_nonhomogeneous uses the engine before dsolve"""
+
+    def setUp(self):
+        general_solutions.cache_clear()
+
+    def test_engine_avoids_dsolve(self):
+        with count_dsolve_calls() as counter:
+            result = solve_second_order_nonhomogeneous('1', '0', '1', 'x', '0', '0', '1')
+        self.assertNotIn('error', result)
+        self.assertEqual(counter['calls'], 0)
+        self.assertIn('Coeficientes Indeterminados', ' '.join(result['steps']))
+        self.assertIn('x', result['solucion'])
+
+    def test_falls_back_to_dsolve(self):
+        with count_dsolve_calls() as counter:
+            result = solve_second_order_nonhomogeneous('1', '0', '1', 'tan(x)')
+        self.assertNotIn('error', result)
+        self.assertEqual(counter['calls'], 1)
@@ -0,0 +1,71 @@
+"""
+Tests for numeric verification of symbolic solutions
+"""
+
+from django.core.cache import caches
+from django.test import TestCase
+from sympy import Eq, Function, exp, symbols
+from math_solver.solver_logic.registry import run_solver
+from math_solver.solver_logic.verification import verify_result, verify_solution
+
+x, C1 = symbols('x C1')
+y = Function('y')(x)
+
+
+class VerifySolutionTests(TestCase):
+    """Residual of the ODE and of the initial conditions"""
+
+    ode = Eq(y.diff(x), y)
+
+    def test_correct_solution(self):
+        report = verify_solution(self.ode, Eq(y, C1 * exp(x)))
+        self.assertTrue(report['ok'])
+        self.assertLess(report['residuo_max'], 1e-12)
+        self.assertEqual(report['puntos'], 32)
+        self.assertGreaterEqual(report['tiempo_ms'], 0)
+
+    def test_wrong_solution(self):
+        report = verify_solution(self.ode, Eq(y, C1 * exp(2 * x)))
+        self.assertFalse(report['ok'])
+        self.assertGreater(report['residuo_max'], 0.1)
+
+    def test_initial_conditions(self):
+        ics = {y.subs(x, 0): 3}
+        self.assertTrue(verify_solution(self.ode, Eq(y, 3 * exp(x)), ics=ics)['ok'])
+        report = verify_solution(self.ode, Eq(y, 2 * exp(x)), ics=ics)
+        self.assertFalse(report['ok'])
+        self.assertAlmostEqual(report['residuo_ci'], 0.25)
+
+    def test_implicit_solution_is_skipped(self):
+        report = verify_solution(self.ode, Eq(y ** 2 + x, C1))
+        self.assertIsNone(report['ok'])
+        self.assertIn('implícita', report['motivo'])
+
+
+class VerifySolverResultTests(TestCase):
+    """Solvers expose their solution so it can be verified later"""
+
+    def test_second_order_ivp(self):
+        result = run_solver('second_order_homogeneous',
+                            {'second_a_val': '1', 'second_b_val': '0', 'second_c_val': '4',
+                             'second_x0': '0', 'second_y0': '1', 'second_y_prime_0': '0'}, verify=True)
+        self.assertTrue(result['verificacion']['ok'])
+        self.assertEqual(result['verificacion']['residuo_ci'], 0.0)
+
+    def test_bernoulli_from_srepr(self):
+        result = run_solver('bernoulli', {'bernoulli_p_function': '1', 'bernoulli_q_function': 'x',
+                                          'bernoulli_n_value': '2'})
+        self.assertIn('solucion_srepr', result)
+        self.assertTrue(verify_result(result)['ok'])
+
+    def test_non_ode_result(self):
+        result = run_solver('quadratic', {'quad_a_val': '1', 'quad_b_val': '0', 'quad_c_val': '-1'})
+        self.assertIsNone(verify_result(result)['ok'])
+
+    def test_view_attaches_report(self):
+        caches['default'].clear()
+        response = self.client.post('/solver/', {
+            'solver_type': 'cauchy', 'cauchy_a_val': '1', 'cauchy_b_val': '1', 'cauchy_c_val': '-1',
+            'cauchy_r_function': '0', 'verify': 'true',
+        }, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertTrue(response.json()['data']['verificacion']['ok'])
@@ -0,0 +1,143 @@
+"""
+Tests for worker memory measurement, SymPy cache governance and recycling
+"""
+
+import json
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import Future
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from math_solver import jobs, worker_memory
+
+
+class MeasureTests(TestCase):
+    """Per-job RSS, retained and peak memory"""
+
+    def test_report_fields(self):
+        with worker_memory.measure() as report:
+            block = bytearray(32 * 1024 * 1024)
+        del block
+        for key in ('rss_before_mb', 'rss_mb', 'retained_mb', 'peak_mb', 'elapsed_s'):
+            self.assertIn(key, report)
+        if report['peak_is_per_job']:
+            self.assertGreaterEqual(report['peak_mb'], report['rss_before_mb'] + 30)
+
+    def test_cache_size_cannot_change_after_import(self):
+        self.assertFalse(worker_memory.configure_worker(100))
+        self.assertTrue(worker_memory.configure_worker(None))
+
+
+class GovernTests(TestCase):
+    """Cache clearing first, recycling only if still over the limit"""
+
+    def test_under_limit(self):
+        report = {'rss_mb': 100.0}
+        self.assertFalse(worker_memory.govern(report, 200))
+        self.assertNotIn('cache_cleared', report)
+
+    def test_no_limit(self):
+        self.assertFalse(worker_memory.govern({'rss_mb': 10_000.0}, None))
+
+    def test_clears_cache_before_recycling(self):
+        with mock.patch('sympy.core.cache.clear_cache') as clear, \
+                mock.patch.object(worker_memory, 'rss_mb', return_value=150.0):
+            report = {'rss_mb': 300.0}
+            self.assertTrue(worker_memory.govern(report, 100))
+        clear.assert_called_once()
+        self.assertTrue(report['cache_cleared'])
+        self.assertEqual(report['rss_mb'], 150.0)
+
+    def test_cache_clear_is_enough(self):
+        with mock.patch('sympy.core.cache.clear_cache'), \
+                mock.patch.object(worker_memory, 'rss_mb', return_value=50.0):
+            self.assertFalse(worker_memory.govern({'rss_mb': 300.0}, 100))
+
+
+class RunJobMemoryTests(TestCase):
+    """run_job reports memory and logs it with the timings"""
+
+    data = {'second_a_val': '1', 'second_b_val': '0', 'second_c_val': '1'}
+
+    def test_report_and_timings_log(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, 'state.sqlite3')
+            log = os.path.join(tmp, 'timings.jsonl')
+            job_id = uuid.uuid4().hex
+            jobs._connect(db_path).execute(
+                "INSERT INTO solve_jobs (id, solver_type, status, created) VALUES (?, ?, ?, 0)",
+                (job_id, 'second_order_homogeneous', jobs.JOB_QUEUED),
+            )
+            report = jobs.run_job(db_path, job_id, 'second_order_homogeneous', self.data, {},
+                                  timings_log=log, max_rss_mb=1)
+            with open(log) as f:
+                record = json.loads(f.readline())
+        self.assertIn('retained_mb', report)
+        self.assertEqual(record['memory']['peak_mb'], report['peak_mb'])
+        if report['rss_mb'] is not None:
+            self.assertTrue(report['recycle'])
+
+
+class RecycleTests(TestCase):
+    """A recycled pool drains its queued jobs while new jobs go to a new pool"""
+
+    def tearDown(self):
+        jobs.shutdown(wait=True)
+
+    @override_settings(SOLVER_QUEUE_WORKERS=1)
+    def test_recycle_swaps_executor(self):
+        old = jobs.get_executor()
+        pending = old.submit(sum, [1, 2, 3])
+        jobs.recycle_executor(old)
+        self.assertEqual(pending.result(timeout=60), 6)
+        self.assertIsNot(jobs.get_executor(), old)
+
+    def test_only_recycle_on_request(self):
+        executor = mock.Mock()
+        future = Future()
+        future.set_result({'recycle': False})
+        jobs._after_job(executor, future)
+        executor.shutdown.assert_not_called()
+        future = Future()
+        future.set_result({'recycle': True})
+        jobs._after_job(executor, future)
+        executor.shutdown.assert_called_once_with(wait=False)
+
+
+class BrokenPoolTests(TestCase):
+    """A worker killed mid-job fails that job and the pool is replaced"""
+
+    data = {'second_a_val': '1', 'second_b_val': '0', 'second_c_val': '1'}
+
+    def tearDown(self):
+        jobs.shutdown(wait=True)
+
+    def wait_for(self, job_id):
+        deadline = time.monotonic() + 60
+        job = jobs.get_job(job_id)
+        while job['status'] in (jobs.JOB_QUEUED, jobs.JOB_RUNNING) and time.monotonic() < deadline:
+            time.sleep(0.1)
+            job = jobs.get_job(job_id)
+        return job
+
+    def test_killed_worker(self):
+        with tempfile.TemporaryDirectory() as tmp, \
+                override_settings(SOLVER_QUEUE_WORKERS=1, SOLVER_STATE_DB=os.path.join(tmp, 'state.sqlite3')):
+            killed = jobs.submit_job('second_order_homogeneous', self.data, {})
+            broken = jobs.get_executor()
+            # El proceso muere mientras arranca o resuelve el trabajo.
+            deadline = time.monotonic() + 30
+            while not broken._processes and time.monotonic() < deadline:
+                time.sleep(0.01)
+            for process in list(broken._processes.values()):
+                process.kill()
+            job = self.wait_for(killed)
+            self.assertEqual(job['status'], jobs.JOB_FAILED)
+            self.assertIn('terminó inesperadamente', job['result']['error'])
+
+            job = self.wait_for(jobs.submit_job('second_order_homogeneous', self.data, {}))
+            self.assertEqual(job['status'], jobs.JOB_DONE)
+            self.assertIsNot(jobs.get_executor(), broken)
@@ -0,0 +1,30 @@
+"""
+Ejecutor de los tests del proyecto.
+
+Los tests no deben tocar el almacén local del servidor (SOLVER_STATE_DB, en
+la raíz del proyecto): las filas de single-flight o de los cubos de tokens
+que dejara una ejecución se reutilizarían en la siguiente. Cada ejecución
+usa un archivo temporal propio; los tests que necesitan uno aislado siguen
+pasando el suyo con 'override_settings'.
+"""
+
+import os
+import tempfile
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._state_dir = tempfile.TemporaryDirectory()
+        self._state_settings = override_settings(
+            SOLVER_STATE_DB=os.path.join(self._state_dir.name, 'solver_state.sqlite3'))
+        self._state_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._state_settings.disable()
+        self._state_dir.cleanup()
+        super().teardown_test_environment(**kwargs)
@@ -17,4 +17,20 @@ urlpatterns = [
     # URL: /solver/help/
     # Página de ayuda con instrucciones detalladas
     path('help/', views.help_view, name='help_view'),
+
+    # URL: /solver/jobs/<job_id>/
+    # Estado (JSON) de un solve enviado a la cola de segundo plano.
+    path('jobs/<str:job_id>/', views.job_status_view, name='job_status'),
+
+    # URL: /solver/solutions/<solution_id>/eval/?x_min=&x_max=&points=&C1=...
+    # Muestras (JSON) de una solución ya calculada, para graficarla.
+    path('solutions/<str:solution_id>/eval/', views.evaluate_solution_view, name='evaluate_solution'),
+
+    # URL: /solver/series/<series_id>/?order=&budget_ms=
+    # Coeficientes (JSON) de una solución en serie, extendida al orden pedido.
+    path('series/<str:series_id>/', views.series_view, name='series'),
+
+    # URL: /solver/<solver_type>/<hash>/?campos...
+    # Resultado cacheable (ETag + Cache-Control) de una entrada canónica.
+    path('<slug:solver_type>/<str:digest>/', views.solver_result_view, name='solver_result'),
 ]
\ No newline at end of file
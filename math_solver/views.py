@@ -1,15 +1,342 @@
-from django.shortcuts import render
+from django.conf import settings
+from django.core.cache import caches
+from django.shortcuts import redirect, render
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag, urlencode
 from django.views.decorators.http import require_http_methods
-from django.http import JsonResponse
+from django.http import JsonResponse, Http404
+from django.middleware.gzip import GZipMiddleware
 import json
+import logging
+import math
+import random
+import threading
+import time
+
+# --- 1. Importar el registro de solvers y la admisión por costo ---
+from . import fair_share, jobs, singleflight, solver_rpc
+from .solver_logic.registry import SOLVERS, canonical_query, input_hash, run_solver, solver_args
+from .solver_logic.compact import SCHEMA_VERSION, compact_result
+from .solver_logic.evaluation import CONSTANT_NAME, SolutionNotEvaluable, evaluate_solution, solution_id
+from .solver_logic.series_engine import DEFAULT_ORDER, SeriesError, series_result
+from .solver_logic.verification import verify_result
+from .solver_logic.cost_model import (
+    LANE_QUEUE, LANE_REJECT, append_timing_record, choose_lane, estimate_cost,
+    extract_features, load_weights,
+)
+
+logger = logging.getLogger(__name__)
+
+# Pesos del modelo de costo, cargados una vez por proceso.
+_cost_weights = None
+
+# Compresión gzip solo para las respuestas JSON compactas: el HTML lleva el
+# token CSRF y no se comprime (BREACH).
+_gzip = GZipMiddleware(lambda request: None)
+# JSON sin espacios ni escapes \uXXXX para el esquema compacto.
+_COMPACT_JSON = {'ensure_ascii': False, 'separators': (',', ':')}
+
+
+def _get_cost_weights():
+    global _cost_weights
+    if _cost_weights is None:
+        _cost_weights = load_weights(settings.SOLVER_COST_WEIGHTS_FILE)
+    return _cost_weights
+
+
+# Tiempo de CPU gastado en trabajadores remotos por el solve de este hilo.
+_remote_usage = threading.local()
+
+
+def _run_solver(solver_type, data, render):
+    """
+    'run_solver' en los trabajadores remotos (SOLVER_REMOTE_WORKERS, ver
+    'solver_rpc') o, si no hay ninguno configurado, en este proceso. Si
+    ningún trabajador responde y SOLVER_REMOTE_FALLBACK_LOCAL es True, se
+    resuelve aquí.
+    """
+    if not settings.SOLVER_REMOTE_WORKERS:
+        return run_solver(solver_type, data, render=render)
+    pool = solver_rpc.get_pool(settings.SOLVER_REMOTE_WORKERS, timeout=settings.SOLVER_REMOTE_TIMEOUT,
+                               retries=settings.SOLVER_REMOTE_RETRIES,
+                               health_interval=settings.SOLVER_REMOTE_HEALTH_INTERVAL)
+    stats = {}
+    try:
+        return pool.solve(solver_type, data, render=render, stats=stats)
+    except solver_rpc.NoWorkersAvailable as e:
+        if not settings.SOLVER_REMOTE_FALLBACK_LOCAL:
+            raise
+        logger.warning('Solve local: %s', e)
+        return run_solver(solver_type, data, render=render)
+    finally:
+        _remote_usage.cpu_s = getattr(_remote_usage, 'cpu_s', 0.0) + stats.get('cpu_s', 0.0)
+
+
+def solve_once(solver_type, data):
+    """
+    Ejecuta el solver coalesciendo peticiones idénticas simultáneas: si otra
+    petición (de este u otro proceso) ya resuelve la misma entrada canónica,
+    se espera y se comparte su resultado en lugar de repetir el dsolve.
+    """
+    render = settings.SOLVER_RENDER_MODE
+    if not settings.SOLVER_SINGLEFLIGHT_ENABLED:
+        return _run_solver(solver_type, data, render)
+    return singleflight.do(
+        singleflight.solve_key(input_hash(solver_type, data), render, settings.SOLVER_RESULT_VERSION),
+        lambda: _run_solver(solver_type, data, render),
+        db_path=settings.SOLVER_STATE_DB,
+        lease=settings.SOLVER_SINGLEFLIGHT_LEASE,
+        result_ttl=settings.SOLVER_SINGLEFLIGHT_RESULT_TTL,
+    )
+
+
+def _client_limited(message, retry_after):
+    return {'error': message, 'limite_cliente': True, 'reintentar_en': max(1, math.ceil(retry_after))}
+
+
+def _rate_check(client):
+    """
+    (cubos del cliente, None) si puede resolver, o (cubos, contexto de error)
+    si agotó su tiempo de CPU. Sin límite activo devuelve (None, None).
+    """
+    if not client or not settings.SOLVER_RATE_LIMIT_ENABLED:
+        return None, None
+    buckets = fair_share.buckets_for(client)
+    wait = fair_share.client_wait(settings.SOLVER_STATE_DB, buckets)
+    if math.isinf(wait):
+        # 'rate' 0: rechazo definitivo, sin 'Retry-After'.
+        return buckets, {'error': 'Este cliente no tiene tiempo de cálculo asignado.', 'limite_cliente': True}
+    if wait > 0:
+        return buckets, _client_limited(
+            f'Has agotado tu tiempo de cálculo. Vuelve a intentarlo en {max(1, math.ceil(wait))} s.', wait)
+    return buckets, None
+
+
+def _admit_and_solve(solver_type, post, client=None):
+    """
+    Estima el costo de la entrada sin llamar a dsolve y, según el carril:
+    - la resuelve en línea (entradas baratas),
+    - la envía a la cola de segundo plano (entradas caras), o
+    - la rechaza con un mensaje claro (entradas patológicas).
+
+    Con 'client' y SOLVER_RATE_LIMIT_ENABLED, antes se comprueba que al
+    cliente le quede tiempo de CPU y después se le cobra el tiempo real del
+    solve (ver 'fair_share').
+    """
+    limits, limited = _rate_check(client)
+    if limited:
+        return limited
+
+    data = {name: post[name] for name, _ in SOLVERS[solver_type].fields if name in post}
+    features = None
+    if settings.SOLVER_ADMISSION_ENABLED or settings.SOLVER_TIMINGS_LOG:
+        features = extract_features(solver_type, solver_args(solver_type, data))
+
+    if settings.SOLVER_ADMISSION_ENABLED:
+        cost = estimate_cost(features, _get_cost_weights())
+        lane = choose_lane(cost, settings.SOLVER_INLINE_MAX_COST, settings.SOLVER_REJECT_COST)
+        if lane == LANE_REJECT:
+            return {'error': (
+                f'La ecuación es demasiado costosa para resolverse en este servicio '
+                f'(costo estimado: {cost:.1f} s, máximo permitido: {settings.SOLVER_REJECT_COST:.0f} s). '
+                f'Intenta simplificar los coeficientes o evitar funciones especiales.'
+            )}
+        if lane == LANE_QUEUE:
+            if limits and jobs.pending_jobs(client) >= settings.SOLVER_RATE_MAX_PENDING:
+                return _client_limited(
+                    f'Ya tienes {settings.SOLVER_RATE_MAX_PENDING} ecuaciones en la cola. '
+                    f'Espera a que terminen antes de enviar más.', settings.SOLVER_RATE_MAX_PENDING)
+            job_id = jobs.submit_job(solver_type, data, features, client=client if limits else None)
+            return {
+                'pendiente': True,
+                'job_id': job_id,
+                'job_url': reverse('math_solver:job_status', args=[job_id]),
+                'costo_estimado': round(cost, 2),
+            }
+
+    start = time.perf_counter()
+    cpu_start = time.thread_time()
+    _remote_usage.cpu_s = 0.0
+    result = solve_once(solver_type, data)
+    if limits:
+        # CPU del hilo de la petición y de los trabajadores remotos: esperar a
+        # otro solve idéntico no se cobra.
+        cpu_s = time.thread_time() - cpu_start + _remote_usage.cpu_s
+        fair_share.charge_client(settings.SOLVER_STATE_DB, limits, cpu_s)
+    if settings.SOLVER_TIMINGS_LOG:
+        append_timing_record(settings.SOLVER_TIMINGS_LOG, solver_type, data, features,
+                             time.perf_counter() - start)
+    return result
+
+
+def result_version() -> str:
+    """Versión de los resultados: SOLVER_RESULT_VERSION y el modo de render."""
+    return f'{settings.SOLVER_RESULT_VERSION}-{settings.SOLVER_RENDER_MODE}'
+
+
+def result_url(solver_type, data, digest=None):
+    """
+    URL canónica (GET) del resultado de una entrada:
+    /solver/<tipo>/<hash>/?campos&v=<versión>. La versión (ver
+    'result_version') forma parte de la URL para que las respuestas
+    'immutable' que guardan navegadores y proxies no sobrevivan a un cambio
+    de la lógica de los solvers o del modo de render.
+    """
+    digest = digest or input_hash(solver_type, data)
+    url = reverse('math_solver:solver_result', args=[solver_type, digest])
+    return f"{url}?{urlencode(canonical_query(solver_type, data) + [('v', result_version())])}"
+
+
+def result_cache_key(digest: str) -> str:
+    """Clave del resultado de una entrada en SOLVER_RESULT_CACHE."""
+    return f'solve:{settings.SOLVER_RESULT_VERSION}:{settings.SOLVER_RENDER_MODE}:{digest}'
+
+
+def _cached_solve(solver_type, data, digest, client=None):
+    """
+    Resuelve una entrada consultando primero la caché de resultados. Solo se
+    guardan resultados finales y correctos: el resultado es función pura de la
+    entrada, pero los errores y el carril dependen de la configuración. Los
+    resultados cacheados no gastan el tiempo de CPU del cliente.
+    """
+    cache = caches[settings.SOLVER_RESULT_CACHE]
+    key = result_cache_key(digest)
+    result = cache.get(key)
+    if result is None:
+        result = _admit_and_solve(solver_type, data, client)
+        if 'error' not in result and not result.get('pendiente'):
+            cache.set(key, result, settings.SOLVER_RESULT_CACHE_TIMEOUT)
+    return dict(result)
+
+
+def _verify_requested(params) -> bool:
+    """'verify=true' en la petición, o muestreo aleatorio del tráfico (SOLVER_VERIFY_SAMPLE_RATE)."""
+    if str(params.get('verify', '')).lower() in ('1', 'true', 'on'):
+        return True
+    return random.random() < settings.SOLVER_VERIFY_SAMPLE_RATE
+
+
+def _attach_verification(solver_type, context):
+    """
+    Verifica numéricamente la solución del contexto y añade 'verificacion'.
+    Las verificaciones fallidas se registran para vigilar la corrección de
+    los solvers con tráfico real.
+    """
+    report = verify_result(context)
+    context['verificacion'] = report
+    if report['ok'] is False:
+        logger.warning('Verificación fallida (%s): residuo=%s, residuo_ci=%s, %.1f ms',
+                       solver_type, report['residuo_max'], report['residuo_ci'], report['tiempo_ms'])
+    else:
+        logger.info('Verificación (%s): ok=%s, %.1f ms', solver_type, report['ok'], report['tiempo_ms'])
+
+
+def _source_query(solver_type, data) -> str:
+    """
+    Query string con la entrada que produjo una solución ('tipo' y los campos
+    canónicos), o '' si no se conoce. Con ella 'evaluate_solution_view' y
+    'series_view' reconstruyen la solución si ya caducó de la caché.
+    """
+    if solver_type not in SOLVERS or data is None:
+        return ''
+    return '?' + urlencode([('tipo', solver_type)] + canonical_query(solver_type, data))
+
+
+def _register_solution(context, solver_type=None, data=None):
+    """
+    Guarda la forma 'srepr' de la solución en la caché de resultados y añade
+    'solution_id' y 'eval_url' al contexto, para poder muestrearla después con
+    'evaluate_solution_view' sin volver a resolver. Las soluciones en serie
+    reciben igualmente un 'url' para extenderlas con 'series_view'.
+
+    Las entradas de la caché caducan (SOLVER_RESULT_CACHE_TIMEOUT) antes que
+    las respuestas que las enlazan (SOLVER_RESULT_MAX_AGE), así que, con
+    'solver_type' y 'data', los enlaces llevan la entrada (ver '_source_query').
+    """
+    source = _source_query(solver_type, data)
+    serie = context.get('serie')
+    if serie and serie.get('serie_spec'):
+        # Las series se pueden extender después a más orden con 'series_view'.
+        caches[settings.SOLVER_RESULT_CACHE].set(f"series:{serie['serie_id']}", serie['serie_spec'],
+                                                 settings.SOLVER_RESULT_CACHE_TIMEOUT)
+        serie['url'] = reverse('math_solver:series', args=[serie['serie_id']]) + source
+    srepr_value = context.get('solucion_srepr')
+    if not srepr_value:
+        return
+    sid = solution_id(srepr_value)
+    caches[settings.SOLVER_RESULT_CACHE].set(f'solution:{sid}', srepr_value, settings.SOLVER_RESULT_CACHE_TIMEOUT)
+    context['solution_id'] = sid
+    context['eval_url'] = reverse('math_solver:evaluate_solution', args=[sid]) + source
+
+
+def _rebuild_solution(request):
+    """
+    Vuelve a resolver (o toma de la caché de resultados) la entrada de la
+    query string de un 'eval_url' o del 'url' de una serie cuyo registro ya
+    caducó, y la registra de nuevo. Devuelve el contexto, o None si la URL no
+    lleva la entrada. El solve se cobra al cliente como cualquier otro.
+    """
+    solver_type = request.GET.get('tipo')
+    if solver_type not in SOLVERS:
+        return None
+    context = _cached_solve(solver_type, request.GET, input_hash(solver_type, request.GET),
+                            fair_share.client_id(request))
+    if 'solucion' in context:
+        _register_solution(context, solver_type, request.GET)
+    return context
+
+
+def _rebuild_pending(context):
+    """Respuesta para una reconstrucción que quedó en la cola (202) o se limitó (429); None si no."""
+    status = _status_for(context)
+    if status == 200:
+        return None
+    return _with_retry_after(JsonResponse({
+        'success': False,
+        'pending': context.get('pendiente', False),
+        'error': context.get('error', 'La solución se está recalculando; vuelve a intentarlo.'),
+    }, status=status), context)
+
+
+def _wants_json(request):
+    return (request.GET.get('format') == 'json'
+            or request.headers.get('X-Requested-With') == 'XMLHttpRequest')
+
+
+def _request_param(request, name):
+    return request.POST.get(name, request.GET.get(name))
+
+
+def _wants_compact(request) -> bool:
+    """'schema=2' en la petición: respuesta con el esquema compacto (ver 'compact.py')."""
+    return _request_param(request, 'schema') == str(SCHEMA_VERSION)
+
+
+def _status_for(context) -> int:
+    """429 si el cliente superó su límite, 202 si el solve quedó en la cola y 200 en otro caso."""
+    if context.get('limite_cliente'):
+        return 429
+    return 202 if context.get('pendiente') else 200
+
+
+def _with_retry_after(response, context):
+    if context.get('reintentar_en'):
+        response.headers['Retry-After'] = str(context['reintentar_en'])
+    return response
+
+
+def _compact_response(request, solver_type, context, elapsed=None, status=200, extra=None):
+    """
+    JsonResponse con el esquema compacto, comprimida con gzip si el cliente
+    lo acepta. Con 'plantillas=0' se omiten las plantillas de los pasos.
+    """
+    payload = compact_result(solver_type, context, elapsed,
+                             templates=_request_param(request, 'plantillas') != '0')
+    if extra:
+        payload.update(extra)
+    return _gzip.process_response(request, JsonResponse(payload, status=status, json_dumps_params=_COMPACT_JSON))
 
-# --- 1. Importar TODOS los solvers de nuestra lógica ---
-from .solver_logic.quadratic_solver import solve_quadratic
-from .solver_logic.bernoulli_solver import solve_bernoulli
-from .solver_logic.cauchy_euler_solver import solve_cauchy_euler
-from .solver_logic.clairaut_solver import solve_clairaut
-from .solver_logic.riccati_solver import solve_riccati
-from .solver_logic.second_order_solver import solve_second_order_homogeneous, solve_second_order_nonhomogeneous
 
 @require_http_methods(["GET", "POST"])
 def main_solver_view(request):
@@ -19,13 +346,21 @@ def main_solver_view(request):
     
     Esta vista ahora maneja los 5 tipos de solvers usando
     nombres de input únicos para evitar conflictos y soporta
-    respuestas JSON para solicitudes AJAX.
+    respuestas JSON para solicitudes AJAX ('schema=2' pide el esquema
+    compacto de la API, ver 'solver_logic/compact.py'). Si el cliente agotó
+    su tiempo de CPU (ver 'fair_share') responde 429 con 'Retry-After'.
     """
     
     # Contexto inicial
     # 'last_solver' se usa para decirle al HTML qué pestaña mostrar.
     # Por defecto (en GET) es 'quadratic'.
     context = {'last_solver': 'quadratic'}
+    elapsed = None
+
+    if request.method == 'GET' and settings.SOLVER_RATE_LIMIT_ENABLED:
+        # Sesión para que cada navegador tenga su propio límite aunque
+        # comparta IP (p. ej. toda una clase tras la misma red).
+        request.session.setdefault('solver_cliente', True)
 
     if request.method == 'POST':
         try:
@@ -36,79 +371,22 @@ def main_solver_view(request):
             # para que la página recargue la pestaña correcta.
             context['last_solver'] = solver_type
 
-            # --- 2. Lógica de enrutamiento basada en solver_type ---
-            
-            if solver_type == 'quadratic':
-                # --- CORREGIDO: Nombres únicos ---
-                a_str = request.POST.get('quad_a_val', '0')
-                b_str = request.POST.get('quad_b_val', '0')
-                c_str = request.POST.get('quad_c_val', '0')
-                # Llamar a la lógica del solver cuadrático
-                context.update(solve_quadratic(a_str, b_str, c_str))
-
-            elif solver_type == 'bernoulli':
-                # --- CORREGIDO: Nombres únicos ---
-                P_str = request.POST.get('bernoulli_p_function', '')
-                Q_str = request.POST.get('bernoulli_q_function', '')
-                n_str = request.POST.get('bernoulli_n_value', '')
-                # IVP parameters (optional)
-                x0_str = request.POST.get('bernoulli_x0', None)
-                y0_str = request.POST.get('bernoulli_y0', None)
-                # Llamar a la lógica del solver de Bernoulli
-                context.update(solve_bernoulli(P_str, Q_str, n_str, x0_str, y0_str))
-            
-            # --- CORREGIDO: 'cauchy_euler' a 'cauchy' para coincidir con el HTML ---
-            elif solver_type == 'cauchy':
-                # --- CORREGIDO: Nombres únicos ---
-                a_str = request.POST.get('cauchy_a_val', '0')
-                b_str = request.POST.get('cauchy_b_val', '0')
-                c_str = request.POST.get('cauchy_c_val', '0')
-                R_str = request.POST.get('cauchy_r_function', '0')
-                # Llamar a la lógica del solver de Cauchy-Euler
-                context.update(solve_cauchy_euler(a_str, b_str, c_str, R_str))
-
-            elif solver_type == 'clairaut':
-                # --- CORREGIDO: Nombres únicos ---
-                f_p_str = request.POST.get('clairaut_f_p_function', '')
-                # Llamar a la lógica del solver de Clairaut
-                context.update(solve_clairaut(f_p_str))
-                
-            elif solver_type == 'riccati':
-                # --- CORREGIDO: Nombres únicos ---
-                P_str = request.POST.get('riccati_p_function', '')
-                Q_str = request.POST.get('riccati_q_function', '')
-                R_str = request.POST.get('riccati_r_function', '')
-                # IVP parameters (optional)
-                x0_str = request.POST.get('riccati_x0', None)
-                y0_str = request.POST.get('riccati_y0', None)
-                # Llamar a la lógica del solver de Riccati
-                context.update(solve_riccati(P_str, Q_str, R_str, x0_str, y0_str))
-                
-            elif solver_type == 'second_order_homogeneous':
-                # --- Solver de segundo orden homogéneo ---
-                a_str = request.POST.get('second_a_val', '0')
-                b_str = request.POST.get('second_b_val', '0')
-                c_str = request.POST.get('second_c_val', '0')
-                # IVP parameters (optional)
-                x0_str = request.POST.get('second_x0', None)
-                y0_str = request.POST.get('second_y0', None)
-                y_prime_0_str = request.POST.get('second_y_prime_0', None)
-                # Llamar a la lógica del solver de segundo orden homogéneo
-                context.update(solve_second_order_homogeneous(a_str, b_str, c_str, x0_str, y0_str, y_prime_0_str))
-                
-            elif solver_type == 'second_order_nonhomogeneous':
-                # --- Solver de segundo orden no homogéneo ---
-                a_str = request.POST.get('second_a_val', '0')
-                b_str = request.POST.get('second_b_val', '0')
-                c_str = request.POST.get('second_c_val', '0')
-                g_str = request.POST.get('second_g_function', '0')
-                # IVP parameters (optional)
-                x0_str = request.POST.get('second_x0', None)
-                y0_str = request.POST.get('second_y0', None)
-                y_prime_0_str = request.POST.get('second_y_prime_0', None)
-                # Llamar a la lógica del solver de segundo orden no homogéneo
-                context.update(solve_second_order_nonhomogeneous(a_str, b_str, c_str, g_str, x0_str, y0_str, y_prime_0_str))
-
+            # --- 2. Enrutamiento basado en solver_type ---
+            # Los nombres de los campos de cada solver están en el registro
+            # ('solver_logic/registry.py'); la admisión decide si se resuelve
+            # en línea, en la cola de segundo plano o si se rechaza.
+            if solver_type in SOLVERS:
+                digest = input_hash(solver_type, request.POST)
+                start = time.perf_counter()
+                context.update(_cached_solve(solver_type, request.POST, digest,
+                                             fair_share.client_id(request)))
+                elapsed = time.perf_counter() - start
+                # Enlace a la URL GET cacheable del mismo resultado.
+                if 'solucion' in context:
+                    context['permalink'] = result_url(solver_type, request.POST, digest)
+                    _register_solution(context, solver_type, request.POST)
+                    if _verify_requested(request.POST):
+                        _attach_verification(solver_type, context)
             else:
                 context = {'error': f'Tipo de solver desconocido: "{solver_type}"'}
 
@@ -117,17 +395,235 @@ def main_solver_view(request):
             context = {'error': f'Ha ocurrido un error inesperado en la vista: {e}'}
 
     # 3. Manejar respuesta AJAX vs respuesta normal
+    if request.method == 'POST' and _wants_compact(request):
+        return _with_retry_after(_compact_response(request, context.get('last_solver'), context, elapsed,
+                                                   status=_status_for(context)), context)
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         # Es una solicitud AJAX - devolver JSON
-        return JsonResponse({
+        # (202 si el solve quedó en la cola de segundo plano, 429 si el
+        # cliente superó su límite)
+        return _with_retry_after(JsonResponse({
             'success': 'error' not in context,
+            'pending': context.get('pendiente', False),
             'data': context
-        })
+        }, status=_status_for(context)), context)
     else:
         # Es una solicitud normal - renderizar la página
         # Si es GET, context es {'last_solver': 'quadratic'}.
         # Si es POST, context contiene la 'solucion' o 'error' Y 'last_solver'.
-        return render(request, 'math_solver/index.html', {'context': context})
+        return _with_retry_after(render(request, 'math_solver/index.html', {'context': context},
+                                        status=_status_for(context)), context)
+
+
+@require_http_methods(["GET", "HEAD"])
+def solver_result_view(request, solver_type, digest):
+    """
+    Resultado de una entrada en una URL GET canónica y cacheable.
+
+    La ruta lleva el hash de la entrada canónica y la query string los campos
+    del formulario y la versión de los resultados ('v'); una URL con otro
+    hash u otra versión redirige (302) a la actual. Como la solución es función pura de la entrada, la
+    respuesta lleva un ETag fuerte (hash + SOLVER_RESULT_VERSION); el JSON
+    además un 'Cache-Control' largo y público, y la página HTML, que lleva el
+    token CSRF, 'private, no-cache'. Un 'If-None-Match' que coincide recibe un
+    304 sin llegar a resolver nada. Devuelve JSON con '?format=json' o en peticiones
+    AJAX (con '?schema=2', el esquema compacto) y la página completa en otro caso.
+    Resolver una entrada nueva gasta el tiempo de CPU del cliente como en
+    'main_solver_view' (429 con 'Retry-After' si lo agotó).
+    """
+    if solver_type not in SOLVERS:
+        raise Http404('Tipo de solver desconocido')
+
+    canonical = input_hash(solver_type, request.GET)
+    if canonical != digest or request.GET.get('v') != result_version():
+        # Hash de otra entrada (o de una versión anterior del parser), o URL
+        # de otra versión de los resultados.
+        url = result_url(solver_type, request.GET, canonical)
+        options = {name: request.GET[name] for name in ('format', 'schema', 'plantillas') if name in request.GET}
+        if options:
+            url += '&' + urlencode(options)
+        # Temporal: el hash canónico cambia con las versiones del parser.
+        return redirect(url)
+
+    compact = _wants_compact(request)
+    as_json = compact or _wants_json(request)
+    # Con 'verify' la respuesta incluye el informe de verificación.
+    verify = str(request.GET.get('verify', '')).lower() in ('1', 'true', 'on')
+    etag = quote_etag(f"{digest[:32]}-{settings.SOLVER_RESULT_VERSION}-{settings.SOLVER_RENDER_MODE}-"
+                      f"{'json' if as_json else 'html'}{'-verify' if verify else ''}"
+                      f"{f'-v{SCHEMA_VERSION}' if compact else ''}"
+                      f"{'-np' if compact and request.GET.get('plantillas') == '0' else ''}")
+
+    def finish(response, cacheable):
+        patch_vary_headers(response, ['X-Requested-With'])
+        if cacheable and as_json:
+            response.headers['ETag'] = etag
+            patch_cache_control(response, public=True, immutable=True,
+                                max_age=settings.SOLVER_RESULT_MAX_AGE)
+        elif cacheable:
+            # La página lleva el formulario con su token CSRF y fija la cookie:
+            # no puede compartirse entre usuarios, solo revalidarse con el ETag.
+            response.headers['ETag'] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+        else:
+            patch_cache_control(response, no_cache=True)
+        return response
+
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return finish(not_modified, cacheable=True)
+
+    context = {'last_solver': solver_type}
+    start = time.perf_counter()
+    try:
+        context.update(_cached_solve(solver_type, request.GET, digest, fair_share.client_id(request)))
+    except Exception as e:
+        context = {'error': f'Ha ocurrido un error inesperado en la vista: {e}'}
+    cacheable = 'error' not in context and not context.get('pendiente')
+    if cacheable:
+        context['permalink'] = request.get_full_path()
+        _register_solution(context, solver_type, request.GET)
+        if verify:
+            _attach_verification(solver_type, context)
+
+    if compact:
+        response = finish(JsonResponse(compact_result(solver_type, context, time.perf_counter() - start,
+                                                      templates=request.GET.get('plantillas') != '0'),
+                                       status=_status_for(context),
+                                       json_dumps_params=_COMPACT_JSON), cacheable)
+        # Después de 'finish': gzip debilita el ETag de la respuesta comprimida.
+        return _with_retry_after(_gzip.process_response(request, response), context)
+    if as_json:
+        response = JsonResponse({
+            'success': 'error' not in context,
+            'pending': context.get('pendiente', False),
+            'data': context,
+        }, status=_status_for(context))
+    else:
+        response = render(request, 'math_solver/index.html', {'context': context}, status=_status_for(context))
+    return _with_retry_after(finish(response, cacheable), context)
+
+
+@require_http_methods(["GET"])
+def job_status_view(request, job_id):
+    """
+    Estado de un solve enviado a la cola de segundo plano.
+
+    Devuelve {'status', 'pending', 'success', 'data'}; mientras el trabajo no
+    termine, 'pending' es True y 'data' no contiene la solución. Con
+    'schema=2' devuelve el esquema compacto más 'status' y 'pending'.
+    """
+    job = jobs.get_job(job_id)
+    if job is None:
+        raise Http404('Trabajo no encontrado')
+
+    pending = job['status'] in (jobs.JOB_QUEUED, jobs.JOB_RUNNING)
+    data = {'last_solver': job['solver_type']}
+    if job['result'] is not None:
+        data.update(job['result'])
+        _register_solution(data, job['solver_type'], job['data'])
+        if 'solucion' in data and _verify_requested(request.GET):
+            _attach_verification(job['solver_type'], data)
+    if _wants_compact(request):
+        if pending:
+            data = {'pendiente': True, 'job_id': job_id, 'job_url': request.path}
+        return _compact_response(request, job['solver_type'], data,
+                                 extra={'status': job['status'], 'pending': pending})
+    return JsonResponse({
+        'status': job['status'],
+        'pending': pending,
+        'success': not pending and 'error' not in data,
+        'data': data,
+    })
+
+
+@require_http_methods(["GET"])
+def evaluate_solution_view(request, solution_id):
+    """
+    Muestrea numéricamente una solución ya calculada.
+
+    Parámetros GET: 'x_min', 'x_max' (finitos), 'points' y un valor por
+    constante ('C1', 'C2', ...; por defecto 1). Se ignoran los demás
+    parámetros y las constantes que no aparecen en la solución. La función
+    compilada se cachea por solución, así que cada llamada solo cuesta la
+    evaluación vectorizada. Si la solución caducó de la caché se reconstruye
+    a partir de la entrada que lleva el 'eval_url' (ver '_register_solution').
+    """
+    srepr_value = caches[settings.SOLVER_RESULT_CACHE].get(f'solution:{solution_id}')
+    if srepr_value is None:
+        context = _rebuild_solution(request)
+        if context is None:
+            raise Http404('Solución no encontrada o caducada; vuelve a resolver la ecuación.')
+        pending = _rebuild_pending(context)
+        if pending is not None:
+            return pending
+        if 'solution_id' not in context:
+            raise Http404('Solución no encontrada o caducada; vuelve a resolver la ecuación.')
+        if context['solution_id'] != solution_id:
+            # La entrada se resuelve ahora con otra forma de la solución.
+            url = reverse('math_solver:evaluate_solution', args=[context['solution_id']])
+            return redirect(f'{url}?{request.GET.urlencode()}')
+        srepr_value = context['solucion_srepr']
+    try:
+        x_min = float(request.GET.get('x_min', -5))
+        x_max = float(request.GET.get('x_max', 5))
+        points = int(request.GET.get('points', 200))
+        constants = {name: value for name, value in request.GET.items() if CONSTANT_NAME.fullmatch(name)}
+        samples = evaluate_solution(srepr_value, x_min, x_max, points, constants)
+    except (ValueError, SolutionNotEvaluable) as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    response = JsonResponse({'success': True, 'data': samples})
+    patch_cache_control(response, public=True, max_age=settings.SOLVER_EVAL_MAX_AGE)
+    return response
+
+
+@require_http_methods(["GET"])
+def series_view(request, series_id):
+    """
+    Extiende una solución en serie ya calculada.
+
+    Parámetros GET: 'order' (orden pedido, hasta SOLVER_SERIES_MAX_ORDER) y
+    'budget_ms' (tiempo máximo; si se agota se devuelve el orden alcanzado).
+    Los coeficientes ya calculados se reutilizan: solo se calculan los nuevos.
+    El tiempo de CPU se cobra al cliente como un solve (ver 'fair_share').
+    Si la serie caducó de la caché se reconstruye como en
+    'evaluate_solution_view'.
+    """
+    spec = caches[settings.SOLVER_RESULT_CACHE].get(f'series:{series_id}')
+    if spec is None:
+        context = _rebuild_solution(request)
+        if context is None:
+            raise Http404('Serie no encontrada o caducada; vuelve a resolver la ecuación.')
+        pending = _rebuild_pending(context)
+        if pending is not None:
+            return pending
+        serie = context.get('serie') or {}
+        if serie.get('serie_id') != series_id:
+            raise Http404('Serie no encontrada o caducada; vuelve a resolver la ecuación.')
+        spec = serie['serie_spec']
+    try:
+        order = int(request.GET.get('order', DEFAULT_ORDER))
+        budget_ms = float(request.GET.get('budget_ms', settings.SOLVER_SERIES_BUDGET_MS))
+        if not 0 <= order <= settings.SOLVER_SERIES_MAX_ORDER:
+            raise ValueError(f'El orden debe estar entre 0 y {settings.SOLVER_SERIES_MAX_ORDER}.')
+        if not math.isfinite(budget_ms) or budget_ms <= 0:
+            raise ValueError('budget_ms debe ser un número positivo.')
+    except ValueError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+
+    buckets, limited = _rate_check(fair_share.client_id(request))
+    if limited:
+        return _with_retry_after(JsonResponse({'success': False, 'error': limited['error']}, status=429), limited)
+    cpu_start = time.thread_time()
+    try:
+        data = series_result(spec, order, budget=min(budget_ms, settings.SOLVER_SERIES_BUDGET_MS) / 1000)
+    except SeriesError as e:
+        return JsonResponse({'success': False, 'error': str(e)}, status=400)
+    finally:
+        if buckets:
+            fair_share.charge_client(settings.SOLVER_STATE_DB, buckets, time.thread_time() - cpu_start)
+    data.pop('serie_spec')
+    return JsonResponse({'success': True, 'data': data})
 
 
 def help_view(request):
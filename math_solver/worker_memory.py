@@ -0,0 +1,128 @@
+"""
+Memoria de los Procesos Trabajadores
+
+Los procesos que llaman a 'dsolve', 'simplify' o 'classify_ode' crecen con
+cada petición: la caché global de SymPy y los objetos que retiene se van
+acumulando. Este módulo:
+
+- fija el tamaño de la caché de SymPy de cada proceso del pool
+  (SYMPY_CACHE_SIZE se lee al importar SymPy, así que se configura en el
+  initializer, antes de que el proceso importe los solvers);
+- mide la memoria de cada trabajo: RSS antes y después (memoria retenida) y
+  el pico durante el trabajo;
+- decide si el proceso debe reciclarse: si tras un trabajo supera el límite,
+  primero se vacía la caché de SymPy y, si sigue por encima, se pide el
+  reciclaje (ver 'jobs.recycle_executor').
+
+Las medidas salen de /proc (Linux). En otros sistemas el pico es el de todo
+el proceso (getrusage) y el RSS actual no está disponible.
+"""
+
+import gc
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def configure_worker(sympy_cache_size=None):
+    """
+    Initializer del pool: fija SYMPY_CACHE_SIZE antes de importar SymPy.
+    Devuelve False si SymPy ya estaba importado (el tamaño ya no se puede cambiar).
+    """
+    if sympy_cache_size is None:
+        return True
+    if 'sympy' in sys.modules:
+        return False
+    os.environ['SYMPY_CACHE_SIZE'] = str(sympy_cache_size)
+    return True
+
+
+def _status_mb(field: str):
+    """Valor de /proc/self/status (en kB) convertido a MB, o None."""
+    try:
+        with open('/proc/self/status', encoding='ascii') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def rss_mb():
+    """Memoria residente actual del proceso en MB, o None si no se puede medir."""
+    return _status_mb('VmRSS')
+
+
+def peak_rss_mb():
+    """Pico de memoria residente en MB (desde el último 'reset_peak' si se pudo)."""
+    peak = _status_mb('VmHWM')
+    if peak is None and resource is not None:
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss está en kB en Linux y en bytes en macOS.
+        peak = maxrss / (1024 * 1024) if sys.platform == 'darwin' else maxrss / 1024
+    return peak
+
+
+def reset_peak() -> bool:
+    """Reinicia el pico de RSS del proceso (Linux >= 4.0). False si no se pudo."""
+    try:
+        with open('/proc/self/clear_refs', 'w', encoding='ascii') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _round(value):
+    return None if value is None else round(value, 1)
+
+
+@contextmanager
+def measure():
+    """
+    Mide la memoria de un bloque. El diccionario entregado se completa al
+    salir con 'rss_before_mb', 'rss_mb', 'retained_mb', 'peak_mb',
+    'peak_is_per_job' (False si el pico es el de toda la vida del proceso),
+    'elapsed_s' y 'cpu_s' (tiempo de CPU de todo el proceso).
+    """
+    report = {'rss_before_mb': _round(rss_mb()), 'peak_is_per_job': reset_peak()}
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield report
+    finally:
+        after = rss_mb()
+        report['rss_mb'] = _round(after)
+        before = report['rss_before_mb']
+        report['retained_mb'] = None if None in (before, after) else _round(after - before)
+        report['peak_mb'] = _round(peak_rss_mb())
+        report['elapsed_s'] = round(time.perf_counter() - start, 6)
+        report['cpu_s'] = round(time.process_time() - cpu_start, 6)
+
+
+def govern(report: dict, max_rss_mb=None) -> bool:
+    """
+    Aplica el límite de memoria tras un trabajo medido con 'measure'.
+
+    Si el RSS supera 'max_rss_mb' se vacía la caché de SymPy y se vuelve a
+    medir; si sigue por encima, marca report['recycle'] = True. Devuelve ese
+    valor.
+    """
+    report['recycle'] = False
+    if not max_rss_mb or report.get('rss_mb') is None or report['rss_mb'] <= max_rss_mb:
+        return False
+    from sympy.core.cache import clear_cache
+
+    clear_cache()
+    gc.collect()
+    report['cache_cleared'] = True
+    report['rss_mb'] = _round(rss_mb())
+    report['recycle'] = report['rss_mb'] is not None and report['rss_mb'] > max_rss_mb
+    return report['recycle']